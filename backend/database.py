@@ -7,8 +7,9 @@ import sqlite3
 import threading
 import time
 from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
 
 try:  # Optional dependency for production Postgres deployments.
     import psycopg  # type: ignore[import-not-found]
@@ -20,14 +21,149 @@ class DatabaseError(RuntimeError):
     """Raised when the database backend cannot be initialised."""
 
 
-class Database:
-    """Lightweight connection manager with transactional helpers."""
+@dataclass
+class PoolStats:
+    """Checkout counters for one connection pool, safe to update from any thread."""
+
+    checkouts: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, waited: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += waited
+            if waited > self.max_wait_seconds:
+                self.max_wait_seconds = waited
 
-    def __init__(self, url: str | None = None) -> None:
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "waitSeconds": self.wait_seconds,
+                "maxWaitSeconds": self.max_wait_seconds,
+            }
+
+
+class _ConnectionPool:
+    """Bounded pool of DB-API connections opened lazily by ``factory``.
+
+    Connections that report ``closed`` after an error are closed and
+    discarded so a restarted server does not leave dead connections in the
+    pool; the freed slot wakes one waiter, which opens a replacement.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int) -> None:
+        self._factory = factory
+        self._size = max(1, size)
+        self._idle: List[Any] = []
+        self._opened: List[Any] = []
+        self._opening = 0
+        self._cond = threading.Condition()
+        self.stats = PoolStats()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        started = time.perf_counter()
+        conn = self._acquire()
+        self.stats.record(time.perf_counter() - started)
+        try:
+            yield conn
+        except BaseException:
+            if getattr(conn, "closed", False):
+                self._discard(conn)
+            else:
+                self._release(conn)
+            raise
+        self._release(conn)
+
+    def _acquire(self) -> Any:
+        with self._cond:
+            while not self._idle and len(self._opened) + self._opening >= self._size:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._opening += 1
+        # Open outside the lock so a slow connect does not stall returns.
+        try:
+            conn = self._factory()
+        except BaseException:
+            with self._cond:
+                self._opening -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._opening -= 1
+            self._opened.append(conn)
+        return conn
+
+    def _release(self, conn: Any) -> None:
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def _discard(self, conn: Any) -> None:
+        with self._cond:
+            if conn in self._opened:
+                self._opened.remove(conn)
+            self._cond.notify()
+        try:
+            conn.close()
+        except Exception:  # pragma: no cover - the handle is already dead
+            pass
+
+    def close(self) -> None:
+        with self._cond:
+            opened, self._opened = self._opened, []
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in opened:
+            try:
+                conn.close()
+            except Exception:  # pragma: no cover - best effort shutdown
+                pass
+
+
+class Database:
+    """Connection manager with pooled, transactional helpers.
+
+    SQLite files get one writer connection (serialised by a lock) plus up to
+    ``pool_size`` read-only connections; with WAL enabled, readers see the
+    last committed state without waiting for an in-flight write.  PostgreSQL
+    uses a pool of ``pool_size`` connections for writes and a read-only pool
+    that targets ``replica_url`` (``HGM_DATABASE_REPLICA_URL``) when set.
+    In-memory SQLite databases have a single connection shared by both paths.
+    """
+
+    def __init__(
+        self,
+        url: str | None = None,
+        *,
+        pool_size: int | None = None,
+        replica_url: str | None = None,
+    ) -> None:
         self._url = url or os.environ.get("HGM_DATABASE_URL", "sqlite:///storage/hgm.db")
         self._driver, self._dsn = self._parse_url(self._url)
+        if pool_size is None:
+            pool_size = int(os.environ.get("HGM_DATABASE_POOL_SIZE", "4") or "4")
+        self._pool_size = max(1, pool_size)
         self._lock = threading.RLock()
-        self._conn = self._connect()
+        self._writer_stats = PoolStats()
+        self._conn: Any = None
+        self._writers: Optional[_ConnectionPool] = None
+        self._readers: Optional[_ConnectionPool] = None
+        if self._driver == "sqlite":
+            self._conn = self._connect()
+            if self._dsn not in {":memory:", "memory"}:
+                self._readers = _ConnectionPool(self._connect_reader, self._pool_size)
+        else:
+            replica = replica_url or os.environ.get("HGM_DATABASE_REPLICA_URL") or None
+            replica_dsn = self._parse_url(replica)[1] if replica else self._dsn
+            self._writers = _ConnectionPool(self._connect, self._pool_size)
+            self._readers = _ConnectionPool(lambda: self._connect_reader(replica_dsn), self._pool_size)
+            with self._writers.connection():
+                pass  # Fail fast on an unreachable server, as the single connection used to.
         self._closed = False
 
     @staticmethod
@@ -74,6 +210,9 @@ class Database:
                     db_path = Path.cwd() / db_path
                 db_path.parent.mkdir(parents=True, exist_ok=True)
                 conn = sqlite3.connect(str(db_path), check_same_thread=False)
+                # WAL lets readers proceed during batched writes; NORMAL sync is durable under WAL.
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.execute("PRAGMA synchronous = NORMAL")
             conn.row_factory = sqlite3.Row
             conn.execute("PRAGMA foreign_keys = ON")
             return conn
@@ -82,6 +221,20 @@ class Database:
             return psycopg.connect(self._dsn)  # type: ignore[no-any-return]
         raise DatabaseError(f"Unsupported driver: {self._driver}")
 
+    def _connect_reader(self, dsn: Optional[str] = None):  # type: ignore[override]
+        if self._driver == "sqlite":
+            db_path = Path(self._dsn)
+            if not db_path.is_absolute():
+                db_path = Path.cwd() / db_path
+            conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only = ON")
+            return conn
+        assert psycopg is not None  # for type-checkers
+        conn = psycopg.connect(dsn or self._dsn)
+        conn.read_only = True
+        return conn
+
     @property
     def driver(self) -> str:
         return self._driver
@@ -94,23 +247,58 @@ class Database:
         with self._lock:
             if self._closed:
                 return
-            self._conn.close()
+            if self._conn is not None:
+                self._conn.close()
+            for pool in (self._writers, self._readers):
+                if pool is not None:
+                    pool.close()
             self._closed = True
 
+    def pool_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return checkout counts and cumulative/max wait times for the writer and reader paths."""
+
+        writer = self._writers.stats if self._writers is not None else self._writer_stats
+        stats = {"writer": writer.as_dict()}
+        if self._readers is not None:
+            stats["reader"] = self._readers.stats.as_dict()
+        return stats
+
     @contextmanager
-    def transaction(self):  # type: ignore[override]
+    def transaction(self, *, readonly: bool = False):  # type: ignore[override]
+        """Yield a cursor inside a transaction.
+
+        ``readonly=True`` runs on a reader connection so lookups do not queue
+        behind writes; statements that modify data fail on that path.
+        """
+
         if self._closed:
             raise DatabaseError("Database connection already closed")
+        if readonly and self._readers is not None:
+            with self._readers.connection() as conn, self._cursor(conn) as cursor:
+                yield cursor
+            return
+        if self._writers is not None:
+            with self._writers.connection() as conn, self._cursor(conn) as cursor:
+                yield cursor
+            return
+        started = time.perf_counter()
         with self._lock:
-            cursor = self._conn.cursor()
-            try:
+            self._writer_stats.record(time.perf_counter() - started)
+            with self._cursor(self._conn) as cursor:
                 yield cursor
-                self._conn.commit()
-            except Exception:
-                self._conn.rollback()
-                raise
-            finally:
-                cursor.close()
+
+    @staticmethod
+    @contextmanager
+    def _cursor(conn: Any) -> Iterator[Any]:
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
 
     def run_migrations(self, migrations: Sequence["Migration"], *, table: str = "hgm_schema_migrations") -> None:
         """Apply migrations sequentially, tracking applied versions."""
@@ -205,4 +393,4 @@ def set_database(database: Database | None) -> None:
         _DATABASE_SINGLETON = database
 
 
-__all__ = ["Database", "DatabaseError", "Migration", "get_database", "set_database"]
+__all__ = ["Database", "DatabaseError", "Migration", "PoolStats", "get_database", "set_database"]
@@ -1,7 +1,8 @@
 """HGM schema migrations."""
 
 from .migration_0001_initial import Migration0001Initial
+from .migration_0002_lineage_paths import Migration0002LineagePaths
 
-MIGRATIONS = [Migration0001Initial()]
+MIGRATIONS = [Migration0001Initial(), Migration0002LineagePaths()]
 
 __all__ = ["MIGRATIONS"]
@@ -0,0 +1,51 @@
+"""Materialised lineage paths for subtree, paginated and delta lineage queries."""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+from backend.database import Migration
+
+# Mirrors ``backend.models.hgm._PATH_SEPARATOR``; kept local so the migration is frozen.
+_PATH_SEPARATOR = "\x1f"
+
+
+class Migration0002LineagePaths(Migration):
+    version = "0002_lineage_paths"
+
+    def upgrade(self, cursor, driver: str) -> None:  # type: ignore[override]
+        if driver == "postgres":
+            # Byte-wise collation keeps the path range scans below index-friendly.
+            cursor.execute(
+                """ALTER TABLE hgm_agents ADD COLUMN IF NOT EXISTS path TEXT COLLATE "C" NOT NULL DEFAULT ''"""
+            )
+            placeholder = "%s"
+        else:
+            cursor.execute("ALTER TABLE hgm_agents ADD COLUMN path TEXT NOT NULL DEFAULT ''")
+            placeholder = "?"
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_hgm_agents_path ON hgm_agents(run_id, path)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_hgm_agents_updated ON hgm_agents(run_id, updated_at)")
+
+        cursor.execute("SELECT run_id, agent_key, parent_key FROM hgm_agents")
+        parents: Dict[Tuple[str, str], Optional[str]] = {
+            (str(row[0]), str(row[1])): row[2] for row in cursor.fetchall() or []
+        }
+        paths: Dict[Tuple[str, str], str] = {}
+        for key in parents:
+            chain = []
+            current: Optional[Tuple[str, str]] = key
+            while current is not None and current in parents and current not in paths and current not in chain:
+                chain.append(current)
+                parent = parents[current]
+                current = (current[0], parent) if parent else None
+            prefix = paths.get(current, _PATH_SEPARATOR) if current is not None else _PATH_SEPARATOR
+            for node in reversed(chain):
+                prefix = paths[node] = f"{prefix}{node[1]}{_PATH_SEPARATOR}"
+        if paths:
+            cursor.executemany(
+                f"UPDATE hgm_agents SET path = {placeholder} WHERE run_id = {placeholder} AND agent_key = {placeholder}",
+                [(path, run_id, agent_key) for (run_id, agent_key), path in paths.items()],
+            )
+
+
+__all__ = ["Migration0002LineagePaths"]
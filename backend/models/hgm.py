@@ -2,16 +2,32 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
 import json
 import logging
+import queue
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field, asdict
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from backend.database import Database, get_database
 
 LOGGER = logging.getLogger(__name__)
 
+_MAX_CACHED_RUNS = 64
+_MAX_LINEAGE_HOPS = 10_000
+# Materialised paths are ``<sep>root<sep>child<sep>...``; the separator sorts
+# below every printable character, so a subtree is one contiguous index range.
+_PATH_SEPARATOR = "\x1f"
+_LINEAGE_COLUMNS = """
+    a.agent_key, a.parent_key, a.depth, a.metadata, a.expansion_count, a.clade_success, a.clade_failure,
+    p.visits, p.success_weight, p.failure_weight, p.cmp_mean, p.cmp_variance, p.cmp_weight,
+    a.updated_at, a.path
+"""
+
 
 def _now() -> float:
     return time.time()
@@ -39,6 +55,30 @@ def _deserialize(payload: Any) -> Dict[str, Any]:
         return {}
 
 
+def _lineage_path(parent_path: Optional[str], agent_key: str) -> str:
+    return f"{parent_path or _PATH_SEPARATOR}{agent_key}{_PATH_SEPARATOR}"
+
+
+def _subtree_bounds(path: str) -> Tuple[str, str]:
+    """Return ``(low, high)`` such that descendants of ``path`` satisfy ``low <= p < high``."""
+
+    return path, path[:-1] + chr(ord(_PATH_SEPARATOR) + 1)
+
+
+def _encode_cursor(path: str) -> str:
+    return base64.urlsafe_b64encode(path.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        path = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid lineage cursor") from exc
+    if not path.startswith(_PATH_SEPARATOR):
+        raise ValueError("Invalid lineage cursor")
+    return path
+
+
 def _bool(value: Any) -> bool:
     if isinstance(value, bool):
         return value
@@ -123,6 +163,7 @@ class LineageNode:
     clade_failure: float
     performance: LineagePerformance
     children: List["LineageNode"] = field(default_factory=list)
+    updated_at: float = 0.0
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -135,14 +176,76 @@ class LineageNode:
             "cladeFailure": self.clade_failure,
             "performance": asdict(self.performance),
             "children": [child.to_dict() for child in self.children],
+            "updatedAt": self.updated_at,
         }
 
 
+@dataclass(slots=True)
+class LineagePage:
+    """Flat, path-ordered slice of a lineage (parents precede their descendants).
+
+    ``next_cursor`` resumes after the last node; ``watermark`` is the newest
+    ``updated_at`` seen and can be passed back as ``since`` to poll for deltas.
+    """
+
+    nodes: List[LineageNode]
+    next_cursor: Optional[str]
+    watermark: Optional[float]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "nodes": [node.to_dict() for node in self.nodes],
+            "nextCursor": self.next_cursor,
+            "watermark": self.watermark,
+        }
+
+
+@dataclass(slots=True)
+class _EvaluationRow:
+    agent_key: str
+    reward: float
+    weight: float
+    success: bool
+    success_mass: float
+    failure_mass: float
+    cmp_mean: float
+    cmp_variance: float
+    cmp_weight: float
+    payload: str
+
+    @classmethod
+    def from_payload(cls, agent_key: str, payload: Dict[str, Any]) -> "_EvaluationRow":
+        reward = float(payload.get("reward", 0.0))
+        weight = float(payload.get("weight", 1.0))
+        cmp_payload = payload.get("cmp") or {}
+        success_flag = payload.get("success")
+        return cls(
+            agent_key=agent_key,
+            reward=reward,
+            weight=weight,
+            success=_bool(success_flag) if success_flag is not None else reward >= 0.5,
+            success_mass=max(0.0, reward * weight),
+            failure_mass=max(0.0, (1.0 - reward) * weight),
+            cmp_mean=float(cmp_payload.get("mean", reward)),
+            cmp_variance=float(cmp_payload.get("variance", 0.0)),
+            cmp_weight=float(cmp_payload.get("weight", weight)),
+            payload=_serialize(payload),
+        )
+
+
 class HgmRepository:
-    """Repository coordinating persistence for HGM entities."""
+    """Repository coordinating persistence for HGM entities.
+
+    The repository remembers each run's ``agent -> parent`` links so clade
+    totals can be propagated to every ancestor without walking the lineage
+    one query at a time.  Links it has not seen yet are fetched with a single
+    recursive query.
+    """
 
     def __init__(self, database: Database | None = None) -> None:
         self._db = database or get_database()
+        self._parents: "OrderedDict[str, Dict[str, Optional[str]]]" = OrderedDict()
+        self._parents_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Run management
@@ -170,7 +273,7 @@ class HgmRepository:
         return self._row_to_run(row)
 
     def list_runs(self) -> List[HgmRun]:
-        with self._db.transaction() as cur:
+        with self._db.transaction(readonly=True) as cur:
             cur.execute(
                 "SELECT run_id, root_agent, metadata, created_at, updated_at FROM hgm_runs ORDER BY created_at DESC"
             )
@@ -179,7 +282,7 @@ class HgmRepository:
 
     def get_run(self, run_id: str) -> Optional[HgmRun]:
         placeholder = self._db.placeholder()
-        with self._db.transaction() as cur:
+        with self._db.transaction(readonly=True) as cur:
             cur.execute(
                 f"SELECT run_id, root_agent, metadata, created_at, updated_at FROM hgm_runs WHERE run_id = {placeholder}",
                 (run_id,),
@@ -191,6 +294,8 @@ class HgmRepository:
         placeholder = self._db.placeholder()
         with self._db.transaction() as cur:
             cur.execute(f"DELETE FROM hgm_runs WHERE run_id = {placeholder}", (run_id,))
+        with self._parents_lock:
+            self._parents.pop(run_id, None)
 
     # ------------------------------------------------------------------
     # Agent helpers
@@ -201,68 +306,104 @@ class HgmRepository:
         parent_key: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> HgmAgent:
-        now = _now()
-        placeholder = self._db.placeholder()
         with self._db.transaction() as cur:
+            row = self._upsert_agent(cur, run_id, agent_key, parent_key, metadata, _now())
+        self._remember_parents(run_id, {row[1]: row[2]})
+        return self._row_to_agent(row)
+
+    def _upsert_agent(
+        self,
+        cur: Any,
+        run_id: str,
+        agent_key: str,
+        parent_key: Optional[str],
+        metadata: Optional[Dict[str, Any]],
+        now: float,
+    ) -> Any:
+        placeholder = self._db.placeholder()
+        cur.execute(
+            f"SELECT run_id, agent_key, parent_key, depth, metadata, expansion_count, clade_success, clade_failure, created_at, updated_at, path "
+            f"FROM hgm_agents WHERE run_id = {placeholder} AND agent_key = {placeholder}",
+            (run_id, agent_key),
+        )
+        existing = cur.fetchone()
+        parent_path: Optional[str] = None
+        if parent_key is not None:
+            depth = 0
+            if parent_key:
+                cur.execute(
+                    f"SELECT depth, path FROM hgm_agents WHERE run_id = {placeholder} AND agent_key = {placeholder}",
+                    (run_id, parent_key),
+                )
+                parent_row = cur.fetchone()
+                if parent_row is not None:
+                    depth = int(parent_row[0]) + 1
+                    parent_path = parent_row[1]
+            path = _lineage_path(parent_path, agent_key)
+        elif existing is not None:
+            parent_key = existing[2]
+            depth = int(existing[3])
+            path = existing[10]
+        else:
+            depth = 0
+            path = _lineage_path(None, agent_key)
+        payload = _serialize(metadata)
+        if existing is None:
             cur.execute(
-                f"SELECT run_id, agent_key, parent_key, depth, metadata, expansion_count, clade_success, clade_failure, created_at, updated_at "
-                f"FROM hgm_agents WHERE run_id = {placeholder} AND agent_key = {placeholder}",
-                (run_id, agent_key),
+                f"""
+                INSERT INTO hgm_agents (
+                    run_id, agent_key, parent_key, depth, metadata,
+                    expansion_count, clade_success, clade_failure, created_at, updated_at, path
+                ) VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, 0, 0, 0, {placeholder}, {placeholder}, {placeholder})
+                """,
+                (run_id, agent_key, parent_key, depth, payload, now, now, path),
             )
-            existing = cur.fetchone()
-            if parent_key is not None:
-                depth = 0
-                if parent_key:
-                    cur.execute(
-                        f"SELECT depth FROM hgm_agents WHERE run_id = {placeholder} AND agent_key = {placeholder}",
-                        (run_id, parent_key),
-                    )
-                    parent_row = cur.fetchone()
-                    if parent_row is not None:
-                        depth = int(parent_row[0]) + 1
-            elif existing is not None:
-                parent_key = existing[2]
-                depth = int(existing[3])
-            else:
-                depth = 0
-            payload = _serialize(metadata)
-            if existing is None:
+        else:
+            if parent_key != existing[2] or self._cached_parent(run_id, agent_key, existing[2]) != existing[2]:
+                # Re-parented here, or by another process since we cached the link.
+                self._forget_parent(run_id, agent_key)
+            old_path = existing[10]
+            if old_path and path != old_path:
+                # Re-parenting moves the whole subtree: rewrite descendant paths and depths.
+                low, high = _subtree_bounds(old_path)
                 cur.execute(
                     f"""
-                    INSERT INTO hgm_agents (
-                        run_id, agent_key, parent_key, depth, metadata,
-                        expansion_count, clade_success, clade_failure, created_at, updated_at
-                    ) VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, 0, 0, 0, {placeholder}, {placeholder})
+                    UPDATE hgm_agents
+                       SET path = {placeholder} || substr(path, {placeholder}),
+                           depth = depth + {placeholder},
+                           updated_at = {placeholder}
+                     WHERE run_id = {placeholder} AND path > {placeholder} AND path < {placeholder}
                     """,
-                    (run_id, agent_key, parent_key, depth, payload, now, now),
-                )
-            else:
-                updates: List[str] = []
-                params: List[Any] = []
-                if parent_key is not None and parent_key != existing[2]:
-                    updates.append(f"parent_key = {placeholder}")
-                    params.append(parent_key)
-                if parent_key is not None and depth != existing[3]:
-                    updates.append(f"depth = {placeholder}")
-                    params.append(depth)
-                if metadata is not None:
-                    updates.append(f"metadata = {placeholder}")
-                    params.append(payload)
-                updates.append(f"updated_at = {placeholder}")
-                params.append(now)
-                params.extend([run_id, agent_key])
-                where_clause = f"WHERE run_id = {placeholder} AND agent_key = {placeholder}"
-                cur.execute(
-                    f"UPDATE hgm_agents SET {', '.join(updates)} {where_clause}",
-                    tuple(params),
+                    (path, len(old_path) + 1, depth - int(existing[3]), now, run_id, low, high),
                 )
+            updates: List[str] = []
+            params: List[Any] = []
+            if parent_key is not None and parent_key != existing[2]:
+                updates.append(f"parent_key = {placeholder}")
+                params.append(parent_key)
+            if parent_key is not None and depth != existing[3]:
+                updates.append(f"depth = {placeholder}")
+                params.append(depth)
+            if path != old_path:
+                updates.append(f"path = {placeholder}")
+                params.append(path)
+            if metadata is not None:
+                updates.append(f"metadata = {placeholder}")
+                params.append(payload)
+            updates.append(f"updated_at = {placeholder}")
+            params.append(now)
+            params.extend([run_id, agent_key])
+            where_clause = f"WHERE run_id = {placeholder} AND agent_key = {placeholder}"
             cur.execute(
-                f"SELECT run_id, agent_key, parent_key, depth, metadata, expansion_count, clade_success, clade_failure, created_at, updated_at "
-                f"FROM hgm_agents WHERE run_id = {placeholder} AND agent_key = {placeholder}",
-                (run_id, agent_key),
+                f"UPDATE hgm_agents SET {', '.join(updates)} {where_clause}",
+                tuple(params),
             )
-            row = cur.fetchone()
-        return self._row_to_agent(row)
+        cur.execute(
+            f"SELECT run_id, agent_key, parent_key, depth, metadata, expansion_count, clade_success, clade_failure, created_at, updated_at "
+            f"FROM hgm_agents WHERE run_id = {placeholder} AND agent_key = {placeholder}",
+            (run_id, agent_key),
+        )
+        return cur.fetchone()
 
     def record_expansion(
         self,
@@ -271,129 +412,229 @@ class HgmRepository:
         parent_key: Optional[str],
         payload: Optional[Dict[str, Any]],
     ) -> HgmAgent:
-        metadata = dict(payload or {})
-        agent = self.ensure_agent(run_id, agent_key, parent_key, metadata)
+        return self.record_expansions(run_id, [(agent_key, parent_key, payload)])[0]
+
+    def record_expansions(
+        self,
+        run_id: str,
+        expansions: Sequence[Tuple[str, Optional[str], Optional[Dict[str, Any]]]],
+    ) -> List[HgmAgent]:
+        """Persist a batch of ``(agent_key, parent_key, payload)`` expansions in one transaction."""
+
         now = _now()
-        serialized = _serialize(metadata)
         placeholder = self._db.placeholder()
+        rows = []
         with self._db.transaction() as cur:
-            cur.execute(
-                f"""
-                UPDATE hgm_agents
-                   SET expansion_count = expansion_count + 1,
-                       metadata = {placeholder},
-                       updated_at = {placeholder}
-                 WHERE run_id = {placeholder} AND agent_key = {placeholder}
-                """,
-                (serialized, now, run_id, agent_key),
-            )
-            cur.execute(
-                f"SELECT run_id, agent_key, parent_key, depth, metadata, expansion_count, clade_success, clade_failure, created_at, updated_at "
-                f"FROM hgm_agents WHERE run_id = {placeholder} AND agent_key = {placeholder}",
-                (run_id, agent_key),
-            )
-            row = cur.fetchone()
-        return self._row_to_agent(row)
+            for agent_key, parent_key, payload in expansions:
+                metadata = dict(payload or {})
+                self._upsert_agent(cur, run_id, agent_key, parent_key, metadata, now)
+                cur.execute(
+                    f"""
+                    UPDATE hgm_agents
+                       SET expansion_count = expansion_count + 1,
+                           metadata = {placeholder},
+                           updated_at = {placeholder}
+                     WHERE run_id = {placeholder} AND agent_key = {placeholder}
+                    """,
+                    (_serialize(metadata), now, run_id, agent_key),
+                )
+                cur.execute(
+                    f"SELECT run_id, agent_key, parent_key, depth, metadata, expansion_count, clade_success, clade_failure, created_at, updated_at "
+                    f"FROM hgm_agents WHERE run_id = {placeholder} AND agent_key = {placeholder}",
+                    (run_id, agent_key),
+                )
+                rows.append(cur.fetchone())
+        self._remember_parents(run_id, {row[1]: row[2] for row in rows})
+        return [self._row_to_agent(row) for row in rows]
 
     # ------------------------------------------------------------------
     # Evaluation helpers
     def record_evaluation(self, run_id: str, agent_key: str, payload: Dict[str, Any]) -> None:
-        reward = float(payload.get("reward", 0.0))
-        weight = float(payload.get("weight", 1.0))
-        cmp_payload = payload.get("cmp") or {}
-        cmp_mean = float(cmp_payload.get("mean", reward))
-        cmp_variance = float(cmp_payload.get("variance", 0.0))
-        cmp_weight = float(cmp_payload.get("weight", weight))
-        success_flag = payload.get("success")
-        success = _bool(success_flag) if success_flag is not None else reward >= 0.5
-        success_mass = max(0.0, reward * weight)
-        failure_mass = max(0.0, (1.0 - reward) * weight)
+        self.record_evaluations(run_id, [(agent_key, payload)])
+
+    def record_evaluations(self, run_id: str, evaluations: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """Persist a batch of ``(agent_key, payload)`` evaluations in one transaction.
+
+        Unknown agents are created as roots, outcomes and performance rows are
+        written with ``executemany`` and the clade mass of every ancestor is
+        summed in Python and applied as one bulk update.  Rows that take
+        locks are written in ``agent_key`` order, so concurrent writers that
+        share ancestors acquire them in the same order and cannot deadlock.
+        """
+
+        self._record_rows(run_id, [_EvaluationRow.from_payload(agent_key, payload) for agent_key, payload in evaluations])
+
+    def _record_rows(self, run_id: str, rows: Sequence[_EvaluationRow]) -> None:
+        if not rows:
+            return
         now = _now()
-        self.ensure_agent(run_id, agent_key)
-        placeholder = self._db.placeholder()
+        p = self._db.placeholder()
+        learned: Dict[str, Optional[str]] = {}
+        # One performance upsert per agent: visits and masses add up, the latest CMP wins.
+        performance: Dict[str, List[float]] = {}
+        for row in rows:
+            totals = performance.get(row.agent_key)
+            if totals is None:
+                performance[row.agent_key] = [
+                    row.weight, row.success_mass, row.failure_mass, row.cmp_mean, row.cmp_variance, row.cmp_weight
+                ]
+            else:
+                totals[0] += row.weight
+                totals[1] += row.success_mass
+                totals[2] += row.failure_mass
+                totals[3:] = [row.cmp_mean, row.cmp_variance, row.cmp_weight]
         with self._db.transaction() as cur:
-            cur.execute(
+            parents = self._parents_for(run_id)
+            missing: List[str] = []
+            for agent_key in dict.fromkeys(row.agent_key for row in rows):
+                if agent_key in parents or agent_key in learned:
+                    continue
+                self._load_ancestors(cur, run_id, agent_key, learned)
+                if agent_key not in learned:
+                    missing.append(agent_key)
+                    learned[agent_key] = None
+            if missing:
+                cur.executemany(
+                    f"""
+                    INSERT INTO hgm_agents (
+                        run_id, agent_key, parent_key, depth, metadata,
+                        expansion_count, clade_success, clade_failure, created_at, updated_at, path
+                    ) VALUES ({p}, {p}, NULL, 0, '{{}}', 0, 0, 0, {p}, {p}, {p})
+                    """,
+                    [(run_id, agent_key, now, now, _lineage_path(None, agent_key)) for agent_key in sorted(missing)],
+                )
+            cur.executemany(
                 f"""
                 INSERT INTO hgm_evaluation_outcomes (
                     run_id, agent_key, reward, weight, success, payload, created_at
-                ) VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
+                ) VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p})
                 """,
-                (
-                    run_id,
-                    agent_key,
-                    reward,
-                    weight,
-                    1 if success else 0,
-                    _serialize(payload),
-                    now,
-                ),
+                [
+                    (run_id, row.agent_key, row.reward, row.weight, 1 if row.success else 0, row.payload, now)
+                    for row in rows
+                ],
             )
-            cur.execute(
+            cur.executemany(
                 f"""
                 INSERT INTO hgm_agent_performance (
                     run_id, agent_key, visits, success_weight, failure_weight, cmp_mean, cmp_variance, cmp_weight, updated_at
-                ) VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
+                ) VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p})
                 ON CONFLICT(run_id, agent_key) DO UPDATE SET
-                    visits = hgm_agent_performance.visits + {placeholder},
-                    success_weight = hgm_agent_performance.success_weight + {placeholder},
-                    failure_weight = hgm_agent_performance.failure_weight + {placeholder},
-                    cmp_mean = {placeholder},
-                    cmp_variance = {placeholder},
-                    cmp_weight = {placeholder},
-                    updated_at = {placeholder}
+                    visits = hgm_agent_performance.visits + excluded.visits,
+                    success_weight = hgm_agent_performance.success_weight + excluded.success_weight,
+                    failure_weight = hgm_agent_performance.failure_weight + excluded.failure_weight,
+                    cmp_mean = excluded.cmp_mean,
+                    cmp_variance = excluded.cmp_variance,
+                    cmp_weight = excluded.cmp_weight,
+                    updated_at = excluded.updated_at
                 """,
-                (
-                    run_id,
-                    agent_key,
-                    weight,
-                    success_mass,
-                    failure_mass,
-                    cmp_mean,
-                    cmp_variance,
-                    cmp_weight,
-                    now,
-                    weight,
-                    success_mass,
-                    failure_mass,
-                    cmp_mean,
-                    cmp_variance,
-                    cmp_weight,
-                    now,
-                ),
+                [(run_id, agent_key, *totals, now) for agent_key, totals in sorted(performance.items())],
             )
-            current = agent_key
-            while current:
-                cur.execute(
-                    f"""
-                    UPDATE hgm_agents
-                       SET clade_success = clade_success + {placeholder},
-                           clade_failure = clade_failure + {placeholder},
-                           updated_at = {placeholder}
-                     WHERE run_id = {placeholder} AND agent_key = {placeholder}
-                    """,
-                    (success_mass, failure_mass, now, run_id, current),
-                )
-                cur.execute(
-                    f"SELECT parent_key FROM hgm_agents WHERE run_id = {placeholder} AND agent_key = {placeholder}",
-                    (run_id, current),
-                )
-                row = cur.fetchone()
-                parent = row[0] if row else None
-                if not parent:
-                    break
-                current = parent
+            clade: Dict[str, List[float]] = {}
+            for row in rows:
+                for ancestor in self._ancestors(cur, run_id, row.agent_key, parents, learned):
+                    mass = clade.setdefault(ancestor, [0.0, 0.0])
+                    mass[0] += row.success_mass
+                    mass[1] += row.failure_mass
+            cur.executemany(
+                f"""
+                UPDATE hgm_agents
+                   SET clade_success = clade_success + {p},
+                       clade_failure = clade_failure + {p},
+                       updated_at = {p}
+                 WHERE run_id = {p} AND agent_key = {p}
+                """,
+                [
+                    (success, failure, now, run_id, agent_key)
+                    for agent_key, (success, failure) in sorted(clade.items())
+                ],
+            )
+        self._remember_parents(run_id, learned)
+
+    # ------------------------------------------------------------------
+    # Parent map
+    def _parents_for(self, run_id: str) -> Dict[str, Optional[str]]:
+        with self._parents_lock:
+            parents = self._parents.get(run_id)
+            if parents is None:
+                parents = self._parents[run_id] = {}
+                while len(self._parents) > _MAX_CACHED_RUNS:
+                    self._parents.popitem(last=False)
+            else:
+                self._parents.move_to_end(run_id)
+            return parents
+
+    def _cached_parent(self, run_id: str, agent_key: str, default: Optional[str]) -> Optional[str]:
+        with self._parents_lock:
+            return self._parents.get(run_id, {}).get(agent_key, default)
+
+    def _forget_parent(self, run_id: str, agent_key: str) -> None:
+        # Dropping a link is always safe, even mid-transaction: it is re-read on demand.
+        with self._parents_lock:
+            parents = self._parents.get(run_id)
+            if parents is not None:
+                parents.pop(agent_key, None)
+
+    def _remember_parents(self, run_id: str, links: Dict[str, Optional[str]]) -> None:
+        # Only called after the transaction that produced ``links`` committed.
+        if links:
+            self._parents_for(run_id).update(links)
+
+    def _load_ancestors(self, cur: Any, run_id: str, agent_key: str, learned: Dict[str, Optional[str]]) -> None:
+        p = self._db.placeholder()
+        cur.execute(
+            f"""
+            WITH RECURSIVE chain(agent_key, parent_key, hops) AS (
+                SELECT agent_key, parent_key, 0 FROM hgm_agents WHERE run_id = {p} AND agent_key = {p}
+                UNION ALL
+                SELECT a.agent_key, a.parent_key, chain.hops + 1
+                  FROM hgm_agents AS a
+                  JOIN chain ON a.agent_key = chain.parent_key
+                 WHERE a.run_id = {p} AND chain.hops < {_MAX_LINEAGE_HOPS}
+            )
+            SELECT agent_key, parent_key FROM chain
+            """,
+            (run_id, agent_key, run_id),
+        )
+        for key, parent in cur.fetchall() or []:
+            learned[str(key)] = parent
+
+    def _ancestors(
+        self,
+        cur: Any,
+        run_id: str,
+        agent_key: str,
+        parents: Dict[str, Optional[str]],
+        learned: Dict[str, Optional[str]],
+    ) -> List[str]:
+        """Return ``agent_key`` followed by its ancestors, nearest first."""
+
+        chain: List[str] = []
+        seen = set()
+        current: Optional[str] = agent_key
+        while current and current not in seen:
+            chain.append(current)
+            seen.add(current)
+            if current in learned:
+                current = learned[current]
+            elif current in parents:
+                current = parents[current]
+            else:
+                self._load_ancestors(cur, run_id, current, learned)
+                current = learned.get(current)
+        return chain
 
     def list_evaluations(self, run_id: str, agent_key: Optional[str] = None) -> List[HgmEvaluationOutcome]:
         placeholder = self._db.placeholder()
-        with self._db.transaction() as cur:
+        with self._db.transaction(readonly=True) as cur:
             if agent_key is None:
                 cur.execute(
-                    f"SELECT id, run_id, agent_key, reward, weight, success, payload, created_at FROM hgm_evaluation_outcomes WHERE run_id = {placeholder} ORDER BY created_at",
+                    f"SELECT id, run_id, agent_key, reward, weight, success, payload, created_at FROM hgm_evaluation_outcomes WHERE run_id = {placeholder} ORDER BY created_at, id",
                     (run_id,),
                 )
             else:
                 cur.execute(
-                    f"SELECT id, run_id, agent_key, reward, weight, success, payload, created_at FROM hgm_evaluation_outcomes WHERE run_id = {placeholder} AND agent_key = {placeholder} ORDER BY created_at",
+                    f"SELECT id, run_id, agent_key, reward, weight, success, payload, created_at FROM hgm_evaluation_outcomes WHERE run_id = {placeholder} AND agent_key = {placeholder} ORDER BY created_at, id",
                     (run_id, agent_key),
                 )
             rows = cur.fetchall()
@@ -401,47 +642,27 @@ class HgmRepository:
 
     # ------------------------------------------------------------------
     # Lineage traversal
-    def fetch_lineage(self, run_id: str, root_key: Optional[str] = None) -> List[LineageNode]:
-        placeholder = self._db.placeholder()
-        with self._db.transaction() as cur:
-            cur.execute(
-                f"""
-                SELECT a.agent_key, a.parent_key, a.depth, a.metadata, a.expansion_count, a.clade_success, a.clade_failure,
-                       p.visits, p.success_weight, p.failure_weight, p.cmp_mean, p.cmp_variance, p.cmp_weight
-                  FROM hgm_agents AS a
-             LEFT JOIN hgm_agent_performance AS p
-                    ON p.run_id = a.run_id AND p.agent_key = a.agent_key
-                 WHERE a.run_id = {placeholder}
-              ORDER BY a.depth ASC, a.agent_key ASC
-                """,
-                (run_id,),
-            )
-            rows = cur.fetchall()
+    def fetch_lineage(
+        self,
+        run_id: str,
+        root_key: Optional[str] = None,
+        *,
+        max_depth: Optional[int] = None,
+    ) -> List[LineageNode]:
+        """Return the lineage as a tree, optionally limited to ``root_key``'s subtree.
+
+        ``max_depth`` counts levels below the root (``0`` returns only the root).
+        """
+
         nodes: Dict[str, LineageNode] = {}
         roots: List[LineageNode] = []
-        for row in rows or []:
-            metadata = _deserialize(row[3])
-            performance = LineagePerformance(
-                visits=float(row[7] or 0.0),
-                success_weight=float(row[8] or 0.0),
-                failure_weight=float(row[9] or 0.0),
-                cmp_mean=float(row[10] or 0.0),
-                cmp_variance=float(row[11] or 0.0),
-                cmp_weight=float(row[12] or 0.0),
-            )
-            node = LineageNode(
-                agent_key=str(row[0]),
-                parent_key=row[1],
-                depth=int(row[2]),
-                metadata=metadata,
-                expansion_count=float(row[4] or 0.0),
-                clade_success=float(row[5] or 0.0),
-                clade_failure=float(row[6] or 0.0),
-                performance=performance,
-            )
+        with self._db.transaction(readonly=True) as cur:
+            rows = self._select_lineage(cur, run_id, root_key=root_key, max_depth=max_depth)
+        for row in rows:
+            node = self._row_to_lineage_node(row)
             nodes[node.agent_key] = node
         for node in nodes.values():
-            if node.parent_key and node.parent_key in nodes:
+            if node.parent_key and node.parent_key in nodes and node.agent_key != root_key:
                 nodes[node.parent_key].children.append(node)
             else:
                 roots.append(node)
@@ -449,6 +670,87 @@ class HgmRepository:
             return [nodes[root_key]] if root_key in nodes else []
         return roots
 
+    def lineage_page(
+        self,
+        run_id: str,
+        *,
+        root_key: Optional[str] = None,
+        max_depth: Optional[int] = None,
+        since: Optional[float] = None,
+        after: Optional[str] = None,
+        limit: int = 500,
+    ) -> LineagePage:
+        """Return up to ``limit`` lineage nodes in path order, without nesting.
+
+        ``after`` is a ``next_cursor`` from a previous page and ``since``
+        keeps only nodes updated at or after that timestamp (inclusive, so
+        rows committed within the same clock tick are not missed).  Raises
+        :class:`ValueError` for a malformed cursor.
+        """
+
+        limit = max(1, int(limit))
+        after_path = _decode_cursor(after) if after else None
+        with self._db.transaction(readonly=True) as cur:
+            rows = self._select_lineage(
+                cur,
+                run_id,
+                root_key=root_key,
+                max_depth=max_depth,
+                since=since,
+                after_path=after_path,
+                limit=limit + 1,
+            )
+        nodes = [self._row_to_lineage_node(row) for row in rows[:limit]]
+        next_cursor = _encode_cursor(rows[limit - 1][14]) if len(rows) > limit else None
+        watermark = max((node.updated_at for node in nodes), default=since)
+        return LineagePage(nodes=nodes, next_cursor=next_cursor, watermark=watermark)
+
+    def _select_lineage(
+        self,
+        cur: Any,
+        run_id: str,
+        *,
+        root_key: Optional[str] = None,
+        max_depth: Optional[int] = None,
+        since: Optional[float] = None,
+        after_path: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        p = self._db.placeholder()
+        clauses = [f"a.run_id = {p}"]
+        params: List[Any] = [run_id]
+        base_depth = 0
+        if root_key:
+            cur.execute(f"SELECT path, depth FROM hgm_agents WHERE run_id = {p} AND agent_key = {p}", (run_id, root_key))
+            root = cur.fetchone()
+            if root is None:
+                return []
+            low, high = _subtree_bounds(root[0])
+            clauses.append(f"a.path >= {p} AND a.path < {p}")
+            params.extend([low, high])
+            base_depth = int(root[1])
+        if max_depth is not None:
+            clauses.append(f"a.depth <= {p}")
+            params.append(base_depth + max(0, int(max_depth)))
+        if since is not None:
+            clauses.append(f"a.updated_at >= {p}")
+            params.append(float(since))
+        if after_path is not None:
+            clauses.append(f"a.path > {p}")
+            params.append(after_path)
+        sql = f"""
+            SELECT {_LINEAGE_COLUMNS}
+              FROM hgm_agents AS a
+         LEFT JOIN hgm_agent_performance AS p
+                ON p.run_id = a.run_id AND p.agent_key = a.agent_key
+             WHERE {' AND '.join(clauses)}
+          ORDER BY a.path ASC
+        """
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        cur.execute(sql, tuple(params))
+        return list(cur.fetchall() or [])
+
     # ------------------------------------------------------------------
     # Row adapters
     def _row_to_run(self, row) -> HgmRun:
@@ -474,6 +776,26 @@ class HgmRepository:
             updated_at=float(row[9]),
         )
 
+    def _row_to_lineage_node(self, row) -> LineageNode:
+        return LineageNode(
+            agent_key=str(row[0]),
+            parent_key=row[1],
+            depth=int(row[2]),
+            metadata=_deserialize(row[3]),
+            expansion_count=float(row[4] or 0.0),
+            clade_success=float(row[5] or 0.0),
+            clade_failure=float(row[6] or 0.0),
+            performance=LineagePerformance(
+                visits=float(row[7] or 0.0),
+                success_weight=float(row[8] or 0.0),
+                failure_weight=float(row[9] or 0.0),
+                cmp_mean=float(row[10] or 0.0),
+                cmp_variance=float(row[11] or 0.0),
+                cmp_weight=float(row[12] or 0.0),
+            ),
+            updated_at=float(row[13] or 0.0),
+        )
+
     def _row_to_evaluation(self, row) -> HgmEvaluationOutcome:
         return HgmEvaluationOutcome(
             id=int(row[0]),
@@ -487,6 +809,135 @@ class HgmRepository:
         )
 
 
+class HgmEvaluationWriter:
+    """Write-behind queue persisting evaluations in batches on a background thread.
+
+    :meth:`submit` returns as soon as the evaluation is queued; a worker
+    thread groups up to ``max_batch`` queued evaluations (waiting at most
+    ``flush_interval`` seconds for more) and hands each run's share to
+    :meth:`HgmRepository.record_evaluations`.  A malformed payload is
+    dropped on its own, and a batch the database rejects is retried row by
+    row, so one bad evaluation never costs the rest of its batch.
+    ``submit`` blocks once ``max_pending`` evaluations are waiting.
+    """
+
+    def __init__(
+        self,
+        repository: HgmRepository,
+        *,
+        max_batch: int = 256,
+        flush_interval: float = 0.05,
+        max_pending: int = 10_000,
+    ) -> None:
+        self._repository = repository
+        self._max_batch = max(1, max_batch)
+        self._flush_interval = max(0.0, flush_interval)
+        self._queue: "queue.Queue[Optional[Tuple[str, str, Dict[str, Any]]]]" = queue.Queue(maxsize=max(1, max_pending))
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+
+    def submit(self, run_id: str, agent_key: str, payload: Dict[str, Any], *, block: bool = True) -> None:
+        """Queue one evaluation; raises :class:`queue.Full` when ``block`` is false and the queue is full."""
+
+        self._ensure_started()
+        self._queue.put((run_id, agent_key, dict(payload)), block=block)
+
+    def submit_many(
+        self,
+        run_id: str,
+        evaluations: Sequence[Tuple[str, Dict[str, Any]]],
+        *,
+        block: bool = True,
+    ) -> int:
+        """Queue ``(agent_key, payload)`` evaluations in order and return how many were queued.
+
+        With ``block=False`` queuing stops at the first full slot instead of
+        raising, so the caller can hand the remainder to a blocking call.
+        """
+
+        self._ensure_started()
+        for queued, (agent_key, payload) in enumerate(evaluations):
+            try:
+                self._queue.put((run_id, agent_key, dict(payload)), block=block)
+            except queue.Full:
+                return queued
+        return len(evaluations)
+
+    def flush(self) -> None:
+        """Block until every evaluation submitted so far has been written (or failed)."""
+
+        self._queue.join()
+
+    def close(self) -> None:
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="hgm-evaluation-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[Tuple[str, str, Dict[str, Any]]]) -> None:
+        by_run: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for run_id, agent_key, payload in batch:
+            by_run.setdefault(run_id, []).append((agent_key, payload))
+        for run_id, evaluations in by_run.items():
+            rows: List[_EvaluationRow] = []
+            for agent_key, payload in evaluations:
+                try:
+                    rows.append(_EvaluationRow.from_payload(agent_key, payload))
+                except Exception:
+                    self.failed += 1
+                    LOGGER.warning("Dropping malformed evaluation for %s in run %s", agent_key, run_id, exc_info=True)
+            try:
+                self._repository._record_rows(run_id, rows)
+            except Exception:
+                LOGGER.warning("Batch of %d evaluations for run %s failed; retrying one by one", len(rows), run_id, exc_info=True)
+                for row in rows:
+                    try:
+                        self._repository._record_rows(run_id, [row])
+                    except Exception:
+                        self.failed += 1
+                        LOGGER.warning("Failed to persist evaluation for %s in run %s", row.agent_key, run_id, exc_info=True)
+                    else:
+                        self.written += 1
+            else:
+                self.written += len(rows)
+
+
 def seed_demo_run(repository: HgmRepository, run_id: str = "demo-run") -> HgmRun:
     """Populate a small lineage useful for demos and manual testing."""
 
@@ -515,12 +966,14 @@ def seed_demo_run(repository: HgmRepository, run_id: str = "demo-run") -> HgmRun
 
 
 __all__ = [
+    "HgmEvaluationWriter",
     "HgmRepository",
     "HgmRun",
     "HgmAgent",
     "HgmAgentPerformance",
     "HgmEvaluationOutcome",
     "LineageNode",
+    "LineagePage",
     "LineagePerformance",
     "seed_demo_run",
 ]
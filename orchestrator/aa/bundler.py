@@ -8,7 +8,7 @@ import time
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
-import httpx
+from ..http_pool import get_http_pool
 
 
 class BundlerError(RuntimeError):
@@ -65,8 +65,7 @@ class BundlerClient:
 
     async def _rpc(self, method: str, params: list[Any]) -> Any:
         payload = {"jsonrpc": "2.0", "id": int(time.time() * 1000), "method": method, "params": params}
-        async with httpx.AsyncClient(timeout=self._timeout, headers=self._headers) as client:
-            response = await client.post(self._url, json=payload)
+        response = await get_http_pool().post(self._url, json=payload, headers=self._headers, timeout=self._timeout)
         if response.status_code >= 400:
             raise BundlerError(
                 f"Bundler responded with HTTP {response.status_code}",
@@ -5,7 +5,7 @@ from __future__ import annotations
 import json
 from typing import Any, Dict, Optional
 
-import httpx
+from ..http_pool import get_http_pool
 
 
 class PaymasterError(RuntimeError):
@@ -46,8 +46,7 @@ class PaymasterClient:
         if self._api_key:
             headers.setdefault("Authorization", f"Bearer {self._api_key}")
         url = self._url.rstrip("/") + "/v1/sponsor"
-        async with httpx.AsyncClient(timeout=self._timeout, headers=headers) as client:
-            response = await client.post(url, json=request_payload)
+        response = await get_http_pool().post(url, json=request_payload, headers=headers, timeout=self._timeout)
         try:
             data = response.json()
         except json.JSONDecodeError as exc:  # pragma: no cover - defensive
@@ -0,0 +1,695 @@
+"""Pluggable activity queues feeding :mod:`orchestrator.worker`.
+
+Activities are named calls (``hgm.expand``, ``hgm.evaluate`` or any handler a
+worker registers) delivered with at-least-once semantics: a worker *leases*
+tasks for a visibility timeout, then acknowledges or rejects them.  A lease
+that is neither acknowledged nor extended before it expires makes the task
+visible again, so a crashed worker's activities are picked up elsewhere.
+Every task carries an idempotency key; enqueueing a key the queue already
+knows is a no-op, which lets workers re-emit follow-up activities after a
+redelivery without duplicating them.
+
+Backends:
+
+* :class:`InMemoryActivityQueue` - process-local, for tests and single
+  process deployments.
+* :class:`SqliteActivityQueue` - durable and shared by every process on one
+  host through a WAL-mode SQLite file.
+* :class:`RedisActivityQueue` - durable and shared across hosts.
+
+Arguments of durable queues must be JSON-serialisable.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_DEFAULT_SQLITE_PATH = Path(os.environ.get("HGM_ACTIVITY_QUEUE_PATH", "storage/orchestrator/activities.db"))
+_STATES = ("queued", "leased", "done", "dead")
+
+
+class ActivityQueueError(RuntimeError):
+    """Raised when an activity queue backend cannot be initialised."""
+
+
+@dataclass(frozen=True)
+class ActivityCall:
+    """A named activity invocation."""
+
+    name: str
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ActivityTask:
+    """A leased activity; pass it back to :meth:`ActivityQueue.ack` or :meth:`ActivityQueue.nack`."""
+
+    id: str
+    call: ActivityCall
+    key: str
+    attempts: int
+    lease: str
+
+
+class ActivityQueue:
+    """Abstract interface for activity queue backends.
+
+    ``max_attempts`` bounds deliveries: a task rejected (or whose lease
+    expires) on its last attempt is moved to the dead-letter state instead
+    of being redelivered.
+    """
+
+    def __init__(self, *, max_attempts: int = 5) -> None:
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be positive")
+        self._max_attempts = max_attempts
+
+    def enqueue(self, call: ActivityCall, *, key: Optional[str] = None, delay: float = 0.0) -> bool:
+        """Queue ``call``; returns ``False`` when ``key`` is already known."""
+
+        return self.enqueue_many([(call, key)], delay=delay) == 1
+
+    def enqueue_many(self, items: Sequence[Tuple[ActivityCall, Optional[str]]], *, delay: float = 0.0) -> int:
+        """Queue ``(call, key)`` pairs and return how many were new."""
+
+        raise NotImplementedError
+
+    def lease(self, owner: str, *, limit: int = 1, visibility_timeout: float = 30.0) -> List[ActivityTask]:
+        """Lease up to ``limit`` visible tasks for ``visibility_timeout`` seconds."""
+
+        raise NotImplementedError
+
+    def extend(self, task: ActivityTask, visibility_timeout: float) -> bool:
+        """Push the lease expiry of ``task`` out; ``False`` when the lease was lost."""
+
+        raise NotImplementedError
+
+    def ack(self, task: ActivityTask) -> bool:
+        """Mark ``task`` done; ``False`` when the lease was lost to another worker."""
+
+        raise NotImplementedError
+
+    def ack_many(self, tasks: Sequence[ActivityTask]) -> int:
+        """Acknowledge several tasks and return how many leases were still held."""
+
+        return sum(1 for task in tasks if self.ack(task))
+
+    def nack(self, task: ActivityTask, error: str = "", *, delay: float = 0.0) -> bool:
+        """Return ``task`` for redelivery after ``delay`` seconds (or dead-letter it)."""
+
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, float]:
+        """Return task counts per state."""
+
+        raise NotImplementedError
+
+    def purge(self, older_than: float) -> int:
+        """Forget done and dead tasks finished more than ``older_than`` seconds ago."""
+
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+def _new_key() -> str:
+    return uuid.uuid4().hex
+
+
+@dataclass
+class _Entry:
+    id: str
+    call: ActivityCall
+    key: str
+    state: str = "queued"
+    attempts: int = 0
+    lease: str = ""
+    error: str = ""
+    seq: int = 0
+    finished_at: float = 0.0
+
+
+class InMemoryActivityQueue(ActivityQueue):
+    """Process-local queue with the same lease semantics as the durable backends.
+
+    Queued and leased tasks share one min-heap keyed by visibility time (a
+    lease's expiry), with lazy invalidation of superseded rows as in
+    :class:`orchestrator.deadlines.DeadlineScheduler`.
+    """
+
+    def __init__(self, *, max_attempts: int = 5) -> None:
+        super().__init__(max_attempts=max_attempts)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._ids = itertools.count(1)
+        self._keys: Dict[str, str] = {}
+        self._finished: "OrderedDict[str, _Entry]" = OrderedDict()
+
+    def enqueue_many(self, items: Sequence[Tuple[ActivityCall, Optional[str]]], *, delay: float = 0.0) -> int:
+        available = time.monotonic() + max(0.0, delay)
+        added = 0
+        with self._lock:
+            for call, key in items:
+                key = key or _new_key()
+                if key in self._keys:
+                    continue
+                entry = _Entry(id=str(next(self._ids)), call=call, key=key)
+                self._keys[key] = entry.id
+                self._entries[entry.id] = entry
+                self._push(entry, available)
+                added += 1
+        return added
+
+    def lease(self, owner: str, *, limit: int = 1, visibility_timeout: float = 30.0) -> List[ActivityTask]:
+        del owner
+        now = time.monotonic()
+        leased: List[ActivityTask] = []
+        with self._lock:
+            while self._heap and len(leased) < limit:
+                available, seq, task_id = self._heap[0]
+                entry = self._entries.get(task_id)
+                if entry is None or entry.seq != seq:
+                    heapq.heappop(self._heap)
+                    continue
+                if available > now:
+                    break
+                heapq.heappop(self._heap)
+                if entry.attempts >= self._max_attempts:
+                    entry.error = entry.error or "lease expired"
+                    self._retire(entry, "dead", now)
+                    continue
+                entry.state = "leased"
+                entry.attempts += 1
+                entry.lease = _new_key()
+                self._push(entry, now + visibility_timeout)
+                leased.append(ActivityTask(entry.id, entry.call, entry.key, entry.attempts, entry.lease))
+        return leased
+
+    def extend(self, task: ActivityTask, visibility_timeout: float) -> bool:
+        with self._lock:
+            entry = self._owned(task)
+            if entry is None:
+                return False
+            self._push(entry, time.monotonic() + visibility_timeout)
+            return True
+
+    def ack(self, task: ActivityTask) -> bool:
+        with self._lock:
+            entry = self._owned(task)
+            if entry is None:
+                return False
+            self._retire(entry, "done", time.monotonic())
+            return True
+
+    def nack(self, task: ActivityTask, error: str = "", *, delay: float = 0.0) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._owned(task)
+            if entry is None:
+                return False
+            entry.error = error
+            if entry.attempts >= self._max_attempts:
+                self._retire(entry, "dead", now)
+            else:
+                entry.state = "queued"
+                entry.lease = ""
+                self._push(entry, now + max(0.0, delay))
+            return True
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            counts = dict.fromkeys(_STATES, 0.0)
+            for entry in itertools.chain(self._entries.values(), self._finished.values()):
+                counts[entry.state] += 1
+            return counts
+
+    def purge(self, older_than: float) -> int:
+        cutoff = time.monotonic() - older_than
+        removed = 0
+        with self._lock:
+            # Finished entries are appended in completion order, so expiry is FIFO.
+            while self._finished:
+                entry = next(iter(self._finished.values()))
+                if entry.finished_at > cutoff:
+                    break
+                self._finished.popitem(last=False)
+                self._keys.pop(entry.key, None)
+                removed += 1
+        return removed
+
+    def _push(self, entry: _Entry, available: float) -> None:
+        entry.seq = next(self._counter)
+        heapq.heappush(self._heap, (available, entry.seq, entry.id))
+
+    def _owned(self, task: ActivityTask) -> Optional[_Entry]:
+        entry = self._entries.get(task.id)
+        if entry is None or entry.state != "leased" or entry.lease != task.lease:
+            return None
+        return entry
+
+    def _retire(self, entry: _Entry, state: str, now: float) -> None:
+        entry.state = state
+        entry.lease = ""
+        entry.finished_at = now
+        del self._entries[entry.id]
+        self._finished[entry.id] = entry
+
+
+class SqliteActivityQueue(ActivityQueue):
+    """Durable queue shared by every process that opens the same SQLite file.
+
+    Leases are taken inside ``BEGIN IMMEDIATE`` transactions, so concurrent
+    workers never lease the same visible task twice.  Leased rows keep their
+    lease expiry in ``available_at`` and become visible again once it passes.
+    """
+
+    def __init__(self, path: Path | str | None = None, *, queue: str = "default", max_attempts: int = 5) -> None:
+        super().__init__(max_attempts=max_attempts)
+        target = Path(path) if path is not None else _DEFAULT_SQLITE_PATH
+        target.parent.mkdir(parents=True, exist_ok=True)
+        self._queue = queue
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(target), check_same_thread=False, isolation_level=None, timeout=30.0)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS activities (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    queue TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    args TEXT NOT NULL,
+                    kwargs TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL,
+                    lease TEXT,
+                    error TEXT,
+                    updated_at REAL NOT NULL,
+                    UNIQUE (queue, key)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS activities_visible ON activities (queue, state, available_at, id)"
+            )
+
+    def enqueue_many(self, items: Sequence[Tuple[ActivityCall, Optional[str]]], *, delay: float = 0.0) -> int:
+        now = time.time()
+        rows = [
+            (
+                self._queue,
+                key or _new_key(),
+                call.name,
+                json.dumps(list(call.args)),
+                json.dumps(call.kwargs),
+                now + max(0.0, delay),
+                now,
+            )
+            for call, key in items
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            self._write(
+                lambda: self._conn.executemany(
+                    """
+                    INSERT INTO activities (queue, key, name, args, kwargs, state, available_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, 'queued', ?, ?)
+                    ON CONFLICT (queue, key) DO NOTHING
+                    """,
+                    rows,
+                )
+            )
+            return self._conn.total_changes - before
+
+    def lease(self, owner: str, *, limit: int = 1, visibility_timeout: float = 30.0) -> List[ActivityTask]:
+        del owner
+        now = time.time()
+
+        def _lease() -> List[ActivityTask]:
+            rows = self._conn.execute(
+                """
+                SELECT id, key, name, args, kwargs, attempts FROM activities
+                 WHERE queue = ? AND state IN ('queued', 'leased') AND available_at <= ?
+                 ORDER BY available_at, id
+                 LIMIT ?
+                """,
+                (self._queue, now, limit),
+            ).fetchall()
+            tasks: List[ActivityTask] = []
+            leases: List[Tuple[str, float, float, int]] = []
+            dead: List[Tuple[float, int]] = []
+            for task_id, key, name, args, kwargs, attempts in rows:
+                if attempts >= self._max_attempts:
+                    dead.append((now, task_id))
+                    continue
+                token = _new_key()
+                leases.append((token, now + visibility_timeout, now, task_id))
+                call = ActivityCall(name, tuple(json.loads(args)), json.loads(kwargs))
+                tasks.append(ActivityTask(str(task_id), call, key, attempts + 1, token))
+            if leases:
+                self._conn.executemany(
+                    """
+                    UPDATE activities
+                       SET state = 'leased', lease = ?, attempts = attempts + 1, available_at = ?, updated_at = ?
+                     WHERE id = ?
+                    """,
+                    leases,
+                )
+            if dead:
+                self._conn.executemany(
+                    """
+                    UPDATE activities
+                       SET state = 'dead', lease = NULL, error = COALESCE(error, 'lease expired'), updated_at = ?
+                     WHERE id = ?
+                    """,
+                    dead,
+                )
+            return tasks
+
+        with self._lock:
+            return self._write(_lease)
+
+    def extend(self, task: ActivityTask, visibility_timeout: float) -> bool:
+        now = time.time()
+        return self._update_owned(
+            task, "UPDATE activities SET available_at = ?, updated_at = ?", (now + visibility_timeout, now)
+        )
+
+    def ack(self, task: ActivityTask) -> bool:
+        return self.ack_many([task]) == 1
+
+    def ack_many(self, tasks: Sequence[ActivityTask]) -> int:
+        now = time.time()
+        rows = [(now, int(task.id), task.lease) for task in tasks]
+        with self._lock:
+            before = self._conn.total_changes
+            self._write(
+                lambda: self._conn.executemany(
+                    """
+                    UPDATE activities SET state = 'done', lease = NULL, updated_at = ?
+                     WHERE id = ? AND state = 'leased' AND lease = ?
+                    """,
+                    rows,
+                )
+            )
+            return self._conn.total_changes - before
+
+    def nack(self, task: ActivityTask, error: str = "", *, delay: float = 0.0) -> bool:
+        now = time.time()
+        if task.attempts >= self._max_attempts:
+            statement = "UPDATE activities SET state = 'dead', lease = NULL, error = ?, updated_at = ?"
+            params: Tuple[Any, ...] = (error, now)
+        else:
+            statement = "UPDATE activities SET state = 'queued', lease = NULL, error = ?, available_at = ?, updated_at = ?"
+            params = (error, now + max(0.0, delay), now)
+        return self._update_owned(task, statement, params)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM activities WHERE queue = ? GROUP BY state", (self._queue,)
+            ).fetchall()
+        counts = dict.fromkeys(_STATES, 0.0)
+        counts.update({state: float(count) for state, count in rows})
+        return counts
+
+    def purge(self, older_than: float) -> int:
+        with self._lock:
+            cursor = self._write(
+                lambda: self._conn.execute(
+                    "DELETE FROM activities WHERE queue = ? AND state IN ('done', 'dead') AND updated_at < ?",
+                    (self._queue, time.time() - older_than),
+                )
+            )
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _update_owned(self, task: ActivityTask, statement: str, params: Tuple[Any, ...]) -> bool:
+        with self._lock:
+            cursor = self._write(
+                lambda: self._conn.execute(
+                    f"{statement} WHERE id = ? AND state = 'leased' AND lease = ?", (*params, int(task.id), task.lease)
+                )
+            )
+            return cursor.rowcount == 1
+
+    def _write(self, operation):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = operation()
+            self._conn.execute("COMMIT")
+        except BaseException:
+            # Any failure (a corrupt row, a failed COMMIT, cancellation) must not
+            # leave the transaction open, or every later BEGIN on it would fail.
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+        return result
+
+
+# Queued and leased ids share the ``ready`` sorted set scored by visibility
+# time; a lease moves the score to the lease expiry.
+_REDIS_ENQUEUE = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX') then
+    redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+    redis.call('ZADD', KEYS[3], ARGV[3], ARGV[1])
+    return 1
+end
+return 0
+"""
+_REDIS_LEASE = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+local out = {}
+local taken = 0
+for _, id in ipairs(ids) do
+    local attempts = tonumber(redis.call('HGET', KEYS[2], id) or '0')
+    redis.call('HDEL', KEYS[3], id)
+    if attempts >= tonumber(ARGV[4]) then
+        redis.call('ZREM', KEYS[1], id)
+        redis.call('ZADD', KEYS[4], ARGV[1], id)
+    else
+        taken = taken + 1
+        attempts = attempts + 1
+        redis.call('HSET', KEYS[2], id, attempts)
+        redis.call('HSET', KEYS[3], id, ARGV[4 + taken])
+        redis.call('ZADD', KEYS[1], tonumber(ARGV[1]) + tonumber(ARGV[3]), id)
+        table.insert(out, id)
+        table.insert(out, attempts)
+        table.insert(out, ARGV[4 + taken])
+        table.insert(out, redis.call('HGET', KEYS[5], id))
+    end
+end
+return out
+"""
+_REDIS_SETTLE = """
+if redis.call('HGET', KEYS[3], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+local mode = ARGV[3]
+if mode == 'extend' or mode == 'retry' then
+    if mode == 'retry' then
+        redis.call('HDEL', KEYS[3], ARGV[1])
+    end
+    redis.call('ZADD', KEYS[1], ARGV[4], ARGV[1])
+    return 1
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[3], ARGV[1])
+if mode == 'dead' then
+    redis.call('ZADD', KEYS[4], ARGV[5], ARGV[1])
+    redis.call('HSET', KEYS[6], ARGV[1], ARGV[6])
+    return 1
+end
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[5], ARGV[1])
+redis.call('HDEL', KEYS[6], ARGV[1])
+redis.call('EXPIRE', KEYS[7], tonumber(ARGV[7]))
+redis.call('INCR', KEYS[8])
+return 1
+"""
+
+
+class RedisActivityQueue(ActivityQueue):
+    """Durable queue shared across hosts through Redis.
+
+    All keys of one queue share a ``{hash tag}`` so the Lua scripts stay
+    valid on Redis Cluster.  Idempotency keys of done tasks are kept for
+    ``retention`` seconds.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        queue: str = "default",
+        max_attempts: int = 5,
+        retention: float = 86_400.0,
+    ) -> None:
+        super().__init__(max_attempts=max_attempts)
+        try:
+            import redis  # type: ignore[import-not-found]
+        except Exception as exc:  # pragma: no cover - optional dependency
+            raise ActivityQueueError("redis package is required for RedisActivityQueue") from exc
+        self._client = redis.from_url(url)
+        self._prefix = f"hgm:activities:{{{queue}}}"
+        self._retention = max(1, int(retention))
+        self._enqueue_script = self._client.register_script(_REDIS_ENQUEUE)
+        self._lease_script = self._client.register_script(_REDIS_LEASE)
+        self._settle_script = self._client.register_script(_REDIS_SETTLE)
+
+    def _key(self, name: str) -> str:
+        return f"{self._prefix}:{name}"
+
+    def enqueue_many(self, items: Sequence[Tuple[ActivityCall, Optional[str]]], *, delay: float = 0.0) -> int:
+        available = time.time() + max(0.0, delay)
+        pipeline = self._client.pipeline(transaction=False)
+        for call, key in items:
+            key = key or _new_key()
+            task_id = _new_key()
+            body = json.dumps({"key": key, "name": call.name, "args": list(call.args), "kwargs": call.kwargs})
+            self._enqueue_script(
+                keys=[self._key(f"key:{key}"), self._key("tasks"), self._key("ready")],
+                args=[task_id, body, available],
+                client=pipeline,
+            )
+        return sum(int(result) for result in pipeline.execute())
+
+    def lease(self, owner: str, *, limit: int = 1, visibility_timeout: float = 30.0) -> List[ActivityTask]:
+        del owner
+        tokens = [_new_key() for _ in range(limit)]
+        raw = self._lease_script(
+            keys=[self._key("ready"), self._key("attempts"), self._key("leases"), self._key("dead"), self._key("tasks")],
+            args=[time.time(), limit, visibility_timeout, self._max_attempts, *tokens],
+        )
+        tasks: List[ActivityTask] = []
+        for offset in range(0, len(raw), 4):
+            task_id, attempts, token, body = raw[offset : offset + 4]
+            data = json.loads(body)
+            call = ActivityCall(data["name"], tuple(data["args"]), data["kwargs"])
+            tasks.append(ActivityTask(_text(task_id), call, data["key"], int(attempts), _text(token)))
+        return tasks
+
+    def extend(self, task: ActivityTask, visibility_timeout: float) -> bool:
+        return self._settle(task, "extend", time.time() + visibility_timeout)
+
+    def ack(self, task: ActivityTask) -> bool:
+        return self._settle(task, "done", 0)
+
+    def nack(self, task: ActivityTask, error: str = "", *, delay: float = 0.0) -> bool:
+        if task.attempts >= self._max_attempts:
+            return self._settle(task, "dead", 0, error)
+        return self._settle(task, "retry", time.time() + max(0.0, delay), error)
+
+    def stats(self) -> Dict[str, float]:
+        pipeline = self._client.pipeline(transaction=False)
+        pipeline.zcard(self._key("ready"))
+        pipeline.hlen(self._key("leases"))
+        pipeline.zcard(self._key("dead"))
+        pipeline.get(self._key("done"))
+        ready, leased, dead, done = pipeline.execute()
+        return {
+            "queued": float(ready - leased),
+            "leased": float(leased),
+            "done": float(int(done or 0)),
+            "dead": float(dead),
+        }
+
+    def purge(self, older_than: float) -> int:
+        # Done tasks are deleted on ack and their keys expire on their own.
+        cutoff = time.time() - older_than
+        dead = [_text(task_id) for task_id in self._client.zrangebyscore(self._key("dead"), "-inf", cutoff)]
+        if not dead:
+            return 0
+        bodies = self._client.hmget(self._key("tasks"), dead)
+        pipeline = self._client.pipeline(transaction=True)
+        pipeline.zrem(self._key("dead"), *dead)
+        for body in bodies:
+            if body:
+                pipeline.delete(self._key(f"key:{json.loads(body)['key']}"))
+        for name in ("tasks", "attempts", "errors"):
+            pipeline.hdel(self._key(name), *dead)
+        pipeline.execute()
+        return len(dead)
+
+    def close(self) -> None:
+        self._client.close()
+
+    def _settle(self, task: ActivityTask, mode: str, score: float, error: str = "") -> bool:
+        keys = [
+            self._key("ready"),
+            self._key("attempts"),
+            self._key("leases"),
+            self._key("dead"),
+            self._key("tasks"),
+            self._key("errors"),
+            self._key(f"key:{task.key}"),
+            self._key("done"),
+        ]
+        args = [task.id, task.lease, mode, score, time.time(), error, self._retention]
+        return bool(self._settle_script(keys=keys, args=args))
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+_QUEUE_SINGLETON: Dict[str, ActivityQueue] = {}
+
+
+def get_activity_queue(queue: str = "default") -> ActivityQueue:
+    """Return the configured activity queue named ``queue``.
+
+    The backend is chosen using ``HGM_ACTIVITY_QUEUE_BACKEND``: ``memory``
+    (default), ``sqlite`` (file at ``HGM_ACTIVITY_QUEUE_PATH``) or ``redis``
+    (``HGM_ACTIVITY_QUEUE_URL``).  Instances are cached per queue name.
+    """
+
+    backend = os.environ.get("HGM_ACTIVITY_QUEUE_BACKEND", "memory").lower()
+    cache_key = f"{backend}:{queue}"
+    if cache_key in _QUEUE_SINGLETON:
+        return _QUEUE_SINGLETON[cache_key]
+    max_attempts = int(os.environ.get("HGM_ACTIVITY_MAX_ATTEMPTS", "5"))
+    if backend == "redis":
+        url = os.environ.get("HGM_ACTIVITY_QUEUE_URL", "redis://localhost:6379/0")
+        instance: ActivityQueue = RedisActivityQueue(url, queue=queue, max_attempts=max_attempts)
+    elif backend == "sqlite":
+        instance = SqliteActivityQueue(queue=queue, max_attempts=max_attempts)
+    elif backend == "memory":
+        instance = InMemoryActivityQueue(max_attempts=max_attempts)
+    else:
+        raise ActivityQueueError(f"Unknown HGM_ACTIVITY_QUEUE_BACKEND: {backend}")
+    _QUEUE_SINGLETON[cache_key] = instance
+    return instance
+
+
+__all__ = [
+    "ActivityCall",
+    "ActivityQueue",
+    "ActivityQueueError",
+    "ActivityTask",
+    "InMemoryActivityQueue",
+    "RedisActivityQueue",
+    "SqliteActivityQueue",
+    "get_activity_queue",
+]
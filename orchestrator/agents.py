@@ -2,19 +2,23 @@
 
 from __future__ import annotations
 
+import bisect
 import hashlib
 import hmac
 import json
+import logging
 import os
 import threading
 import time
+from collections import defaultdict
 from dataclasses import dataclass
 from decimal import Decimal
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 from pydantic import BaseModel, ValidationError
 
+from .deadlines import get_deadline_scheduler
 from .models import (
     AgentCapability,
     AgentHeartbeatIn,
@@ -26,6 +30,9 @@ from .models import (
     AgentUpdateIn,
 )
 
+_LOGGER = logging.getLogger(__name__)
+
+
 def _default_registry_path() -> Path:
     return Path(os.environ.get("AGENT_REGISTRY_PATH", "storage/orchestrator/agents/registry.json"))
 
@@ -34,6 +41,12 @@ def _default_heartbeat_timeout() -> float:
     return float(os.environ.get("AGENT_HEARTBEAT_TIMEOUT", "120"))
 
 
+# The journal is folded into the snapshot once it holds this many records or
+# as many records as there are agents, whichever is larger.
+_JOURNAL_COMPACT_MIN = 1024
+_UNAVAILABLE_STATES = frozenset({"suspended", "offline"})
+
+
 class AgentRegistryError(RuntimeError):
     """Base class for registry interaction failures."""
 
@@ -71,8 +84,125 @@ class AgentAssignment:
     reason: Optional[str] = None
 
 
+def _capability_value(capability_hint: str) -> str:
+    try:
+        return AgentCapability(capability_hint).value
+    except ValueError:
+        return capability_hint
+
+
+_RankKey = Tuple[Optional[str], Optional[str]]
+_Rank = Tuple[Decimal, int, str]
+
+
+class _AgentIndex:
+    """Secondary indexes over registry entries.
+
+    Agents that may receive work are kept in lists ordered by descending
+    stake (ties by registration order) under ``(capability, region)``,
+    ``(capability, None)``, ``(None, region)`` and ``(None, None)``, so the
+    best candidate for any hint combination is at the front of one list.
+    Status and region sets narrow :meth:`AgentRegistry.list`.
+    """
+
+    def __init__(self) -> None:
+        self._ranked: Dict[_RankKey, List[_Rank]] = defaultdict(list)
+        self._placement: Dict[str, Tuple[_Rank, Tuple[_RankKey, ...]]] = {}
+        self._signatures: Dict[str, Tuple[object, ...]] = {}
+        self._by_status: Dict[str, Set[str]] = defaultdict(set)
+        self._by_region: Dict[str, Set[str]] = defaultdict(set)
+        self._order: Dict[str, int] = {}
+        self._counter = 0
+
+    @staticmethod
+    def _signature(entry: AgentStatus) -> Tuple[object, ...]:
+        return (
+            entry.status,
+            entry.region,
+            tuple(capability.value for capability in entry.capabilities),
+            entry.stake.amount,
+            entry.last_heartbeat is not None,
+        )
+
+    @staticmethod
+    def _eligible(entry: AgentStatus) -> bool:
+        if entry.status in _UNAVAILABLE_STATES:
+            return False
+        return entry.last_heartbeat is not None or entry.status == "active"
+
+    def put(self, entry: AgentStatus) -> None:
+        agent_id = entry.agent_id
+        signature = self._signature(entry)
+        if self._signatures.get(agent_id) == signature:
+            return
+        self._unindex(agent_id)
+        if agent_id not in self._order:
+            self._order[agent_id] = self._counter
+            self._counter += 1
+        self._signatures[agent_id] = signature
+        self._by_status[entry.status].add(agent_id)
+        self._by_region[entry.region].add(agent_id)
+        if not self._eligible(entry):
+            return
+        rank: _Rank = (-Decimal(entry.stake.amount), self._order[agent_id], agent_id)
+        keys: List[_RankKey] = [(None, None), (None, entry.region)]
+        for capability in {capability.value for capability in entry.capabilities}:
+            keys.extend([(capability, None), (capability, entry.region)])
+        for key in keys:
+            bisect.insort(self._ranked[key], rank)
+        self._placement[agent_id] = (rank, tuple(keys))
+
+    def remove(self, agent_id: str) -> None:
+        self._unindex(agent_id)
+        self._order.pop(agent_id, None)
+
+    def _unindex(self, agent_id: str) -> None:
+        signature = self._signatures.pop(agent_id, None)
+        if signature is None:
+            return
+        status, region = signature[0], signature[1]
+        self._by_status[status].discard(agent_id)  # type: ignore[index]
+        self._by_region[region].discard(agent_id)  # type: ignore[index]
+        placement = self._placement.pop(agent_id, None)
+        if placement is None:
+            return
+        rank, keys = placement
+        for key in keys:
+            ranked = self._ranked[key]
+            position = bisect.bisect_left(ranked, rank)
+            if position < len(ranked) and ranked[position] == rank:
+                del ranked[position]
+            if not ranked:
+                del self._ranked[key]
+
+    def ranked(self, capability: Optional[str], region: Optional[str]) -> Iterator[str]:
+        for _, _, agent_id in self._ranked.get((capability, region), ()):
+            yield agent_id
+
+    def select(self, region: Optional[str], status: Optional[str]) -> List[str]:
+        candidates: Optional[Set[str]] = None
+        if region:
+            candidates = set(self._by_region.get(region, ()))
+        if status:
+            matches = self._by_status.get(status, set())
+            candidates = matches & candidates if candidates is not None else set(matches)
+        if candidates is None:
+            candidates = set(self._order)
+        return sorted(candidates, key=self._order.__getitem__)
+
+
 class AgentRegistry:
-    """Authoritative store for registered agent metadata and runtime health."""
+    """Authoritative store for registered agent metadata and runtime health.
+
+    Every heartbeat (re)arms a per-agent deadline on the shared
+    :class:`~orchestrator.deadlines.DeadlineScheduler`; an agent is marked
+    offline when its deadline fires.  ``watchdog_interval`` is accepted for
+    backwards compatibility but no longer used.
+
+    Changes are appended to a JSON-lines journal next to the registry file and
+    periodically folded into the snapshot, so a heartbeat costs one short
+    append rather than a rewrite of every agent.
+    """
 
     def __init__(
         self,
@@ -81,32 +211,102 @@ class AgentRegistry:
         watchdog_interval: float | None = None,
     ) -> None:
         self._path = (path or _default_registry_path()).resolve()
+        self._journal_path = self._path.with_suffix(".journal.jsonl")
         self._heartbeat_timeout = float(heartbeat_timeout or _default_heartbeat_timeout())
-        interval = watchdog_interval or max(5.0, self._heartbeat_timeout / 2.0)
-        self._watchdog_interval = max(0.5, float(interval))
+        del watchdog_interval
         self._lock = threading.RLock()
         self._agents: Dict[str, AgentStatus] = {}
         self._secrets: Dict[str, str] = {}
-        self._watchdog_started = False
+        self._index = _AgentIndex()
+        self._journal_handle: Optional[IO[str]] = None
+        self._journal_records = 0
+        self._deadlines = get_deadline_scheduler()
         self._load()
-        self._ensure_watchdog()
+        with self._lock:
+            for entry in self._agents.values():
+                self._index.put(entry)
+                self._arm_heartbeat_deadline(entry)
 
     # ---------------------------------------------------------------------
     # persistence helpers
     # ------------------------------------------------------------------
     def _load(self) -> None:
-        if not self._path.exists():
+        if self._path.exists():
+            try:
+                data = json.loads(self._path.read_text(encoding="utf-8"))
+                snapshot = _RegistrySnapshot.model_validate(data)
+            except (OSError, json.JSONDecodeError, ValidationError) as exc:
+                raise AgentRegistryError(f"Failed to load agent registry: {exc}") from exc
+            for entry in snapshot.agents:
+                self._agents[entry.agent_id] = entry
+            self._secrets = dict(snapshot.secrets)
+        self._replay_journal()
+
+    def _replay_journal(self) -> None:
+        if not self._journal_path.exists():
             return
         try:
-            data = json.loads(self._path.read_text(encoding="utf-8"))
-            snapshot = _RegistrySnapshot.model_validate(data)
-        except (OSError, json.JSONDecodeError, ValidationError) as exc:
-            raise AgentRegistryError(f"Failed to load agent registry: {exc}") from exc
-        for entry in snapshot.agents:
+            lines = self._journal_path.read_text(encoding="utf-8").splitlines()
+        except OSError as exc:
+            raise AgentRegistryError(f"Failed to load agent registry journal: {exc}") from exc
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                self._apply_record(json.loads(line))
+            except (json.JSONDecodeError, KeyError, TypeError, ValidationError) as exc:
+                if number == len(lines):
+                    # Appending after a torn record would bury it mid-file;
+                    # fold everything into a fresh snapshot instead.
+                    _LOGGER.warning("Ignoring truncated agent registry journal record at line %d", number)
+                    self._persist()
+                    return
+                raise AgentRegistryError(f"Corrupted agent registry journal at line {number}: {exc}") from exc
+            self._journal_records += 1
+
+    def _apply_record(self, record: Dict[str, object]) -> None:
+        op = record["op"]
+        if op == "put":
+            entry = AgentStatus.model_validate(record["agent"])
             self._agents[entry.agent_id] = entry
-        self._secrets = dict(snapshot.secrets)
+            if "secret" in record:
+                self._secrets[entry.agent_id] = str(record["secret"])
+        elif op == "patch":
+            agent_id = str(record["agent_id"])
+            current = self._agents.get(agent_id)
+            if current is not None:
+                fields = dict(record["fields"])  # type: ignore[call-overload]
+                if "capabilities" in fields:
+                    fields["capabilities"] = [AgentCapability(value) for value in fields["capabilities"]]
+                self._agents[agent_id] = current.model_copy(update=fields)
+        elif op == "delete":
+            agent_id = str(record["agent_id"])
+            self._agents.pop(agent_id, None)
+            self._secrets.pop(agent_id, None)
+        else:
+            raise KeyError(op)
+
+    def _journal(self, record: Dict[str, object]) -> None:
+        """Append ``record`` to the journal; compact once the journal is long."""
+
+        if self._journal_handle is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal_handle = self._journal_path.open("a", encoding="utf-8")
+        self._journal_handle.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._journal_handle.flush()
+        self._journal_records += 1
+        if self._journal_records >= max(_JOURNAL_COMPACT_MIN, len(self._agents)):
+            self._persist()
+
+    def _journal_put(self, entry: AgentStatus, *, secret: bool = False) -> None:
+        record: Dict[str, object] = {"op": "put", "agent": entry.model_dump(mode="json")}
+        if secret:
+            record["secret"] = self._secrets[entry.agent_id]
+        self._journal(record)
 
     def _persist(self) -> None:
+        """Write a full snapshot and start a fresh journal."""
+
         snapshot = _RegistrySnapshot(
             agents=list(self._agents.values()),
             secrets=dict(self._secrets),
@@ -116,6 +316,17 @@ class AgentRegistry:
         tmp_path = self._path.with_suffix(".tmp")
         tmp_path.write_text(json.dumps(payload, ensure_ascii=False, sort_keys=True), encoding="utf-8")
         tmp_path.replace(self._path)
+        # Replaying records already in the snapshot is harmless, so a crash
+        # before the truncation below cannot lose or corrupt state.
+        if self._journal_handle is not None:
+            self._journal_handle.close()
+            self._journal_handle = None
+        self._journal_path.unlink(missing_ok=True)
+        self._journal_records = 0
+
+    def _store(self, entry: AgentStatus) -> None:
+        self._agents[entry.agent_id] = entry
+        self._index.put(entry)
 
     # ------------------------------------------------------------------
     # public API
@@ -138,9 +349,9 @@ class AgentRegistry:
                 updated_at=timestamp,
                 last_heartbeat=None,
             )
-            self._agents[payload.agent_id] = status
             self._secrets[payload.agent_id] = _hash_secret(payload.operator_secret)
-            self._persist()
+            self._store(status)
+            self._journal_put(status, secret=True)
             return self._with_heartbeat_lag(status)
 
     def update(self, agent_id: str, payload: AgentUpdateIn) -> AgentStatus:
@@ -168,14 +379,16 @@ class AgentRegistry:
             if payload.status is not None and payload.status != updated.status:
                 updated.status = payload.status
                 changed = True
+            secret_changed = payload.operator_secret is not None
             if payload.operator_secret is not None:
                 self._secrets[agent_id] = _hash_secret(payload.operator_secret)
                 changed = True
             if not changed:
                 return self._with_heartbeat_lag(status)
             updated.updated_at = time.time()
-            self._agents[agent_id] = updated
-            self._persist()
+            self._store(updated)
+            self._arm_heartbeat_deadline(updated)
+            self._journal_put(updated, secret=secret_changed)
             return self._with_heartbeat_lag(updated)
 
     def deregister(self, agent_id: str) -> AgentStatus:
@@ -184,7 +397,9 @@ class AgentRegistry:
             if not status:
                 raise AgentNotFoundError(f"Agent `{agent_id}` is not registered")
             self._secrets.pop(agent_id, None)
-            self._persist()
+            self._index.remove(agent_id)
+            self._deadlines.cancel(self._deadline_key(agent_id))
+            self._journal({"op": "delete", "agent_id": agent_id})
             return self._with_heartbeat_lag(status)
 
     def record_heartbeat(self, agent_id: str, payload: AgentHeartbeatIn) -> AgentStatus:
@@ -199,17 +414,19 @@ class AgentRegistry:
                 if not hmac.compare_digest(secret_hash, _hash_secret(payload.secret)):
                     raise AgentUnauthorizedError("Heartbeat secret mismatch")
             timestamp = time.time()
-            updated = status.model_copy()
-            updated.last_heartbeat = timestamp
-            updated.updated_at = timestamp
-            if updated.status != "suspended":
-                updated.status = "active"
+            fields: Dict[str, object] = {"last_heartbeat": timestamp, "updated_at": timestamp}
+            if status.status != "suspended":
+                fields["status"] = "active"
             if payload.router is not None:
-                updated.router = payload.router
+                fields["router"] = payload.router
             if payload.capabilities is not None:
-                updated.capabilities = list(payload.capabilities)
-            self._agents[agent_id] = updated
-            self._persist()
+                fields["capabilities"] = list(payload.capabilities)
+            updated = status.model_copy(update=fields)
+            self._store(updated)
+            self._arm_heartbeat_deadline(updated)
+            if "capabilities" in fields:
+                fields["capabilities"] = [capability.value for capability in updated.capabilities]
+            self._journal({"op": "patch", "agent_id": agent_id, "fields": fields})
             return self._with_heartbeat_lag(updated)
 
     def get(self, agent_id: str) -> AgentStatus:
@@ -221,14 +438,8 @@ class AgentRegistry:
 
     def list(self, region: str | None = None, status: str | None = None) -> AgentListOut:
         with self._lock:
-            agents = list(self._agents.values())
-        filtered: List[AgentStatus] = []
-        for entry in agents:
-            if region and entry.region != region:
-                continue
-            if status and entry.status != status:
-                continue
-            filtered.append(self._with_heartbeat_lag(entry))
+            agents = [self._agents[agent_id] for agent_id in self._index.select(region, status)]
+        filtered = [self._with_heartbeat_lag(entry) for entry in agents]
         return AgentListOut(agents=filtered, total=len(filtered))
 
     # ------------------------------------------------------------------
@@ -237,11 +448,36 @@ class AgentRegistry:
     def prepare_step(self, step: "Step", agent_ids: List[str]) -> Tuple[List[str], List[str]]:
         """Ensure the provided agents are live; replace offline entries if required."""
 
-        from .models import Step  # local import to avoid circular dependency
+        resolved = self.prepare_steps([(step, agent_ids)])[0]
+        assert resolved is not None  # without skip_unstaffed an unstaffed step raises
+        return resolved
 
-        if not isinstance(step, Step):  # defensive check for typing
-            raise AgentRegistryError("prepare_step received incompatible step instance")
+    def prepare_steps(
+        self, assignments: Sequence[Tuple["Step", List[str]]], *, skip_unstaffed: bool = False
+    ) -> List[Optional[Tuple[List[str], List[str]]]]:
+        """Resolve agents for several steps, e.g. a whole plan, under one lock.
 
+        Returns ``(agents, logs)`` per step in input order.  Raises
+        :class:`AgentAssignmentError` for the first step that cannot be staffed,
+        or with ``skip_unstaffed`` returns ``None`` for it and carries on.
+        """
+
+        from .models import Step  # local import to avoid circular dependency
+
+        results: List[Optional[Tuple[List[str], List[str]]]] = []
+        with self._lock:
+            for step, agent_ids in assignments:
+                if not isinstance(step, Step):  # defensive check for typing
+                    raise AgentRegistryError("prepare_step received incompatible step instance")
+                try:
+                    results.append(self._prepare_step_locked(step, agent_ids))
+                except AgentAssignmentError:
+                    if not skip_unstaffed:
+                        raise
+                    results.append(None)
+        return results
+
+    def _prepare_step_locked(self, step: "Step", agent_ids: List[str]) -> Tuple[List[str], List[str]]:
         logs: List[str] = []
         resolved: List[str] = []
         capability_hint = getattr(step, "tool", None) or None
@@ -296,41 +532,33 @@ class AgentRegistry:
         region_hint: str | None,
         exclude: Iterable[str],
     ) -> Optional[AgentStatus]:
+        """Return the highest-staked available agent, preferring hint matches.
+
+        Preference order: capability and region, capability only, region
+        only, then any available agent.
+        """
+
+        excluded = set(exclude)
+        capability = _capability_value(capability_hint) if capability_hint else None
+        keys: List[_RankKey] = []
+        if capability:
+            if region_hint:
+                keys.append((capability, region_hint))
+            keys.append((capability, None))
+        if region_hint:
+            keys.append((None, region_hint))
+        keys.append((None, None))
         with self._lock:
-            candidates = [entry for entry in self._agents.values() if entry.agent_id not in set(exclude)]
-        active_candidates = [entry for entry in candidates if self._is_available(entry)]
-        if not active_candidates:
-            return None
-
-        def _score(entry: AgentStatus) -> Tuple[int, int, Decimal]:
-            score_capability = 1 if capability_hint and self._matches_capability(entry, capability_hint) else 0
-            score_region = 1 if region_hint and entry.region == region_hint else 0
-            stake_amount = entry.stake.amount if isinstance(entry.stake.amount, Decimal) else Decimal(str(entry.stake.amount))
-            return (score_capability, score_region, stake_amount)
-
-        active_candidates.sort(key=_score, reverse=True)
-
-        if capability_hint:
-            for entry in active_candidates:
-                if self._matches_capability(entry, capability_hint):
-                    if region_hint and entry.region == region_hint:
+            for capability_key, region_key in keys:
+                for agent_id in self._index.ranked(capability_key, region_key):
+                    if agent_id in excluded:
+                        continue
+                    entry = self._agents[agent_id]
+                    # Indexed agents only drop out once their heartbeat deadline
+                    # fires, so re-check freshness for the callback lag window.
+                    if self._is_available(entry):
                         return entry
-            for entry in active_candidates:
-                if self._matches_capability(entry, capability_hint):
-                    return entry
-
-        if region_hint:
-            for entry in active_candidates:
-                if entry.region == region_hint:
-                    return entry
-        return active_candidates[0]
-
-    def _matches_capability(self, entry: AgentStatus, capability_hint: str) -> bool:
-        try:
-            capability = AgentCapability(capability_hint)
-            return capability in entry.capabilities
-        except ValueError:
-            return capability_hint in {capability.value for capability in entry.capabilities}
+        return None
 
     def _is_available(self, entry: AgentStatus) -> bool:
         if entry.status in {"suspended", "offline"}:
@@ -363,37 +591,30 @@ class AgentRegistry:
         return copy
 
     # ------------------------------------------------------------------
-    # watchdog
+    # heartbeat deadlines
     # ------------------------------------------------------------------
-    def _ensure_watchdog(self) -> None:
-        if self._watchdog_started:
+    def _deadline_key(self, agent_id: str) -> Tuple[str, int, str]:
+        return ("agent-heartbeat", id(self), agent_id)
+
+    def _arm_heartbeat_deadline(self, entry: AgentStatus) -> None:
+        if entry.status in _UNAVAILABLE_STATES or not entry.last_heartbeat:
             return
+        agent_id = entry.agent_id
+        delay = entry.last_heartbeat + self._heartbeat_timeout - time.time()
+        self._deadlines.schedule(self._deadline_key(agent_id), delay, lambda: self._expire_heartbeat(agent_id))
 
-        def _watchdog() -> None:
-            interval = self._watchdog_interval
-            while True:
-                time.sleep(interval)
-                with self._lock:
-                    dirty = False
-                    now = time.time()
-                    for agent_id, entry in list(self._agents.items()):
-                        if entry.status == "suspended":
-                            continue
-                        if not entry.last_heartbeat:
-                            continue
-                        if now - entry.last_heartbeat <= self._heartbeat_timeout:
-                            continue
-                        updated = entry.model_copy()
-                        updated.status = "offline"
-                        updated.updated_at = now
-                        self._agents[agent_id] = updated
-                        dirty = True
-                    if dirty:
-                        self._persist()
-
-        thread = threading.Thread(target=_watchdog, daemon=True, name="agent-registry-watchdog")
-        thread.start()
-        self._watchdog_started = True
+    def _expire_heartbeat(self, agent_id: str) -> None:
+        with self._lock:
+            entry = self._agents.get(agent_id)
+            if entry is None or entry.status in _UNAVAILABLE_STATES or not entry.last_heartbeat:
+                return
+            now = time.time()
+            if now - entry.last_heartbeat <= self._heartbeat_timeout:
+                self._arm_heartbeat_deadline(entry)
+                return
+            updated = entry.model_copy(update={"status": "offline", "updated_at": now})
+            self._store(updated)
+            self._journal({"op": "patch", "agent_id": agent_id, "fields": {"status": "offline", "updated_at": now}})
 
 
 _REGISTRY_SINGLETON: AgentRegistry | None = None
@@ -0,0 +1,302 @@
+"""Canonical JSON encoding and digests for onebox receipts and plan hashes.
+
+Receipt digests are the keccak-256 of a compact JSON rendering in which
+dict keys are sorted, sets are ordered by the JSON of their elements,
+``Decimal`` values become ``"decimal:<normalized>"`` strings, bytes become
+``0x`` hex and pydantic models are dumped in JSON mode.
+:func:`normalize_for_digest` builds that rendering as a Python tree and is
+kept as the reference definition; :func:`canonical_json` emits the same text
+in a single pass without building the intermediate tree or re-encoding set
+elements for sorting.
+
+Plan hashes are the SHA-256 of ``json.dumps(snapshot, sort_keys=True)``.
+Both formats are frozen: issued hashes and receipts must keep verifying.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from json.encoder import encode_basestring, encode_basestring_ascii  # type: ignore[attr-defined]
+from operator import itemgetter
+from typing import Any, Callable, Hashable, List, Optional
+
+_COMPACT = (",", ":")
+_first = itemgetter(0)
+
+
+def maybe_model_dump(value: Any) -> Any:
+    """Return ``value`` dumped to plain data if it is a pydantic model."""
+
+    if hasattr(value, "model_dump"):
+        try:
+            return value.model_dump(mode="json")
+        except TypeError:
+            try:
+                return value.model_dump()
+            except Exception:
+                pass
+        except Exception:
+            pass
+    if hasattr(value, "dict"):
+        try:
+            return value.dict()
+        except Exception:
+            pass
+    return value
+
+
+def _decimal_text(value: Decimal) -> str:
+    try:
+        return f"decimal:{value.normalize()}"
+    except Exception:
+        return f"decimal:{value}"
+
+
+def normalize_for_digest(value: Any) -> Any:
+    """Convert ``value`` into the JSON-compatible tree that receipt digests cover."""
+
+    if value is None:
+        return None
+    if isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, Decimal):
+        return _decimal_text(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        if math.isfinite(value):
+            return value
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + value.hex()
+    if isinstance(value, (list, tuple)):
+        return [normalize_for_digest(item) for item in value]
+    if isinstance(value, set):
+        normalized = [normalize_for_digest(item) for item in value]
+        normalized.sort(key=lambda entry: json.dumps(entry, sort_keys=True, separators=_COMPACT))
+        return normalized
+    if isinstance(value, dict):
+        items = sorted((str(k), normalize_for_digest(v)) for k, v in value.items())
+        return {k: v for k, v in items}
+    dumped = maybe_model_dump(value)
+    if dumped is not None and dumped is not value:
+        return normalize_for_digest(dumped)
+    if hasattr(value, "__iter__") and not isinstance(value, (bytes, bytearray, str)):
+        try:
+            return [normalize_for_digest(item) for item in list(value)]
+        except Exception:
+            pass
+    try:
+        return json.loads(json.dumps(value, default=str))
+    except Exception:
+        return str(value)
+
+
+def _encode(value: Any, parts: List[str], encode_str: Callable[[str], str]) -> None:
+    # Exact built-in types take the fast path; everything else (subclasses,
+    # models, iterables) goes through the same checks, in the same order, as
+    # normalize_for_digest.
+    cls = type(value)
+    if cls is str:
+        parts.append(encode_str(value))
+    elif cls is dict:
+        _encode_dict(value, parts, encode_str)
+    elif cls is list or cls is tuple:
+        _encode_list(value, parts, encode_str)
+    elif cls is int:
+        parts.append(int.__repr__(value))
+    elif value is None:
+        parts.append("null")
+    elif value is True:
+        parts.append("true")
+    elif value is False:
+        parts.append("false")
+    elif isinstance(value, str):
+        parts.append(encode_str(value))
+    elif isinstance(value, Decimal):
+        parts.append(encode_str(_decimal_text(value)))
+    elif isinstance(value, int):
+        parts.append(int.__repr__(value))
+    elif isinstance(value, float):
+        parts.append(float.__repr__(value) if math.isfinite(value) else encode_str(str(value)))
+    elif isinstance(value, (bytes, bytearray)):
+        parts.append(encode_str("0x" + value.hex()))
+    elif isinstance(value, (list, tuple)):
+        _encode_list(value, parts, encode_str)
+    elif isinstance(value, set):
+        _encode_set(value, parts, encode_str)
+    elif isinstance(value, dict):
+        _encode_dict(value, parts, encode_str)
+    else:
+        dumped = maybe_model_dump(value)
+        if dumped is not None and dumped is not value:
+            _encode(dumped, parts, encode_str)
+            return
+        if hasattr(value, "__iter__"):
+            try:
+                nested: List[str] = []
+                _encode_list(list(value), nested, encode_str)
+            except Exception:
+                pass
+            else:
+                parts.extend(nested)
+                return
+        parts.append(encode_str(str(value)))
+
+
+def _encode_list(values: Any, parts: List[str], encode_str: Callable[[str], str]) -> None:
+    if not values:
+        parts.append("[]")
+        return
+    separator = "["
+    for item in values:
+        parts.append(separator)
+        separator = ","
+        cls = type(item)
+        if cls is str:
+            parts.append(encode_str(item))
+        elif cls is int:
+            parts.append(int.__repr__(item))
+        else:
+            _encode(item, parts, encode_str)
+    parts.append("]")
+
+
+def _encode_one(value: Any, encode_str: Callable[[str], str]) -> str:
+    parts: List[str] = []
+    _encode(value, parts, encode_str)
+    return "".join(parts)
+
+
+def _encode_set(values: set, parts: List[str], encode_str: Callable[[str], str]) -> None:
+    # Elements are ordered by their ASCII-escaped JSON, as json.dumps'
+    # default ensure_ascii=True would render them.
+    entries = []
+    for item in values:
+        text = encode_str(item) if type(item) is str else _encode_one(item, encode_str)
+        if text.isascii() or encode_str is encode_basestring_ascii:
+            key = text
+        else:
+            key = _encode_one(item, encode_basestring_ascii)
+        entries.append((key, text))
+    entries.sort(key=_first)
+    parts.append("[" + ",".join(text for _, text in entries) + "]")
+
+
+def _encode_dict(value: dict, parts: List[str], encode_str: Callable[[str], str]) -> None:
+    keys = [str(key) for key in value]
+    if len(set(keys)) != len(keys):
+        # Keys such as 1 and "1" collide once stringified; the reference
+        # normaliser decides which value survives.
+        ensure_ascii = encode_str is encode_basestring_ascii
+        parts.append(json.dumps(normalize_for_digest(value), separators=_COMPACT, ensure_ascii=ensure_ascii))
+        return
+    if not keys:
+        parts.append("{}")
+        return
+    separator = "{"
+    for key, item in sorted(zip(keys, value.values()), key=_first):
+        parts.append(separator)
+        separator = ","
+        parts.append(encode_str(key))
+        parts.append(":")
+        cls = type(item)
+        if cls is str:
+            parts.append(encode_str(item))
+        elif cls is int:
+            parts.append(int.__repr__(item))
+        else:
+            _encode(item, parts, encode_str)
+    parts.append("}")
+
+
+def canonical_json(value: Any, *, ensure_ascii: bool = False) -> str:
+    """Return ``json.dumps(normalize_for_digest(value), separators=(",", ":"))`` in one pass."""
+
+    parts: List[str] = []
+    _encode(value, parts, encode_basestring_ascii if ensure_ascii else encode_basestring)
+    return "".join(parts)
+
+
+_KECCAK: Optional[Callable[[bytes], bytes]] = None
+
+
+def keccak256(data: bytes) -> bytes:
+    """Keccak-256 via ``eth_hash``; SHA3-256 when no backend is installed."""
+
+    global _KECCAK
+    if _KECCAK is None:
+        try:
+            from eth_hash.auto import keccak as _auto_keccak
+
+            _auto_keccak(b"")
+            _KECCAK = _auto_keccak
+        except Exception:
+            _KECCAK = lambda data: hashlib.sha3_256(data).digest()  # noqa: E731
+    return _KECCAK(data)
+
+
+def receipt_digest(payload: Any) -> str:
+    """Return the ``0x``-prefixed keccak-256 of the canonical JSON of ``payload``."""
+
+    return "0x" + keccak256(canonical_json(payload).encode("utf-8")).hex()
+
+
+def plan_digest(snapshot: Any) -> str:
+    """Return the ``0x``-prefixed SHA-256 plan hash of a dumped intent snapshot."""
+
+    return "0x" + hashlib.sha256(json.dumps(snapshot, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class DigestMemo:
+    """Thread-safe LRU of digests keyed by an immutable snapshot key.
+
+    Callers choose a key that identifies the hashed content exactly, e.g.
+    the JSON dump of a pydantic model whose fields are all JSON-native.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self._max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], str]) -> str:
+        with self._lock:
+            digest = self._entries.get(key)
+            if digest is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return digest
+            self.misses += 1
+        digest = compute()
+        with self._lock:
+            self._entries[key] = digest
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return digest
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+__all__ = [
+    "DigestMemo",
+    "canonical_json",
+    "keccak256",
+    "maybe_model_dump",
+    "normalize_for_digest",
+    "plan_digest",
+    "receipt_digest",
+]
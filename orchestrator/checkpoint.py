@@ -4,14 +4,16 @@ from __future__ import annotations
 
 import hashlib
 import hmac
+import io
 import json
 import logging
 import os
+import struct
 import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
@@ -20,6 +22,8 @@ from .models import OrchestrationPlan, StatusOut
 _LOGGER = logging.getLogger(__name__)
 
 _CHECKPOINT_VERSION = "orchestrator.checkpoint.v1"
+_DELTA_VERSION = "orchestrator.checkpoint.delta.v1"
+_DEFAULT_COMPACTION_INTERVAL = int(os.environ.get("ORCHESTRATOR_CHECKPOINT_COMPACT_EVERY", "256"))
 _DEFAULT_FILE_PATH = Path(os.environ.get("ORCHESTRATOR_CHECKPOINT_PATH", "storage/orchestrator/checkpoint.json"))
 _DEFAULT_LEVELDB_PATH = Path(
     os.environ.get("ORCHESTRATOR_CHECKPOINT_LEVELDB", "storage/orchestrator/checkpoint.db")
@@ -28,6 +32,13 @@ _DEFAULT_S3_PREFIX = os.environ.get("ORCHESTRATOR_CHECKPOINT_PREFIX", "orchestra
 _DEFAULT_GOVERNANCE_PATH = Path(
     os.environ.get("ORCHESTRATOR_GOVERNANCE_PATH", "storage/orchestrator/governance.json")
 )
+_ENCODINGS = ("json", "msgpack")
+_COMPRESSIONS = ("zstd",)
+_STREAMED_FIELDS = frozenset({"jobs", "shards", "nodes"})
+
+
+def _canonical_json(value: object) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
 
 class CheckpointError(RuntimeError):
@@ -124,6 +135,58 @@ class Checkpoint(BaseModel):
     scoreboard: Dict[str, Dict[str, object]] = Field(default_factory=dict)
     integrity: str
 
+    def iter_canonical(self) -> Iterator[str]:
+        """Yield the canonical JSON encoding of the checkpoint in chunks.
+
+        The chunks concatenate to the sorted-key, compact JSON dump of every
+        field except ``integrity``, but only one job is serialised at a time.
+        """
+
+        fields = sorted(name for name in type(self).model_fields if name != "integrity")
+        yield "{"
+        for position, name in enumerate(fields):
+            if position:
+                yield ","
+            yield f"{_canonical_json(name)}:"
+            if name in _STREAMED_FIELDS:
+                entries: Dict[str, BaseModel] = getattr(self, name)
+                yield "{"
+                for index, key in enumerate(sorted(entries)):
+                    prefix = "," if index else ""
+                    yield f"{prefix}{_canonical_json(key)}:{_canonical_json(entries[key].model_dump(mode='json'))}"
+                yield "}"
+            else:
+                yield _canonical_json(self.model_dump(mode="json", include={name})[name])
+        yield "}"
+
+    def compute_integrity(self) -> str:
+        digest = hashlib.sha256()
+        for chunk in self.iter_canonical():
+            digest.update(chunk.encode("utf-8"))
+        return digest.hexdigest()
+
+    def verify(self) -> None:
+        expected = self.compute_integrity()
+        if not hmac.compare_digest(expected, self.integrity):
+            raise CheckpointIntegrityError("Checkpoint integrity mismatch")
+
+
+class CheckpointDelta(BaseModel):
+    """Single per-run change record appended between full checkpoints.
+
+    Deltas are chained by hash: ``previous`` holds the integrity of the record
+    written immediately before (the base checkpoint for the first delta after a
+    compaction, or an empty string when no base exists yet).
+    """
+
+    version: str = Field(default=_DELTA_VERSION)
+    sequence: int
+    created_at: float
+    run_id: str
+    job: Optional[JobCheckpoint] = None
+    previous: str = ""
+    integrity: str
+
     def compute_integrity(self) -> str:
         payload = self.model_dump(mode="json", exclude={"integrity"})
         canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
@@ -132,11 +195,16 @@ class Checkpoint(BaseModel):
     def verify(self) -> None:
         expected = self.compute_integrity()
         if not hmac.compare_digest(expected, self.integrity):
-            raise CheckpointIntegrityError("Checkpoint integrity mismatch")
+            raise CheckpointIntegrityError(f"Checkpoint delta {self.sequence} integrity mismatch")
 
 
 class CheckpointStore:
-    """Abstract persistence backend for checkpoints."""
+    """Abstract persistence backend for checkpoints.
+
+    Backends that support the append-only delta log override
+    :meth:`append_delta`, :meth:`load_deltas` and :meth:`truncate_deltas`.  The
+    defaults make :class:`CheckpointManager` fall back to full snapshots.
+    """
 
     def save(self, checkpoint: Checkpoint) -> None:
         raise NotImplementedError
@@ -144,35 +212,237 @@ class CheckpointStore:
     def load_latest(self) -> Optional[Checkpoint]:
         raise NotImplementedError
 
+    def append_delta(self, delta: CheckpointDelta) -> None:
+        raise NotImplementedError
+
+    def load_deltas(self, after_sequence: int = 0) -> List[CheckpointDelta]:
+        del after_sequence
+        return []
+
+    def truncate_deltas(self, up_to_sequence: int) -> None:
+        """Discard deltas already folded into a base checkpoint."""
+
+        del up_to_sequence
+
+
+_BINARY_MAGIC = b"OCKP\x02"
+_BINARY_PLAIN = 0
+_BINARY_ZSTD = 1
+_RECORD_LENGTH = struct.Struct(">I")
+_JSON_EXT_TYPE = 1
+
+
+def _import_msgpack() -> Any:
+    try:
+        import msgpack  # type: ignore[import-not-found]
+    except Exception as exc:  # pragma: no cover - optional dependency
+        raise CheckpointStoreError("msgpack package is required for binary checkpoints") from exc
+    return msgpack
+
+
+def _import_zstandard() -> Any:
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except Exception as exc:  # pragma: no cover - optional dependency
+        raise CheckpointStoreError("zstandard package is required for compressed checkpoints") from exc
+    return zstandard
+
+
+def _pack_record(msgpack: Any, value: object) -> bytes:
+    try:
+        return msgpack.packb(value, use_bin_type=True)
+    except OverflowError:
+        # msgpack integers stop at 64 bits; wei amounts and similar values
+        # fall back to an embedded JSON document for this record only.
+        return msgpack.packb(msgpack.ExtType(_JSON_EXT_TYPE, _canonical_json(value).encode("utf-8")))
+
+
+def _decode_ext(code: int, data: bytes) -> object:
+    if code != _JSON_EXT_TYPE:
+        raise CheckpointStoreError(f"Unknown checkpoint record extension {code}")
+    return json.loads(data.decode("utf-8"))
+
+
+def write_binary_checkpoint(checkpoint: Checkpoint, handle: IO[bytes], *, compression: Optional[str] = None) -> None:
+    """Stream ``checkpoint`` as length-prefixed msgpack records.
+
+    The file starts with a magic header and a codec byte, followed by one
+    record holding every field except ``jobs`` (plus the job count) and then
+    one ``[run_id, job]`` record per job.  With ``compression="zstd"`` the
+    record stream is wrapped in a single zstd frame.
+    """
+
+    msgpack = _import_msgpack()
+    handle.write(_BINARY_MAGIC + bytes([_BINARY_ZSTD if compression == "zstd" else _BINARY_PLAIN]))
+    sink: IO[bytes] = handle
+    if compression == "zstd":
+        sink = _import_zstandard().ZstdCompressor(level=3).stream_writer(handle, closefd=False)
+    header = checkpoint.model_dump(mode="json", exclude={"jobs"})
+    header["jobs"] = len(checkpoint.jobs)
+    payload = _pack_record(msgpack, header)
+    sink.write(_RECORD_LENGTH.pack(len(payload)) + payload)
+    for run_id, job in checkpoint.jobs.items():
+        payload = _pack_record(msgpack, [run_id, job.model_dump(mode="json")])
+        sink.write(_RECORD_LENGTH.pack(len(payload)) + payload)
+    if sink is not handle:
+        sink.close()
+
+
+def _read_exact(stream: IO[bytes], size: int) -> bytes:
+    chunks: List[bytes] = []
+    remaining = size
+    while remaining:
+        chunk = stream.read(remaining)
+        if not chunk:
+            raise CheckpointStoreError("Truncated binary checkpoint")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_binary_checkpoint(handle: IO[bytes]) -> Checkpoint:
+    """Decode a checkpoint written by :func:`write_binary_checkpoint`."""
+
+    msgpack = _import_msgpack()
+    preamble = _read_exact(handle, len(_BINARY_MAGIC) + 1)
+    if preamble[: len(_BINARY_MAGIC)] != _BINARY_MAGIC:
+        raise CheckpointStoreError("Not a binary checkpoint")
+    codec = preamble[-1]
+    source: IO[bytes] = handle
+    if codec == _BINARY_ZSTD:
+        source = _import_zstandard().ZstdDecompressor().stream_reader(handle, closefd=False)
+    elif codec != _BINARY_PLAIN:
+        raise CheckpointStoreError(f"Unknown binary checkpoint codec {codec}")
+
+    def _next_record() -> Any:
+        (length,) = _RECORD_LENGTH.unpack(_read_exact(source, _RECORD_LENGTH.size))
+        return msgpack.unpackb(_read_exact(source, length), raw=False, ext_hook=_decode_ext, strict_map_key=False)
+
+    try:
+        header = _next_record()
+        jobs: Dict[str, JobCheckpoint] = {}
+        for _ in range(int(header.pop("jobs"))):
+            run_id, job = _next_record()
+            jobs[run_id] = JobCheckpoint.model_validate(job)
+        return Checkpoint.model_validate({**header, "jobs": jobs})
+    except (ValueError, KeyError, TypeError, ValidationError) as exc:
+        raise CheckpointStoreError(f"Invalid binary checkpoint payload: {exc}") from exc
+
 
 class FileCheckpointStore(CheckpointStore):
-    """Persist checkpoints to a single JSON file with atomic swaps."""
+    """Persist checkpoints to a single file with atomic swaps.
 
-    def __init__(self, path: Path | None = None) -> None:
+    ``encoding="json"`` (the default) writes the v1 JSON document;
+    ``encoding="msgpack"`` streams length-prefixed msgpack records, optionally
+    zstd-compressed.  Loading detects the format from the file itself, so a
+    store can switch encodings without migrating existing checkpoints.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        encoding: str = "json",
+        compression: Optional[str] = None,
+    ) -> None:
+        if encoding not in _ENCODINGS:
+            raise CheckpointStoreError(f"Unknown checkpoint encoding: {encoding}")
+        if compression is not None and (compression not in _COMPRESSIONS or encoding != "msgpack"):
+            raise CheckpointStoreError(f"Unsupported checkpoint compression for {encoding}: {compression}")
+        if encoding == "msgpack":
+            _import_msgpack()
+        if compression == "zstd":
+            _import_zstandard()
         self._path = (path or _DEFAULT_FILE_PATH).resolve()
+        self._delta_path = self._path.with_suffix(".deltas.jsonl")
+        self._encoding = encoding
+        self._compression = compression
         self._lock = threading.Lock()
         self._path.parent.mkdir(parents=True, exist_ok=True)
 
     def save(self, checkpoint: Checkpoint) -> None:
-        payload = checkpoint.model_dump(mode="json")
-        serialized = json.dumps(payload, ensure_ascii=False, sort_keys=True, indent=2)
         tmp_path = self._path.with_suffix(".tmp")
         with self._lock:
-            tmp_path.write_text(serialized, encoding="utf-8")
+            if self._encoding == "msgpack":
+                with tmp_path.open("wb") as handle:
+                    write_binary_checkpoint(checkpoint, handle, compression=self._compression)
+            else:
+                payload = checkpoint.model_dump(mode="json")
+                with tmp_path.open("w", encoding="utf-8") as handle:
+                    json.dump(payload, handle, ensure_ascii=False, sort_keys=True, indent=2)
             tmp_path.replace(self._path)
 
     def load_latest(self) -> Optional[Checkpoint]:
         if not self._path.exists():
             return None
         try:
-            data = json.loads(self._path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError) as exc:
+            with self._path.open("rb") as handle:
+                if handle.read(len(_BINARY_MAGIC)) == _BINARY_MAGIC:
+                    handle.seek(0)
+                    return read_binary_checkpoint(handle)
+                handle.seek(0)
+                data = json.load(io.TextIOWrapper(handle, encoding="utf-8"))
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError) as exc:
             raise CheckpointStoreError(f"Failed to load checkpoint file: {exc}") from exc
         try:
             return Checkpoint.model_validate(data)
         except ValidationError as exc:  # pragma: no cover - defensive
             raise CheckpointStoreError(f"Invalid checkpoint payload: {exc}") from exc
 
+    def append_delta(self, delta: CheckpointDelta) -> None:
+        line = json.dumps(delta.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            with self._delta_path.open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+    def load_deltas(self, after_sequence: int = 0) -> List[CheckpointDelta]:
+        if not self._delta_path.exists():
+            return []
+        try:
+            lines = self._delta_path.read_text(encoding="utf-8").splitlines()
+        except OSError as exc:
+            raise CheckpointStoreError(f"Failed to load checkpoint deltas: {exc}") from exc
+        deltas: List[CheckpointDelta] = []
+        for index, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                delta = CheckpointDelta.model_validate_json(line)
+            except ValidationError as exc:
+                if index == len(lines) - 1:
+                    # A torn trailing record means the process died mid-append;
+                    # everything before it is still a valid chain.
+                    _LOGGER.warning("Ignoring truncated checkpoint delta at line %d", index + 1)
+                    break
+                raise CheckpointStoreError(f"Corrupted checkpoint delta at line {index + 1}: {exc}") from exc
+            if delta.sequence > after_sequence:
+                deltas.append(delta)
+        return deltas
+
+    def truncate_deltas(self, up_to_sequence: int) -> None:
+        with self._lock:
+            if not self._delta_path.exists():
+                return
+            retained = [
+                line
+                for line in self._delta_path.read_text(encoding="utf-8").splitlines()
+                if line.strip() and _delta_sequence(line) > up_to_sequence
+            ]
+            tmp_path = self._delta_path.with_suffix(".tmp")
+            tmp_path.write_text("".join(f"{line}\n" for line in retained), encoding="utf-8")
+            tmp_path.replace(self._delta_path)
+
+
+def _delta_sequence(line: str) -> int:
+    try:
+        return int(json.loads(line).get("sequence", 0))
+    except (json.JSONDecodeError, AttributeError, TypeError, ValueError):
+        return 0
+
+
+_LEVELDB_DELTA_PREFIX = b"delta/"
+_LEVELDB_DELTA_STOP = b"delta0"
+
 
 class LevelDBCheckpointStore(CheckpointStore):
     """Persist checkpoints into a LevelDB key/value database."""
@@ -192,7 +462,9 @@ class LevelDBCheckpointStore(CheckpointStore):
         self._db.put(key, serialized)
 
     def load_latest(self) -> Optional[Checkpoint]:
-        with self._db.iterator(reverse=True) as iterator:
+        # Base checkpoints use bare zero-padded sequence keys; restrict the scan
+        # to the digit range so delta records never shadow them.
+        with self._db.iterator(reverse=True, start=b"0", stop=b":") as iterator:
             for _, raw in iterator:
                 try:
                     data = json.loads(raw.decode("utf-8"))
@@ -201,6 +473,32 @@ class LevelDBCheckpointStore(CheckpointStore):
                 return Checkpoint.model_validate(data)
         return None
 
+    @staticmethod
+    def _delta_key(sequence: int) -> bytes:
+        return _LEVELDB_DELTA_PREFIX + f"{sequence:020d}".encode("utf-8")
+
+    def append_delta(self, delta: CheckpointDelta) -> None:
+        serialized = json.dumps(delta.model_dump(mode="json"), ensure_ascii=False, sort_keys=True)
+        self._db.put(self._delta_key(delta.sequence), serialized.encode("utf-8"))
+
+    def load_deltas(self, after_sequence: int = 0) -> List[CheckpointDelta]:
+        deltas: List[CheckpointDelta] = []
+        start = self._delta_key(after_sequence + 1)
+        with self._db.iterator(start=start, stop=_LEVELDB_DELTA_STOP) as iterator:
+            for _, raw in iterator:
+                try:
+                    deltas.append(CheckpointDelta.model_validate_json(raw))
+                except ValidationError as exc:
+                    raise CheckpointStoreError(f"Corrupted LevelDB checkpoint delta: {exc}") from exc
+        return deltas
+
+    def truncate_deltas(self, up_to_sequence: int) -> None:
+        stop = self._delta_key(up_to_sequence + 1)
+        with self._db.write_batch() as batch:
+            with self._db.iterator(start=_LEVELDB_DELTA_PREFIX, stop=stop, include_value=False) as iterator:
+                for key in iterator:
+                    batch.delete(key)
+
 
 class S3CheckpointStore(CheckpointStore):
     """Persist checkpoints in an S3-compatible object store."""
@@ -250,6 +548,49 @@ class S3CheckpointStore(CheckpointStore):
         data = json.loads(raw)
         return Checkpoint.model_validate(data)
 
+    def _delta_object_key(self, sequence: int) -> str:
+        return f"{self._prefix}/deltas/delta-{sequence:020d}.json"
+
+    def _delta_keys(self, *, start_after: str | None = None) -> List[str]:
+        paginator = self._client.get_paginator("list_objects_v2")
+        params: Dict[str, object] = {"Bucket": self._bucket, "Prefix": f"{self._prefix}/deltas/"}
+        if start_after:
+            params["StartAfter"] = start_after
+        keys: List[str] = []
+        for page in paginator.paginate(**params):
+            keys.extend(entry["Key"] for entry in page.get("Contents", []))
+        return keys
+
+    def append_delta(self, delta: CheckpointDelta) -> None:
+        serialized = json.dumps(delta.model_dump(mode="json"), ensure_ascii=False, sort_keys=True)
+        self._client.put_object(
+            Bucket=self._bucket,
+            Key=self._delta_object_key(delta.sequence),
+            Body=serialized.encode("utf-8"),
+            ContentType="application/json",
+        )
+
+    def load_deltas(self, after_sequence: int = 0) -> List[CheckpointDelta]:
+        deltas: List[CheckpointDelta] = []
+        for key in self._delta_keys(start_after=self._delta_object_key(after_sequence)):
+            payload = self._client.get_object(Bucket=self._bucket, Key=key)
+            raw = payload["Body"].read().decode("utf-8")
+            try:
+                deltas.append(CheckpointDelta.model_validate_json(raw))
+            except ValidationError as exc:
+                raise CheckpointStoreError(f"Corrupted S3 checkpoint delta {key}: {exc}") from exc
+        return deltas
+
+    def truncate_deltas(self, up_to_sequence: int) -> None:
+        boundary = self._delta_object_key(up_to_sequence)
+        stale = [key for key in self._delta_keys() if key <= boundary]
+        for offset in range(0, len(stale), 1000):
+            chunk = stale[offset : offset + 1000]
+            self._client.delete_objects(
+                Bucket=self._bucket,
+                Delete={"Objects": [{"Key": key} for key in chunk], "Quiet": True},
+            )
+
 
 @dataclass
 class RestoredJob:
@@ -260,13 +601,20 @@ class RestoredJob:
 
 
 class CheckpointManager:
-    """Coordinate checkpoint snapshots and recovery for orchestrator state."""
+    """Coordinate checkpoint snapshots and recovery for orchestrator state.
+
+    Per-run updates are appended to the store's delta log via
+    :meth:`record_job`; every ``compaction_interval`` deltas the accumulated
+    state is folded into a full base checkpoint by :meth:`compact`.  Recovery
+    replays the latest base plus any deltas chained after it.
+    """
 
     def __init__(
         self,
         *,
         store: CheckpointStore | None = None,
         governance: GovernanceSettings | None = None,
+        compaction_interval: int | None = None,
     ) -> None:
         self._store = store or get_checkpoint_store()
         self._governance = governance or load_governance_settings()
@@ -274,7 +622,16 @@ class CheckpointManager:
         self._nodes: Dict[str, NodeAssignment] = {}
         self._sequence = 0
         self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
         self._last_snapshot: Optional[Checkpoint] = None
+        self._jobs: Dict[str, JobCheckpoint] = {}
+        self._scoreboard: Dict[str, Dict[str, object]] = {}
+        self._head = ""
+        self._pending_deltas = 0
+        self._base_established = False
+        self._deltas_supported = True
+        interval = compaction_interval if compaction_interval is not None else _DEFAULT_COMPACTION_INTERVAL
+        self._compaction_interval = max(1, int(interval))
 
     def update_shard(self, shard: ShardState) -> None:
         with self._lock:
@@ -312,6 +669,16 @@ class CheckpointManager:
         with self._lock:
             return self._last_snapshot
 
+    def pending_deltas(self) -> int:
+        """Return the number of deltas appended since the last base checkpoint."""
+
+        with self._lock:
+            return self._pending_deltas
+
+    def compaction_due(self) -> bool:
+        with self._lock:
+            return self._pending_deltas >= self._compaction_interval
+
     def _resolve_shard(self, job_id: str) -> Optional[str]:
         for shard in self._shards.values():
             if job_id in shard.active_jobs or job_id in shard.queued_jobs:
@@ -325,60 +692,164 @@ class CheckpointManager:
                 nodes.append(assignment.node_id)
         return nodes
 
-    def snapshot_runtime(
-        self,
-        runs: Dict[str, StatusOut],
-        plans: Dict[str, OrchestrationPlan],
-        *,
-        scoreboard: Dict[str, Dict[str, object]] | None = None,
-    ) -> Checkpoint:
+    def record_job(self, status: StatusOut, plan: OrchestrationPlan) -> Optional[CheckpointDelta]:
+        """Append a delta capturing the latest state of a single run.
+
+        Ownership of ``status`` and ``plan`` passes to the manager; callers must
+        hand over copies they will not mutate afterwards.  Returns ``None`` when
+        the update was written as a full checkpoint instead (first write after
+        start-up, or a store without delta support).
+        """
+
+        run_id = status.run.id
+        with self._lock:
+            job = JobCheckpoint(
+                status=status,
+                plan=plan,
+                assigned_shard=self._resolve_shard(run_id),
+                assigned_nodes=self._resolve_nodes(run_id),
+                updated_at=time.time(),
+            )
+        return self._append(run_id, job)
+
+    def remove_job(self, run_id: str) -> Optional[CheckpointDelta]:
+        """Append a tombstone delta so ``run_id`` is dropped on recovery."""
+
+        return self._append(run_id, None)
+
+    def _append(self, run_id: str, job: Optional[JobCheckpoint]) -> Optional[CheckpointDelta]:
+        with self._write_lock:
+            with self._lock:
+                if job is None:
+                    self._jobs.pop(run_id, None)
+                else:
+                    self._jobs[run_id] = job
+                if not (self._base_established and self._deltas_supported):
+                    compact = True
+                else:
+                    compact = False
+                    self._sequence += 1
+                    delta = CheckpointDelta(
+                        sequence=self._sequence,
+                        created_at=time.time(),
+                        run_id=run_id,
+                        job=job,
+                        previous=self._head,
+                        integrity="",
+                    )
+            if compact:
+                self._compact_locked(None)
+                return None
+            delta.integrity = delta.compute_integrity()
+            try:
+                self._store.append_delta(delta)
+            except NotImplementedError:
+                self._deltas_supported = False
+                self._compact_locked(None)
+                return None
+            with self._lock:
+                self._head = delta.integrity
+                self._pending_deltas += 1
+        return delta
+
+    def compact(self, *, scoreboard: Dict[str, Dict[str, object]] | None = None) -> Checkpoint:
+        """Fold the accumulated job state into a new base checkpoint."""
+
+        with self._write_lock:
+            return self._compact_locked(scoreboard)
+
+    def _compact_locked(self, scoreboard: Dict[str, Dict[str, object]] | None) -> Checkpoint:
         timestamp = time.time()
         with self._lock:
             self._sequence += 1
             governance = self._governance.model_copy(deep=True)
             shards = {key: value.model_copy(deep=True) for key, value in self._shards.items()}
             nodes = {key: value.model_copy(deep=True) for key, value in self._nodes.items()}
-        jobs: Dict[str, JobCheckpoint] = {}
-        for run_id, status in runs.items():
-            plan = plans.get(run_id)
-            if not plan:
-                continue
-            jobs[run_id] = JobCheckpoint(
-                status=status.model_copy(deep=True),
-                plan=plan.model_copy(deep=True),
-                assigned_shard=self._resolve_shard(run_id),
-                assigned_nodes=self._resolve_nodes(run_id),
-                updated_at=timestamp,
+            jobs = dict(self._jobs)
+            if scoreboard is not None:
+                self._scoreboard = scoreboard
+            checkpoint = Checkpoint(
+                sequence=self._sequence,
+                created_at=timestamp,
+                jobs=jobs,
+                shards=shards,
+                nodes=nodes,
+                governance=governance,
+                scoreboard=self._scoreboard,
+                integrity="",
             )
-        checkpoint = Checkpoint(
-            sequence=self._sequence,
-            created_at=timestamp,
-            jobs=jobs,
-            shards=shards,
-            nodes=nodes,
-            governance=governance,
-            scoreboard=scoreboard or {},
-            integrity="",
-        )
         checkpoint.integrity = checkpoint.compute_integrity()
         self._store.save(checkpoint)
+        self._store.truncate_deltas(checkpoint.sequence)
         with self._lock:
             self._last_snapshot = checkpoint
+            self._head = checkpoint.integrity
+            self._pending_deltas = 0
+            self._base_established = True
         return checkpoint
 
+    def snapshot_runtime(
+        self,
+        runs: Dict[str, StatusOut],
+        plans: Dict[str, OrchestrationPlan],
+        *,
+        scoreboard: Dict[str, Dict[str, object]] | None = None,
+    ) -> Checkpoint:
+        timestamp = time.time()
+        with self._lock:
+            jobs: Dict[str, JobCheckpoint] = {}
+            for run_id, status in runs.items():
+                plan = plans.get(run_id)
+                if not plan:
+                    continue
+                jobs[run_id] = JobCheckpoint(
+                    status=status.model_copy(deep=True),
+                    plan=plan.model_copy(deep=True),
+                    assigned_shard=self._resolve_shard(run_id),
+                    assigned_nodes=self._resolve_nodes(run_id),
+                    updated_at=timestamp,
+                )
+        with self._write_lock:
+            with self._lock:
+                self._jobs = jobs
+            return self._compact_locked(scoreboard or {})
+
     def restore_runtime(self) -> Dict[str, RestoredJob]:
         snapshot = self._store.load_latest()
-        if not snapshot:
+        if snapshot:
+            snapshot.verify()
+        sequence = snapshot.sequence if snapshot else 0
+        head = snapshot.integrity if snapshot else ""
+        deltas = self._store.load_deltas(sequence)
+        if not snapshot and not deltas:
+            with self._lock:
+                self._base_established = True
             return {}
-        snapshot.verify()
+        jobs: Dict[str, JobCheckpoint] = dict(snapshot.jobs) if snapshot else {}
+        for delta in deltas:
+            delta.verify()
+            if not hmac.compare_digest(delta.previous, head):
+                raise CheckpointIntegrityError(f"Checkpoint delta chain broken at sequence {delta.sequence}")
+            if delta.job is None:
+                jobs.pop(delta.run_id, None)
+            else:
+                jobs[delta.run_id] = delta.job
+            head = delta.integrity
+            sequence = delta.sequence
         with self._lock:
-            self._sequence = snapshot.sequence
-            self._governance = snapshot.governance
-            self._shards = {key: value for key, value in snapshot.shards.items()}
-            self._nodes = {key: value for key, value in snapshot.nodes.items()}
-            self._last_snapshot = snapshot
+            self._sequence = sequence
+            self._head = head
+            self._jobs = jobs
+            self._pending_deltas = len(deltas)
+            self._base_established = True
+            if snapshot:
+                self._governance = snapshot.governance
+                self._shards = {key: value for key, value in snapshot.shards.items()}
+                self._nodes = {key: value for key, value in snapshot.nodes.items()}
+                self._scoreboard = snapshot.scoreboard
+                self._last_snapshot = snapshot
         restored: Dict[str, RestoredJob] = {}
-        for run_id, job in snapshot.jobs.items():
+        for run_id, job in jobs.items():
             restored[run_id] = RestoredJob(
                 status=job.status.model_copy(deep=True),
                 plan=job.plan.model_copy(deep=True),
@@ -416,7 +887,9 @@ def _checkpoint_store_config() -> tuple[object, ...]:
         prefix = os.environ.get("ORCHESTRATOR_CHECKPOINT_PREFIX", _DEFAULT_S3_PREFIX)
         return (backend, bucket, prefix)
     path = Path(os.environ.get("ORCHESTRATOR_CHECKPOINT_PATH", "storage/orchestrator/checkpoint.json")).resolve()
-    return (backend, path)
+    encoding = os.environ.get("ORCHESTRATOR_CHECKPOINT_FORMAT", "json").lower()
+    compression = os.environ.get("ORCHESTRATOR_CHECKPOINT_COMPRESSION", "").lower() or None
+    return (backend, path, encoding, compression)
 
 
 def get_checkpoint_store() -> CheckpointStore:
@@ -435,7 +908,7 @@ def get_checkpoint_store() -> CheckpointStore:
         store = S3CheckpointStore(bucket, prefix)
     else:
         path = Path(config[1])
-        store = FileCheckpointStore(path)
+        store = FileCheckpointStore(path, encoding=str(config[2]), compression=config[3])  # type: ignore[arg-type]
     _CHECKPOINT_STORE_SINGLETON = store
     _CHECKPOINT_STORE_CONFIG = config
     return store
@@ -443,10 +916,12 @@ def get_checkpoint_store() -> CheckpointStore:
 
 __all__ = [
     "Checkpoint",
+    "CheckpointDelta",
     "CheckpointError",
     "CheckpointIntegrityError",
     "CheckpointManager",
     "CheckpointStore",
+    "CheckpointStoreError",
     "FileCheckpointStore",
     "GovernanceSettings",
     "LevelDBCheckpointStore",
@@ -456,4 +931,6 @@ __all__ = [
     "ShardState",
     "get_checkpoint_store",
     "load_governance_settings",
+    "read_binary_checkpoint",
+    "write_binary_checkpoint",
 ]
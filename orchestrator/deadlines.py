@@ -0,0 +1,170 @@
+"""Heap-based deadline scheduler shared by the runner and agent registry."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from prometheus_client import Gauge, Histogram
+
+_LOGGER = logging.getLogger(__name__)
+
+_PENDING_DEADLINES = Gauge(
+    "orchestrator_deadlines_pending",
+    "Deadlines registered and not yet fired or cancelled.",
+    ["scheduler"],
+)
+_CALLBACK_LAG = Histogram(
+    "orchestrator_deadline_callback_lag_seconds",
+    "Delay between a deadline expiring and its callback starting.",
+    ["scheduler"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+DeadlineCallback = Callable[[], None]
+
+
+@dataclass
+class _Deadline:
+    due: float
+    sequence: int
+    callback: DeadlineCallback
+
+
+class DeadlineScheduler:
+    """Fire keyed callbacks when their deadline passes.
+
+    Each key holds at most one deadline: :meth:`schedule` on an existing key
+    replaces it, which is how heartbeats and step starts refresh a timeout.
+    Deadlines live in a min-heap with lazy invalidation, so scheduling,
+    refreshing and firing cost ``O(log n)`` and nothing ever scans every key.
+    Callbacks run on the scheduler thread and must be short; anything slow
+    should be handed to a worker.
+    """
+
+    def __init__(self, name: str = "orchestrator-deadlines") -> None:
+        self._name = name
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._entries: Dict[Hashable, _Deadline] = {}
+        self._counter = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._shutdown = False
+        self._fired = 0
+        self._max_lag = 0.0
+        self._lag_metric = _CALLBACK_LAG.labels(name)
+        _PENDING_DEADLINES.labels(name).set_function(self.pending)
+
+    def schedule(self, key: Hashable, delay: float, callback: DeadlineCallback) -> None:
+        """Run ``callback`` once ``delay`` seconds from now unless refreshed or cancelled."""
+
+        due = time.monotonic() + max(0.0, delay)
+        with self._cond:
+            if self._shutdown:
+                return
+            sequence = next(self._counter)
+            self._entries[key] = _Deadline(due=due, sequence=sequence, callback=callback)
+            heapq.heappush(self._heap, (due, sequence, key))
+            self._maybe_compact()
+            self._ensure_thread()
+            if self._heap[0][1] == sequence:
+                self._cond.notify()
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._cond:
+            return self._entries.pop(key, None) is not None
+
+    def pending(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "pending": float(len(self._entries)),
+                "heap_size": float(len(self._heap)),
+                "fired": float(self._fired),
+                "max_lag_seconds": self._max_lag,
+            }
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        with self._cond:
+            self._shutdown = True
+            self._entries.clear()
+            self._heap.clear()
+            self._cond.notify_all()
+            thread = self._thread
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _maybe_compact(self) -> None:
+        # Refreshes leave superseded heap rows behind; rebuild once they
+        # dominate so memory tracks live deadlines rather than refresh volume.
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._entries):
+            self._heap = [
+                (entry.due, entry.sequence, key) for key, entry in self._entries.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def _next_due(self) -> Optional[Tuple[Hashable, _Deadline, float]]:
+        """Pop and return the first live expired deadline, if any."""
+
+        while self._heap:
+            due, sequence, key = self._heap[0]
+            entry = self._entries.get(key)
+            if entry is None or entry.sequence != sequence:
+                heapq.heappop(self._heap)
+                continue
+            now = time.monotonic()
+            if due > now:
+                return None
+            heapq.heappop(self._heap)
+            del self._entries[key]
+            return key, entry, now - due
+        return None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._shutdown:
+                        return
+                    expired = self._next_due()
+                    if expired is not None:
+                        break
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                key, entry, lag = expired
+                self._fired += 1
+                self._max_lag = max(self._max_lag, lag)
+            self._lag_metric.observe(lag)
+            try:
+                entry.callback()
+            except Exception:  # pragma: no cover - callbacks own their failures
+                _LOGGER.exception("Deadline callback for %r failed", key)
+
+
+_SCHEDULER: Optional[DeadlineScheduler] = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_deadline_scheduler() -> DeadlineScheduler:
+    """Return the process-wide scheduler used by the orchestrator."""
+
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = DeadlineScheduler()
+        return _SCHEDULER
+
+
+__all__ = ["DeadlineCallback", "DeadlineScheduler", "get_deadline_scheduler"]
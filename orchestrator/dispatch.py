@@ -0,0 +1,304 @@
+"""Bounded worker pool and priority run queue for the orchestration runner."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .deadlines import DeadlineScheduler, get_deadline_scheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+_DEFAULT_TENANT = "__default__"
+
+
+class RunQueueFull(RuntimeError):
+    """Raised when the run queue cannot accept more work."""
+
+
+class RunLease:
+    """Exclusive, expiring claim on a run held by the worker executing it.
+
+    Workers renew the lease at every step boundary and, while a step runs,
+    from a :meth:`keepalive` heartbeat.  If renewal fails (the holder was
+    starved past the lease TTL) the run may be handed to another worker; the
+    original holder sees ``lost`` set and must stop touching the run.
+    """
+
+    def __init__(self, dispatcher: "RunDispatcher", run_id: str, token: str) -> None:
+        self._dispatcher = dispatcher
+        self.run_id = run_id
+        self.token = token
+
+    def renew(self) -> bool:
+        return self._dispatcher._renew_lease(self.run_id, self.token)
+
+    def release(self) -> None:
+        self._dispatcher._release_lease(self.run_id, self.token)
+
+    @property
+    def held(self) -> bool:
+        return self._dispatcher._holds_lease(self.run_id, self.token)
+
+    @property
+    def ttl(self) -> float:
+        return self._dispatcher._lease_ttl
+
+    @contextmanager
+    def keepalive(
+        self,
+        interval: float | None = None,
+        *,
+        scheduler: DeadlineScheduler | None = None,
+    ) -> Iterator[threading.Event]:
+        """Renew the lease every ``interval`` seconds (TTL/3 by default) until exit.
+
+        Yields an event that is set once a renewal fails; heartbeats stop then,
+        since another worker may already own the run.
+        """
+
+        scheduler = scheduler or get_deadline_scheduler()
+        period = interval if interval is not None else self.ttl / 3
+        key = ("orchestrator:lease-heartbeat", self.run_id, self.token)
+        lost = threading.Event()
+        stopped = threading.Event()
+
+        def _beat() -> None:
+            if stopped.is_set():
+                return
+            if self.renew():
+                scheduler.schedule(key, period, _beat)
+            else:
+                lost.set()
+
+        scheduler.schedule(key, period, _beat)
+        try:
+            yield lost
+        finally:
+            stopped.set()
+            scheduler.cancel(key)
+
+
+RunTarget = Callable[[RunLease], None]
+
+
+@dataclass(order=True)
+class _QueuedRun:
+    sort_key: tuple[int, int]
+    run_id: str = field(compare=False)
+    tenant: str = field(compare=False)
+    target: RunTarget = field(compare=False)
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+
+
+@dataclass
+class _LeaseRecord:
+    token: str
+    expires_at: float
+
+
+class RunDispatcher:
+    """Execute runs on a fixed pool of threads fed by a priority queue.
+
+    Higher ``priority`` values are dequeued first, FIFO within a priority.
+    ``tenant_limit`` caps how many runs of one tenant execute concurrently
+    (``0`` disables the cap); queued runs of a saturated tenant are skipped
+    until one of its runs finishes.  A run id is only ever queued once and
+    is never dispatched while another worker holds an unexpired lease on it,
+    so duplicate resume requests are no-ops.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 8,
+        max_queue: int = 1024,
+        tenant_limit: int = 0,
+        lease_ttl: float = 60.0,
+    ) -> None:
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        if max_queue <= 0:
+            raise ValueError("max_queue must be positive")
+        if lease_ttl <= 0:
+            raise ValueError("lease_ttl must be positive")
+        self._workers = workers
+        self._max_queue = max_queue
+        self._tenant_limit = max(0, tenant_limit)
+        self._lease_ttl = lease_ttl
+        self._cond = threading.Condition()
+        self._heap: List[_QueuedRun] = []
+        self._queued: Dict[str, _QueuedRun] = {}
+        self._leases: Dict[str, _LeaseRecord] = {}
+        self._running: Dict[str, int] = {}
+        self._threads: List[threading.Thread] = []
+        self._counter = itertools.count()
+        self._shutdown = False
+
+    # ------------------------------------------------------------------
+    # Submission
+    def submit(
+        self,
+        run_id: str,
+        target: RunTarget,
+        *,
+        tenant: Optional[str] = None,
+        priority: int = 0,
+    ) -> bool:
+        """Queue ``target`` for execution.
+
+        Returns ``False`` without queueing when the run is already queued or
+        leased by a live worker.  Raises :class:`RunQueueFull` when the queue
+        is at capacity.
+        """
+
+        with self._cond:
+            if self._shutdown:
+                raise RunQueueFull("dispatcher is shut down")
+            if run_id in self._queued or self._lease_active(run_id):
+                return False
+            if len(self._queued) >= self._max_queue:
+                raise RunQueueFull(f"run queue is full ({self._max_queue} pending)")
+            entry = _QueuedRun(
+                sort_key=(-int(priority), next(self._counter)),
+                run_id=run_id,
+                tenant=tenant or _DEFAULT_TENANT,
+                target=target,
+            )
+            heapq.heappush(self._heap, entry)
+            self._queued[run_id] = entry
+            self._ensure_workers()
+            self._cond.notify()
+        return True
+
+    def is_active(self, run_id: str) -> bool:
+        """Return True when the run is queued or executing under a live lease."""
+
+        with self._cond:
+            return run_id in self._queued or self._lease_active(run_id)
+
+    def stats(self) -> Dict[str, object]:
+        with self._cond:
+            return {
+                "workers": len(self._threads),
+                "queued": len(self._queued),
+                "running": sum(self._running.values()),
+                "max_queue": self._max_queue,
+                "tenants": dict(self._running),
+            }
+
+    def shutdown(self, *, wait: bool = True, timeout: float | None = None) -> None:
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Leases
+    def acquire_lease(self, run_id: str) -> Optional[RunLease]:
+        """Claim ``run_id`` for the caller, or return ``None`` if it is held."""
+
+        with self._cond:
+            if self._lease_active(run_id):
+                return None
+            token = uuid.uuid4().hex
+            self._leases[run_id] = _LeaseRecord(token=token, expires_at=time.monotonic() + self._lease_ttl)
+        return RunLease(self, run_id, token)
+
+    def _lease_active(self, run_id: str) -> bool:
+        record = self._leases.get(run_id)
+        return record is not None and record.expires_at > time.monotonic()
+
+    def _holds_lease(self, run_id: str, token: str) -> bool:
+        with self._cond:
+            record = self._leases.get(run_id)
+            return record is not None and record.token == token and record.expires_at > time.monotonic()
+
+    def _renew_lease(self, run_id: str, token: str) -> bool:
+        with self._cond:
+            record = self._leases.get(run_id)
+            if record is None or record.token != token:
+                return False
+            now = time.monotonic()
+            if record.expires_at <= now:
+                return False
+            record.expires_at = now + self._lease_ttl
+            return True
+
+    def _release_lease(self, run_id: str, token: str) -> None:
+        with self._cond:
+            record = self._leases.get(run_id)
+            if record is not None and record.token == token:
+                del self._leases[run_id]
+                self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Worker loop
+    def _ensure_workers(self) -> None:
+        busy = sum(self._running.values())
+        if len(self._threads) >= self._workers or busy + len(self._queued) <= len(self._threads):
+            return
+        index = len(self._threads)
+        thread = threading.Thread(target=self._work, name=f"orchestrator-run-worker-{index}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _next_runnable(self) -> Optional[_QueuedRun]:
+        skipped: List[_QueuedRun] = []
+        chosen: Optional[_QueuedRun] = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if self._queued.get(entry.run_id) is not entry:
+                continue
+            if self._tenant_limit and self._running.get(entry.tenant, 0) >= self._tenant_limit:
+                skipped.append(entry)
+                continue
+            chosen = entry
+            break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return chosen
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                entry = self._next_runnable()
+                while entry is None:
+                    if self._shutdown:
+                        return
+                    self._cond.wait()
+                    entry = self._next_runnable()
+                del self._queued[entry.run_id]
+                self._running[entry.tenant] = self._running.get(entry.tenant, 0) + 1
+            try:
+                lease = self.acquire_lease(entry.run_id)
+                if lease is None:
+                    _LOGGER.debug("Run %s is leased by another worker; skipping", entry.run_id)
+                    continue
+                try:
+                    entry.target(lease)
+                except Exception:  # pragma: no cover - targets handle their own failures
+                    _LOGGER.exception("Run %s raised in worker pool", entry.run_id)
+                finally:
+                    lease.release()
+            finally:
+                with self._cond:
+                    remaining = self._running.get(entry.tenant, 0) - 1
+                    if remaining > 0:
+                        self._running[entry.tenant] = remaining
+                    else:
+                        self._running.pop(entry.tenant, None)
+                    self._cond.notify_all()
+
+
+__all__ = ["RunDispatcher", "RunLease", "RunQueueFull"]
@@ -0,0 +1,210 @@
+"""Application-scoped async HTTP client shared by outbound integrations.
+
+Pinning services, ERC-4337 bundlers and the paymaster supervisor used to
+open a fresh :class:`httpx.AsyncClient` per call, paying a TCP and TLS
+handshake every time.  :class:`HttpClientPool` keeps one keep-alive client
+per event loop (HTTP/2 when the ``h2`` package is installed) and bounds the
+number of in-flight requests per host.  :class:`ProviderHealth` tracks a
+latency EWMA and a circuit breaker for callers that fail over between
+redundant providers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+_DEFAULT_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+_DEFAULT_MAX_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+_DEFAULT_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+_DEFAULT_TIMEOUT = float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+
+
+def _http2_default() -> bool:
+    flag = os.getenv("HTTP_ENABLE_HTTP2")
+    if flag is not None:
+        return flag != "0"
+    return importlib.util.find_spec("h2") is not None
+
+
+class _LoopState:
+    __slots__ = ("client", "host_slots")
+
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self.client = client
+        self.host_slots: Dict[str, asyncio.Semaphore] = {}
+
+
+class HttpClientPool:
+    """Keep-alive HTTP client with per-host concurrency limits.
+
+    httpx clients are bound to the event loop they first run on, so one
+    client is kept per loop: FastAPI workers share a single client while
+    tests driving ``asyncio.run`` repeatedly still get a working one.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = _DEFAULT_MAX_CONNECTIONS,
+        max_connections_per_host: int = _DEFAULT_MAX_PER_HOST,
+        keepalive_expiry: float = _DEFAULT_KEEPALIVE_EXPIRY,
+        timeout: float = _DEFAULT_TIMEOUT,
+        http2: Optional[bool] = None,
+    ) -> None:
+        self._max_connections = max(1, max_connections)
+        self._max_per_host = max(1, max_connections_per_host)
+        self._keepalive_expiry = keepalive_expiry
+        self._timeout = timeout
+        self._http2 = _http2_default() if http2 is None else http2
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def client(self) -> httpx.AsyncClient:
+        """Return the client bound to the running event loop."""
+
+        return self._state().client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request, waiting for a free slot on ``url``'s host first."""
+
+        state = self._state()
+        host = urlsplit(url).netloc.lower()
+        slots = state.host_slots.get(host)
+        if slots is None:
+            slots = state.host_slots.setdefault(host, asyncio.Semaphore(self._max_per_host))
+        async with slots:
+            return await state.client.request(method, url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close the client bound to the running loop."""
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._states.pop(loop, None)
+        if state is not None:
+            await state.client.aclose()
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._states.get(loop)
+            if state is None or state.client.is_closed:
+                state = _LoopState(self._create_client())
+                self._states[loop] = state
+            return state
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=self._timeout,
+            http2=self._http2,
+            limits=httpx.Limits(
+                max_connections=self._max_connections,
+                max_keepalive_connections=self._max_connections,
+                keepalive_expiry=self._keepalive_expiry,
+            ),
+        )
+
+
+class ProviderHealth:
+    """Latency EWMA and consecutive-failure circuit breaker for one provider.
+
+    After ``failure_threshold`` consecutive failures the breaker opens for
+    ``reset_timeout`` seconds.  Once that elapses :meth:`allow` lets a single
+    trial request through; its outcome closes or re-opens the breaker.
+    Callers that only rank or filter providers use :meth:`available`, which
+    does not claim the trial.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        alpha: float = 0.3,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        self.name = name
+        self._alpha = alpha
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_timeout = reset_timeout
+        self._latency: Optional[float] = None
+        self._failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Smoothed latency of successful requests in seconds, if any."""
+
+        return self._latency
+
+    @property
+    def is_open(self) -> bool:
+        return self._failures >= self._failure_threshold
+
+    def available(self) -> bool:
+        """Return whether :meth:`allow` would admit a request now, without changing state."""
+
+        with self._lock:
+            return self._failures < self._failure_threshold or time.monotonic() >= self._open_until
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent to this provider now."""
+
+        with self._lock:
+            if self._failures < self._failure_threshold:
+                return True
+            now = time.monotonic()
+            if now < self._open_until:
+                return False
+            # Half-open: admit this caller and hold everyone else back until
+            # the trial reports back or another reset window passes.
+            self._open_until = now + self._reset_timeout
+            return True
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+            if self._latency is None:
+                self._latency = latency
+            else:
+                self._latency += self._alpha * (latency - self._latency)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self._failure_threshold:
+                self._open_until = time.monotonic() + self._reset_timeout
+
+
+_POOL: Optional[HttpClientPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_http_pool() -> HttpClientPool:
+    """Return the process-wide HTTP client pool."""
+
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = HttpClientPool()
+        return _POOL
+
+
+__all__ = ["HttpClientPool", "ProviderHealth", "get_http_pool"]
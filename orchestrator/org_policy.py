@@ -0,0 +1,427 @@
+"""Compiled organisation policies shared by the onebox router and simulator.
+
+Policy documents map an organisation key to caps (``maxBudgetWei``,
+``maxDurationDays``) and an optional tool allowlist (``allowedTools`` or the
+legacy ``toolWhitelist``).  A :class:`PolicyWatcher` parses a document once
+into an immutable compiled snapshot and swaps the reference atomically when
+the source changes, so readers never take a lock: they only compare a
+monotonic deadline before returning the current snapshot.  Sources are either
+the JSON file on disk (reloaded when its mtime/size changes) or a database
+row shared by every API replica.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Generic, Iterable, Iterator, Optional, Tuple, TypeVar
+
+from backend.database import Database, Migration
+
+try:  # POSIX advisory locks serialise writers across processes.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+_LOGGER = logging.getLogger(__name__)
+
+PolicyDocument = Dict[str, Any]
+T = TypeVar("T")
+
+_ALLOW_ALL_TOKENS = frozenset({"*", "all", "any"})
+_TOOL_SEPARATORS = re.compile(r"[\s,;]+")
+_TRIE_END = ""
+_MIGRATIONS_TABLE = "org_policy_migrations"
+
+
+class PolicySourceError(RuntimeError):
+    """Raised when a policy document cannot be read or is malformed."""
+
+
+def normalize_tool_patterns(raw: Any) -> Optional[Tuple[str, ...]]:
+    """Return trimmed allowlist entries from a list or a ``,``/``;``/space separated string."""
+
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        entries: Iterable[Any] = _TOOL_SEPARATORS.split(raw)
+    elif isinstance(raw, list):
+        entries = raw
+    else:
+        return ()
+    return tuple(entry.strip() for entry in entries if isinstance(entry, str) and entry.strip())
+
+
+@dataclass(frozen=True)
+class ToolAllowlist:
+    """Case-insensitive tool matcher: exact names plus a trie of ``prefix*`` patterns."""
+
+    allow_all: bool = False
+    exact: FrozenSet[str] = frozenset()
+    prefixes: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def compile(cls, patterns: Iterable[str]) -> "ToolAllowlist":
+        exact = set()
+        root: Dict[str, Any] = {}
+        for pattern in patterns:
+            lowered = pattern.strip().lower()
+            if not lowered:
+                continue
+            if lowered in _ALLOW_ALL_TOKENS:
+                return cls(allow_all=True)
+            if not lowered.endswith("*"):
+                exact.add(lowered)
+                continue
+            node = root
+            for char in lowered[:-1]:
+                node = node.setdefault(char, {})
+            node[_TRIE_END] = True
+        return cls(exact=frozenset(exact), prefixes=root)
+
+    @property
+    def has_patterns(self) -> bool:
+        return self.allow_all or bool(self.exact) or bool(self.prefixes)
+
+    def allows(self, tool: str) -> bool:
+        target = tool.strip().lower()
+        if not target or self.allow_all or target in self.exact:
+            return True
+        node = self.prefixes
+        for char in target:
+            if _TRIE_END in node:
+                return True
+            node = node.get(char)  # type: ignore[assignment]
+            if node is None:
+                return False
+        return _TRIE_END in node
+
+
+@dataclass(frozen=True)
+class OrgPolicyEntry:
+    """One organisation's caps as stored in the policy document; ``None`` means unset.
+
+    ``cleared`` names the cap fields stored as an explicit ``null``, which
+    remove the cap instead of falling back to a default.
+    """
+
+    max_budget_wei: Optional[int] = None
+    max_duration_days: Optional[int] = None
+    allowed_tools: Optional[Tuple[str, ...]] = None
+    updated_at: Optional[str] = None
+    cleared: Tuple[str, ...] = ()
+
+
+def _parse_int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    return None
+
+
+_CAP_FIELDS = ("maxBudgetWei", "maxDurationDays")
+
+
+def parse_policy_document(document: PolicyDocument) -> Dict[str, OrgPolicyEntry]:
+    """Parse a policy document into :class:`OrgPolicyEntry` values; non-object entries are skipped."""
+
+    entries: Dict[str, OrgPolicyEntry] = {}
+    for key, value in document.items():
+        if not isinstance(value, dict):
+            continue
+        tools = value.get("allowedTools")
+        if tools is None:
+            tools = value.get("toolWhitelist")
+        duration = value.get("maxDurationDays")
+        updated_at = value.get("updatedAt")
+        entries[str(key)] = OrgPolicyEntry(
+            max_budget_wei=_parse_int(value.get("maxBudgetWei")),
+            max_duration_days=_parse_int(duration) if isinstance(duration, (int, str)) else None,
+            allowed_tools=normalize_tool_patterns(tools),
+            updated_at=updated_at if isinstance(updated_at, str) else None,
+            cleared=tuple(name for name in _CAP_FIELDS if name in value and value[name] is None),
+        )
+    return entries
+
+
+def _decode(raw: str) -> PolicyDocument:
+    if not raw.strip():
+        return {}
+    try:
+        document = json.loads(raw)
+    except json.JSONDecodeError as exc:
+        raise PolicySourceError(f"Invalid policy JSON: {exc}") from exc
+    if not isinstance(document, dict):
+        raise PolicySourceError(f"Policy document must be an object, found {type(document).__name__}")
+    return document
+
+
+class PolicySource:
+    """Interface for policy document storage.
+
+    ``revision`` must be cheap: watchers call it on every reload check and
+    only re-read the document when the value changes.
+    """
+
+    def revision(self) -> Optional[str]:
+        raise NotImplementedError
+
+    def read(self) -> Tuple[Optional[str], PolicyDocument]:
+        raise NotImplementedError
+
+    def transform(self, apply: Callable[[PolicyDocument], PolicyDocument]) -> Tuple[Optional[str], PolicyDocument]:
+        """Atomically replace the stored document with ``apply(current)``."""
+
+        raise NotImplementedError
+
+
+class FilePolicySource(PolicySource):
+    """JSON policy file, rewritten via a temporary file and ``os.replace``.
+
+    Writers hold an advisory lock on ``<path>.lock`` so read-modify-write
+    cycles from several processes do not lose updates.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def revision(self) -> Optional[str]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}:{stat.st_ino}"
+
+    def read(self) -> Tuple[Optional[str], PolicyDocument]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                stat = os.fstat(handle.fileno())
+                raw = handle.read()
+        except FileNotFoundError:
+            return None, {}
+        except OSError as exc:
+            raise PolicySourceError(f"Cannot read {self.path}: {exc}") from exc
+        return f"{stat.st_mtime_ns}:{stat.st_size}:{stat.st_ino}", _decode(raw)
+
+    def transform(self, apply: Callable[[PolicyDocument], PolicyDocument]) -> Tuple[Optional[str], PolicyDocument]:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock, self._file_lock():
+            _, current = self.read()
+            document = apply(current)
+            fd, tmp_path = tempfile.mkstemp(prefix=".org-policies-", suffix=".json", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump(document, handle, indent=2)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            return self.revision(), document
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:  # pragma: no cover - Windows
+            yield
+            return
+        with open(self.path + ".lock", "a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class _OrgPolicyMigration(Migration):
+    version = "0001_org_policy_documents"
+
+    def upgrade(self, cursor, driver: str) -> None:  # type: ignore[override]
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS org_policy_documents (
+                name TEXT PRIMARY KEY,
+                document TEXT NOT NULL,
+                revision BIGINT NOT NULL
+            )
+            """
+        )
+
+
+class DatabasePolicySource(PolicySource):
+    """Policy document stored as one row of a SQLite or PostgreSQL table.
+
+    Every update bumps ``revision`` so replicas polling the row pick it up on
+    their next reload check.
+    """
+
+    def __init__(self, database: Database, name: str = "default") -> None:
+        self._db = database
+        self._name = name
+        self._db.run_migrations([_OrgPolicyMigration()], table=_MIGRATIONS_TABLE)
+        p = self._db.placeholder()
+        lock = " FOR UPDATE" if self._db.driver == "postgres" else ""
+        self._select_revision = f"SELECT revision FROM org_policy_documents WHERE name = {p}"
+        self._select = f"SELECT revision, document FROM org_policy_documents WHERE name = {p}{lock}"
+        self._upsert = (
+            f"INSERT INTO org_policy_documents (name, document, revision) VALUES ({p}, {p}, {p}) "
+            "ON CONFLICT (name) DO UPDATE SET document = excluded.document, revision = excluded.revision"
+        )
+
+    def revision(self) -> Optional[str]:
+        with self._db.transaction() as cur:
+            cur.execute(self._select_revision, (self._name,))
+            row = cur.fetchone()
+        return None if row is None else str(row[0])
+
+    def read(self) -> Tuple[Optional[str], PolicyDocument]:
+        with self._db.transaction() as cur:
+            return self._read(cur)
+
+    def transform(self, apply: Callable[[PolicyDocument], PolicyDocument]) -> Tuple[Optional[str], PolicyDocument]:
+        with self._db.transaction() as cur:
+            revision, current = self._read(cur)
+            document = apply(current)
+            next_revision = int(revision or 0) + 1
+            cur.execute(self._upsert, (self._name, json.dumps(document, separators=(",", ":")), next_revision))
+        return str(next_revision), document
+
+    def _read(self, cur: Any) -> Tuple[Optional[str], PolicyDocument]:
+        cur.execute(self._select, (self._name,))
+        row = cur.fetchone()
+        if row is None:
+            return None, {}
+        return str(row[0]), _decode(row[1])
+
+
+def build_policy_source(path: str, *, url: Optional[str] = None) -> PolicySource:
+    """Return a shared database source when ``url`` is set, else the JSON file at ``path``."""
+
+    if url:
+        return DatabasePolicySource(Database(url))
+    return FilePolicySource(path)
+
+
+@dataclass(frozen=True)
+class _Snapshot(Generic[T]):
+    revision: Optional[str]
+    document: PolicyDocument
+    compiled: T
+
+
+class PolicyWatcher(Generic[T]):
+    """Serve a compiled policy snapshot and recompile it when the source changes.
+
+    :meth:`current` is lock-free: snapshots are immutable and replaced by a
+    single reference assignment, so concurrent readers see either the old or
+    the new snapshot.  At most one thread polls the source per
+    ``reload_interval`` seconds; the others keep serving the previous
+    snapshot meanwhile.  A document that fails to load is logged and skipped
+    until its revision changes again.
+    """
+
+    def __init__(
+        self,
+        source: PolicySource,
+        compile: Callable[[PolicyDocument], T],
+        *,
+        reload_interval: float = 1.0,
+        strict: bool = True,
+    ) -> None:
+        self.source = source
+        self._compile = compile
+        self._interval = max(0.0, reload_interval)
+        self._refresh_lock = threading.Lock()
+        self._failed_revision: Optional[str] = None
+        try:
+            revision, document = source.read()
+        except PolicySourceError:
+            if strict:
+                raise
+            _LOGGER.warning("Org policy source is unreadable; starting with an empty policy set", exc_info=True)
+            revision, document = source.revision(), {}
+            self._failed_revision = revision
+        self._snapshot: _Snapshot[T] = _Snapshot(revision, document, compile(document))
+        self._next_check = time.monotonic() + self._interval
+
+    def current(self) -> T:
+        if time.monotonic() >= self._next_check:
+            self.refresh()
+        return self._snapshot.compiled
+
+    @property
+    def document(self) -> PolicyDocument:
+        return self._snapshot.document
+
+    def refresh(self, *, force: bool = False) -> bool:
+        """Reload the snapshot if the source revision moved; return whether it changed."""
+
+        if not self._refresh_lock.acquire(blocking=force):
+            return False
+        try:
+            self._next_check = time.monotonic() + self._interval
+            try:
+                revision = self.source.revision()
+                if not force and revision in (self._snapshot.revision, self._failed_revision):
+                    return False
+                revision, document = self.source.read()
+                compiled = self._compile(document)
+            except Exception:
+                _LOGGER.warning("Keeping previous org policies; reload failed", exc_info=True)
+                self._failed_revision = self.source.revision()
+                return False
+            self._snapshot = _Snapshot(revision, document, compiled)
+            self._failed_revision = None
+            return True
+        finally:
+            self._refresh_lock.release()
+
+    def mutate(self, apply: Callable[[PolicyDocument], PolicyDocument]) -> T:
+        """Persist ``apply(document)`` and publish its compiled snapshot.
+
+        ``apply`` receives a copy of the latest stored document.  If the
+        source cannot be written the new snapshot is still published locally
+        before the error propagates.
+        """
+
+        with self._refresh_lock:
+            try:
+                revision, document = self.source.transform(lambda current: apply(dict(current)))
+            except Exception:
+                document = apply(dict(self._snapshot.document))
+                self._snapshot = _Snapshot(self._snapshot.revision, document, self._compile(document))
+                raise
+            self._snapshot = _Snapshot(revision, document, self._compile(document))
+            self._next_check = time.monotonic() + self._interval
+            return self._snapshot.compiled
+
+
+__all__ = [
+    "DatabasePolicySource",
+    "FilePolicySource",
+    "OrgPolicyEntry",
+    "PolicyDocument",
+    "PolicySource",
+    "PolicySourceError",
+    "PolicyWatcher",
+    "ToolAllowlist",
+    "build_policy_source",
+    "normalize_tool_patterns",
+    "parse_policy_document",
+]
@@ -0,0 +1,333 @@
+"""Bounded, optionally shared storage for onebox plan metadata.
+
+Plan hashes issued by ``/onebox/plan`` are bound to the intent snapshot they
+were computed from so ``/onebox/execute`` can verify that only the missing
+fields changed.  Records are small JSON documents keyed by the normalised
+plan hash; every backend expires them after a TTL so memory and disk stay
+bounded under sustained traffic.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from backend.database import Database, Migration
+
+_LOGGER = logging.getLogger(__name__)
+
+PlanRecord = Dict[str, Any]
+EventHook = Callable[[str], None]
+
+_MIGRATIONS_TABLE = "onebox_plan_store_migrations"
+
+
+class PlanStoreError(RuntimeError):
+    """Raised when a plan metadata backend cannot be initialised."""
+
+
+def _noop(_event: str) -> None:
+    return None
+
+
+class PlanMetadataStore:
+    """Interface shared by the plan metadata backends.
+
+    ``on_event`` is called with ``"hit"``, ``"miss"``, ``"eviction"`` or
+    ``"expired"`` so callers can export the counts as metrics.
+    """
+
+    def __init__(self, *, on_event: Optional[EventHook] = None) -> None:
+        self._on_event = on_event or _noop
+
+    def get(self, plan_hash: str) -> Optional[PlanRecord]:
+        raise NotImplementedError
+
+    def put(self, plan_hash: str, record: PlanRecord) -> None:
+        raise NotImplementedError
+
+    def update(self, plan_hash: str, fields: PlanRecord) -> PlanRecord:
+        """Merge ``fields`` into the stored record and return the result."""
+
+        merged = dict(self.get(plan_hash) or {})
+        merged.update(fields)
+        self.put(plan_hash, merged)
+        return merged
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+@dataclass
+class _Entry:
+    record: PlanRecord
+    expires_at: float
+
+
+class MemoryPlanMetadataStore(PlanMetadataStore):
+    """Thread-safe LRU of plan records that also expire after ``ttl`` seconds."""
+
+    def __init__(self, max_entries: int = 100_000, ttl: float = 7 * 86400.0, *, on_event: Optional[EventHook] = None) -> None:
+        super().__init__(on_event=on_event)
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, plan_hash: str) -> Optional[PlanRecord]:
+        with self._lock:
+            entry = self._lookup(plan_hash)
+        self._on_event("miss" if entry is None else "hit")
+        return None if entry is None else dict(entry.record)
+
+    def put(self, plan_hash: str, record: PlanRecord) -> None:
+        with self._lock:
+            self._insert(plan_hash, dict(record))
+
+    def update(self, plan_hash: str, fields: PlanRecord) -> PlanRecord:
+        with self._lock:
+            entry = self._lookup(plan_hash)
+            merged = dict(entry.record) if entry is not None else {}
+            merged.update(fields)
+            self._insert(plan_hash, merged)
+        return dict(merged)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, plan_hash: str) -> Optional[_Entry]:
+        entry = self._entries.get(plan_hash)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[plan_hash]
+            self._on_event("expired")
+            return None
+        self._entries.move_to_end(plan_hash)
+        return entry
+
+    def _insert(self, plan_hash: str, record: PlanRecord) -> None:
+        self._entries[plan_hash] = _Entry(record, time.monotonic() + self._ttl)
+        self._entries.move_to_end(plan_hash)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._on_event("eviction")
+
+
+class _PlanMetadataMigration(Migration):
+    version = "0001_plan_metadata"
+
+    def upgrade(self, cursor, driver: str) -> None:  # type: ignore[override]
+        timestamp = "DOUBLE PRECISION" if driver == "postgres" else "REAL"
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS onebox_plan_metadata (
+                plan_hash TEXT PRIMARY KEY,
+                record TEXT NOT NULL,
+                expires_at {timestamp} NOT NULL
+            )
+            """
+        )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_onebox_plan_expires ON onebox_plan_metadata(expires_at)")
+
+
+class DatabasePlanMetadataStore(PlanMetadataStore):
+    """Plan records in a SQLite or PostgreSQL table shared by API replicas.
+
+    Expired rows are ignored on read and purged every ``purge_every`` writes.
+    """
+
+    def __init__(
+        self,
+        database: Database,
+        ttl: float = 7 * 86400.0,
+        *,
+        purge_every: int = 1000,
+        on_event: Optional[EventHook] = None,
+    ) -> None:
+        super().__init__(on_event=on_event)
+        self._db = database
+        self._ttl = ttl
+        self._purge_every = max(1, purge_every)
+        self._writes = 0
+        self._db.run_migrations([_PlanMetadataMigration()], table=_MIGRATIONS_TABLE)
+        p = self._db.placeholder()
+        self._select = f"SELECT record, expires_at FROM onebox_plan_metadata WHERE plan_hash = {p}"
+        self._upsert = (
+            f"INSERT INTO onebox_plan_metadata (plan_hash, record, expires_at) VALUES ({p}, {p}, {p}) "
+            "ON CONFLICT (plan_hash) DO UPDATE SET record = excluded.record, expires_at = excluded.expires_at"
+        )
+        self._purge = f"DELETE FROM onebox_plan_metadata WHERE expires_at <= {p}"
+
+    def get(self, plan_hash: str) -> Optional[PlanRecord]:
+        with self._db.transaction() as cur:
+            record = self._read(cur, plan_hash)
+        self._on_event("miss" if record is None else "hit")
+        return record
+
+    def put(self, plan_hash: str, record: PlanRecord) -> None:
+        with self._db.transaction() as cur:
+            self._write(cur, plan_hash, record)
+
+    def update(self, plan_hash: str, fields: PlanRecord) -> PlanRecord:
+        with self._db.transaction() as cur:
+            merged = self._read(cur, plan_hash) or {}
+            merged.update(fields)
+            self._write(cur, plan_hash, merged)
+        return merged
+
+    def clear(self) -> None:
+        with self._db.transaction() as cur:
+            cur.execute("DELETE FROM onebox_plan_metadata")
+
+    def __len__(self) -> int:
+        with self._db.transaction() as cur:
+            cur.execute(f"SELECT COUNT(*) FROM onebox_plan_metadata WHERE expires_at > {self._db.placeholder()}", (time.time(),))
+            row = cur.fetchone()
+        return int(row[0]) if row else 0
+
+    def _read(self, cur: Any, plan_hash: str) -> Optional[PlanRecord]:
+        cur.execute(self._select, (plan_hash,))
+        row = cur.fetchone()
+        if row is None:
+            return None
+        if float(row[1]) <= time.time():
+            self._on_event("expired")
+            return None
+        return json.loads(row[0])
+
+    def _write(self, cur: Any, plan_hash: str, record: PlanRecord) -> None:
+        now = time.time()
+        cur.execute(self._upsert, (plan_hash, json.dumps(record, separators=(",", ":")), now + self._ttl))
+        self._writes += 1
+        if self._writes % self._purge_every == 0:
+            cur.execute(self._purge, (now,))
+            purged = max(cur.rowcount or 0, 0)
+            if purged:
+                _LOGGER.debug("Purged %d expired plan metadata rows", purged)
+            for _ in range(purged):
+                self._on_event("expired")
+
+
+class RedisPlanMetadataStore(PlanMetadataStore):
+    """Plan records stored as Redis strings that expire after ``ttl`` seconds."""
+
+    _PREFIX = "onebox:plan:"
+
+    def __init__(self, url: str, ttl: float = 7 * 86400.0, *, on_event: Optional[EventHook] = None) -> None:
+        super().__init__(on_event=on_event)
+        try:
+            import redis  # type: ignore[import-not-found]
+        except Exception as exc:  # pragma: no cover - optional dependency
+            raise PlanStoreError("redis package is required for RedisPlanMetadataStore") from exc
+        self._client = redis.from_url(url)
+        self._ttl = max(1, int(ttl))
+
+    def get(self, plan_hash: str) -> Optional[PlanRecord]:
+        data = self._client.get(self._PREFIX + plan_hash)
+        self._on_event("miss" if not data else "hit")
+        return json.loads(data) if data else None
+
+    def put(self, plan_hash: str, record: PlanRecord) -> None:
+        self._client.set(self._PREFIX + plan_hash, json.dumps(record, separators=(",", ":")), ex=self._ttl)
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(match=self._PREFIX + "*", count=1000))
+        if keys:
+            self._client.delete(*keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(match=self._PREFIX + "*", count=1000))
+
+
+class TieredPlanMetadataStore(PlanMetadataStore):
+    """Serve repeat lookups from a local LRU in front of a shared backend.
+
+    Writes go through to ``shared`` so every replica can bind the plan hash;
+    the local tier's short TTL bounds how stale a replica's view can get.
+    """
+
+    def __init__(self, local: MemoryPlanMetadataStore, shared: PlanMetadataStore) -> None:
+        super().__init__()
+        self.local = local
+        self.shared = shared
+
+    def get(self, plan_hash: str) -> Optional[PlanRecord]:
+        record = self.local.get(plan_hash)
+        if record is not None:
+            return record
+        record = self.shared.get(plan_hash)
+        if record is not None:
+            self.local.put(plan_hash, record)
+        return record
+
+    def put(self, plan_hash: str, record: PlanRecord) -> None:
+        self.shared.put(plan_hash, record)
+        self.local.put(plan_hash, record)
+
+    def update(self, plan_hash: str, fields: PlanRecord) -> PlanRecord:
+        merged = self.shared.update(plan_hash, fields)
+        self.local.put(plan_hash, merged)
+        return merged
+
+    def clear(self) -> None:
+        self.shared.clear()
+        self.local.clear()
+
+    def __len__(self) -> int:
+        return len(self.shared)
+
+
+def build_plan_store(
+    backend: str = "memory",
+    *,
+    url: Optional[str] = None,
+    max_entries: int = 100_000,
+    ttl: float = 7 * 86400.0,
+    local_ttl: float = 60.0,
+    on_event: Optional[EventHook] = None,
+) -> PlanMetadataStore:
+    """Create the store selected by ``backend`` (``memory``, ``sqlite``/``postgres`` or ``redis``).
+
+    Shared backends get a local LRU tier of ``max_entries`` records that are
+    trusted for ``local_ttl`` seconds; ``on_event`` only observes that tier.
+    """
+
+    backend = backend.lower()
+    if backend == "memory":
+        return MemoryPlanMetadataStore(max_entries, ttl, on_event=on_event)
+    shared: PlanMetadataStore
+    if backend == "redis":
+        shared = RedisPlanMetadataStore(url or "redis://localhost:6379/0", ttl)
+    elif backend in {"database", "sqlite", "postgres", "postgresql"}:
+        shared = DatabasePlanMetadataStore(Database(url or "sqlite:///storage/onebox/plans.db"), ttl)
+    else:
+        raise PlanStoreError(f"Unknown plan store backend: {backend}")
+    local = MemoryPlanMetadataStore(max_entries, min(ttl, local_ttl), on_event=on_event)
+    return TieredPlanMetadataStore(local, shared)
+
+
+__all__ = [
+    "DatabasePlanMetadataStore",
+    "MemoryPlanMetadataStore",
+    "PlanMetadataStore",
+    "PlanRecord",
+    "PlanStoreError",
+    "RedisPlanMetadataStore",
+    "TieredPlanMetadataStore",
+    "build_plan_store",
+]
@@ -0,0 +1,399 @@
+"""Relayer transaction pipeline: local nonces, per-block fees, batched receipts."""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+_LOGGER = logging.getLogger(__name__)
+
+ReceiptFetcher = Callable[[Sequence[str]], Dict[str, Optional[Dict[str, Any]]]]
+
+# Node error fragments meaning our local nonce view is behind the chain.
+_NONCE_CONFLICTS = ("nonce too low", "already known", "replacement transaction underpriced", "known transaction")
+
+
+class ReceiptTimeout(TimeoutError):
+    """Raised when a submitted transaction is not mined before the deadline."""
+
+
+def _hex_hash(value: Any) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        text = bytes(value).hex()
+    elif hasattr(value, "hex") and callable(value.hex):
+        text = value.hex()
+    else:
+        text = str(value)
+    return text if text.startswith("0x") else f"0x{text}"
+
+
+class NonceManager:
+    """Hand out account nonces locally instead of asking the node per send.
+
+    The first allocation seeds from the chain's pending transaction count.
+    Nonces that were allocated but never landed are :meth:`release`-d and
+    handed out again before fresh ones, so a failed or dropped send does not
+    leave a gap that stalls every later transaction.
+    """
+
+    def __init__(self, fetch_pending_count: Callable[[], int]) -> None:
+        self._fetch = fetch_pending_count
+        self._lock = threading.Lock()
+        self._next: Optional[int] = None
+        self._gaps: List[int] = []
+
+    def allocate(self) -> int:
+        with self._lock:
+            if self._next is None:
+                self._next = int(self._fetch())
+            if self._gaps:
+                return heapq.heappop(self._gaps)
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    def release(self, nonce: int) -> None:
+        with self._lock:
+            if self._next is None or nonce >= self._next or nonce in self._gaps:
+                return
+            if nonce == self._next - 1:
+                self._next -= 1
+                # Gaps that now sit at the tail are simply unallocated again.
+                while self._next - 1 in self._gaps:
+                    self._gaps.remove(self._next - 1)
+                    self._next -= 1
+                heapq.heapify(self._gaps)
+                return
+            heapq.heappush(self._gaps, nonce)
+
+    def resync(self) -> int:
+        """Adopt the chain's pending count when it has moved past our view."""
+
+        chain_next = int(self._fetch())
+        with self._lock:
+            self._next = max(self._next or 0, chain_next)
+            self._gaps = [gap for gap in self._gaps if gap >= chain_next]
+            heapq.heapify(self._gaps)
+            return self._next
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"next_nonce": -1 if self._next is None else self._next, "nonce_gaps": len(self._gaps)}
+
+
+@dataclass(frozen=True)
+class FeeQuote:
+    block: Optional[int]
+    gas_price: int
+    gas_limit: int
+
+
+class FeeOracle:
+    """Gas price and block gas limit, fetched at most once per block."""
+
+    def __init__(self, w3: Any, *, refresh_interval: float = 1.0) -> None:
+        self._w3 = w3
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._quote: Optional[FeeQuote] = None
+        self._checked_at = 0.0
+
+    def quote(self) -> FeeQuote:
+        with self._lock:
+            now = time.monotonic()
+            cached = self._quote
+            if cached is not None and now - self._checked_at < self._refresh_interval:
+                return cached
+            try:
+                block: Optional[int] = int(self._w3.eth.block_number)
+            except Exception:
+                block = None
+            self._checked_at = now
+            if cached is not None and block is not None and cached.block == block:
+                return cached
+            latest = self._w3.eth.get_block("latest")
+            gas_limit = latest["gasLimit"] if isinstance(latest, dict) else latest.gasLimit
+            self._quote = FeeQuote(block=block, gas_price=int(self._w3.eth.gas_price), gas_limit=int(gas_limit))
+            return self._quote
+
+
+@dataclass
+class _Watch:
+    future: "Future[Dict[str, Any]]"
+    deadline: float
+    nonce: Optional[int]
+
+
+class ReceiptWatcher:
+    """Resolve many pending transaction hashes with one receipt sweep per block.
+
+    When a watch reaches its deadline ``on_timeout`` decides its fate: a true
+    return means the transaction is still in the mempool and the watch is
+    extended, otherwise the future fails with :class:`ReceiptTimeout`.
+    """
+
+    def __init__(
+        self,
+        w3: Any,
+        fetch_receipts: ReceiptFetcher,
+        *,
+        poll_interval: float = 1.0,
+        timeout: float = 180.0,
+        on_timeout: Optional[Callable[[str, Optional[int]], bool]] = None,
+    ) -> None:
+        self._w3 = w3
+        self._fetch = fetch_receipts
+        self._poll_interval = poll_interval
+        self._timeout = timeout
+        self._on_timeout = on_timeout
+        self._cond = threading.Condition()
+        self._pending: Dict[str, _Watch] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._last_block: Optional[int] = None
+        self._dirty = False
+        self._shutdown = False
+        self.sweeps = 0
+
+    def watch(self, tx_hash: str, *, nonce: Optional[int] = None) -> "Future[Dict[str, Any]]":
+        with self._cond:
+            existing = self._pending.get(tx_hash)
+            if existing is not None:
+                return existing.future
+            future: "Future[Dict[str, Any]]" = Future()
+            self._pending[tx_hash] = _Watch(future, time.monotonic() + self._timeout, nonce)
+            # A new hash must be looked up even if no new block arrives.
+            self._dirty = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="relayer-receipts", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return future
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+
+    def _current_block(self) -> Optional[int]:
+        try:
+            return int(self._w3.eth.block_number)
+        except Exception:
+            return None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._shutdown:
+                    self._cond.wait()
+                if self._shutdown:
+                    return
+                hashes = list(self._pending)
+                last_block = self._last_block
+                dirty, self._dirty = self._dirty, False
+            block = self._current_block()
+            if dirty or block is None or block != last_block:
+                self._sweep(hashes, block)
+            self._expire()
+            with self._cond:
+                if self._pending and not self._shutdown:
+                    self._cond.wait(self._poll_interval)
+
+    def _sweep(self, hashes: List[str], block: Optional[int]) -> None:
+        try:
+            receipts = self._fetch(hashes)
+        except Exception as exc:
+            _LOGGER.warning("Receipt sweep for %d transactions failed: %s", len(hashes), exc)
+            with self._cond:
+                self._dirty = True
+            return
+        self.sweeps += 1
+        resolved = []
+        with self._cond:
+            self._last_block = block
+            for tx_hash in hashes:
+                receipt = receipts.get(tx_hash)
+                if receipt is None:
+                    continue
+                entry = self._pending.pop(tx_hash, None)
+                if entry is not None:
+                    resolved.append((entry, receipt))
+        for entry, receipt in resolved:
+            if not entry.future.done():
+                entry.future.set_result(dict(receipt))
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        with self._cond:
+            expired = [(tx_hash, entry) for tx_hash, entry in self._pending.items() if entry.deadline <= now]
+            for tx_hash, _entry in expired:
+                del self._pending[tx_hash]
+        for tx_hash, entry in expired:
+            still_pending = False
+            if self._on_timeout is not None:
+                try:
+                    still_pending = bool(self._on_timeout(tx_hash, entry.nonce))
+                except Exception:  # pragma: no cover - recovery is best effort
+                    _LOGGER.exception("Timeout handler for %s failed", tx_hash)
+            if still_pending:
+                with self._cond:
+                    entry.deadline = time.monotonic() + self._timeout
+                    self._pending.setdefault(tx_hash, entry)
+                continue
+            if not entry.future.done():
+                entry.future.set_exception(ReceiptTimeout(f"Transaction {tx_hash} not mined within {self._timeout:.0f}s"))
+
+
+@dataclass
+class _Submission:
+    tx: Dict[str, Any]
+    future: "Future[str]"
+
+
+class RelayerPipeline:
+    """Sign and broadcast relayer transactions without blocking callers.
+
+    :meth:`submit` enqueues a transaction and resolves with its hash once a
+    single submitter thread has assigned the next local nonce, signed and
+    broadcast it.  :meth:`watch` resolves with the receipt, found by a shared
+    per-block sweep over every pending hash.  Transactions that time out
+    unmined give their nonce back only once the node no longer holds them;
+    one still in the mempool keeps its nonce and stays watched.
+    """
+
+    def __init__(
+        self,
+        w3: Any,
+        account: Any,
+        *,
+        chain_id: Optional[int] = None,
+        fetch_receipts: Optional[ReceiptFetcher] = None,
+        poll_interval: float = 1.0,
+        receipt_timeout: float = 180.0,
+        fee_refresh_interval: float = 1.0,
+    ) -> None:
+        self._w3 = w3
+        self.account = account
+        self.address = account.address
+        self._chain_id = chain_id
+        self.nonces = NonceManager(lambda: w3.eth.get_transaction_count(self.address, "pending"))
+        self.fees = FeeOracle(w3, refresh_interval=fee_refresh_interval)
+        self.receipts = ReceiptWatcher(
+            w3,
+            fetch_receipts or self._fetch_receipts_individually,
+            poll_interval=poll_interval,
+            timeout=receipt_timeout,
+            on_timeout=self._recover_nonce,
+        )
+        self._queue: "queue.Queue[Optional[_Submission]]" = queue.Queue()
+        self._nonce_by_hash: Dict[str, int] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+
+    # ------------------------------------------------------------------
+    def submit(self, tx: Dict[str, Any]) -> "Future[str]":
+        future: "Future[str]" = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._submit_loop, name="relayer-submit", daemon=True)
+                self._thread.start()
+        self._queue.put(_Submission(dict(tx), future))
+        return future
+
+    def watch(self, tx_hash: str) -> "Future[Dict[str, Any]]":
+        return self.receipts.watch(tx_hash, nonce=self._nonce_by_hash.pop(tx_hash, None))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self.nonces.stats(),
+            "queued": self._queue.qsize(),
+            "submitted": self.submitted,
+            "pending_receipts": self.receipts.pending(),
+            "receipt_sweeps": self.receipts.sweeps,
+        }
+
+    def shutdown(self) -> None:
+        self._queue.put(None)
+        self.receipts.shutdown()
+
+    # ------------------------------------------------------------------
+    def _submit_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                tx_hash = self._send(item.tx)
+            except Exception as exc:
+                item.future.set_exception(exc)
+            else:
+                item.future.set_result(tx_hash)
+
+    def _send(self, tx: Dict[str, Any]) -> str:
+        if self._chain_id:
+            tx.setdefault("chainId", self._chain_id)
+        for attempt in range(2):
+            nonce = self.nonces.allocate()
+            tx["nonce"] = nonce
+            try:
+                signed = self.account.sign_transaction(tx)
+                raw = getattr(signed, "rawTransaction", None) or getattr(signed, "raw_transaction")
+                tx_hash = _hex_hash(self._w3.eth.send_raw_transaction(raw))
+            except Exception as exc:
+                message = str(exc).lower()
+                if attempt == 0 and any(fragment in message for fragment in _NONCE_CONFLICTS):
+                    _LOGGER.info("Relayer nonce %s rejected (%s); resyncing from chain", nonce, exc)
+                    self.nonces.resync()
+                    continue
+                self.nonces.release(nonce)
+                raise
+            self.submitted += 1
+            self._nonce_by_hash[tx_hash] = nonce
+            return tx_hash
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    def _recover_nonce(self, tx_hash: str, nonce: Optional[int]) -> bool:
+        """Release the nonce of a dropped tx; return True if it is still pending."""
+
+        if nonce is None:
+            return False
+        # The pending count covers mempool transactions, so it only stays at or
+        # below our nonce when nothing holding that nonce is queued any more.
+        if int(self._w3.eth.get_transaction_count(self.address, "pending")) <= nonce:
+            _LOGGER.warning("Relayer tx %s (nonce %s) was dropped; reusing its nonce", tx_hash, nonce)
+            self.nonces.release(nonce)
+            return False
+        if int(self._w3.eth.get_transaction_count(self.address, "latest")) > nonce:
+            # The nonce was consumed, by this tx or a replacement of it.
+            return False
+        _LOGGER.warning("Relayer tx %s (nonce %s) is still pending; keeping its nonce reserved", tx_hash, nonce)
+        return True
+
+    def _fetch_receipts_individually(self, hashes: Sequence[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        receipts: Dict[str, Optional[Dict[str, Any]]] = {}
+        for tx_hash in hashes:
+            try:
+                receipts[tx_hash] = self._w3.eth.get_transaction_receipt(tx_hash)
+            except Exception:
+                receipts[tx_hash] = None
+        return receipts
+
+
+__all__ = [
+    "FeeOracle",
+    "FeeQuote",
+    "NonceManager",
+    "ReceiptFetcher",
+    "ReceiptTimeout",
+    "ReceiptWatcher",
+    "RelayerPipeline",
+]
@@ -0,0 +1,294 @@
+"""Pooled JSON-RPC client with batching and short-lived response caching."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Coroutine, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+import httpx
+
+_LOGGER = logging.getLogger(__name__)
+
+_DEFAULT_RPC_URL = os.getenv("SIMULATOR_RPC_URL") or os.getenv("RPC_URL") or "http://127.0.0.1:8545"
+_DEFAULT_TIMEOUT = float(os.getenv("SIMULATOR_RPC_TIMEOUT", "5"))
+_DEFAULT_CACHE_TTL = float(os.getenv("RPC_CACHE_TTL_SECONDS", "2"))
+_DEFAULT_MAX_CONNECTIONS = int(os.getenv("RPC_MAX_CONNECTIONS", "32"))
+
+# Results that only change once per block (or never) and are safe to reuse
+# for a couple of seconds.
+_TTL_CACHED_METHODS = frozenset({"eth_chainId", "eth_gasPrice", "eth_blockNumber", "eth_maxPriorityFeePerGas"})
+# Calls pinned to a block other than these tags are immutable.
+_MOVING_BLOCK_TAGS = frozenset({"latest", "pending", "safe", "finalized"})
+_BLOCK_SCOPED_METHODS = frozenset({"eth_call", "eth_estimateGas", "eth_getBalance", "eth_getCode", "eth_getStorageAt"})
+# "Invalid Request" / "Method not found" answers to a batch body mean the
+# endpoint only understands single calls.
+_BATCH_REJECTED_CODES = frozenset({-32600, -32601})
+
+T = TypeVar("T")
+RpcCall = Tuple[str, List[Any]]
+
+
+class JsonRpcError(Exception):
+    """Raised when an RPC request returns an error payload."""
+
+    def __init__(self, code: int | None, message: str, data: Any | None = None) -> None:
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class RpcTransportError(Exception):
+    """Raised when the RPC endpoint cannot be reached."""
+
+    pass
+
+
+def _cache_key(method: str, params: List[Any]) -> Optional[str]:
+    if method in _TTL_CACHED_METHODS:
+        return method if not params else f"{method}:{json.dumps(params, sort_keys=True)}"
+    if method in _BLOCK_SCOPED_METHODS and params:
+        block = params[-1]
+        if isinstance(block, str) and block.startswith("0x") and block not in _MOVING_BLOCK_TAGS and len(params) > 1:
+            return f"{method}:{json.dumps(params, sort_keys=True)}"
+    return None
+
+
+def _decode_error(payload: Dict[str, Any]) -> JsonRpcError:
+    error = payload.get("error") or {}
+    return JsonRpcError(error.get("code"), error.get("message", "RPC error"), error.get("data"))
+
+
+def _rejects_batch(payload: Any) -> bool:
+    """Return True if ``payload`` says the endpoint does not accept batches."""
+
+    if not isinstance(payload, dict):
+        return False
+    error = payload.get("error")
+    if not isinstance(error, dict):
+        return False
+    message = str(error.get("message") or "").lower()
+    return error.get("code") in _BATCH_REJECTED_CODES or "batch" in message
+
+
+class JsonRpcClient:
+    """Keep-alive JSON-RPC client shared by synchronous and async callers.
+
+    Requests run on a private event loop thread that owns one
+    :class:`httpx.AsyncClient`, so the connection pool survives across
+    ``asyncio.run`` invocations and FastAPI workers alike.  :meth:`batch`
+    sends several calls as one JSON-RPC batch; endpoints that reject batches
+    get the calls concurrently instead.  ``eth_gasPrice``-style results and
+    calls pinned to a block number are cached for ``cache_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        url: str = _DEFAULT_RPC_URL,
+        *,
+        timeout: float = _DEFAULT_TIMEOUT,
+        cache_ttl: float = _DEFAULT_CACHE_TTL,
+        cache_size: int = 1024,
+        max_connections: int = _DEFAULT_MAX_CONNECTIONS,
+    ) -> None:
+        self.url = url
+        self._timeout = timeout
+        self._cache_ttl = cache_ttl
+        self._cache_size = cache_size
+        self._max_connections = max_connections
+        self._cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._start_lock = threading.Lock()
+        self._supports_batch = True
+
+    # ------------------------------------------------------------------
+    # Public API
+    def call(self, method: str, params: Optional[List[Any]] = None) -> Any:
+        return self._unwrap(self.batch([(method, list(params or []))])[0])
+
+    def batch(self, calls: Sequence[RpcCall]) -> List[Union[Any, JsonRpcError]]:
+        """Execute ``calls`` and return results in order.
+
+        Per-call RPC errors are returned as :class:`JsonRpcError` instances;
+        transport failures raise :class:`RpcTransportError` for the batch.
+        """
+
+        return self._submit(self._batch(calls)).result()
+
+    async def acall(self, method: str, params: Optional[List[Any]] = None) -> Any:
+        results = await self.abatch([(method, list(params or []))])
+        return self._unwrap(results[0])
+
+    async def abatch(self, calls: Sequence[RpcCall]) -> List[Union[Any, JsonRpcError]]:
+        return await asyncio.wrap_future(self._submit(self._batch(calls)))
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+    def close(self) -> None:
+        loop = self._loop
+        if loop is None:
+            return
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), loop).result(timeout=self._timeout)
+        loop.call_soon_threadsafe(loop.stop)
+        self._loop = None
+        self._client = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    @staticmethod
+    def _unwrap(result: Any) -> Any:
+        if isinstance(result, JsonRpcError):
+            raise result
+        return result
+
+    def _submit(self, coroutine: Coroutine[Any, Any, T]) -> "Future[T]":
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coroutine, loop)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def _run() -> None:
+                    asyncio.set_event_loop(loop)
+                    self._client = httpx.AsyncClient(
+                        timeout=self._timeout,
+                        limits=httpx.Limits(
+                            max_connections=self._max_connections,
+                            max_keepalive_connections=self._max_connections,
+                        ),
+                        headers={"Content-Type": "application/json"},
+                    )
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=_run, name="orchestrator-rpc", daemon=True).start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _cached(self, key: str) -> Tuple[bool, Any]:
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._cache[key]
+                return False, None
+            self._cache.move_to_end(key)
+            return True, value
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + self._cache_ttl, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    async def _batch(self, calls: Sequence[RpcCall]) -> List[Union[Any, JsonRpcError]]:
+        results: List[Union[Any, JsonRpcError]] = [None] * len(calls)
+        pending: Dict[int, int] = {}
+        requests: List[Dict[str, Any]] = []
+        keys: Dict[int, Optional[str]] = {}
+        deduped: Dict[str, int] = {}
+        aliases: List[Tuple[int, int]] = []
+        for position, (method, params) in enumerate(calls):
+            key = _cache_key(method, params) if self._cache_ttl > 0 else None
+            if key is not None:
+                hit, value = self._cached(key)
+                if hit:
+                    results[position] = value
+                    continue
+                if key in deduped:
+                    aliases.append((position, deduped[key]))
+                    continue
+                deduped[key] = position
+            request_id = next(self._ids)
+            pending[request_id] = position
+            keys[request_id] = key
+            requests.append({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+
+        if requests:
+            responses = await self._send(requests)
+            for payload in responses:
+                request_id = payload.get("id")
+                if request_id not in pending:
+                    continue
+                position = pending.pop(request_id)
+                if "error" in payload and payload["error"] is not None:
+                    results[position] = _decode_error(payload)
+                    continue
+                value = payload.get("result")
+                results[position] = value
+                key = keys.get(request_id)
+                if key is not None:
+                    self._remember(key, value)
+            for position in pending.values():
+                results[position] = JsonRpcError(None, "Missing JSON-RPC response")
+        for position, source in aliases:
+            results[position] = results[source]
+        return results
+
+    async def _send(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if len(requests) == 1:
+            return [await self._post(requests[0])]
+        if self._supports_batch:
+            decoded = await self._post(requests)
+            if isinstance(decoded, list):
+                return decoded
+            if _rejects_batch(decoded):
+                _LOGGER.info("RPC endpoint %s rejected a batch request; falling back to concurrent calls", self.url)
+                self._supports_batch = False
+            elif isinstance(decoded, dict) and decoded.get("error") is not None:
+                # A rate limit or outage answered for the whole batch: report it
+                # against every call and keep batching for the next request.
+                return [{**decoded, "id": request["id"]} for request in requests]
+        return list(await asyncio.gather(*(self._post(request) for request in requests)))
+
+    async def _post(self, body: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Any:
+        assert self._client is not None
+        try:
+            response = await self._client.post(self.url, content=json.dumps(body).encode("utf-8"))
+        except httpx.HTTPError as exc:
+            raise RpcTransportError(str(exc) or exc.__class__.__name__) from exc
+        if not response.content:
+            return {} if isinstance(body, dict) else []
+        try:
+            return response.json()
+        except json.JSONDecodeError as exc:
+            raise RpcTransportError(f"Invalid JSON-RPC response: {exc}") from exc
+
+
+_CLIENTS: Dict[str, JsonRpcClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_rpc_client(url: str | None = None) -> JsonRpcClient:
+    """Return the shared client for ``url`` (defaults to ``SIMULATOR_RPC_URL``/``RPC_URL``)."""
+
+    resolved = url or _DEFAULT_RPC_URL
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(resolved)
+        if client is None:
+            client = JsonRpcClient(resolved)
+            _CLIENTS[resolved] = client
+        return client
+
+
+__all__ = ["JsonRpcClient", "JsonRpcError", "RpcCall", "RpcTransportError", "get_rpc_client"]
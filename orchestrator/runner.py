@@ -7,27 +7,65 @@ import os
 import threading
 import time
 import uuid
+from contextlib import nullcontext
 from typing import Dict, Iterable, List, Optional
 
 from .checkpoint import CheckpointError, CheckpointIntegrityError, CheckpointManager
+from .deadlines import get_deadline_scheduler
+from .dispatch import RunDispatcher, RunLease, RunQueueFull
 from .events import reconcile as reconcile_receipt
 from .models import OrchestrationPlan, Receipt, RunInfo, StatusOut, Step, StepStatus
 from .scoreboard import get_scoreboard
-from .state import RunStateError, RunStateStore, get_store
-from .tools import StepExecutor
+from .simulator import resolve_tenant
+from .state import RunStateError, RunStateStore, get_archive, get_store
+from .tools import StepExecutor, prepare_plan_agents
 
 logger = logging.getLogger(__name__)
 
-_RUNS: Dict[str, StatusOut] = {}
-_PLANS: Dict[str, OrchestrationPlan] = {}
+
+class _RunState:
+    """Mutable run record paired with the immutable snapshot served to readers.
+
+    ``status`` is the working copy.  Only the worker holding the run's lease
+    mutates it, always under ``lock``.  Each persisted transition publishes a
+    deep copy to ``snapshot``; status readers, the state store and the
+    checkpoint log only ever see published snapshots, so they never take
+    ``lock`` and never block behind step execution.
+    """
+
+    __slots__ = ("run_id", "plan", "status", "snapshot", "lock")
+
+    def __init__(self, status: StatusOut, plan: OrchestrationPlan | None) -> None:
+        self.run_id = status.run.id
+        self.plan = plan
+        self.status = status
+        self.lock = threading.RLock()
+        self.snapshot = status.model_copy(deep=True)
+
+    def publish(self) -> StatusOut:
+        with self.lock:
+            snapshot = self.status.model_copy(deep=True)
+            self.snapshot = snapshot
+        return snapshot
+
+
+# ``_LOCK`` only guards membership of ``_RUNS``; per-run state has its own lock.
+_RUNS: Dict[str, _RunState] = {}
 _LOCK = threading.RLock()
+_BOOTSTRAP_LOCK = threading.Lock()
+# Runs published since their last successful checkpoint record.
+_DIRTY: set[str] = set()
+_DIRTY_LOCK = threading.Lock()
 _EXECUTOR = StepExecutor()
 _STORE: RunStateStore | None = None
-_WATCHDOG_STARTED = False
+_RETENTION_SCHEDULED = False
 _STALL_THRESHOLD = 60.0
-_WATCHDOG_INTERVAL = 15.0
+_ARCHIVE_INTERVAL = 15.0
+# Terminal runs untouched for this many seconds move to the cold archive; 0 keeps them forever.
+_RETENTION_SECONDS = float(os.getenv("ORCHESTRATOR_STATE_RETENTION_SECONDS", "0"))
 _CHECKPOINT_MANAGER: CheckpointManager | None = None
 _CHECKPOINT_RESTORED = False
+_DISPATCHER: RunDispatcher | None = None
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,6 +77,44 @@ def _store() -> RunStateStore:
     return _STORE
 
 
+def _dispatcher() -> RunDispatcher:
+    global _DISPATCHER
+    if _DISPATCHER is None:
+        _DISPATCHER = RunDispatcher(
+            workers=int(os.getenv("ORCHESTRATOR_RUN_WORKERS", "8")),
+            max_queue=int(os.getenv("ORCHESTRATOR_RUN_QUEUE_SIZE", "1024")),
+            tenant_limit=int(os.getenv("ORCHESTRATOR_TENANT_CONCURRENCY", "0")),
+            lease_ttl=_STALL_THRESHOLD,
+        )
+    return _DISPATCHER
+
+
+def _run_priority(plan: OrchestrationPlan) -> int:
+    metadata = plan.metadata if isinstance(plan.metadata, dict) else {}
+    try:
+        return int(metadata.get("priority", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _dispatch_resume(state: _RunState) -> bool:
+    """Queue a resume of ``state``; a no-op while the run is queued or leased."""
+
+    plan = state.plan
+    if plan is None:
+        return False
+    try:
+        return _dispatcher().submit(
+            state.run_id,
+            lambda lease: _resume_run(state, lease=lease),
+            tenant=resolve_tenant(plan),
+            priority=_run_priority(plan),
+        )
+    except RunQueueFull as exc:
+        _LOGGER.warning("Unable to queue resume for run %s: %s", state.run_id, exc)
+        return False
+
+
 def _should_run_inline() -> bool:
     """Return True when runs should execute synchronously."""
 
@@ -58,8 +134,8 @@ def _bootstrap_from_checkpoint() -> None:
     global _CHECKPOINT_RESTORED
     if _CHECKPOINT_RESTORED:
         return
-    to_resume = []
-    with _LOCK:
+    to_resume: List[_RunState] = []
+    with _BOOTSTRAP_LOCK:
         if _CHECKPOINT_RESTORED:
             return
         manager = _ensure_checkpoint_manager()
@@ -77,25 +153,20 @@ def _bootstrap_from_checkpoint() -> None:
             _CHECKPOINT_RESTORED = True
             return
         for run_id, job in restored.items():
-            _RUNS[run_id] = job.status
-            _PLANS[run_id] = job.plan
+            state = _RunState(job.status, job.plan)
+            with _LOCK:
+                _RUNS[run_id] = state
             try:
-                _store().save(job.status)
+                _store().save(state.snapshot)
             except RunStateError as exc:
                 _LOGGER.warning("Failed to persist restored run %s to state store: %s", run_id, exc)
-            status = job.status
-            if status.run.state == "running" and status.current:
-                to_resume.append((run_id, job.plan, status))
-        _ensure_watchdog()
+            if state.snapshot.run.state == "running" and state.snapshot.current:
+                to_resume.append(state)
+        _ensure_retention()
         _CHECKPOINT_RESTORED = True
-    for run_id, plan, status in to_resume:
-        thread = threading.Thread(
-            target=_resume_run,
-            args=(plan, status, run_id),
-            daemon=True,
-            name=f"orchestrator-resume-{run_id}",
-        )
-        thread.start()
+    for state in to_resume:
+        _arm_stall_deadline(state)
+        _dispatch_resume(state)
 
 
 def _checkpoint() -> CheckpointManager:
@@ -104,17 +175,42 @@ def _checkpoint() -> CheckpointManager:
     return manager
 
 
-def _snapshot_checkpoint(status: StatusOut | None = None) -> None:
+def _snapshot_checkpoint(state: _RunState | None = None) -> None:
+    """Record dirty runs in the checkpoint log.
+
+    With a ``state`` only that run is appended to the delta log, keeping each
+    step transition O(1) in the number of live runs; the manager periodically
+    compacts the log into a full snapshot.  Without a state every run dirtied
+    since its last record is appended and the log is compacted immediately.
+    Only published snapshots are recorded, so no run is copied here.
+    """
+
+    with _DIRTY_LOCK:
+        if state is None:
+            dirty = list(_DIRTY)
+            _DIRTY.clear()
+        else:
+            _DIRTY.discard(state.run_id)
+            dirty = [state.run_id]
+    recorded: List[str] = []
     try:
-        with _LOCK:
-            runs_copy = {run_id: run.model_copy(deep=True) for run_id, run in _RUNS.items()}
-            plans_copy = {run_id: plan.model_copy(deep=True) for run_id, plan in _PLANS.items()}
-        scoreboard_snapshot = get_scoreboard().snapshot()
-        _checkpoint().snapshot_runtime(runs_copy, plans_copy, scoreboard=scoreboard_snapshot)
+        manager = _checkpoint()
+        for run_id in dirty:
+            current = _RUNS.get(run_id)
+            if current is None or current.plan is None:
+                recorded.append(run_id)
+                continue
+            manager.record_job(current.snapshot, current.plan)
+            recorded.append(run_id)
+        if state is None or manager.compaction_due():
+            manager.compact(scoreboard=get_scoreboard().snapshot())
     except CheckpointError as exc:
+        with _DIRTY_LOCK:
+            _DIRTY.update(run_id for run_id in dirty if run_id not in recorded)
         message = f"Checkpoint error: {exc}"
-        if status is not None:
-            _log(status, message)
+        if state is not None:
+            with state.lock:
+                _log(state.status, message)
         else:
             _LOGGER.warning(message)
 
@@ -166,12 +262,16 @@ def _mark_run(status: StatusOut, state: str) -> None:
     status.run.completed_at = now
 
 
-def _persist(status: StatusOut) -> None:
+def _persist(state: _RunState) -> None:
+    snapshot = state.publish()
     try:
-        _store().save(status)
+        _store().save(snapshot)
     except RunStateError as exc:  # pragma: no cover - persistence failures should be rare
-        _log(status, f"Persistence error: {exc}")
-    _snapshot_checkpoint(status)
+        with state.lock:
+            _log(state.status, f"Persistence error: {exc}")
+    with _DIRTY_LOCK:
+        _DIRTY.add(state.run_id)
+    _snapshot_checkpoint(state)
 
 
 def _resume_pending_steps(plan: OrchestrationPlan, status: StatusOut) -> Iterable[int]:
@@ -181,24 +281,47 @@ def _resume_pending_steps(plan: OrchestrationPlan, status: StatusOut) -> Iterabl
         yield idx
 
 
-def _execute_step(step: Step, status: StatusOut, step_status: StepStatus) -> bool | None:
-    _apply_transition(status, step_status, "running", f"Starting {step.name}")
-    _persist(status)
+def _lease_lost(lease: RunLease | None) -> bool:
+    return lease is not None and not lease.renew()
+
+
+def _execute_step(
+    step: Step,
+    state: _RunState,
+    step_status: StepStatus,
+    lease: RunLease | None = None,
+) -> bool | None:
+    with state.lock:
+        _apply_transition(state.status, step_status, "running", f"Starting {step.name}")
+    _persist(state)
+    _arm_stall_deadline(state)
+    # Heartbeat the lease while the step runs so the stall watchdog never
+    # hands a live step to a second worker; a failed renewal aborts retries.
+    heartbeat = lease.keepalive() if lease is not None else nullcontext(None)
     try:
-        result = _EXECUTOR.execute(step)
+        with heartbeat as lost:
+            result = _EXECUTOR.execute(step, abort=lost)
     except Exception as exc:  # pragma: no cover - defensive guard for executor failures
         logger.exception("Step executor crashed for %s", step.name)
-        _log(status, f"{step.name}: executor error: {exc}")
-        _log(status, f"{step.name}: marked for resume after crash")
-        _persist(status)
+        with state.lock:
+            _log(state.status, f"{step.name}: executor error: {exc}")
+            _log(state.status, f"{step.name}: marked for resume after crash")
+        _persist(state)
         return None
-    for line in result.logs:
-        _log(status, f"{step.name}: {line}")
-    if result.success:
-        _apply_transition(status, step_status, "completed", f"Completed {step.name}")
-    else:
-        _apply_transition(status, step_status, "failed", f"Failed {step.name}")
-    _persist(status)
+    if _lease_lost(lease):
+        # The heartbeat was starved past the lease TTL and the watchdog handed
+        # this run to another worker; that worker now owns the outcome.
+        logger.warning("Lease for run %s expired during %s; discarding result", state.run_id, step.name)
+        return None
+    with state.lock:
+        for line in result.logs:
+            _log(state.status, f"{step.name}: {line}")
+        if result.success:
+            _apply_transition(state.status, step_status, "completed", f"Completed {step.name}")
+        else:
+            _apply_transition(state.status, step_status, "failed", f"Failed {step.name}")
+    _persist(state)
+    get_deadline_scheduler().cancel(_stall_key(state.run_id))
     return result.success
 
 
@@ -218,142 +341,207 @@ def _finalize_receipt(plan: OrchestrationPlan, status: StatusOut) -> Receipt:
     return reconcile_receipt(status)
 
 
-def _ensure_watchdog() -> None:
-    global _WATCHDOG_STARTED
-    if _WATCHDOG_STARTED:
+def _archive_expired_runs() -> None:
+    if _RETENTION_SECONDS <= 0:
         return
-
-    def _watchdog() -> None:
-        while True:
-            time.sleep(_WATCHDOG_INTERVAL)
-            with _LOCK:
-                runs = list(_RUNS.items())
-            for run_id, status in runs:
-                if status.run.state != "running" or not status.current:
-                    continue
-                step = next((s for s in status.steps if s.id == status.current), None)
-                if not step or not step.started_at:
-                    continue
-                if time.time() - step.started_at < _STALL_THRESHOLD:
-                    continue
-                _log(status, f"Watchdog detected stall in `{step.name}`; rescheduling.")
-                plan = _PLANS.get(run_id)
-                if not plan:
-                    continue
-                thread = threading.Thread(
-                    target=_resume_run,
-                    args=(plan, status, run_id),
-                    daemon=True,
-                    name=f"orchestrator-resume-{run_id}",
-                )
-                thread.start()
-
-    thread = threading.Thread(target=_watchdog, daemon=True, name="orchestrator-watchdog")
-    thread.start()
-    _WATCHDOG_STARTED = True
-
-
-def _resume_run(plan: OrchestrationPlan, status: StatusOut, run_id: str) -> None:
-    with _LOCK:
-        _RUNS[run_id] = status
-    for idx in _resume_pending_steps(plan, status):
+    try:
+        archived = _store().archive_expired(get_archive(), ttl=_RETENTION_SECONDS)
+    except RunStateError as exc:
+        _LOGGER.warning("Run archival failed: %s", exc)
+        return
+    for run_id in archived:
         with _LOCK:
-            current_status = _RUNS.get(run_id)
-        if not current_status:
-            return
+            _RUNS.pop(run_id, None)
+        with _DIRTY_LOCK:
+            _DIRTY.discard(run_id)
+        try:
+            _checkpoint().remove_job(run_id)
+        except CheckpointError as exc:  # pragma: no cover - best effort cleanup
+            _LOGGER.warning("Failed to checkpoint archival of run %s: %s", run_id, exc)
+    if archived:
+        _LOGGER.info("Archived %d expired runs", len(archived))
+
+
+def _run_archival_cycle() -> None:
+    # Archival does store I/O, so keep it off the deadline thread.
+    threading.Thread(target=_archive_expired_runs, name="orchestrator-run-archival", daemon=True).start()
+    get_deadline_scheduler().schedule("orchestrator:run-archival", _ARCHIVE_INTERVAL, _run_archival_cycle)
+
+
+def _ensure_retention() -> None:
+    global _RETENTION_SCHEDULED
+    if _RETENTION_SCHEDULED or _RETENTION_SECONDS <= 0:
+        return
+    _RETENTION_SCHEDULED = True
+    get_deadline_scheduler().schedule("orchestrator:run-archival", _ARCHIVE_INTERVAL, _run_archival_cycle)
+
+
+def _stall_key(run_id: str) -> tuple[str, str]:
+    return ("orchestrator:run-stall", run_id)
+
+
+def _arm_stall_deadline(state: _RunState, delay: float | None = None) -> None:
+    """Schedule a stall check for the step ``state`` is currently executing."""
+
+    if delay is None:
+        snapshot = state.snapshot
+        step = next((s for s in snapshot.steps if s.id == snapshot.current), None)
+        started_at = step.started_at if step and step.started_at else time.time()
+        delay = started_at + _STALL_THRESHOLD - time.time()
+    run_id = state.run_id
+    get_deadline_scheduler().schedule(_stall_key(run_id), delay, lambda: _on_stall_deadline(run_id))
+
+
+def _on_stall_deadline(run_id: str) -> None:
+    state = _RUNS.get(run_id)
+    if state is None:
+        return
+    snapshot = state.snapshot
+    if snapshot.run.state != "running" or not snapshot.current:
+        return
+    step = next((s for s in snapshot.steps if s.id == snapshot.current), None)
+    if not step or not step.started_at:
+        return
+    remaining = step.started_at + _STALL_THRESHOLD - time.time()
+    if remaining > 0:
+        _arm_stall_deadline(state, remaining)
+        return
+    # Check again later: a live lease means the worker may still finish, and a
+    # rejected resume should be retried.
+    _arm_stall_deadline(state, _STALL_THRESHOLD)
+    if state.plan is None or _dispatcher().is_active(run_id):
+        return
+    with state.lock:
+        _log(state.status, f"Watchdog detected stall in `{step.name}`; rescheduling.")
+    _dispatch_resume(state)
+
+
+def _staff_steps(state: _RunState, steps: List[Step]) -> None:
+    # Replace offline agents for the whole run in one registry pass; each step's
+    # own check at execution time then only confirms its agents are still live.
+    reassignments = prepare_plan_agents(steps)
+    if not reassignments:
+        return
+    with state.lock:
+        for step in steps:
+            for line in reassignments.get(step.id, ()):
+                _log(state.status, f"{step.name}: {line}")
+
+
+def _resume_run(state: _RunState, *, lease: RunLease | None = None) -> None:
+    plan = state.plan
+    if plan is None:
+        return
+    pending = list(_resume_pending_steps(plan, state.status))
+    _staff_steps(state, [plan.steps[idx] for idx in pending])
+    for idx in pending:
         step = plan.steps[idx]
-        step_status = current_status.steps[idx]
+        step_status = state.status.steps[idx]
         if step_status.state == "completed":
             continue
-        success = _execute_step(step, current_status, step_status)
-        with _LOCK:
-            _RUNS[run_id] = current_status
+        if _lease_lost(lease):
+            return
+        success = _execute_step(step, state, step_status, lease)
         if success is None:
             return
         if not success:
-            with _LOCK:
-                _mark_run(current_status, "failed")
-                _persist(current_status)
-                _RUNS[run_id] = current_status
+            with state.lock:
+                _mark_run(state.status, "failed")
+            _persist(state)
             return
+    with state.lock:
+        _mark_run(state.status, "succeeded")
+        state.status.receipts = _finalize_receipt(plan, state.status)
+    _persist(state)
+    get_deadline_scheduler().cancel(_stall_key(state.run_id))
+
+
+def _forget_run(state: _RunState) -> None:
+    get_deadline_scheduler().cancel(_stall_key(state.run_id))
     with _LOCK:
-        current_status = _RUNS.get(run_id)
-        if not current_status:
-            return
-        _mark_run(current_status, "succeeded")
-        current_status.receipts = _finalize_receipt(plan, current_status)
-        _persist(current_status)
-        _RUNS[run_id] = current_status
+        _RUNS.pop(state.run_id, None)
+    with _DIRTY_LOCK:
+        _DIRTY.discard(state.run_id)
+    try:
+        _store().delete(state.run_id)
+    except RunStateError as exc:  # pragma: no cover - best effort cleanup
+        _LOGGER.warning("Failed to remove rejected run %s: %s", state.run_id, exc)
+    try:
+        _checkpoint().remove_job(state.run_id)
+    except CheckpointError as exc:  # pragma: no cover - best effort cleanup
+        _LOGGER.warning("Failed to checkpoint removal of run %s: %s", state.run_id, exc)
 
 
 def start_run(plan: OrchestrationPlan, approvals: List[str]) -> RunInfo:
     del approvals
     restore_pending_runs()
-    status = _initial_status(plan)
+    state = _RunState(_initial_status(plan), plan)
     with _LOCK:
-        _RUNS[status.run.id] = status
-        _PLANS[status.run.id] = plan
-        _ensure_watchdog()
-    _persist(status)
+        _RUNS[state.run_id] = state
+        _ensure_retention()
+    _persist(state)
 
     if _should_run_inline():
-        with _LOCK:
-            current_status = _RUNS.get(status.run.id)
-            if not current_status:
-                return status.run
-            current_status.run.state = "running"  # type: ignore[assignment]
-            current_status.run.started_at = time.time()
-            _RUNS[status.run.id] = current_status
-            _persist(current_status)
+        with state.lock:
+            state.status.run.state = "running"  # type: ignore[assignment]
+            state.status.run.started_at = time.time()
+        _persist(state)
         try:
-            _resume_run(plan, current_status, status.run.id)
+            _resume_run(state)
         except Exception:  # pragma: no cover - defensive guard for inline failures
-            logger.exception("Run %s failed during inline resume", status.run.id)
-            with _LOCK:
-                _RUNS[status.run.id] = current_status
-                _persist(current_status)
-        return status.run
+            logger.exception("Run %s failed during inline resume", state.run_id)
+            _persist(state)
+        return state.snapshot.run
 
-    def _worker() -> None:
-        with _LOCK:
-            current_status = _RUNS.get(status.run.id)
-            if not current_status:
-                return
-            current_status.run.state = "running"  # type: ignore[assignment]
-            current_status.run.started_at = time.time()
-            _RUNS[status.run.id] = current_status
-            _persist(current_status)
+    def _worker(lease: RunLease) -> None:
+        with state.lock:
+            state.status.run.state = "running"  # type: ignore[assignment]
+            state.status.run.started_at = time.time()
+        _persist(state)
 
         final_state: str | None = None
         try:
-            _resume_run(plan, current_status, status.run.id)
-            final_state = current_status.run.state
+            _resume_run(state, lease=lease)
+            final_state = state.status.run.state
         except Exception:  # pragma: no cover - defensive guard for background failures
-            logger.exception("Run %s failed during resume", status.run.id)
+            logger.exception("Run %s failed during resume", state.run_id)
             final_state = "failed"
         finally:
-            with _LOCK:
-                latest_status = _RUNS.get(status.run.id, current_status)
-                if final_state:
-                    latest_status.run.state = final_state  # type: ignore[assignment]
-                    latest_status.run.completed_at = time.time()
-                _RUNS[status.run.id] = latest_status
-                _persist(latest_status)
+            # A worker that lost its lease to a watchdog resume must not
+            # overwrite the state now owned by the replacement worker.
+            if lease.held:
+                with state.lock:
+                    if final_state:
+                        state.status.run.state = final_state  # type: ignore[assignment]
+                        state.status.run.completed_at = time.time()
+                _persist(state)
 
-    thread = threading.Thread(target=_worker, name=f"plan-runner-{status.run.id}", daemon=True)
-    thread.start()
-    return status.run
+    try:
+        _dispatcher().submit(
+            state.run_id,
+            _worker,
+            tenant=resolve_tenant(plan),
+            priority=_run_priority(plan),
+        )
+    except RunQueueFull:
+        _forget_run(state)
+        raise
+    return state.snapshot.run
 
 
 def get_status(run_id: str) -> StatusOut:
+    """Return the latest published status snapshot for ``run_id``.
+
+    The returned object is shared with other readers and must not be mutated.
+    """
+
     _bootstrap_from_checkpoint()
-    with _LOCK:
-        status = _RUNS.get(run_id)
-    if status:
-        return status
+    state = _RUNS.get(run_id)
+    if state is not None:
+        return state.snapshot
     stored = _store().load(run_id)
     if not stored:
         raise KeyError(run_id)
     with _LOCK:
-        _RUNS[run_id] = stored
-    return stored
+        state = _RUNS.setdefault(run_id, _RunState(stored, None))
+    return state.snapshot
@@ -2,17 +2,16 @@
 
 from __future__ import annotations
 
-import json
 import os
-import time
+import threading
+from dataclasses import dataclass, field
 from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
-from functools import lru_cache
-from typing import Any, Dict, List, Tuple
-from urllib.error import URLError
-from urllib.request import Request, urlopen
+from typing import Any, Callable, Dict, List, Tuple, Union
 
 from .config import format_percent, get_burn_fraction, get_fee_fraction
 from .models import OrchestrationPlan, SimOut
+from .org_policy import PolicyWatcher, build_policy_source, parse_policy_document
+from .rpc import JsonRpcError, RpcCall, RpcTransportError, get_rpc_client
 
 FEE_FRACTION = get_fee_fraction()
 BURN_FRACTION = get_burn_fraction()
@@ -20,13 +19,13 @@ FEE_PERCENT_LABEL = format_percent(FEE_FRACTION)
 BURN_PERCENT_LABEL = format_percent(BURN_FRACTION)
 _TOTAL_MULTIPLIER = Decimal("1") + FEE_FRACTION + BURN_FRACTION
 
-_DEFAULT_RPC_URL = os.getenv("SIMULATOR_RPC_URL") or os.getenv("RPC_URL") or "http://127.0.0.1:8545"
-_RPC_TIMEOUT = float(os.getenv("SIMULATOR_RPC_TIMEOUT", "5"))
 _ORG_POLICY_PATH = (
     os.getenv("SIMULATOR_POLICY_PATH")
     or os.getenv("ONEBOX_POLICY_PATH")
     or os.path.join(os.path.dirname(__file__), "..", "storage", "org-policies.json")
 )
+_ORG_POLICY_URL = os.getenv("SIMULATOR_POLICY_STORE_URL") or os.getenv("ONEBOX_POLICY_STORE_URL") or None
+_ORG_POLICY_RELOAD_SECONDS = float(os.getenv("SIMULATOR_POLICY_RELOAD_SECONDS", "1") or "1")
 
 _HEX_QUANTITY_FIELDS = {
     "gas",
@@ -72,21 +71,6 @@ def _append_blocker(blockers: List[str], code: str) -> None:
         blockers.append(code)
 
 
-class JsonRpcError(Exception):
-    """Raised when an RPC request returns an error payload."""
-
-    def __init__(self, code: int | None, message: str, data: Any | None = None) -> None:
-        super().__init__(message)
-        self.code = code
-        self.data = data
-
-
-class RpcTransportError(Exception):
-    """Raised when the RPC endpoint cannot be reached."""
-
-    pass
-
-
 def _safe_decimal(value: str | None) -> Decimal:
     if not value:
         return Decimal("0")
@@ -96,38 +80,6 @@ def _safe_decimal(value: str | None) -> Decimal:
         return Decimal("0")
 
 
-def _rpc_request(method: str, params: List[Any], *, rpc_url: str = _DEFAULT_RPC_URL) -> Any:
-    """Send a JSON-RPC request and return the decoded result."""
-
-    payload = json.dumps(
-        {
-            "jsonrpc": "2.0",
-            "id": int(time.time() * 1000) % 1_000_000,
-            "method": method,
-            "params": params,
-        }
-    ).encode("utf-8")
-    request = Request(rpc_url, data=payload, headers={"Content-Type": "application/json"})
-    try:
-        with urlopen(request, timeout=_RPC_TIMEOUT) as response:
-            raw = response.read()
-    except URLError as exc:  # pragma: no cover - network errors are environment-specific
-        raise RpcTransportError(str(exc)) from exc
-    except OSError as exc:  # pragma: no cover - defensive
-        raise RpcTransportError(str(exc)) from exc
-
-    if not raw:
-        return None
-    try:
-        decoded = json.loads(raw.decode("utf-8"))
-    except json.JSONDecodeError as exc:  # pragma: no cover - defensive parsing
-        raise RpcTransportError(f"Invalid JSON-RPC response: {exc}") from exc
-    if "error" in decoded:
-        error = decoded["error"] or {}
-        raise JsonRpcError(error.get("code"), error.get("message", "RPC error"), error.get("data"))
-    return decoded.get("result")
-
-
 def _estimate_budget(plan: OrchestrationPlan) -> Tuple[Decimal, Decimal]:
     total_budget = _safe_decimal(plan.budget.max)
     if total_budget <= 0:
@@ -316,47 +268,43 @@ def _classify_revert(reason: str | None) -> str:
     return "UNKNOWN_REVERT"
 
 
-@lru_cache(maxsize=1)
-def _load_org_policies() -> Dict[str, Dict[str, Any]]:
-    try:
-        with open(_ORG_POLICY_PATH, "r", encoding="utf-8") as handle:
-            raw = handle.read()
-    except FileNotFoundError:
-        return {}
-    except OSError:  # pragma: no cover - defensive I/O handling
-        return {}
-    if not raw:
-        return {}
-    try:
-        data = json.loads(raw)
-    except json.JSONDecodeError:
-        return {}
-    if not isinstance(data, dict):
-        return {}
+def _compile_org_policies(document: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     policies: Dict[str, Dict[str, Any]] = {}
-    for key, value in data.items():
-        if not isinstance(value, dict):
-            continue
+    for key, entry in parse_policy_document(document).items():
         record: Dict[str, Any] = {}
-        max_budget = value.get("maxBudgetWei")
-        if isinstance(max_budget, str):
-            try:
-                record["maxBudgetWei"] = int(max_budget, 10)
-            except ValueError:
-                pass
-        elif isinstance(max_budget, int):
-            record["maxBudgetWei"] = max_budget
-        max_duration = value.get("maxDurationDays")
-        if isinstance(max_duration, int) and max_duration > 0:
-            record["maxDurationDays"] = max_duration
-        updated_at = value.get("updatedAt")
-        if isinstance(updated_at, str):
-            record["updatedAt"] = updated_at
+        if entry.max_budget_wei is not None:
+            record["maxBudgetWei"] = entry.max_budget_wei
+        if entry.max_duration_days is not None and entry.max_duration_days > 0:
+            record["maxDurationDays"] = entry.max_duration_days
+        if entry.updated_at is not None:
+            record["updatedAt"] = entry.updated_at
         policies[key] = record
     return policies
 
 
-def _resolve_tenant(plan: OrchestrationPlan) -> str | None:
+_ORG_POLICIES: PolicyWatcher[Dict[str, Dict[str, Any]]] | None = None
+_ORG_POLICIES_LOCK = threading.Lock()
+
+
+def _load_org_policies() -> Dict[str, Dict[str, Any]]:
+    """Return the compiled org policies, reloading them when the source changes."""
+
+    global _ORG_POLICIES
+    if _ORG_POLICIES is None:
+        with _ORG_POLICIES_LOCK:
+            if _ORG_POLICIES is None:
+                _ORG_POLICIES = PolicyWatcher(
+                    build_policy_source(_ORG_POLICY_PATH, url=_ORG_POLICY_URL),
+                    _compile_org_policies,
+                    reload_interval=_ORG_POLICY_RELOAD_SECONDS,
+                    strict=False,
+                )
+    return _ORG_POLICIES.current()
+
+
+def resolve_tenant(plan: OrchestrationPlan) -> str | None:
+    """Return the organisation, team or user a plan is billed to, if any."""
+
     policy_fields = ("orgId", "organizationId", "tenantId", "teamId", "userId")
     for field in policy_fields:
         value = getattr(plan.policies, field, None)
@@ -421,7 +369,7 @@ def _enforce_org_policy(
     policies = _load_org_policies()
     if not policies:
         return {}
-    tenant = _resolve_tenant(plan)
+    tenant = resolve_tenant(plan)
     record = None
     if tenant and tenant in policies:
         record = policies[tenant]
@@ -448,31 +396,44 @@ def _enforce_org_policy(
     return policy_info
 
 
-def _simulate_chain_steps(
-    plan: OrchestrationPlan,
-    risks: List[str],
-    risk_details: List[Dict[str, str]],
-    blockers: List[str],
-) -> Tuple[List[Dict[str, Any]], int, int]:
-    chain_calls: List[Dict[str, Any]] = []
-    total_gas = 0
-    total_fee = 0
+@dataclass
+class _ChainBatch:
+    """Chain steps of a plan and the JSON-RPC calls that simulate them."""
+
+    entries: List[Tuple[Dict[str, Any], Dict[str, Any] | None]] = field(default_factory=list)
+    calls: List[RpcCall] = field(default_factory=list)
+    gas_price_index: int | None = None
+
+
+ChainOutcome = Union[List[Any], RpcTransportError]
+ChainSimulation = Tuple[List[Dict[str, Any]], int, int]
 
+
+def _plan_chain_batch(plan: OrchestrationPlan) -> _ChainBatch:
+    """Collect ``eth_estimateGas``/``eth_call`` pairs for every chain step.
+
+    One ``eth_gasPrice`` is shared by all steps that do not pin a fee, so a
+    plan is simulated with a single JSON-RPC round trip.
+    """
+
+    batch = _ChainBatch()
     for step in plan.steps:
         if step.kind != "chain":
             continue
         call = _extract_call(step)
         if call is None:
-            chain_calls.append(
-                {
-                    "step_id": step.id,
-                    "tool": step.tool,
-                    "status": "skipped",
-                    "error": "CALL_DATA_MISSING",
-                }
+            batch.entries.append(
+                (
+                    {
+                        "step_id": step.id,
+                        "tool": step.tool,
+                        "status": "skipped",
+                        "error": "CALL_DATA_MISSING",
+                    },
+                    None,
+                )
             )
             continue
-
         step_result: Dict[str, Any] = {
             "step_id": step.id,
             "tool": step.tool,
@@ -482,55 +443,118 @@ def _simulate_chain_steps(
                 if call.get(key) is not None
             },
         }
+        batch.entries.append((step_result, call))
+        batch.calls.append(("eth_estimateGas", [call]))
+        batch.calls.append(("eth_call", [call, "latest"]))
+        if batch.gas_price_index is None and _quantity_to_int(call.get("gasPrice") or call.get("maxFeePerGas")) == 0:
+            batch.gas_price_index = len(batch.calls)
+            batch.calls.append(("eth_gasPrice", []))
+    return batch
+
+
+def _execute_chain_batch(batch: _ChainBatch) -> ChainOutcome:
+    if not batch.calls:
+        return []
+    try:
+        return get_rpc_client().batch(batch.calls)
+    except RpcTransportError as exc:
+        return exc
 
-        try:
-            gas_hex = _rpc_request("eth_estimateGas", [call])
-            gas_estimate = _quantity_to_int(gas_hex)
-        except JsonRpcError as exc:
-            reason, revert_data = _extract_revert_details(exc)
-            code = _classify_revert(reason)
-            friendly = _RISK_GUIDANCE.get(code)
-            message = friendly
-            if reason and friendly:
-                message = f"{friendly} (Revert: {reason})"
-            elif reason:
-                message = reason
-            _append_risk(risks, risk_details, code, message_override=message)
-            _append_blocker(blockers, code)
-            step_result.update(
-                {
-                    "status": "error",
-                    "error": exc.args[0] if exc.args else "execution reverted",
-                    "revert_reason": reason,
-                    "revert_data": revert_data,
-                }
-            )
+
+async def _execute_chain_batch_async(batch: _ChainBatch) -> ChainOutcome:
+    if not batch.calls:
+        return []
+    try:
+        return await get_rpc_client().abatch(batch.calls)
+    except RpcTransportError as exc:
+        return exc
+
+
+def _record_revert(
+    exc: JsonRpcError,
+    step_result: Dict[str, Any],
+    risks: List[str],
+    risk_details: List[Dict[str, str]],
+    blockers: List[str],
+) -> None:
+    reason, revert_data = _extract_revert_details(exc)
+    code = _classify_revert(reason)
+    friendly = _RISK_GUIDANCE.get(code)
+    message = friendly
+    if reason and friendly:
+        message = f"{friendly} (Revert: {reason})"
+    elif reason:
+        message = reason
+    _append_risk(risks, risk_details, code, message_override=message)
+    _append_blocker(blockers, code)
+    step_result.update(
+        {
+            "status": "error",
+            "error": exc.args[0] if exc.args else "execution reverted",
+            "revert_reason": reason,
+            "revert_data": revert_data,
+        }
+    )
+
+
+def _record_failure(
+    code: str,
+    exc: Exception,
+    step_result: Dict[str, Any],
+    risks: List[str],
+    risk_details: List[Dict[str, str]],
+    blockers: List[str],
+) -> None:
+    friendly = _RISK_GUIDANCE.get(code)
+    detail = str(exc)
+    message = friendly
+    if detail and friendly:
+        message = f"{friendly} ({detail})"
+    elif detail:
+        message = detail
+    _append_risk(risks, risk_details, code, message_override=message)
+    _append_blocker(blockers, code)
+    step_result.update({"status": "error", "error": detail or code})
+
+
+def _apply_chain_results(
+    batch: _ChainBatch,
+    outcome: ChainOutcome,
+    risks: List[str],
+    risk_details: List[Dict[str, str]],
+    blockers: List[str],
+) -> ChainSimulation:
+    chain_calls: List[Dict[str, Any]] = []
+    total_gas = 0
+    total_fee = 0
+
+    shared_gas_price = 0
+    if isinstance(outcome, list) and batch.gas_price_index is not None:
+        price_result = outcome[batch.gas_price_index]
+        if not isinstance(price_result, JsonRpcError):
+            shared_gas_price = _quantity_to_int(price_result)
+
+    position = 0
+    for step_result, call in batch.entries:
+        if call is None:
             chain_calls.append(step_result)
             continue
-        except RpcTransportError as exc:
-            friendly = _RISK_GUIDANCE.get("RPC_TIMEOUT")
-            detail = str(exc)
-            message = friendly
-            if detail and friendly:
-                message = f"{friendly} ({detail})"
-            elif detail:
-                message = detail
-            _append_risk(risks, risk_details, "RPC_TIMEOUT", message_override=message)
-            _append_blocker(blockers, "RPC_TIMEOUT")
-            step_result.update({"status": "error", "error": str(exc) or "RPC_TIMEOUT"})
+        if isinstance(outcome, RpcTransportError):
+            _record_failure("RPC_TIMEOUT", outcome, step_result, risks, risk_details, blockers)
             chain_calls.append(step_result)
             break
+        estimate_result = outcome[position]
+        call_result = outcome[position + 1]
+        position += 3 if position + 2 == batch.gas_price_index else 2
+
+        if isinstance(estimate_result, JsonRpcError):
+            _record_revert(estimate_result, step_result, risks, risk_details, blockers)
+            chain_calls.append(step_result)
+            continue
+        try:
+            gas_estimate = _quantity_to_int(estimate_result)
         except Exception as exc:  # pragma: no cover - defensive catch-all
-            friendly = _RISK_GUIDANCE.get("UNKNOWN_REVERT")
-            message = friendly
-            detail = str(exc)
-            if detail and friendly:
-                message = f"{friendly} ({detail})"
-            elif detail:
-                message = detail
-            _append_risk(risks, risk_details, "UNKNOWN_REVERT", message_override=message)
-            _append_blocker(blockers, "UNKNOWN_REVERT")
-            step_result.update({"status": "error", "error": str(exc)})
+            _record_failure("UNKNOWN_REVERT", exc, step_result, risks, risk_details, blockers)
             chain_calls.append(step_result)
             continue
 
@@ -538,51 +562,15 @@ def _simulate_chain_steps(
         step_result["gas_estimate_int"] = str(gas_estimate)
         total_gas += gas_estimate
 
-        gas_price = _quantity_to_int(call.get("gasPrice") or call.get("maxFeePerGas"))
-        if gas_price == 0:
-            try:
-                gas_price_hex = _rpc_request("eth_gasPrice", [])
-                gas_price = _quantity_to_int(gas_price_hex)
-            except (JsonRpcError, RpcTransportError):
-                gas_price = 0
+        gas_price = _quantity_to_int(call.get("gasPrice") or call.get("maxFeePerGas")) or shared_gas_price
         step_result["gas_price"] = hex(gas_price) if gas_price else None
 
         step_fee = gas_estimate * gas_price if gas_price else 0
         step_result["fee_wei"] = str(step_fee) if step_fee else None
         total_fee += step_fee
 
-        try:
-            call_result = _rpc_request("eth_call", [call, "latest"])
-        except JsonRpcError as exc:
-            reason, revert_data = _extract_revert_details(exc)
-            code = _classify_revert(reason)
-            friendly = _RISK_GUIDANCE.get(code)
-            message = friendly
-            if reason and friendly:
-                message = f"{friendly} (Revert: {reason})"
-            elif reason:
-                message = reason
-            _append_risk(risks, risk_details, code, message_override=message)
-            _append_blocker(blockers, code)
-            step_result.update(
-                {
-                    "status": "error",
-                    "error": exc.args[0] if exc.args else "execution reverted",
-                    "revert_reason": reason,
-                    "revert_data": revert_data,
-                }
-            )
-        except RpcTransportError as exc:
-            friendly = _RISK_GUIDANCE.get("RPC_TIMEOUT")
-            detail = str(exc)
-            message = friendly
-            if detail and friendly:
-                message = f"{friendly} ({detail})"
-            elif detail:
-                message = detail
-            _append_risk(risks, risk_details, "RPC_TIMEOUT", message_override=message)
-            _append_blocker(blockers, "RPC_TIMEOUT")
-            step_result.update({"status": "error", "error": str(exc) or "RPC_TIMEOUT"})
+        if isinstance(call_result, JsonRpcError):
+            _record_revert(call_result, step_result, risks, risk_details, blockers)
         else:
             step_result["status"] = "ok"
             step_result["result"] = call_result
@@ -592,9 +580,40 @@ def _simulate_chain_steps(
     return chain_calls, total_gas, total_fee
 
 
+def _simulate_chain_steps(
+    plan: OrchestrationPlan,
+    risks: List[str],
+    risk_details: List[Dict[str, str]],
+    blockers: List[str],
+) -> ChainSimulation:
+    batch = _plan_chain_batch(plan)
+    return _apply_chain_results(batch, _execute_chain_batch(batch), risks, risk_details, blockers)
+
+
 def simulate_plan(plan: OrchestrationPlan) -> SimOut:
     """Return budget/time estimates and guardrail feedback."""
 
+    return _assemble_simulation(
+        plan,
+        lambda risks, risk_details, blockers: _simulate_chain_steps(plan, risks, risk_details, blockers),
+    )
+
+
+async def simulate_plan_async(plan: OrchestrationPlan) -> SimOut:
+    """Async variant of :func:`simulate_plan` for event-loop callers."""
+
+    batch = _plan_chain_batch(plan)
+    outcome = await _execute_chain_batch_async(batch)
+    return _assemble_simulation(
+        plan,
+        lambda risks, risk_details, blockers: _apply_chain_results(batch, outcome, risks, risk_details, blockers),
+    )
+
+
+def _assemble_simulation(
+    plan: OrchestrationPlan,
+    simulate_chain: Callable[[List[str], List[Dict[str, str]], List[str]], ChainSimulation],
+) -> SimOut:
     total_budget, total_fees = _estimate_budget(plan)
     needs_budget = _requires_budget(plan)
 
@@ -624,7 +643,7 @@ def simulate_plan(plan: OrchestrationPlan) -> SimOut:
         _append_risk(risks, risk_details, "OVER_BUDGET")
         _append_blocker(blockers, "OVER_BUDGET")
 
-    chain_calls, total_gas, total_fee_native = _simulate_chain_steps(plan, risks, risk_details, blockers)
+    chain_calls, total_gas, total_fee_native = simulate_chain(risks, risk_details, blockers)
     if chain_calls:
         confirmations.append(
             "Simulated {count} chain step(s); estimated gas {gas}.".format(
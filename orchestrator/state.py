@@ -2,30 +2,163 @@
 
 from __future__ import annotations
 
+import atexit
+import base64
+import gzip
 import json
+import logging
 import os
+import sqlite3
 import threading
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from pydantic import ValidationError
 
 from .models import StatusOut
 
+_LOGGER = logging.getLogger(__name__)
+
 _DEFAULT_DIR = Path(os.environ.get("ORCHESTRATOR_STATE_DIR", "storage/orchestrator/runs"))
+_DEFAULT_ARCHIVE_DIR = Path(os.environ.get("ORCHESTRATOR_STATE_ARCHIVE_DIR", "storage/orchestrator/archive"))
+_DURABILITY_TRANSITION = "transition"
+_DURABILITY_GROUP = "group"
+_RUN_STATES = ("pending", "running", "succeeded", "failed")
+TERMINAL_STATES = frozenset({"succeeded", "failed"})
+_DEFAULT_PAGE_SIZE = 100
 
 
 class RunStateError(RuntimeError):
     """Raised when a persistence backend cannot be initialised."""
 
 
+@dataclass(frozen=True)
+class RunIndexEntry:
+    """Secondary index row describing a persisted run."""
+
+    run_id: str
+    plan_id: str
+    state: str
+    updated_at: float
+
+    @property
+    def sort_key(self) -> Tuple[float, str]:
+        return (self.updated_at, self.run_id)
+
+
+@dataclass
+class RunPage:
+    """One page of :meth:`RunStateStore.list` results.
+
+    ``cursor`` is ``None`` on the last page; otherwise pass it back to fetch
+    the next page.
+    """
+
+    entries: List[RunIndexEntry] = field(default_factory=list)
+    cursor: Optional[str] = None
+
+
+def _encode_cursor(entry: RunIndexEntry) -> str:
+    raw = json.dumps([entry.updated_at, entry.run_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[Tuple[float, str]]:
+    if not cursor:
+        return None
+    try:
+        updated_at, run_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(updated_at), str(run_id)
+    except (ValueError, TypeError) as exc:
+        raise RunStateError("Invalid run listing cursor") from exc
+
+
+def _page(entries: List[RunIndexEntry], limit: int) -> RunPage:
+    """Trim ``entries`` (fetched with one look-ahead row) into a page."""
+
+    if len(entries) > limit:
+        entries = entries[:limit]
+        return RunPage(entries=entries, cursor=_encode_cursor(entries[-1]))
+    return RunPage(entries=entries)
+
+
+def _status_timestamp(status: StatusOut) -> float:
+    run = status.run
+    return run.completed_at or run.started_at or run.created_at
+
+
+def _index_entry(status: StatusOut, updated_at: float) -> RunIndexEntry:
+    return RunIndexEntry(run_id=status.run.id, plan_id=status.run.plan_id, state=status.run.state, updated_at=updated_at)
+
+
+class RunArchive:
+    """Compressed cold store for terminal runs evicted from the hot store.
+
+    Archived statuses are appended as gzip-compressed JSON lines to one segment
+    per UTC day.  Every :meth:`write` appends a complete gzip member, so a
+    segment stays readable even if a later append is torn.  Lookups scan the
+    segments newest first and are meant for audits, not the request path.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self._root = (root or _DEFAULT_ARCHIVE_DIR).resolve()
+        self._lock = threading.Lock()
+        self._root.mkdir(parents=True, exist_ok=True)
+
+    def segments(self) -> List[Path]:
+        return sorted(self._root.glob("runs-*.jsonl.gz"), reverse=True)
+
+    def write(self, statuses: Sequence[StatusOut]) -> None:
+        if not statuses:
+            return
+        lines = "".join(
+            json.dumps(status.model_dump(mode="json"), ensure_ascii=False, sort_keys=True) + "\n" for status in statuses
+        )
+        segment = self._root / time.strftime("runs-%Y%m%d.jsonl.gz", time.gmtime())
+        with self._lock:
+            with segment.open("ab") as handle:
+                handle.write(gzip.compress(lines.encode("utf-8")))
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    def iter_statuses(self) -> Iterator[StatusOut]:
+        for segment in self.segments():
+            yield from self._read_segment(segment)
+
+    def load(self, run_id: str) -> Optional[StatusOut]:
+        for segment in self.segments():
+            found: Optional[StatusOut] = None
+            for status in self._read_segment(segment):
+                if status.run.id == run_id:
+                    found = status
+            if found is not None:
+                return found
+        return None
+
+    def _read_segment(self, segment: Path) -> Iterator[StatusOut]:
+        try:
+            with gzip.open(segment, "rt", encoding="utf-8") as handle:
+                for line in handle:
+                    if line.strip():
+                        yield StatusOut.model_validate_json(line)
+        except (OSError, EOFError, ValidationError) as exc:
+            _LOGGER.warning("Stopped reading run archive segment %s: %s", segment, exc)
+
+
 class RunStateStore:
     """Abstract interface for run state persistence backends."""
 
     def save(self, status: StatusOut) -> None:
         raise NotImplementedError
 
+    def save_many(self, statuses: Sequence[StatusOut]) -> None:
+        """Persist several runs at once; backends override this with a bulk path."""
+
+        for status in statuses:
+            self.save(status)
+
     def load(self, run_id: str) -> Optional[StatusOut]:
         raise NotImplementedError
 
@@ -35,6 +168,182 @@ class RunStateStore:
     def list_ids(self) -> Iterable[str]:
         raise NotImplementedError
 
+    def list(
+        self,
+        *,
+        plan_id: Optional[str] = None,
+        state: Optional[str] = None,
+        updated_after: Optional[float] = None,
+        updated_before: Optional[float] = None,
+        limit: int = _DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> RunPage:
+        """Return runs ordered by ``(updated_at, run_id)``, one page at a time.
+
+        ``updated_after`` is inclusive and ``updated_before`` exclusive.  The
+        built-in backends answer from a secondary index; this fallback loads
+        every run and uses the run's own timestamps as ``updated_at``.
+        """
+
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        after = _decode_cursor(cursor)
+        entries: List[RunIndexEntry] = []
+        for run_id in self.list_ids():
+            status = self.load(run_id)
+            if status is None:
+                continue
+            entry = _index_entry(status, _status_timestamp(status))
+            if _matches(entry, plan_id, state, updated_after, updated_before, after):
+                entries.append(entry)
+        entries.sort(key=lambda entry: entry.sort_key)
+        return _page(entries[: limit + 1], limit)
+
+    def archive_expired(
+        self,
+        archive: RunArchive,
+        *,
+        ttl: float,
+        now: Optional[float] = None,
+        batch_size: int = 256,
+    ) -> List[str]:
+        """Move terminal runs not updated for ``ttl`` seconds into ``archive``.
+
+        Returns the archived run ids.  Runs are written to the archive before
+        they are deleted, so a crash in between leaves a duplicate rather than
+        a lost run.
+        """
+
+        cutoff = (time.time() if now is None else now) - ttl
+        archived: List[str] = []
+        for state in sorted(TERMINAL_STATES):
+            cursor: Optional[str] = None
+            while True:
+                page = self.list(state=state, updated_before=cutoff, limit=batch_size, cursor=cursor)
+                statuses = [status for status in (self.load(entry.run_id) for entry in page.entries) if status]
+                if statuses:
+                    archive.write(statuses)
+                    for status in statuses:
+                        self.delete(status.run.id)
+                        archived.append(status.run.id)
+                if page.cursor is None:
+                    break
+                cursor = page.cursor
+        return archived
+
+
+def _matches(
+    entry: RunIndexEntry,
+    plan_id: Optional[str],
+    state: Optional[str],
+    updated_after: Optional[float],
+    updated_before: Optional[float],
+    after: Optional[Tuple[float, str]],
+) -> bool:
+    if plan_id is not None and entry.plan_id != plan_id:
+        return False
+    if state is not None and entry.state != state:
+        return False
+    if updated_after is not None and entry.updated_at < updated_after:
+        return False
+    if updated_before is not None and entry.updated_at >= updated_before:
+        return False
+    return after is None or entry.sort_key > after
+
+
+class _SqliteRunIndex:
+    """SQLite secondary index over the run files of :class:`FileRunStateStore`."""
+
+    def __init__(self, path: Path) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    plan_id TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS runs_state_updated ON runs (state, updated_at, run_id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS runs_plan_updated ON runs (plan_id, updated_at, run_id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS runs_updated ON runs (updated_at, run_id)")
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM runs LIMIT 1").fetchone() is None
+
+    def upsert(self, entries: Sequence[RunIndexEntry]) -> None:
+        rows = [(entry.run_id, entry.plan_id, entry.state, entry.updated_at) for entry in entries]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    """
+                    INSERT INTO runs (run_id, plan_id, state, updated_at) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (run_id) DO UPDATE SET
+                        plan_id = excluded.plan_id, state = excluded.state, updated_at = excluded.updated_at
+                    """,
+                    rows,
+                )
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def remove(self, run_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    def run_ids(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT run_id FROM runs")]
+
+    def query(
+        self,
+        *,
+        plan_id: Optional[str],
+        state: Optional[str],
+        updated_after: Optional[float],
+        updated_before: Optional[float],
+        after: Optional[Tuple[float, str]],
+        limit: int,
+    ) -> List[RunIndexEntry]:
+        clauses: List[str] = []
+        params: List[object] = []
+        if plan_id is not None:
+            clauses.append("plan_id = ?")
+            params.append(plan_id)
+        if state is not None:
+            clauses.append("state = ?")
+            params.append(state)
+        if updated_after is not None:
+            clauses.append("updated_at >= ?")
+            params.append(updated_after)
+        if updated_before is not None:
+            clauses.append("updated_at < ?")
+            params.append(updated_before)
+        if after is not None:
+            clauses.append("(updated_at, run_id) > (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT run_id, plan_id, state, updated_at FROM runs {where} ORDER BY updated_at, run_id LIMIT ?",
+                params,
+            ).fetchall()
+        return [RunIndexEntry(*row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
 
 class FileRunStateStore(RunStateStore):
     """Store run state on disk as JSON payloads.
@@ -42,28 +351,99 @@ class FileRunStateStore(RunStateStore):
     The goal is to provide a deterministic persistence layer that works out of the
     box for unit tests and local development.  Production deployments can swap the
     implementation via :func:`get_store`.
+
+    Payloads are sharded into sub-directories named after the first
+    ``shard_width`` characters of the run id so no single directory grows past
+    a few thousand entries.  A SQLite index next to the shards answers
+    :meth:`list` queries; it is rebuilt from the payloads when missing.  Files
+    written by older releases directly under ``root`` are still readable and
+    move into their shard on the next save.
     """
 
-    def __init__(self, root: Path | None = None) -> None:
+    def __init__(self, root: Path | None = None, *, shard_width: int = 2) -> None:
+        if shard_width <= 0:
+            raise ValueError("shard_width must be positive")
         self._root = (root or _DEFAULT_DIR).resolve()
+        self._shard_width = shard_width
         self._lock = threading.Lock()
         self._root.mkdir(parents=True, exist_ok=True)
+        self._has_legacy = any(self._root.glob("*.json"))
+        self._index = _SqliteRunIndex(self._root / "index.sqlite3")
+        if self._index.is_empty():
+            self._rebuild_index()
 
     def _path(self, run_id: str) -> Path:
+        shard = run_id[: self._shard_width].ljust(self._shard_width, "_")
+        return self._root / shard / f"{run_id}.json"
+
+    def _legacy_path(self, run_id: str) -> Path:
         return self._root / f"{run_id}.json"
 
+    def _iter_payload_paths(self) -> Iterator[Path]:
+        yield from self._root.glob("*/*.json")
+        yield from self._root.glob("*.json")
+
+    def _rebuild_index(self) -> None:
+        entries: List[RunIndexEntry] = []
+        for path in self._iter_payload_paths():
+            try:
+                status = StatusOut.model_validate_json(path.read_bytes())
+            except (OSError, ValidationError) as exc:
+                _LOGGER.warning("Skipping unreadable run state file %s: %s", path, exc)
+                continue
+            entries.append(_index_entry(status, path.stat().st_mtime))
+        if entries:
+            self._index.upsert(entries)
+            _LOGGER.info("Indexed %d persisted runs under %s", len(entries), self._root)
+
+    def _write_payload(self, run_id: str, payload: Dict[str, object], *, sync: bool) -> tuple[Path, Path]:
+        target = self._path(run_id)
+        target.parent.mkdir(exist_ok=True)
+        tmp_path = target.with_suffix(".json.tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False, sort_keys=True)
+            if sync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        return tmp_path, target
+
+    def _drop_legacy(self, run_id: str) -> None:
+        if self._has_legacy:
+            self._legacy_path(run_id).unlink(missing_ok=True)
+
     def save(self, status: StatusOut) -> None:
         payload = status.model_dump(mode="json")
         with self._lock:
-            tmp_path = self._path(status.run.id).with_suffix(".json.tmp")
-            with tmp_path.open("w", encoding="utf-8") as handle:
-                json.dump(payload, handle, ensure_ascii=False, sort_keys=True)
-            tmp_path.replace(self._path(status.run.id))
+            tmp_path, target = self._write_payload(status.run.id, payload, sync=False)
+            tmp_path.replace(target)
+            self._drop_legacy(status.run.id)
+            self._index.upsert([_index_entry(status, time.time())])
+
+    def save_many(self, statuses: Sequence[StatusOut]) -> None:
+        payloads = [(status, status.model_dump(mode="json")) for status in statuses]
+        if not payloads:
+            return
+        with self._lock:
+            staged: List[tuple[Path, Path]] = []
+            for status, payload in payloads:
+                staged.append(self._write_payload(status.run.id, payload, sync=True))
+            shards = set()
+            for tmp_path, target in staged:
+                tmp_path.replace(target)
+                shards.add(target.parent)
+            for shard in shards:
+                _fsync_directory(shard)
+            now = time.time()
+            for status, _ in payloads:
+                self._drop_legacy(status.run.id)
+            self._index.upsert([_index_entry(status, now) for status, _ in payloads])
 
     def load(self, run_id: str) -> Optional[StatusOut]:
         path = self._path(run_id)
         if not path.exists():
-            return None
+            path = self._legacy_path(run_id)
+            if not self._has_legacy or not path.exists():
+                return None
         try:
             with path.open("r", encoding="utf-8") as handle:
                 data = json.load(handle)
@@ -72,15 +452,50 @@ class FileRunStateStore(RunStateStore):
             raise RunStateError(f"Failed to load persisted run {run_id}: {exc}") from exc
 
     def delete(self, run_id: str) -> None:
-        path = self._path(run_id)
         with self._lock:
-            if path.exists():
-                path.unlink()
+            self._path(run_id).unlink(missing_ok=True)
+            self._drop_legacy(run_id)
+            self._index.remove(run_id)
 
     def list_ids(self) -> Iterable[str]:
-        if not self._root.exists():
-            return []
-        return [path.stem for path in self._root.glob("*.json")]
+        return self._index.run_ids()
+
+    def list(
+        self,
+        *,
+        plan_id: Optional[str] = None,
+        state: Optional[str] = None,
+        updated_after: Optional[float] = None,
+        updated_before: Optional[float] = None,
+        limit: int = _DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> RunPage:
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        entries = self._index.query(
+            plan_id=plan_id,
+            state=state,
+            updated_after=updated_after,
+            updated_before=updated_before,
+            after=_decode_cursor(cursor),
+            limit=limit + 1,
+        )
+        return _page(entries, limit)
+
+
+def _fsync_directory(path: Path) -> None:
+    """Flush directory metadata so a batch of renames survives a crash."""
+
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:  # pragma: no cover - platforms without directory handles
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover - e.g. Windows
+        pass
+    finally:
+        os.close(fd)
 
 
 @dataclass
@@ -98,7 +513,16 @@ class _RedisFacade:
 
 
 class RedisRunStateStore(RunStateStore):
-    """Redis-backed state store for horizontal scaling deployments."""
+    """Redis-backed state store for horizontal scaling deployments.
+
+    Besides the payload key per run, every save maintains sorted sets scored
+    by ``updated_at`` (all runs, per state and per plan) plus a metadata hash,
+    which :meth:`list` walks instead of scanning the keyspace.
+    """
+
+    _SCAN_COUNT = 1000
+    _META_KEY = "orchestrator:runs:meta"
+    _ALL_KEY = "orchestrator:runs:by-updated"
 
     def __init__(self, url: str) -> None:
         self._facade = _RedisFacade.create(url)
@@ -106,9 +530,36 @@ class RedisRunStateStore(RunStateStore):
     def _key(self, run_id: str) -> str:
         return f"orchestrator:run:{run_id}"
 
-    def save(self, status: StatusOut) -> None:
+    def _state_key(self, state: str) -> str:
+        return f"orchestrator:runs:state:{state}"
+
+    def _plan_key(self, plan_id: str) -> str:
+        return f"orchestrator:runs:plan:{plan_id}"
+
+    def _stage(self, pipeline: "redis.client.Pipeline", status: StatusOut, updated_at: float) -> None:
+        run = status.run
         payload = json.dumps(status.model_dump(mode="json"), ensure_ascii=False)
-        self._facade.client.set(self._key(status.run.id), payload)
+        meta = json.dumps({"plan_id": run.plan_id, "state": run.state, "updated_at": updated_at})
+        pipeline.set(self._key(run.id), payload)
+        pipeline.hset(self._META_KEY, run.id, meta)
+        pipeline.zadd(self._ALL_KEY, {run.id: updated_at})
+        pipeline.zadd(self._plan_key(run.plan_id), {run.id: updated_at})
+        for state in _RUN_STATES:
+            if state != run.state:
+                pipeline.zrem(self._state_key(state), run.id)
+        pipeline.zadd(self._state_key(run.state), {run.id: updated_at})
+
+    def save(self, status: StatusOut) -> None:
+        self.save_many([status])
+
+    def save_many(self, statuses: Sequence[StatusOut]) -> None:
+        if not statuses:
+            return
+        pipeline = self._facade.client.pipeline(transaction=False)
+        now = time.time()
+        for status in statuses:
+            self._stage(pipeline, status, now)
+        pipeline.execute()
 
     def load(self, run_id: str) -> Optional[StatusOut]:
         data = self._facade.client.get(self._key(run_id))
@@ -118,17 +569,74 @@ class RedisRunStateStore(RunStateStore):
         return StatusOut.model_validate(payload)
 
     def delete(self, run_id: str) -> None:
-        self._facade.client.delete(self._key(run_id))
+        client = self._facade.client
+        meta = client.hget(self._META_KEY, run_id)
+        pipeline = client.pipeline(transaction=False)
+        pipeline.delete(self._key(run_id))
+        pipeline.hdel(self._META_KEY, run_id)
+        pipeline.zrem(self._ALL_KEY, run_id)
+        for state in _RUN_STATES:
+            pipeline.zrem(self._state_key(state), run_id)
+        if meta:
+            pipeline.zrem(self._plan_key(json.loads(meta)["plan_id"]), run_id)
+        pipeline.execute()
 
     def list_ids(self) -> Iterable[str]:
-        pattern = self._key("*")
-        keys = self._facade.client.keys(pattern)
         prefix = self._key("")
-        return [key.decode("utf-8")[len(prefix):] for key in keys]
+        for key in self._facade.client.scan_iter(match=self._key("*"), count=self._SCAN_COUNT):
+            yield key.decode("utf-8")[len(prefix):]
+
+    def list(
+        self,
+        *,
+        plan_id: Optional[str] = None,
+        state: Optional[str] = None,
+        updated_after: Optional[float] = None,
+        updated_before: Optional[float] = None,
+        limit: int = _DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> RunPage:
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        client = self._facade.client
+        after = _decode_cursor(cursor)
+        if state is not None:
+            key = self._state_key(state)
+        elif plan_id is not None:
+            key = self._plan_key(plan_id)
+        else:
+            key = self._ALL_KEY
+        lower: object = "-inf"
+        if updated_after is not None or after is not None:
+            lower = max(value for value in (updated_after, after[0] if after else None) if value is not None)
+        upper = f"({updated_before!r}" if updated_before is not None else "+inf"
+        entries: List[RunIndexEntry] = []
+        offset = 0
+        batch = max(limit + 1, 64)
+        while len(entries) <= limit:
+            chunk = client.zrangebyscore(key, lower, upper, start=offset, num=batch, withscores=True)
+            if not chunk:
+                break
+            offset += len(chunk)
+            run_ids = [member.decode("utf-8") for member, _ in chunk]
+            for run_id, (_, score), meta in zip(run_ids, chunk, client.hmget(self._META_KEY, run_ids)):
+                if not meta:
+                    continue
+                fields = json.loads(meta)
+                entry = RunIndexEntry(run_id=run_id, plan_id=fields["plan_id"], state=fields["state"], updated_at=score)
+                if _matches(entry, plan_id, state, updated_after, updated_before, after):
+                    entries.append(entry)
+                    if len(entries) > limit:
+                        break
+        return _page(entries, limit)
 
 
 class PostgresRunStateStore(RunStateStore):
-    """PostgreSQL-backed persistence using a simple JSONB table."""
+    """PostgreSQL-backed persistence using a simple JSONB table.
+
+    ``plan_id`` and ``state`` are denormalised into columns indexed together
+    with ``updated_at`` so :meth:`list` uses keyset pagination.
+    """
 
     def __init__(self, dsn: str) -> None:
         try:
@@ -147,17 +655,61 @@ class PostgresRunStateStore(RunStateStore):
                 )
                 """
             )
+            cur.execute("ALTER TABLE orchestrator_runs ADD COLUMN IF NOT EXISTS plan_id TEXT")
+            cur.execute("ALTER TABLE orchestrator_runs ADD COLUMN IF NOT EXISTS state TEXT")
+            cur.execute(
+                """
+                UPDATE orchestrator_runs
+                SET plan_id = payload->'run'->>'plan_id', state = payload->'run'->>'state'
+                WHERE state IS NULL
+                """
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS orchestrator_runs_state_updated "
+                "ON orchestrator_runs (state, updated_at, run_id)"
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS orchestrator_runs_plan_updated "
+                "ON orchestrator_runs (plan_id, updated_at, run_id)"
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS orchestrator_runs_updated ON orchestrator_runs (updated_at, run_id)"
+            )
 
     def save(self, status: StatusOut) -> None:
         payload = json.dumps(status.model_dump(mode="json"), ensure_ascii=False)
         with self._pool.cursor() as cur:
             cur.execute(
                 """
-                INSERT INTO orchestrator_runs (run_id, payload)
-                VALUES (%s, %s)
-                ON CONFLICT (run_id) DO UPDATE SET payload = EXCLUDED.payload, updated_at = NOW()
+                INSERT INTO orchestrator_runs (run_id, payload, plan_id, state)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (run_id) DO UPDATE SET
+                    payload = EXCLUDED.payload, plan_id = EXCLUDED.plan_id, state = EXCLUDED.state, updated_at = NOW()
+                """,
+                (status.run.id, payload, status.run.plan_id, status.run.state),
+            )
+
+    def save_many(self, statuses: Sequence[StatusOut]) -> None:
+        rows: Dict[str, tuple[str, str, str]] = {}
+        for status in statuses:
+            payload = json.dumps(status.model_dump(mode="json"), ensure_ascii=False)
+            rows[status.run.id] = (payload, status.run.plan_id, status.run.state)
+        if not rows:
+            return
+        placeholders = ", ".join(["(%s, %s, %s, %s, NOW())"] * len(rows))
+        params: List[str] = []
+        for run_id, row in rows.items():
+            params.append(run_id)
+            params.extend(row)
+        with self._pool.cursor() as cur:
+            cur.execute(
+                f"""
+                INSERT INTO orchestrator_runs (run_id, payload, plan_id, state, updated_at)
+                VALUES {placeholders}
+                ON CONFLICT (run_id) DO UPDATE SET
+                    payload = EXCLUDED.payload, plan_id = EXCLUDED.plan_id, state = EXCLUDED.state, updated_at = NOW()
                 """,
-                (status.run.id, payload),
+                params,
             )
 
     def load(self, run_id: str) -> Optional[StatusOut]:
@@ -174,12 +726,231 @@ class PostgresRunStateStore(RunStateStore):
             cur.execute("DELETE FROM orchestrator_runs WHERE run_id = %s", (run_id,))
 
     def list_ids(self) -> Iterable[str]:
+        cursor: Optional[str] = None
+        while True:
+            page = self.list(limit=1000, cursor=cursor)
+            for entry in page.entries:
+                yield entry.run_id
+            if page.cursor is None:
+                return
+            cursor = page.cursor
+
+    def list(
+        self,
+        *,
+        plan_id: Optional[str] = None,
+        state: Optional[str] = None,
+        updated_after: Optional[float] = None,
+        updated_before: Optional[float] = None,
+        limit: int = _DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> RunPage:
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        clauses: List[str] = []
+        params: List[object] = []
+        if plan_id is not None:
+            clauses.append("plan_id = %s")
+            params.append(plan_id)
+        if state is not None:
+            clauses.append("state = %s")
+            params.append(state)
+        if updated_after is not None:
+            clauses.append("updated_at >= to_timestamp(%s)")
+            params.append(updated_after)
+        if updated_before is not None:
+            clauses.append("updated_at < to_timestamp(%s)")
+            params.append(updated_before)
+        after = _decode_cursor(cursor)
+        if after is not None:
+            clauses.append("(updated_at, run_id) > (to_timestamp(%s), %s)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit + 1)
         with self._pool.cursor() as cur:
-            cur.execute("SELECT run_id FROM orchestrator_runs")
-            return [row[0] for row in cur.fetchall()]
+            cur.execute(
+                f"""
+                SELECT run_id, plan_id, state, EXTRACT(EPOCH FROM updated_at)::float8
+                FROM orchestrator_runs {where}
+                ORDER BY updated_at, run_id
+                LIMIT %s
+                """,
+                params,
+            )
+            rows = cur.fetchall()
+        return _page([RunIndexEntry(*row) for row in rows], limit)
+
+
+class GroupCommitRunStateStore(RunStateStore):
+    """Coalesce run state writes and flush them to a backend in batches.
+
+    ``save`` only records the latest :class:`StatusOut` per run; a background
+    flusher hands the dirty set to the backend's :meth:`RunStateStore.save_many`
+    once ``max_batch`` runs are pending or ``interval`` seconds have elapsed
+    since the first unflushed write.  Reads consult the pending buffer first so
+    callers always observe their own writes.
+
+    Buffered statuses are serialised at flush time, so writes made between two
+    flushes collapse into a single backend write per run.
+    """
+
+    def __init__(self, backend: RunStateStore, *, interval: float = 0.005, max_batch: int = 256) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if max_batch <= 0:
+            raise ValueError("max_batch must be positive")
+        self._backend = backend
+        self._interval = interval
+        self._max_batch = max_batch
+        self._pending: Dict[str, StatusOut] = {}
+        self._inflight: Dict[str, StatusOut] = {}
+        self._oldest: Optional[float] = None
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="orchestrator-state-flusher", daemon=True)
+        self._thread.start()
+
+    @property
+    def backend(self) -> RunStateStore:
+        return self._backend
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def save(self, status: StatusOut) -> None:
+        with self._cond:
+            if self._closed:
+                raise RunStateError("GroupCommitRunStateStore is closed")
+            self._pending[status.run.id] = status
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+                self._cond.notify_all()
+            elif len(self._pending) >= self._max_batch:
+                self._cond.notify_all()
+
+    def save_many(self, statuses: Sequence[StatusOut]) -> None:
+        for status in statuses:
+            self.save(status)
+
+    def load(self, run_id: str) -> Optional[StatusOut]:
+        with self._cond:
+            pending = self._pending.get(run_id) or self._inflight.get(run_id)
+        if pending is not None:
+            return pending
+        return self._backend.load(run_id)
+
+    def delete(self, run_id: str) -> None:
+        with self._flush_lock:
+            with self._cond:
+                self._pending.pop(run_id, None)
+            self._backend.delete(run_id)
+
+    def list_ids(self) -> Iterable[str]:
+        with self._cond:
+            pending = list(self._pending)
+        known = list(self._backend.list_ids())
+        seen = set(known)
+        return known + [run_id for run_id in pending if run_id not in seen]
+
+    def list(
+        self,
+        *,
+        plan_id: Optional[str] = None,
+        state: Optional[str] = None,
+        updated_after: Optional[float] = None,
+        updated_before: Optional[float] = None,
+        limit: int = _DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> RunPage:
+        self.flush()
+        return self._backend.list(
+            plan_id=plan_id,
+            state=state,
+            updated_after=updated_after,
+            updated_before=updated_before,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    def archive_expired(
+        self,
+        archive: RunArchive,
+        *,
+        ttl: float,
+        now: Optional[float] = None,
+        batch_size: int = 256,
+    ) -> List[str]:
+        self.flush()
+        return self._backend.archive_expired(archive, ttl=ttl, now=now, batch_size=batch_size)
+
+    def flush(self) -> None:
+        """Write every pending status to the backend before returning."""
+
+        with self._flush_lock:
+            with self._cond:
+                self._inflight = self._pending
+                self._pending = {}
+                self._oldest = None
+                batch = list(self._inflight.values())
+            if not batch:
+                return
+            try:
+                self._backend.save_many(batch)
+            except Exception:
+                # Re-queue anything not superseded in the meantime so the next
+                # flush retries it rather than silently dropping state.
+                with self._cond:
+                    for status in batch:
+                        self._pending.setdefault(status.run.id, status)
+                    if self._oldest is None:
+                        self._oldest = time.monotonic()
+                raise
+            finally:
+                with self._cond:
+                    self._inflight = {}
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=max(1.0, self._interval * 10))
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._oldest is not None:
+                        if len(self._pending) >= self._max_batch:
+                            break
+                        remaining = self._oldest + self._interval - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as exc:  # pragma: no cover - backend outages are logged and retried
+                _LOGGER.warning("Group commit flush failed: %s", exc)
+                time.sleep(self._interval)
 
 
 _STORE_SINGLETON: Dict[str, RunStateStore] = {}
+_ARCHIVE_SINGLETON: Optional[RunArchive] = None
+
+
+def get_archive() -> RunArchive:
+    """Return the cold store under ``ORCHESTRATOR_STATE_ARCHIVE_DIR``."""
+
+    global _ARCHIVE_SINGLETON
+    if _ARCHIVE_SINGLETON is None:
+        _ARCHIVE_SINGLETON = RunArchive()
+    return _ARCHIVE_SINGLETON
 
 
 def get_store() -> RunStateStore:
@@ -188,11 +959,19 @@ def get_store() -> RunStateStore:
     The backend is chosen using ``ORCHESTRATOR_STATE_BACKEND`` which accepts
     ``file`` (default), ``redis`` or ``postgres``.  The helper caches the
     instantiated store since the runner calls it frequently.
+
+    ``ORCHESTRATOR_STATE_DURABILITY`` selects when writes reach the backend:
+    ``transition`` (default) persists every save synchronously, while
+    ``group`` wraps the backend in :class:`GroupCommitRunStateStore` and
+    commits within ``ORCHESTRATOR_STATE_GROUP_COMMIT_MS`` milliseconds or once
+    ``ORCHESTRATOR_STATE_GROUP_COMMIT_MAX`` runs are dirty.
     """
 
     backend = os.environ.get("ORCHESTRATOR_STATE_BACKEND", "file").lower()
-    if backend in _STORE_SINGLETON:
-        return _STORE_SINGLETON[backend]
+    durability = os.environ.get("ORCHESTRATOR_STATE_DURABILITY", _DURABILITY_TRANSITION).lower()
+    cache_key = f"{backend}:{durability}"
+    if cache_key in _STORE_SINGLETON:
+        return _STORE_SINGLETON[cache_key]
 
     if backend == "redis":
         url = os.environ.get("ORCHESTRATOR_STATE_URL", "redis://localhost:6379/0")
@@ -202,5 +981,12 @@ def get_store() -> RunStateStore:
         store = PostgresRunStateStore(dsn)
     else:
         store = FileRunStateStore()
-    _STORE_SINGLETON[backend] = store
+    if durability == _DURABILITY_GROUP:
+        interval_ms = float(os.environ.get("ORCHESTRATOR_STATE_GROUP_COMMIT_MS", "5"))
+        max_batch = int(os.environ.get("ORCHESTRATOR_STATE_GROUP_COMMIT_MAX", "256"))
+        store = GroupCommitRunStateStore(store, interval=interval_ms / 1000.0, max_batch=max_batch)
+        atexit.register(store.close)
+    elif durability != _DURABILITY_TRANSITION:
+        raise RunStateError(f"Unknown ORCHESTRATOR_STATE_DURABILITY mode: {durability}")
+    _STORE_SINGLETON[cache_key] = store
     return store
@@ -1,10 +1,11 @@
 """Tooling utilities for orchestration step execution."""
 
-from .executors import RetryPolicy, StepExecutionError, StepExecutor, StepResult
+from .executors import RetryPolicy, StepExecutionError, StepExecutor, StepResult, prepare_plan_agents
 
 __all__ = [
     "RetryPolicy",
     "StepExecutionError",
     "StepExecutor",
     "StepResult",
+    "prepare_plan_agents",
 ]
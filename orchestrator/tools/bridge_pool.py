@@ -0,0 +1,384 @@
+"""Pool of long-lived Node bridge workers speaking line-delimited JSON.
+
+A worker is started as ``node <bridge> --serve`` and exchanges one JSON object
+per line over stdin/stdout::
+
+    -> {"id": 7, "method": "run", "intent": "create_job", "payload": {...}}
+    <- {"id": 7, "ok": true, "logs": ["..."]}
+    <- {"id": 8, "ok": false, "logs": [], "error": "reason"}
+
+``{"id": n, "method": "ping"}`` must be answered with ``{"id": n, "ok": true}``
+and is used both as the start-up handshake and as the health check.  Requests
+are tagged with ids so a worker may process several of them concurrently and
+answer out of order; anything the worker writes to stderr is logged.
+
+A bridge only counts as lacking ``--serve`` when it says so: it answers the
+handshake with an "unsupported" error, or it exits having treated ``--serve``
+as a one-shot intent (non-protocol output) or printed a usage/unknown-flag
+error.  A handshake that merely runs late is a start-up failure that later
+requests retry after a backoff.
+"""
+
+from __future__ import annotations
+
+import atexit
+import itertools
+import json
+import logging
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Set, Union
+
+_LOGGER = logging.getLogger(__name__)
+
+# Output fragments of a bridge rejecting the ``--serve`` flag itself.
+_UNSUPPORTED_MARKERS = (
+    "unsupported",
+    "not supported",
+    "unknown option",
+    "unknown flag",
+    "unknown argument",
+    "unknown intent",
+    "unrecognized",
+    "usage:",
+)
+_MAX_START_BACKOFF = 30.0
+
+
+class BridgeWorkerError(RuntimeError):
+    """Raised when a bridge worker cannot serve a request."""
+
+
+class BridgeUnsupported(BridgeWorkerError):
+    """Raised when the bridge script does not implement ``--serve``."""
+
+
+class BridgeStartError(BridgeWorkerError):
+    """Raised when a worker could not be started this time; later requests retry."""
+
+
+class _BridgeWorker:
+    def __init__(self, script: Path, index: int) -> None:
+        self.index = index
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self.completed = 0
+        # Recent non-protocol stdout lines and stderr lines, for start-up diagnosis.
+        self.stray_output: Deque[str] = deque(maxlen=20)
+        self.stderr_tail: Deque[str] = deque(maxlen=20)
+        self.process = subprocess.Popen(
+            ["node", str(script), "--serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="ignore",
+            bufsize=1,
+        )
+        self._readers = [
+            threading.Thread(target=self._read_stdout, name=f"node-bridge-{index}-out", daemon=True),
+            threading.Thread(target=self._read_stderr, name=f"node-bridge-{index}-err", daemon=True),
+        ]
+        for reader in self._readers:
+            reader.start()
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    @property
+    def inflight(self) -> int:
+        return len(self._pending)
+
+    def submit(self, message: Dict[str, Any]) -> "Future[Dict[str, Any]]":
+        future: "Future[Dict[str, Any]]" = Future()
+        with self._lock:
+            if not self.alive:
+                raise BridgeWorkerError(f"Node bridge worker {self.index} is not running")
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            try:
+                assert self.process.stdin is not None
+                self.process.stdin.write(json.dumps({**message, "id": request_id}) + "\n")
+                self.process.stdin.flush()
+            except (OSError, ValueError) as exc:
+                self._pending.pop(request_id, None)
+                raise BridgeWorkerError(f"Node bridge worker {self.index} rejected input: {exc}") from exc
+        return future
+
+    def stop(self) -> None:
+        if self.alive:
+            self.process.kill()
+        self.process.wait()
+        self._fail_pending("Node bridge worker stopped")
+
+    def drain(self, timeout: float) -> bool:
+        """Close stdin and wait for the process to exit; return True if it did."""
+
+        try:
+            assert self.process.stdin is not None
+            self.process.stdin.close()
+        except (OSError, ValueError):
+            pass
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return False
+        for reader in self._readers:
+            reader.join(timeout)
+        return True
+
+    def _fail_pending(self, reason: str) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(BridgeWorkerError(reason))
+
+    def _read_stdout(self) -> None:
+        assert self.process.stdout is not None
+        for line in self.process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                response = json.loads(line)
+                request_id = int(response["id"])
+            except (ValueError, KeyError, TypeError):
+                _LOGGER.warning("Node bridge worker %s wrote a non-protocol line: %s", self.index, line[:200])
+                self.stray_output.append(line)
+                continue
+            with self._lock:
+                future = self._pending.pop(request_id, None)
+                self.completed += 1
+            if future is not None and not future.done():
+                future.set_result(response)
+        code = self.process.wait()
+        self._fail_pending(f"Node bridge worker {self.index} exited with {code}")
+
+    def _read_stderr(self) -> None:
+        assert self.process.stderr is not None
+        for line in self.process.stderr:
+            if line.strip():
+                _LOGGER.info("node-bridge[%s]: %s", self.index, line.rstrip())
+                self.stderr_tail.append(line.strip())
+
+
+class NodeBridgePool:
+    """Dispatch bridge requests across ``size`` persistent Node workers.
+
+    Each worker accepts up to ``max_inflight`` concurrent requests and the
+    least-loaded live worker is chosen for each call, so throughput scales
+    with the pool.  Workers that crash or time out are replaced on the next
+    request; :meth:`health_check` pings every worker and restarts the ones
+    that do not answer.  After a failed start, new workers are not spawned
+    again until a backoff (``start_backoff`` doubling up to 30 seconds) has
+    passed; requests in that window raise :class:`BridgeStartError`.
+    """
+
+    def __init__(
+        self,
+        script: Path,
+        *,
+        size: int = 4,
+        max_inflight: int = 8,
+        request_timeout: float = 120.0,
+        start_timeout: float = 10.0,
+        start_backoff: float = 1.0,
+    ) -> None:
+        if size <= 0:
+            raise ValueError("size must be positive")
+        if max_inflight <= 0:
+            raise ValueError("max_inflight must be positive")
+        self.script = script
+        self._size = size
+        self._max_inflight = max_inflight
+        self._request_timeout = request_timeout
+        self._start_timeout = start_timeout
+        self._start_backoff = max(0.0, start_backoff)
+        self._start_failures = 0
+        self._retry_start_at = 0.0
+        self._cond = threading.Condition()
+        self._workers: List[Optional[_BridgeWorker]] = [None] * size
+        self._reserved: Set[int] = set()
+        self._next_index = itertools.count()
+        self._restarts = 0
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    def request(self, intent: str, payload: Dict[str, object]) -> Dict[str, Any]:
+        """Run ``intent`` on a worker and return its decoded response."""
+
+        worker = self._acquire()
+        try:
+            future = worker.submit({"method": "run", "intent": intent, "payload": payload})
+            try:
+                return future.result(timeout=self._request_timeout)
+            except FutureTimeout:
+                # A wedged worker would keep its other requests hostage too.
+                _LOGGER.warning("Node bridge worker %s timed out on %s; restarting", worker.index, intent)
+                worker.stop()
+                raise BridgeWorkerError(f"Node bridge timed out after {self._request_timeout:.0f}s") from None
+        finally:
+            with self._cond:
+                self._cond.notify()
+
+    def health_check(self) -> Dict[str, bool]:
+        """Ping every running worker, replacing those that fail to answer."""
+
+        with self._cond:
+            workers = [worker for worker in self._workers if worker is not None]
+        health: Dict[str, bool] = {}
+        for worker in workers:
+            healthy = worker.alive and self._ping(worker, self._start_timeout)
+            health[str(worker.index)] = healthy
+            if not healthy:
+                worker.stop()
+        return health
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            workers = [worker for worker in self._workers if worker is not None and worker.alive]
+            return {
+                "size": self._size,
+                "workers": len(workers),
+                "inflight": sum(worker.inflight for worker in workers),
+                "completed": sum(worker.completed for worker in workers),
+                "restarts": self._restarts,
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            workers = [worker for worker in self._workers if worker is not None]
+            self._workers = [None] * self._size
+            self._cond.notify_all()
+        for worker in workers:
+            worker.stop()
+
+    # ------------------------------------------------------------------
+    def _acquire(self) -> _BridgeWorker:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise BridgeWorkerError("Node bridge pool is closed")
+                live = [
+                    worker
+                    for worker in self._workers
+                    if worker is not None and worker.alive and worker.inflight < self._max_inflight
+                ]
+                idle = next((worker for worker in live if worker.inflight == 0), None)
+                if idle is not None:
+                    return idle
+                slot = self._free_slot()
+                if slot is not None and time.monotonic() < self._retry_start_at:
+                    if not any(worker is not None and worker.alive for worker in self._workers):
+                        raise BridgeStartError("Node bridge worker start-up is backing off after a failure")
+                    slot = None
+                if slot is None:
+                    if live:
+                        return min(live, key=lambda worker: worker.inflight)
+                    self._cond.wait(0.5)
+                    continue
+                replacing = self._workers[slot] is not None
+                self._reserved.add(slot)
+                break
+        try:
+            worker = self._spawn()
+        except BaseException as exc:
+            with self._cond:
+                self._reserved.discard(slot)
+                if isinstance(exc, BridgeStartError):
+                    self._start_failures += 1
+                    delay = min(_MAX_START_BACKOFF, self._start_backoff * 2 ** (self._start_failures - 1))
+                    self._retry_start_at = time.monotonic() + delay
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            self._reserved.discard(slot)
+            self._start_failures = 0
+            self._retry_start_at = 0.0
+            self._workers[slot] = worker
+            if replacing:
+                self._restarts += 1
+            self._cond.notify_all()
+        return worker
+
+    def _free_slot(self) -> Optional[int]:
+        for index, worker in enumerate(self._workers):
+            if index not in self._reserved and (worker is None or not worker.alive):
+                return index
+        return None
+
+    def _spawn(self) -> _BridgeWorker:
+        try:
+            worker = _BridgeWorker(self.script, next(self._next_index))
+        except OSError as exc:
+            raise BridgeStartError(f"Failed to start Node bridge worker: {exc}") from exc
+        try:
+            response: Optional[Dict[str, Any]] = worker.submit({"method": "ping"}).result(timeout=self._start_timeout)
+        except (BridgeWorkerError, FutureTimeout):
+            response = None
+        if response is not None and response.get("ok"):
+            return worker
+        # Closing stdin makes a one-shot bridge, which read ``--serve`` as an
+        # intent, finish and show itself; a slow ``--serve`` worker just exits.
+        exited = worker.drain(min(self._start_timeout, 2.0))
+        worker.stop()
+        error = str(response.get("error") or "") if response is not None else ""
+        if _rejects_serve(error) or (exited and response is None and _rejects_serve(worker)):
+            raise BridgeUnsupported(f"{self.script} does not implement --serve")
+        if response is not None:
+            raise BridgeStartError(f"{self.script} failed the --serve handshake: {error or 'not ok'}")
+        raise BridgeStartError(f"{self.script} did not answer the --serve handshake within {self._start_timeout:.0f}s")
+
+    @staticmethod
+    def _ping(worker: _BridgeWorker, timeout: float) -> bool:
+        started = time.monotonic()
+        try:
+            response = worker.submit({"method": "ping"}).result(timeout=timeout)
+        except (BridgeWorkerError, FutureTimeout):
+            return False
+        _LOGGER.debug("Node bridge worker %s answered ping in %.3fs", worker.index, time.monotonic() - started)
+        return bool(response.get("ok"))
+
+
+def _rejects_serve(evidence: Union[str, _BridgeWorker]) -> bool:
+    """Return True if ``evidence`` shows a bridge that does not implement ``--serve``.
+
+    For an exited worker, any non-protocol stdout counts: it ran ``--serve``
+    as an ordinary one-shot intent.  Stderr alone must name the problem, so a
+    ``--serve`` worker that crashed while starting is not mistaken for one.
+    """
+
+    if isinstance(evidence, str):
+        text = evidence
+    else:
+        if evidence.stray_output:
+            return True
+        text = " ".join(evidence.stderr_tail)
+    text = text.lower()
+    return any(marker in text for marker in _UNSUPPORTED_MARKERS)
+
+
+_POOLS: List[NodeBridgePool] = []
+
+
+@atexit.register
+def _close_pools() -> None:  # pragma: no cover - interpreter shutdown
+    for pool in _POOLS:
+        pool.close()
+
+
+def register_pool(pool: NodeBridgePool) -> NodeBridgePool:
+    _POOLS.append(pool)
+    return pool
+
+
+__all__ = ["BridgeStartError", "BridgeUnsupported", "BridgeWorkerError", "NodeBridgePool", "register_pool"]
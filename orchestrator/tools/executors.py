@@ -3,21 +3,30 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
 import subprocess
 import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence
 
 from ..agents import AgentRegistryError, get_registry
 from ..models import Attachment, Step
 from ..moderation import ModerationReport, evaluate_step
 from ..scoreboard import get_scoreboard
 from ..extensions import load_runtime as _load_phase6_runtime
+from .bridge_pool import BridgeStartError, BridgeUnsupported, BridgeWorkerError, NodeBridgePool, register_pool
+
+_LOGGER = logging.getLogger(__name__)
 
 _ROUTER_PATH = Path("packages/orchestrator/src/router.ts")
+_BRIDGE_POOL_SIZE = int(os.getenv("ORCHESTRATOR_BRIDGE_POOL_SIZE", "4"))
+_BRIDGE_MAX_INFLIGHT = int(os.getenv("ORCHESTRATOR_BRIDGE_MAX_INFLIGHT", "8"))
+_BRIDGE_TIMEOUT = float(os.getenv("ORCHESTRATOR_BRIDGE_TIMEOUT_SECONDS", "120"))
+_BRIDGE_START_TIMEOUT = float(os.getenv("ORCHESTRATOR_BRIDGE_START_TIMEOUT_SECONDS", "10"))
+_BRIDGE_START_BACKOFF = float(os.getenv("ORCHESTRATOR_BRIDGE_START_BACKOFF_SECONDS", "1"))
 
 
 class StepExecutionError(RuntimeError):
@@ -77,11 +86,18 @@ _STEP_TO_INTENT = {
 
 
 class _NodeBridge:
-    """Lazy wrapper that shells out to the TypeScript runtime when available."""
+    """Lazy wrapper that dispatches intents to the TypeScript runtime when available.
+
+    Bridges that implement ``--serve`` (see :mod:`.bridge_pool`) are driven
+    through a pool of ``ORCHESTRATOR_BRIDGE_POOL_SIZE`` persistent workers;
+    older scripts fall back to one ``node`` process per step.
+    """
 
     def __init__(self) -> None:
         self._lock = threading.Lock()
         self._supported = None  # type: Optional[bool]
+        self._pool: Optional[NodeBridgePool] = None
+        self._pool_unsupported: set[Path] = set()
 
     def _is_supported(self) -> bool:
         if self._supported is not None:
@@ -93,6 +109,30 @@ class _NodeBridge:
             self._supported = False
         return self._supported
 
+    def _get_pool(self, bridge_script: Path) -> Optional[NodeBridgePool]:
+        with self._lock:
+            if bridge_script in self._pool_unsupported:
+                return None
+            if self._pool is not None and self._pool.script != bridge_script:
+                self._pool.close()
+                self._pool = None
+            if self._pool is None:
+                self._pool = register_pool(
+                    NodeBridgePool(
+                        bridge_script,
+                        size=_BRIDGE_POOL_SIZE,
+                        max_inflight=_BRIDGE_MAX_INFLIGHT,
+                        request_timeout=_BRIDGE_TIMEOUT,
+                        start_timeout=_BRIDGE_START_TIMEOUT,
+                        start_backoff=_BRIDGE_START_BACKOFF,
+                    )
+                )
+            return self._pool
+
+    def stats(self) -> Dict[str, int]:
+        pool = self._pool
+        return pool.stats() if pool is not None else {}
+
     def run(self, intent: str, payload: Dict[str, object]) -> Iterable[str]:
         if not self._is_supported():
             yield f"⚠️ Node runtime unavailable; skipped intent {intent}."
@@ -101,16 +141,37 @@ class _NodeBridge:
         if not bridge_script.exists():
             yield f"⚠️ Bridge script missing ({bridge_script}); skipped intent {intent}."
             return
-        with self._lock:
+        pool = self._get_pool(bridge_script) if _BRIDGE_POOL_SIZE > 0 else None
+        if pool is not None:
             try:
-                proc = subprocess.run(
-                    ["node", str(bridge_script), intent],
-                    input=json.dumps(payload).encode("utf-8"),
-                    capture_output=True,
-                    check=False,
-                )
-            except Exception as exc:  # pragma: no cover - shell issues
-                raise StepExecutionError(f"Failed to invoke Node bridge: {exc}") from exc
+                response = pool.request(intent, payload)
+            except BridgeUnsupported:
+                _LOGGER.info("%s does not support --serve; using one process per step", bridge_script)
+                with self._lock:
+                    self._pool_unsupported.add(bridge_script)
+            except BridgeStartError as exc:
+                # Slow or failed starts are retried by the pool; only this step runs alone.
+                _LOGGER.warning("Node bridge pool unavailable (%s); running %s in its own process", exc, intent)
+            except BridgeWorkerError as exc:
+                raise StepExecutionError(f"Node bridge failed: {exc}") from exc
+            else:
+                logs = [str(line) for line in response.get("logs") or [] if line]
+                yield from logs
+                if not response.get("ok"):
+                    raise StepExecutionError(str(response.get("error") or "Node bridge reported failure"))
+                return
+        yield from self._run_once(bridge_script, intent, payload)
+
+    def _run_once(self, bridge_script: Path, intent: str, payload: Dict[str, object]) -> Iterable[str]:
+        try:
+            proc = subprocess.run(
+                ["node", str(bridge_script), intent],
+                input=json.dumps(payload).encode("utf-8"),
+                capture_output=True,
+                check=False,
+            )
+        except Exception as exc:  # pragma: no cover - shell issues
+            raise StepExecutionError(f"Failed to invoke Node bridge: {exc}") from exc
         stdout = proc.stdout.decode("utf-8", errors="ignore").strip()
         stderr = proc.stderr.decode("utf-8", errors="ignore").strip()
         if stderr:
@@ -144,6 +205,26 @@ def _simulate_adapter(intent: str, step: Step) -> Iterable[str]:
         yield "• Ready to dispatch payload."
 
 
+def prepare_plan_agents(steps: Sequence[Step]) -> Dict[str, List[str]]:
+    """Staff every step that names agents in one registry pass.
+
+    Offline agents are replaced and the step params rewritten before the run
+    starts, so each step's own check at execution time finds live agents.
+    Returns the reassignment logs by step id; a step that cannot be staffed
+    is left alone and reports the error when it runs.
+    """
+
+    assignments = [(step, agents) for step in steps if (agents := _extract_agents(step))]
+    if not assignments:
+        return {}
+    try:
+        results = get_registry().prepare_steps(assignments, skip_unstaffed=True)
+    except AgentRegistryError as exc:
+        _LOGGER.warning("Could not staff plan steps up front: %s", exc)
+        return {}
+    return {step.id: result[1] for (step, _agents), result in zip(assignments, results) if result and result[1]}
+
+
 def _extract_agents(step: Step) -> List[str]:
     agents: List[str] = []
     if isinstance(step.params, dict):
@@ -246,7 +327,9 @@ class StepExecutor:
         logs.append("Intent completed (logical).")
         return logs
 
-    def execute(self, step: Step) -> StepResult:
+    def execute(self, step: Step, abort: threading.Event | None = None) -> StepResult:
+        """Run ``step`` with retries; once ``abort`` is set no further attempt starts."""
+
         start = time.time()
         errors: List[str] = []
         agents = _extract_agents(step)
@@ -285,7 +368,11 @@ class StepExecutor:
                 errors.append(str(exc))
                 if attempt >= self.retry.attempts:
                     break
-                time.sleep(self.retry.backoff * attempt)
+                if abort is None:
+                    time.sleep(self.retry.backoff * attempt)
+                elif abort.wait(self.retry.backoff * attempt):
+                    errors.append("aborted: run lease lost")
+                    break
         compensate_logs = self.compensate(step, errors)
         _SCOREBOARD.record_result(agents, success=False, context=context)
         slash_detected, descriptor = _detect_slash(compensate_logs, step, errors)
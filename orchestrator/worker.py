@@ -1,13 +1,41 @@
-"""Activity worker wiring for the HGM orchestration workflow."""
+"""Activity worker wiring for the HGM orchestration workflow.
+
+A worker leases activities from an :class:`~orchestrator.activity_queue.ActivityQueue`,
+runs up to ``concurrency`` of them at a time and acknowledges each one once
+its handler returns.  Any number of workers, in any number of processes or
+hosts, can share a durable queue.
+
+Handlers may return an :class:`~orchestrator.activity_queue.ActivityCall` (or
+a list of them).  The worker enqueues these follow-up calls on its
+``reply_queue`` before it acknowledges the task.  This is how distributed
+evaluation works: remote workers run the expensive scoring handlers and
+reply with ``hgm.evaluate`` calls.  A coordinator worker bound to the
+workflow consumes the replies and applies them to the engine in batches.
+Follow-up calls are keyed by the task's idempotency key, so a redelivered
+scoring task cannot enqueue its result twice.  The coordinator remembers
+the keys of results it has applied and acknowledges redeliveries of them
+without touching the engine again; that record lives in the coordinator
+process, so a coordinator that crashes between applying a batch and
+acknowledging it may apply that batch again after a restart.
+
+Run a worker process with ``python -m orchestrator.worker --activities pkg.module:register``.
+"""
 
 from __future__ import annotations
 
+import argparse
 import asyncio
+import contextlib
+import importlib
 import importlib.util
 import logging
+import random
 import sys
+import uuid
+from collections import OrderedDict
+from numbers import Real
 from pathlib import Path
-from typing import Awaitable, Callable, Dict
+from typing import Awaitable, Callable, Dict, Iterable, List, Sequence
 
 if importlib.util.find_spec("hgm_core") is None:
     repo_root = Path(__file__).resolve().parents[1]
@@ -19,32 +47,250 @@ from hgm_core.config import EngineConfig
 
 from orchestrator.tools.executors import RetryPolicy
 
+from .activity_queue import ActivityCall, ActivityQueue, ActivityTask, get_activity_queue
 from .workflows import HGMOrchestrationWorkflow
 from .workflows.hgm import WorkflowConfig
 
 LOGGER = logging.getLogger(__name__)
 
-Activity = Callable[..., Awaitable[None]]
+Activity = Callable[..., Awaitable[object | None]]
 
 
 class HGMActivityWorker:
-    """Bind workflow activities to a scheduler for worker execution."""
+    """Bind workflow activities to a queue for worker execution.
+
+    ``hgm.expand`` and ``hgm.evaluate`` apply results to ``workflow``.  The
+    worker validates them, then applies every well-formed one in a leased
+    batch with one ``record_expansions`` or ``record_evaluations`` call;
+    malformed ones run (and fail) individually.  Keys of the last
+    ``applied_limit`` applied results are remembered so a redelivery is
+    acknowledged without being counted twice.  Workers that only run
+    registered work handlers can be built without a workflow.
+    """
 
     def __init__(
         self,
-        workflow: HGMOrchestrationWorkflow,
+        workflow: HGMOrchestrationWorkflow | None,
+        *,
+        queue: ActivityQueue | None = None,
+        reply_queue: ActivityQueue | None = None,
+        concurrency: int = 4,
+        retry: RetryPolicy | None = None,
+        owner: str | None = None,
+        applied_limit: int = 100_000,
     ) -> None:
+        if concurrency <= 0:
+            raise ValueError("Concurrency must be positive")
         self.workflow = workflow
-        self.activities: Dict[str, Activity] = {
-            "hgm.expand": self.workflow.expansion_activity,
-            "hgm.evaluate": self.workflow.evaluation_activity,
-        }
+        self.queue = queue
+        self.reply_queue = reply_queue
+        self.concurrency = concurrency
+        self.retry = retry or RetryPolicy()
+        self.owner = owner or f"worker-{uuid.uuid4().hex[:12]}"
+        self.activities: Dict[str, Activity] = {}
+        if workflow is not None:
+            self.activities["hgm.expand"] = workflow.expansion_activity
+            self.activities["hgm.evaluate"] = workflow.evaluation_activity
+        self.processed = 0
+        self.failed = 0
+        self._applied: "OrderedDict[str, None]" = OrderedDict()
+        self._applied_limit = max(1, applied_limit)
+
+    def register(self, name: str, handler: Activity) -> None:
+        """Expose ``handler`` as activity ``name``."""
 
-    async def dispatch(self, name: str, *args, **kwargs) -> None:
+        self.activities[name] = handler
+
+    async def dispatch(self, name: str, *args, **kwargs) -> object | None:
         handler = self.activities.get(name)
         if handler is None:
             raise KeyError(name)
-        await handler(*args, **kwargs)
+        return await handler(*args, **kwargs)
+
+    async def run(
+        self,
+        *,
+        stop: asyncio.Event | None = None,
+        poll_interval: float = 0.05,
+        visibility_timeout: float = 30.0,
+        retention: float = 3600.0,
+    ) -> None:
+        """Lease and run activities until ``stop`` is set (or the task is cancelled).
+
+        Leases of running activities are extended every third of
+        ``visibility_timeout``.  Done tasks older than ``retention`` seconds
+        are purged from the queue about once per ``retention`` interval.
+        """
+
+        queue = self._require_queue()
+        inflight: Dict[asyncio.Task[None], List[ActivityTask]] = {}
+        loop = asyncio.get_running_loop()
+        last_heartbeat = last_purge = loop.time()
+        try:
+            while stop is None or not stop.is_set():
+                slots = self.concurrency - sum(len(group) for group in inflight.values())
+                if slots > 0:
+                    leased = await asyncio.to_thread(
+                        queue.lease, self.owner, limit=slots, visibility_timeout=visibility_timeout
+                    )
+                    for group in self._group(leased):
+                        inflight[loop.create_task(self._process(queue, group))] = group
+                if inflight:
+                    done, _ = await asyncio.wait(inflight, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        del inflight[task]
+                elif stop is not None:
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+                else:
+                    await asyncio.sleep(poll_interval)
+                now = loop.time()
+                if inflight and now - last_heartbeat >= visibility_timeout / 3:
+                    last_heartbeat = now
+                    held = [item for group in inflight.values() for item in group]
+                    await asyncio.to_thread(_extend_all, queue, held, visibility_timeout)
+                if now - last_purge >= retention:
+                    last_purge = now
+                    await asyncio.to_thread(queue.purge, retention)
+        finally:
+            if inflight:
+                await asyncio.gather(*inflight, return_exceptions=True)
+
+    async def run_once(self, *, limit: int | None = None, visibility_timeout: float = 30.0) -> int:
+        """Lease one batch, run it to completion and return how many activities were leased."""
+
+        queue = self._require_queue()
+        leased = await asyncio.to_thread(
+            queue.lease, self.owner, limit=limit or self.concurrency, visibility_timeout=visibility_timeout
+        )
+        await asyncio.gather(*(self._process(queue, group) for group in self._group(leased)))
+        return len(leased)
+
+    def _require_queue(self) -> ActivityQueue:
+        if self.queue is None:
+            raise RuntimeError("HGMActivityWorker has no activity queue configured")
+        return self.queue
+
+    def _group(self, leased: Sequence[ActivityTask]) -> List[List[ActivityTask]]:
+        """Keep results bound for the workflow together (in lease order); everything else runs alone."""
+
+        workflow_tasks = [task for task in leased if self._batchable(task.call.name)]
+        groups = [[task] for task in leased if not self._batchable(task.call.name)]
+        if workflow_tasks:
+            groups.append(workflow_tasks)
+        return groups
+
+    def _batchable(self, name: str) -> bool:
+        workflow = self.workflow
+        if workflow is None:
+            return False
+        handler = self.activities.get(name)
+        return (name == "hgm.evaluate" and handler == workflow.evaluation_activity) or (
+            name == "hgm.expand" and handler == workflow.expansion_activity
+        )
+
+    async def _process(self, queue: ActivityQueue, group: List[ActivityTask]) -> None:
+        if not self._batchable(group[0].call.name):
+            for task in group:
+                await self._run_task(queue, task)
+            return
+        # Expansions first so evaluations of freshly expanded children find them in the engine.
+        for name in ("hgm.expand", "hgm.evaluate"):
+            tasks = [task for task in group if task.call.name == name]
+            if tasks:
+                await self._apply_results(queue, name, tasks)
+
+    async def _apply_results(self, queue: ActivityQueue, name: str, tasks: List[ActivityTask]) -> None:
+        redelivered: List[ActivityTask] = []
+        valid: List[ActivityTask] = []
+        malformed: List[ActivityTask] = []
+        for task in tasks:
+            if task.key in self._applied:
+                redelivered.append(task)
+            elif _well_formed(task.call):
+                valid.append(task)
+            else:
+                malformed.append(task)
+        if valid:
+            try:
+                await self._apply_batch(name, valid)
+            except Exception:
+                # Validation passed, so the engine has already taken these
+                # results; running them again would count them twice.
+                LOGGER.exception("Applying %d %s results raised after the engine was updated", len(valid), name)
+            self._remember(task.key for task in valid)
+        settled = redelivered + valid
+        if settled:
+            await asyncio.to_thread(queue.ack_many, settled)
+            self.processed += len(settled)
+        for task in malformed:
+            # Malformed calls fail in the handler before the engine changes; nack them individually.
+            await self._run_task(queue, task)
+
+    def _remember(self, keys: Iterable[str]) -> None:
+        applied = self._applied
+        for key in keys:
+            applied[key] = None
+            applied.move_to_end(key)
+        while len(applied) > self._applied_limit:
+            applied.popitem(last=False)
+
+    async def _apply_batch(self, name: str, tasks: List[ActivityTask]) -> None:
+        workflow = self.workflow
+        assert workflow is not None
+        if name == "hgm.evaluate":
+            await workflow.record_evaluations(
+                [(*task.call.args, task.call.kwargs.get("weight"), task.call.kwargs.get("payload")) for task in tasks]
+            )
+        else:
+            await workflow.record_expansions([(*task.call.args, task.call.kwargs.get("payload")) for task in tasks])
+
+    async def _run_task(self, queue: ActivityQueue, task: ActivityTask) -> None:
+        call = task.call
+        try:
+            result = await self.dispatch(call.name, *call.args, **call.kwargs)
+            follow_ups = _follow_ups(result)
+            if follow_ups:
+                target = self.reply_queue or queue
+                keyed = [(item, f"{task.key}:{index}") for index, item in enumerate(follow_ups)]
+                await asyncio.to_thread(target.enqueue_many, keyed)
+        except Exception as exc:
+            self.failed += 1
+            delay = self.retry.backoff * (2 ** (task.attempts - 1)) * (1.0 - 0.5 * random.random())
+            LOGGER.warning("Activity %s (%s) attempt %d failed: %s", call.name, task.key, task.attempts, exc)
+            await asyncio.to_thread(queue.nack, task, repr(exc), delay=delay)
+            return
+        if not await asyncio.to_thread(queue.ack, task):
+            LOGGER.warning("Lease on activity %s (%s) was lost before it was acknowledged", call.name, task.key)
+        self.processed += 1
+
+
+def _well_formed(call: ActivityCall) -> bool:
+    """Return whether a workflow result call would pass the engine's validation."""
+
+    args, kwargs = call.args, call.kwargs
+    payload = kwargs.get("payload")
+    if len(args) != 2 or not isinstance(args[0], str) or (payload is not None and not isinstance(payload, dict)):
+        return False
+    if call.name == "hgm.expand":
+        return isinstance(args[1], str) and set(kwargs) <= {"payload"}
+    reward, weight = args[1], kwargs.get("weight")
+    if not isinstance(reward, Real) or not 0.0 <= reward <= 1.0 or not set(kwargs) <= {"weight", "payload"}:
+        return False
+    return weight is None or (isinstance(weight, Real) and weight > 0)
+
+
+def _follow_ups(result: object | None) -> List[ActivityCall]:
+    if isinstance(result, ActivityCall):
+        return [result]
+    if isinstance(result, (list, tuple)) and result and all(isinstance(item, ActivityCall) for item in result):
+        return list(result)
+    return []
+
+
+def _extend_all(queue: ActivityQueue, tasks: Sequence[ActivityTask], visibility_timeout: float) -> None:
+    for task in tasks:
+        queue.extend(task, visibility_timeout)
 
 
 def build_worker(
@@ -52,18 +298,52 @@ def build_worker(
     concurrency: int = 4,
     retry: RetryPolicy | None = None,
     engine_config: EngineConfig | None = None,
+    queue: ActivityQueue | None = None,
+    reply_queue: ActivityQueue | None = None,
 ) -> HGMActivityWorker:
     """Construct a worker pre-wired with the HGM workflow activities."""
 
     workflow = HGMOrchestrationWorkflow(
         config=WorkflowConfig(concurrency=concurrency, retry=retry, engine=engine_config),
     )
-    return HGMActivityWorker(workflow)
+    return HGMActivityWorker(workflow, queue=queue, reply_queue=reply_queue, concurrency=concurrency, retry=retry)
 
 
 async def run_worker_forever(worker: HGMActivityWorker) -> None:
-    """Placeholder loop simulating a long-running task worker."""
+    """Run ``worker`` against its queue (the configured default queue if unset) until cancelled."""
+
+    if worker.queue is None:
+        worker.queue = get_activity_queue()
+    LOGGER.info("HGM worker %s booted with %d activities", worker.owner, len(worker.activities))
+    await worker.run()
+
+
+def main(argv: Sequence[str] | None = None) -> None:  # pragma: no cover - CLI entry point
+    parser = argparse.ArgumentParser(description="Run an HGM activity worker.")
+    parser.add_argument("--queue", default="default", help="Activity queue to lease from")
+    parser.add_argument("--reply-queue", default=None, help="Queue receiving follow-up activities")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--activities",
+        action="append",
+        default=[],
+        help="module:function called with the worker to register handlers (repeatable)",
+    )
+    parser.add_argument("--no-workflow", action="store_true", help="Run registered handlers only")
+    args = parser.parse_args(argv)
+
+    queue = get_activity_queue(args.queue)
+    reply_queue = get_activity_queue(args.reply_queue) if args.reply_queue else None
+    if args.no_workflow:
+        worker = HGMActivityWorker(None, queue=queue, reply_queue=reply_queue, concurrency=args.concurrency)
+    else:
+        worker = build_worker(concurrency=args.concurrency, queue=queue, reply_queue=reply_queue)
+    for spec in args.activities:
+        module_name, _, function_name = spec.partition(":")
+        getattr(importlib.import_module(module_name), function_name or "register")(worker)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker_forever(worker))
+
 
-    LOGGER.info("HGM worker booted with %d activities", len(worker.activities))
-    while True:
-        await asyncio.sleep(3600)
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
+import queue
 import uuid
 from dataclasses import dataclass, field
-from typing import Awaitable, Callable, Dict, Iterable, Optional, Sequence
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from hgm_core.config import EngineConfig
 from hgm_core.engine import HGMEngine
@@ -14,11 +16,15 @@ from hgm_core.types import AgentNode
 
 from .scheduler import TaskScheduler
 from orchestrator.tools.executors import RetryPolicy
-from backend.models.hgm import HgmRepository
+from backend.models.hgm import HgmEvaluationWriter, HgmRepository
 from services.sentinel import SentinelConfig, SentinelMonitor, load_config as load_sentinel_config
 
 LOGGER = logging.getLogger(__name__)
 
+# Scheduler priority classes: finishing evaluations feeds the sampler before new expansions widen the tree.
+EVALUATION_PRIORITY = 0
+EXPANSION_PRIORITY = 1
+
 ExpansionWork = Callable[[str], Awaitable[Dict[str, object] | None]]
 EvaluationWork = Callable[
     [],
@@ -27,6 +33,10 @@ EvaluationWork = Callable[
         | tuple[float, float | None, Dict[str, object] | None]
     ],
 ]
+ExpansionRecord = tuple[str, str] | tuple[str, str, Dict[str, object] | None]
+EvaluationRecord = (
+    tuple[str, float] | tuple[str, float, float | None] | tuple[str, float, float | None, Dict[str, object] | None]
+)
 
 
 @dataclass(slots=True)
@@ -43,10 +53,19 @@ class WorkflowConfig:
     sentinel: SentinelMonitor | None = None
     sentinel_config: SentinelConfig | None = None
     sentinel_enabled: bool = True
+    lock_stripes: int = 16
+    max_pending_tasks: int = 10_000
 
 
 class HGMOrchestrationWorkflow:
-    """Coordinate HGM engine actions with asynchronous workers."""
+    """Coordinate HGM engine actions with asynchronous workers.
+
+    Engine calls and the persistence/sentinel fan-out they trigger are
+    serialised per subtree: a node's lock stripe is chosen by its first two
+    path segments (``root/a`` for ``root/a/b/c``), so independent branches
+    progress in parallel while each branch keeps its event order.  Run-wide
+    calls such as :meth:`snapshot` take every stripe.
+    """
 
     def __init__(
         self,
@@ -57,9 +76,15 @@ class HGMOrchestrationWorkflow:
     ) -> None:
         self._config = config or WorkflowConfig()
         retry_policy = self._config.retry or RetryPolicy()
-        self._scheduler = scheduler or TaskScheduler(concurrency=self._config.concurrency, retry=retry_policy)
-        engine_config = self._config.engine or EngineConfig()
         self._run_id = self._config.run_id or uuid.uuid4().hex
+        self._owns_scheduler = scheduler is None
+        self._scheduler = scheduler or TaskScheduler(
+            concurrency=self._config.concurrency,
+            retry=retry_policy,
+            max_pending=self._config.max_pending_tasks,
+            name=f"hgm-{self._run_id}",
+        )
+        engine_config = self._config.engine or EngineConfig()
         self._repository = self._config.repository
         if self._repository is None:
             try:
@@ -69,15 +94,15 @@ class HGMOrchestrationWorkflow:
                 self._repository = None
         self._engine = engine or HGMEngine(
             engine_config,
-            on_expansion_result=self._on_expansion_result,
-            on_evaluation_result=self._on_evaluation_result,
+            on_expansion_batch=self._on_expansion_batch,
+            on_evaluation_batch=self._on_evaluation_batch,
         )
         sentinel = self._config.sentinel
         if sentinel is None and self._config.sentinel_enabled:
             sentinel_config = self._config.sentinel_config or load_sentinel_config()
             sentinel = SentinelMonitor(self._engine, sentinel_config)
         self._sentinel = sentinel
-        self._engine_lock = asyncio.Lock()
+        self._engine_locks = [asyncio.Lock() for _ in range(max(1, self._config.lock_stripes))]
         self._busy_lock = asyncio.Lock()
         self._busy_agents: set[str] = set()
         self.expansion_events: list[tuple[str, Dict[str, object]]] = []
@@ -90,58 +115,56 @@ class HGMOrchestrationWorkflow:
             except Exception:  # pragma: no cover - defensive guard
                 LOGGER.warning("Failed to prime HGM persistence", exc_info=True)
                 self._repository = None
+        self._evaluation_writer = HgmEvaluationWriter(self._repository) if self._repository is not None else None
 
     # ------------------------------------------------------------------
     # Internal synchronisation helpers
-    def _engine_guard(self) -> asyncio.Lock:
-        return self._engine_lock
+    def _engine_guards(self, keys: Iterable[str] | None = None) -> List[asyncio.Lock]:
+        """Return the lock stripes covering ``keys`` (every stripe for ``None``) in acquisition order."""
+
+        if keys is None:
+            return self._engine_locks
+        stripes = sorted({hash(_branch(key)) % len(self._engine_locks) for key in keys})
+        return [self._engine_locks[stripe] for stripe in stripes]
 
     def _busy_guard(self) -> asyncio.Lock:
         return self._busy_lock
 
-    async def _invoke_with_engine(self, coro: Awaitable[object | None]) -> object | None:
-        lock = self._engine_guard()
-        async with lock:
+    async def _invoke_with_engine(self, coro: Awaitable[object | None], keys: Iterable[str] | None = None) -> object | None:
+        locks = self._engine_guards(keys)
+        if len(locks) == 1:
+            async with locks[0]:
+                return await coro
+        async with contextlib.AsyncExitStack() as stack:
+            for lock in locks:
+                await stack.enter_async_context(lock)
             return await coro
 
-    async def _on_expansion_result(self, node: AgentNode, payload: Dict[str, object]) -> None:
-        self.expansion_events.append((node.key, dict(payload)))
+    async def _on_expansion_batch(self, results: List[Tuple[AgentNode, Dict[str, object]]]) -> None:
+        self.expansion_events.extend((node.key, dict(payload)) for node, payload in results)
         if self._repository is not None:
-            data = dict(payload)
-            parent = node.parent
+            batch = [(node.key, node.parent, dict(payload)) for node, payload in results]
             try:
-                await asyncio.to_thread(
-                    self._repository.record_expansion,
-                    self._run_id,
-                    node.key,
-                    parent,
-                    data,
-                )
+                await asyncio.to_thread(self._repository.record_expansions, self._run_id, batch)
             except Exception:  # pragma: no cover - persistence errors should not break workflow
-                LOGGER.warning("Failed to persist expansion event for %s", node.key, exc_info=True)
+                LOGGER.warning("Failed to persist %d expansion events", len(batch), exc_info=True)
         if self._sentinel is not None:
-            await self._sentinel.observe_expansion(node.key, dict(payload))
-
-    async def _on_evaluation_result(self, node: AgentNode, payload: Dict[str, object]) -> None:
-        self.evaluation_events.append((node.key, dict(payload)))
-        if self._repository is not None:
-            data = dict(payload)
-            try:
-                await asyncio.to_thread(
-                    self._repository.record_evaluation,
-                    self._run_id,
-                    node.key,
-                    data,
-                )
-            except Exception:  # pragma: no cover - persistence errors should not break workflow
-                LOGGER.warning("Failed to persist evaluation event for %s", node.key, exc_info=True)
+            await self._sentinel.observe_expansions([(node.key, dict(payload)) for node, payload in results])
+
+    async def _on_evaluation_batch(self, results: List[Tuple[AgentNode, Dict[str, object]]]) -> None:
+        self.evaluation_events.extend((node.key, dict(payload)) for node, payload in results)
+        if self._evaluation_writer is not None:
+            batch = [(node.key, dict(payload)) for node, payload in results]
+            queued = self._evaluation_writer.submit_many(self._run_id, batch, block=False)
+            if queued < len(batch):
+                await asyncio.to_thread(self._evaluation_writer.submit_many, self._run_id, batch[queued:])
         if self._sentinel is not None:
-            await self._sentinel.observe_evaluation(node.key, dict(payload))
+            await self._sentinel.observe_evaluations([(node.key, dict(payload)) for node, payload in results])
 
     # ------------------------------------------------------------------
     # Public engine adapters
     async def ensure_node(self, key: str, **metadata: object) -> AgentNode:
-        node = await self._invoke_with_engine(self._engine.ensure_node(key, **metadata))
+        node = await self._invoke_with_engine(self._engine.ensure_node(key, **metadata), [key])
         if self._repository is not None:
             combined = dict(node.metadata)
             combined.update(metadata)
@@ -158,7 +181,12 @@ class HGMOrchestrationWorkflow:
         return node
 
     async def next_action(self, key: str, actions: Sequence[str]) -> Optional[str]:
-        return await self._invoke_with_engine(self._engine.next_action(key, actions))
+        return await self._invoke_with_engine(self._engine.next_action(key, actions), [key])
+
+    async def next_actions(self, keys: Sequence[str], actions: Sequence[str]) -> List[Optional[str]]:
+        """Decide the next action for several nodes with one engine call."""
+
+        return await self._invoke_with_engine(self._engine.next_actions(keys, actions), keys)
 
     async def expansion_activity(
         self,
@@ -167,7 +195,10 @@ class HGMOrchestrationWorkflow:
         *,
         payload: Dict[str, object] | None = None,
     ) -> None:
-        await self._invoke_with_engine(self._engine.record_expansion(parent_key, action, payload=payload))
+        await self._invoke_with_engine(
+            self._engine.record_expansion(parent_key, action, payload=payload),
+            [f"{parent_key}/{action}"],
+        )
 
     async def evaluation_activity(
         self,
@@ -178,9 +209,41 @@ class HGMOrchestrationWorkflow:
         payload: Dict[str, object] | None = None,
     ) -> None:
         await self._invoke_with_engine(
-            self._engine.record_evaluation(node_key, reward, weight=weight, payload=payload)
+            self._engine.record_evaluation(node_key, reward, weight=weight, payload=payload),
+            [node_key],
         )
 
+    async def record_expansions(self, expansions: Sequence[ExpansionRecord]) -> None:
+        """Apply ``(parent_key, action[, payload])`` expansions in bulk.
+
+        The engine is updated under one lock acquisition, the repository
+        receives one transaction and the sentinel one queued batch.
+        """
+
+        items: List[Tuple[str, str, Dict[str, object] | None]] = []
+        for parent_key, action, *rest in expansions:
+            items.append((parent_key, action, rest[0] if rest else None))
+        if items:
+            await self._invoke_with_engine(
+                self._engine.record_expansions(items),
+                [f"{parent_key}/{action}" for parent_key, action, _ in items],
+            )
+
+    async def record_evaluations(self, evaluations: Sequence[EvaluationRecord]) -> None:
+        """Apply ``(node_key, reward[, weight[, payload]])`` evaluations in bulk.
+
+        A ``None`` weight counts as ``1.0``.  The engine is updated under one
+        lock acquisition, the evaluation writer receives the whole batch and
+        the sentinel one queued batch.
+        """
+
+        items: List[Tuple[str, float, float, Dict[str, object] | None]] = []
+        for node_key, reward, *rest in evaluations:
+            weight = rest[0] if rest and rest[0] is not None else 1.0
+            items.append((node_key, reward, weight, rest[1] if len(rest) > 1 else None))
+        if items:
+            await self._invoke_with_engine(self._engine.record_evaluations(items), [item[0] for item in items])
+
     async def snapshot(self) -> Dict[str, AgentNode]:
         return await self._invoke_with_engine(self._engine.snapshot())
 
@@ -219,31 +282,49 @@ class HGMOrchestrationWorkflow:
         if self._sentinel is not None and self._sentinel.stop_requested:
             LOGGER.warning("Sentinel stop requested; skipping expansion for %s", parent_key)
             return False
-        choice = await self.next_action(parent_key, actions)
-        if choice is None:
-            LOGGER.debug("No expansion available for %s", parent_key)
+        # Reserve queue capacity before next_action widens the tree, so a full
+        # queue cannot leave behind a child whose expansion never runs.
+        if not self._scheduler.reserve(request_id):
+            LOGGER.debug("Scheduler cannot admit an expansion for %s", parent_key)
             return False
-        child_key = f"{parent_key}/{choice}"
-
-        busy_lock = self._busy_guard()
-        async with busy_lock:
-            if child_key in self._busy_agents:
-                LOGGER.debug("Expansion for %s already in progress", child_key)
+        reserved = True
+        try:
+            choice = await self.next_action(parent_key, actions)
+            if choice is None:
+                LOGGER.debug("No expansion available for %s", parent_key)
                 return False
-            self._busy_agents.add(child_key)
-
-        task_id = request_id or f"expand:{child_key}:{uuid.uuid4().hex}"
+            child_key = f"{parent_key}/{choice}"
 
-        async def _run() -> None:
-            payload = await work(choice)
-            await self.expansion_activity(parent_key, choice, payload=payload or {})
-
-        async def _cleanup(success: bool, error: Exception | None) -> None:
-            del success, error
+            busy_lock = self._busy_guard()
             async with busy_lock:
-                self._busy_agents.discard(child_key)
-
-        scheduled = await self._scheduler.schedule(task_id, _run, on_complete=_cleanup)
+                if child_key in self._busy_agents:
+                    LOGGER.debug("Expansion for %s already in progress", child_key)
+                    return False
+                self._busy_agents.add(child_key)
+
+            task_id = request_id or f"expand:{child_key}:{uuid.uuid4().hex}"
+
+            async def _run() -> None:
+                payload = await work(choice)
+                await self.expansion_activity(parent_key, choice, payload=payload or {})
+
+            async def _cleanup(success: bool, error: Exception | None) -> None:
+                del success, error
+                async with busy_lock:
+                    self._busy_agents.discard(child_key)
+
+            reserved = False
+            scheduled = await self._scheduler.schedule(
+                task_id,
+                _run,
+                on_complete=_cleanup,
+                priority=EXPANSION_PRIORITY,
+                key=_branch(child_key),
+                reserved=True,
+            )
+        finally:
+            if reserved:
+                self._scheduler.release()
         if not scheduled:
             async with busy_lock:
                 self._busy_agents.discard(child_key)
@@ -288,7 +369,9 @@ class HGMOrchestrationWorkflow:
             async with busy_lock:
                 self._busy_agents.discard(node_key)
 
-        scheduled = await self._scheduler.schedule(task_id, _run, on_complete=_cleanup)
+        scheduled = await self._scheduler.schedule(
+            task_id, _run, on_complete=_cleanup, priority=EVALUATION_PRIORITY, key=_branch(node_key)
+        )
         if not scheduled:
             async with busy_lock:
                 self._busy_agents.discard(node_key)
@@ -296,13 +379,19 @@ class HGMOrchestrationWorkflow:
 
     async def drain(self) -> None:
         await self._scheduler.wait_for_all()
+        if self._evaluation_writer is not None:
+            await asyncio.to_thread(self._evaluation_writer.flush)
         if self._sentinel is not None:
             await self._sentinel.drain()
 
     async def shutdown(self) -> None:
         await self.drain()
+        if self._evaluation_writer is not None:
+            await asyncio.to_thread(self._evaluation_writer.close)
         if self._sentinel is not None:
             await self._sentinel.close()
+        if self._owns_scheduler:
+            self._scheduler.close()
 
     # ------------------------------------------------------------------
     # Diagnostic helpers
@@ -314,3 +403,9 @@ class HGMOrchestrationWorkflow:
         busy_lock = self._busy_guard()
         async with busy_lock:
             return set(self._busy_agents)
+
+
+def _branch(key: str) -> str:
+    """Return the subtree a key belongs to for lock striping (its first two path segments)."""
+
+    return "/".join(key.split("/", 2)[:2])
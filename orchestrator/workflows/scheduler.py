@@ -4,43 +4,125 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections import defaultdict
-from typing import Awaitable, Callable, Dict
+import random
+import time
+import weakref
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, List
 
 from orchestrator.tools.executors import RetryPolicy
 
+try:  # Optional dependency; ``stats()`` carries the same numbers without it.
+    from prometheus_client import Gauge, Histogram
+except ImportError:  # pragma: no cover - prometheus is optional for the scheduler
+    Gauge = Histogram = None  # type: ignore[assignment]
+
 LOGGER = logging.getLogger(__name__)
 
 CoroutineFactory = Callable[[], Awaitable[object | None]]
 CompletionHook = Callable[[bool, Exception | None], Awaitable[None] | None]
 
+if Gauge is not None and Histogram is not None:
+    _QUEUE_DEPTH = Gauge(
+        "orchestrator_scheduler_queue_depth",
+        "Tasks admitted to the scheduler and waiting for a worker.",
+        ["scheduler"],
+    )
+    _WAIT_SECONDS = Histogram(
+        "orchestrator_scheduler_wait_seconds",
+        "Delay between a task attempt being queued and a worker starting it.",
+        ["scheduler"],
+        buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+    )
+    _RUN_SECONDS = Histogram(
+        "orchestrator_scheduler_run_seconds",
+        "Duration of a single task attempt.",
+        ["scheduler"],
+        buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+    )
+else:  # pragma: no cover - prometheus is optional for the scheduler
+    _QUEUE_DEPTH = _WAIT_SECONDS = _RUN_SECONDS = None
+
+
+@dataclass
+class _Job:
+    task_id: str
+    factory: CoroutineFactory
+    on_complete: CompletionHook | None
+    priority: int
+    key: str
+    attempts: int = 0
+    queued_at: float = 0.0
+
+
+@dataclass
+class _Finished:
+    expires_at: float
+    attempts: int
+    error: Exception | None
+
 
 class TaskScheduler:
-    """Dispatch coroutine tasks with concurrency limits and retries."""
+    """Dispatch coroutine tasks with concurrency limits and retries.
+
+    Admitted tasks wait in a bounded queue (``max_pending``) and are run by at
+    most ``concurrency`` worker tasks, so a saturated scheduler holds queued
+    callables rather than parked asyncio tasks.  Lower ``priority`` values run
+    first; within a priority class tasks are taken round-robin by ``key`` so a
+    single busy key cannot starve the others.  Failed attempts are retried
+    after a jittered exponential backoff without holding a worker.
+
+    Completed task ids are remembered for ``dedupe_ttl`` seconds (and at most
+    ``max_tracked`` of them) so a replayed request id is still rejected while
+    memory stays bounded in long-running workers.
+    """
 
     def __init__(
         self,
         *,
         concurrency: int,
         retry: RetryPolicy | None = None,
+        max_pending: int = 10_000,
+        dedupe_ttl: float = 3600.0,
+        max_tracked: int = 100_000,
+        max_backoff: float = 30.0,
+        jitter: float = 0.5,
+        name: str = "default",
     ) -> None:
         if concurrency <= 0:
             raise ValueError("Concurrency must be positive")
+        if max_pending <= 0:
+            raise ValueError("max_pending must be positive")
         self._concurrency = concurrency
         self._retry = retry or RetryPolicy()
-        self._inflight: set[str] = set()
-        self._completed: set[str] = set()
-        self._errors: Dict[str, Exception] = {}
-        self._tasks: set[asyncio.Task[object | None]] = set()
-        self._attempts: Dict[str, int] = defaultdict(int)
-        self._lock = asyncio.Lock()
-        self._semaphore = asyncio.Semaphore(self._concurrency)
-
-    def _ensure_lock(self) -> asyncio.Lock:
-        return self._lock
-
-    def _ensure_semaphore(self) -> asyncio.Semaphore:
-        return self._semaphore
+        self._max_pending = max_pending
+        self._dedupe_ttl = max(0.0, dedupe_ttl)
+        self._max_tracked = max(1, max_tracked)
+        self._max_backoff = max(0.0, max_backoff)
+        self._jitter = min(1.0, max(0.0, jitter))
+        self._rng = random.Random()
+        self._queues: Dict[int, "OrderedDict[str, Deque[_Job]]"] = {}
+        self._queued = 0
+        self._reserved = 0
+        self._live: Dict[str, _Job] = {}
+        self._finished: "OrderedDict[str, _Finished]" = OrderedDict()
+        self._workers: set[asyncio.Task[None]] = set()
+        self._worker_count = 0
+        self._running = 0
+        self._idle_waiters: List[asyncio.Future[None]] = []
+        self._rejected = 0
+        self._max_wait = 0.0
+        self._max_run = 0.0
+        self._name = name
+        if _QUEUE_DEPTH is not None:
+            self._wait_metric = _WAIT_SECONDS.labels(name)
+            self._run_metric = _RUN_SECONDS.labels(name)
+            # A weak reference so the registry never keeps a dropped scheduler alive.
+            ref = weakref.ref(self)
+            _QUEUE_DEPTH.labels(name).set_function(lambda: _pending_of(ref))
+        else:  # pragma: no cover - prometheus is optional for the scheduler
+            self._wait_metric = self._run_metric = None
 
     async def schedule(
         self,
@@ -48,88 +130,216 @@ class TaskScheduler:
         factory: CoroutineFactory,
         *,
         on_complete: CompletionHook | None = None,
+        priority: int = 0,
+        key: str | None = None,
+        reserved: bool = False,
     ) -> bool:
-        """Schedule a task if it is not already running or completed."""
+        """Queue a task unless it is already known or the pending queue is full.
+
+        Returns ``False`` for a duplicate ``task_id`` (queued, running or
+        completed within ``dedupe_ttl``) and when ``max_pending`` tasks are
+        already waiting.  A full queue rejects rather than blocks so a task
+        that schedules follow-up work can never deadlock the workers.
+        ``reserved=True`` consumes a slot taken earlier with :meth:`reserve`.
+        """
 
-        lock = self._ensure_lock()
-        async with lock:
-            if task_id in self._completed or task_id in self._inflight:
+        if reserved:
+            self._reserved -= 1
+        self._expire_finished(time.monotonic())
+        if task_id in self._live or task_id in self._finished:
+            return False
+        if not reserved and self._queued + self._reserved >= self._max_pending:
+            self._rejected += 1
+            LOGGER.debug("Scheduler %s queue full (%d pending); rejecting %s", self._name, self._queued, task_id)
+            return False
+        job = _Job(task_id, factory, on_complete, priority, key if key is not None else task_id)
+        self._live[task_id] = job
+        self._enqueue(job)
+        return True
+
+    def reserve(self, task_id: str | None = None) -> bool:
+        """Hold a pending slot for a task whose admission has side effects.
+
+        Callers that must commit state before they can build the task (such
+        as choosing an expansion) reserve first, then pass ``reserved=True``
+        to :meth:`schedule` or hand the slot back with :meth:`release`.
+        Returns ``False`` when the queue is full or ``task_id`` is known.
+        """
+
+        if task_id is not None:
+            self._expire_finished(time.monotonic())
+            if task_id in self._live or task_id in self._finished:
                 return False
-            self._inflight.add(task_id)
+        if self._queued + self._reserved >= self._max_pending:
+            self._rejected += 1
+            LOGGER.debug("Scheduler %s queue full (%d pending); refusing reservation", self._name, self._queued)
+            return False
+        self._reserved += 1
+        return True
+
+    def release(self) -> None:
+        """Return a slot taken with :meth:`reserve` that will not be scheduled."""
+
+        self._reserved = max(0, self._reserved - 1)
+
+    def pending(self) -> int:
+        """Return the number of task attempts waiting for a worker."""
+
+        return self._queued
+
+    def stats(self) -> Dict[str, float]:
+        """Return queue depth, concurrency and latency counters."""
 
+        return {
+            "pending": float(self._queued),
+            "reserved": float(self._reserved),
+            "running": float(self._running),
+            "retrying": float(len(self._live) - self._queued - self._running),
+            "tracked": float(len(self._finished)),
+            "rejected": float(self._rejected),
+            "max_wait_seconds": self._max_wait,
+            "max_run_seconds": self._max_run,
+        }
+
+    def _enqueue(self, job: _Job) -> None:
+        job.queued_at = time.monotonic()
+        lanes = self._queues.setdefault(job.priority, OrderedDict())
+        lane = lanes.get(job.key)
+        if lane is None:
+            lane = lanes[job.key] = deque()
+        lane.append(job)
+        self._queued += 1
+        self._spawn_workers()
+
+    def _next_job(self) -> _Job | None:
+        if not self._queued:
+            return None
+        priority = min(priority for priority, lanes in self._queues.items() if lanes)
+        lanes = self._queues[priority]
+        key, lane = next(iter(lanes.items()))
+        job = lane.popleft()
+        if lane:
+            lanes.move_to_end(key)
+        else:
+            del lanes[key]
+        self._queued -= 1
+        return job
+
+    def _spawn_workers(self) -> None:
         loop = asyncio.get_running_loop()
-        task = loop.create_task(self._run_task(task_id, factory, on_complete))
-        async with lock:
-            self._tasks.add(task)
-        return True
+        while self._worker_count < min(self._concurrency, self._queued + self._running):
+            # Counted here and released synchronously in ``_work`` (not via a done
+            # callback) so a job queued while a worker is exiting still gets one.
+            self._worker_count += 1
+            worker = loop.create_task(self._work())
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
 
-    async def _run_task(
-        self,
-        task_id: str,
-        factory: CoroutineFactory,
-        on_complete: CompletionHook | None,
-    ) -> None:
-        semaphore = self._ensure_semaphore()
-        attempt = 0
-        success = False
-        error: Exception | None = None
+    async def _work(self) -> None:
         try:
-            while attempt < self._retry.attempts:
-                attempt += 1
-                self._attempts[task_id] = attempt
-                try:
-                    async with semaphore:
-                        await factory()
-                    success = True
-                    error = None
-                    break
-                except Exception as exc:  # pragma: no cover - defensive; exercised in tests
-                    error = exc
-                    if attempt >= self._retry.attempts:
-                        break
-                    delay = self._retry.backoff * (2 ** (attempt - 1))
-                    try:
-                        await asyncio.sleep(delay)
-                    except asyncio.CancelledError:
-                        raise
-            if not success and error is not None:
-                LOGGER.warning("Task %s failed after %d attempts: %s", task_id, attempt, error)
-                self._errors[task_id] = error
-            if on_complete is not None:
-                try:
-                    result = on_complete(success, error)
-                    if asyncio.iscoroutine(result):
-                        await result
-                except Exception as hook_error:  # pragma: no cover - hook errors are rare
-                    LOGGER.warning("Completion hook for %s raised: %s", task_id, hook_error)
+            while True:
+                job = self._next_job()
+                if job is None:
+                    return
+                await self._run_attempt(job)
         finally:
-            lock = self._ensure_lock()
-            async with lock:
-                self._inflight.discard(task_id)
-                self._completed.add(task_id)
-                task = asyncio.current_task()
-                if task is not None:
-                    self._tasks.discard(task)
+            self._worker_count -= 1
+
+    async def _run_attempt(self, job: _Job) -> None:
+        started = time.monotonic()
+        wait = started - job.queued_at
+        self._max_wait = max(self._max_wait, wait)
+        if self._wait_metric is not None:
+            self._wait_metric.observe(wait)
+        job.attempts += 1
+        self._running += 1
+        error: Exception | None = None
+        try:
+            await job.factory()
+        except Exception as exc:  # pragma: no cover - defensive; exercised in tests
+            error = exc
+        except BaseException:  # cancellation: release the id without retrying or running the hook
+            self._running -= 1
+            self._finish(job, None)
+            raise
+        elapsed = time.monotonic() - started
+        self._max_run = max(self._max_run, elapsed)
+        if self._run_metric is not None:
+            self._run_metric.observe(elapsed)
+        self._running -= 1
+
+        if error is not None and job.attempts < self._retry.attempts:
+            delay = self._backoff(job.attempts)
+            asyncio.get_running_loop().call_later(delay, self._enqueue, job)
+            return
+        if error is not None:
+            LOGGER.warning("Task %s failed after %d attempts: %s", job.task_id, job.attempts, error)
+        if job.on_complete is not None:
+            try:
+                result = job.on_complete(error is None, error)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as hook_error:  # pragma: no cover - hook errors are rare
+                LOGGER.warning("Completion hook for %s raised: %s", job.task_id, hook_error)
+        self._finish(job, error)
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self._max_backoff, self._retry.backoff * (2 ** (attempt - 1)))
+        return delay * (1.0 - self._jitter * self._rng.random())
+
+    def _finish(self, job: _Job, error: Exception | None) -> None:
+        now = time.monotonic()
+        self._live.pop(job.task_id, None)
+        self._finished[job.task_id] = _Finished(now + self._dedupe_ttl, job.attempts, error)
+        self._expire_finished(now)
+        if not self._live:
+            waiters, self._idle_waiters = self._idle_waiters, []
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def _expire_finished(self, now: float) -> None:
+        # Records are appended in completion order with one TTL, so expiry is FIFO.
+        finished = self._finished
+        while finished and (len(finished) > self._max_tracked or next(iter(finished.values())).expires_at <= now):
+            finished.popitem(last=False)
+
+    def close(self) -> None:
+        """Drop this scheduler's labelled metric series from the registry."""
+
+        if _QUEUE_DEPTH is None or self._wait_metric is None:
+            return
+        self._wait_metric = self._run_metric = None
+        for metric in (_QUEUE_DEPTH, _WAIT_SECONDS, _RUN_SECONDS):
+            try:
+                metric.remove(self._name)
+            except KeyError:  # pragma: no cover - already removed by a namesake
+                pass
 
     async def wait_for_all(self) -> None:
-        """Block until all scheduled tasks have completed."""
+        """Block until every scheduled task, including pending retries, has completed."""
 
-        lock = self._ensure_lock()
-        while True:
-            async with lock:
-                if not self._tasks:
-                    break
-                tasks = list(self._tasks)
-            await asyncio.gather(*tasks, return_exceptions=True)
+        if not self._live:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._idle_waiters.append(waiter)
+        await waiter
 
     @property
     def errors(self) -> Dict[str, Exception]:
-        """Return a mapping of task ids to the last error raised."""
+        """Return a mapping of task ids to the last error raised (for tracked completed tasks)."""
 
-        return dict(self._errors)
+        return {task_id: record.error for task_id, record in self._finished.items() if record.error is not None}
 
     @property
     def attempts(self) -> Dict[str, int]:
         """Return a mapping of task ids to the number of attempts performed."""
 
-        return dict(self._attempts)
+        attempts = {task_id: record.attempts for task_id, record in self._finished.items()}
+        attempts.update((task_id, job.attempts) for task_id, job in self._live.items())
+        return attempts
+
+
+def _pending_of(ref: "weakref.ReferenceType[TaskScheduler]") -> float:
+    scheduler = ref()
+    return float(scheduler.pending()) if scheduler is not None else 0.0
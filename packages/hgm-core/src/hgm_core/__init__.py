@@ -7,7 +7,7 @@ and cumulative metric propagation (CMP).
 
 from .config import EngineConfig
 from .engine import HGMEngine
-from .sampling import ThompsonSampler
+from .sampling import ThompsonSampler, VectorThompsonSampler
 from .types import AgentNode
 from .cmp import CMPAggregate, aggregate_cmp, merge_cmp_aggregates
 
@@ -15,6 +15,7 @@ __all__ = [
     "EngineConfig",
     "HGMEngine",
     "ThompsonSampler",
+    "VectorThompsonSampler",
     "AgentNode",
     "CMPAggregate",
     "aggregate_cmp",
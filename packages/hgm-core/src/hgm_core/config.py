@@ -21,9 +21,14 @@ class EngineConfig:
         seed: Optional deterministic seed fed into the internal random number
             generator. When provided, the engine behaves deterministically –
             a requirement for reproducible unit tests.
+        vectorized: Keep Thompson statistics in NumPy arrays and draw each
+            decision's Beta samples in one call. Requires ``numpy``; seeded
+            runs stay deterministic but follow a different random stream
+            than the default mode.
     """
 
     widening_alpha: float = 0.5
     min_visitations: int = 1
     thompson_prior: float = 1.0
     seed: int | None = None
+    vectorized: bool = False
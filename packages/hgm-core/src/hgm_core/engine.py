@@ -3,14 +3,18 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import math
 from dataclasses import replace
-from typing import Awaitable, Callable, Dict, Optional, Sequence
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from .cmp import merge_cmp_aggregates
 from .config import EngineConfig
-from .sampling import ThompsonSampler, posterior_parameters
+from .sampling import ThompsonSampler, VectorThompsonSampler, posterior_parameters
+from .store import ArrayNodeStore
 from .types import AgentNode
 
 Callback = Callable[[AgentNode, Dict[str, object]], Awaitable[None] | None]
+BatchCallback = Callable[[List[Tuple[AgentNode, Dict[str, object]]]], Awaitable[None] | None]
 
 
 class HGMEngine:
@@ -21,6 +25,18 @@ class HGMEngine:
     loop used by the orchestrator. Callbacks supplied through the constructor
     are always invoked outside of the internal lock which makes it safe to
     perform I/O in reaction to state updates.
+
+    Evaluations are O(1): rewards land in a per-node local accumulator and
+    the clade totals of the node and its ancestors (``visits``, the
+    success/failure weights and ``cmp``) are rolled up lazily, deepest level
+    first, the next time the engine reads them.  Evaluations that share
+    ancestors are merged before climbing, so ``k`` evaluations in one
+    lineage cost ``O(k + depth)`` instead of ``O(k * depth)``.
+
+    With ``EngineConfig(vectorized=True)`` (requires NumPy) the Thompson
+    statistics are mirrored into an :class:`~hgm_core.store.ArrayNodeStore`
+    and each decision draws all of a node's children in one vectorized call;
+    the :class:`AgentNode` objects remain the public view of the tree.
     """
 
     def __init__(
@@ -29,25 +45,35 @@ class HGMEngine:
         *,
         on_expansion_result: Callback | None = None,
         on_evaluation_result: Callback | None = None,
+        on_expansion_batch: BatchCallback | None = None,
+        on_evaluation_batch: BatchCallback | None = None,
     ) -> None:
         self._config = config or EngineConfig()
         self._nodes: Dict[str, AgentNode] = {}
+        self._pending: Dict[str, AgentNode] = {}
+        self._depths: Dict[str, int] = {}
         self._lock = asyncio.Lock()
-        self._sampler = ThompsonSampler(seed=self._config.seed)
+        self._store: ArrayNodeStore | None = None
+        self._sampler: ThompsonSampler | VectorThompsonSampler
+        if self._config.vectorized:
+            self._store = ArrayNodeStore()
+            self._sampler = VectorThompsonSampler(seed=self._config.seed)
+        else:
+            self._sampler = ThompsonSampler(seed=self._config.seed)
         self._on_expansion_result = on_expansion_result
         self._on_evaluation_result = on_evaluation_result
+        self._on_expansion_batch = on_expansion_batch
+        self._on_evaluation_batch = on_evaluation_batch
         self._expansion_gate = True
 
     async def ensure_node(self, key: str, **metadata: object) -> AgentNode:
         """Return a node, creating it when necessary."""
 
         async with self._lock:
-            node = self._nodes.get(key)
-            if node is None:
-                node = AgentNode(key=key, metadata=dict(metadata))
-                self._nodes[key] = node
-            else:
-                node.metadata.update(metadata)
+            self._roll_up()
+            node = self._get_node(key)
+            node.metadata.update(metadata)
+            self._sync_pruned(node)
             return node
 
     async def next_action(self, key: str, actions: Sequence[str]) -> Optional[str]:
@@ -56,74 +82,120 @@ class HGMEngine:
         if not actions:
             return None
 
-        return_action: Optional[str] = None
+        async with self._lock:
+            return self._select([key], actions)[0]
+
+    async def next_actions(self, keys: Sequence[str], actions: Sequence[str]) -> List[Optional[str]]:
+        """Decide :meth:`next_action` for several nodes under a single lock acquisition.
+
+        Decisions are made in order, so a key listed twice sees the expansion
+        made for its first occurrence.  In vectorized mode the Beta draws for
+        every node that needs sampling are taken in one call.
+        """
+
+        if not actions:
+            return [None] * len(keys)
 
         async with self._lock:
-            if not self._expansion_gate:
-                return None
-            node = self._nodes.get(key)
-            if node is None:
-                node = AgentNode(key=key)
-                self._nodes[key] = node
+            return self._select(keys, actions)
 
+    def _select(self, keys: Sequence[str], actions: Sequence[str]) -> List[Optional[str]]:
+        self._roll_up()
+        results: List[Optional[str]] = []
+        draws: List[Tuple[int, Sequence[str], Any, Any, Any]] = []
+        for key in keys:
+            if not self._expansion_gate:
+                results.append(None)
+                continue
+            node = self._get_node(key)
             if _is_pruned(node):
-                return None
-
-            widened_limit = max(
-                1,
-                int(
-                    math.floor(
-                        max(node.visits, self._config.min_visitations)
-                        ** self._config.widening_alpha
-                    )
-                ),
-            )
+                results.append(None)
+                continue
             children = node.metadata.setdefault("children", [])
-            explored_set = set(children)
-
-            if len(children) < min(widened_limit, len(actions)):
-                for action in actions:
-                    if action not in explored_set:
-                        children.append(action)
-                        child = AgentNode(key=f"{key}/{action}", parent=key)
-                        self._nodes[child.key] = child
-                        return_action = action
-                        break
-                else:
-                    return_action = None
-            else:
-                return_action = None
-
-            if return_action is not None:
-                action = return_action
-            else:
-                if not children:
-                    return actions[0]
-
-                alphas = []
-                betas = []
-                arms = []
+            action = self._widen(node, children, actions)
+            if action is None and not children:
+                action = actions[0]
+            if action is None:
+                arms, positions, alphas, betas = self._posteriors(key, children)
+                if len(positions):
+                    draws.append((len(results), arms, positions, alphas, betas))
+            results.append(action)
+        if draws:
+            self._draw(draws, results)
+        return results
+
+    def _widen(self, node: AgentNode, children: List[str], actions: Sequence[str]) -> Optional[str]:
+        """Expand the first unexplored action while the widening rule allows it."""
+
+        widened_limit = max(
+            1,
+            int(
+                math.floor(
+                    max(node.visits, self._config.min_visitations)
+                    ** self._config.widening_alpha
+                )
+            ),
+        )
+        if len(children) >= min(widened_limit, len(actions)):
+            return None
+        explored_set = set(children)
+        for action in actions:
+            if action not in explored_set:
+                children.append(action)
+                child = self._get_node(f"{node.key}/{action}", parent=node.key)
+                if self._store is not None:
+                    self._store.add_child(self._store.id_of(node.key), action, self._store.id_of(child.key))
+                return action
+        return None
+
+    def _posteriors(self, key: str, children: List[str]) -> Tuple[Sequence[str], Any, Any, Any]:
+        """Return ``(arms, positions, alphas, betas)`` for the unpruned children of ``key``."""
+
+        if self._store is not None:
+            store = self._store
+            parent_id = store.id_of(key)
+            arms, ids = store.children(parent_id)
+            if arms != children:
+                # ``metadata["children"]`` was edited outside next_action; rebuild the adjacency.
+                store.reset_children(parent_id)
                 for action in children:
-                    child_key = f"{key}/{action}"
-                    child = self._nodes.setdefault(
-                        child_key, AgentNode(key=child_key, parent=key)
-                    )
-                    if _is_pruned(child):
-                        continue
-                    alpha, beta = posterior_parameters(
-                        child.success_weight,
-                        child.failure_weight,
-                        self._config.thompson_prior,
-                    )
-                    alphas.append(alpha)
-                    betas.append(beta)
-                    arms.append(action)
-                if not arms:
-                    return None
-                choice = self._sampler.choose(arms, alphas, betas)
-                action = choice.arm
-
-        return action
+                    child = self._get_node(f"{key}/{action}", parent=key)
+                    store.add_child(parent_id, action, store.id_of(child.key))
+                arms, ids = store.children(parent_id)
+            positions, alphas, betas = store.posterior(ids, self._config.thompson_prior)
+            return arms, positions, alphas, betas
+
+        alphas = []
+        betas = []
+        arms = []
+        for action in children:
+            child_key = f"{key}/{action}"
+            child = self._nodes.setdefault(
+                child_key, AgentNode(key=child_key, parent=key)
+            )
+            if _is_pruned(child):
+                continue
+            alpha, beta = posterior_parameters(
+                child.success_weight,
+                child.failure_weight,
+                self._config.thompson_prior,
+            )
+            alphas.append(alpha)
+            betas.append(beta)
+            arms.append(action)
+        return arms, range(len(arms)), alphas, betas
+
+    def _draw(self, draws: List[Tuple[int, Sequence[str], Any, Any, Any]], results: List[Optional[str]]) -> None:
+        if isinstance(self._sampler, ThompsonSampler):
+            for index, arms, _, alphas, betas in draws:
+                results[index] = self._sampler.choose(arms, alphas, betas).arm
+            return
+        values = self._sampler.draw_batch([draw[3] for draw in draws], [draw[4] for draw in draws])
+        start = 0
+        for index, arms, positions, _, _ in draws:
+            end = start + len(positions)
+            results[index] = arms[int(positions[int(values[start:end].argmax())])]
+            start = end
 
     async def set_expansion_gate(self, allowed: bool) -> None:
         """Enable or disable further expansions."""
@@ -148,6 +220,7 @@ class HGMEngine:
             sentinel_meta["pruned"] = True
             if reason is not None:
                 sentinel_meta["reason"] = reason
+            self._sync_pruned(node)
 
     async def is_pruned(self, key: str) -> bool:
         """Return whether the specified node is pruned."""
@@ -161,14 +234,28 @@ class HGMEngine:
     async def record_expansion(self, key: str, action: str, *, payload: Optional[dict[str, object]] = None) -> None:
         """Record the result of expanding an action."""
 
-        payload = dict(payload or {})
-        child_key = f"{key}/{action}"
+        await self.record_expansions([(key, action, payload)])
+
+    async def record_expansions(
+        self,
+        expansions: Sequence[Tuple[str, str, Optional[Dict[str, object]]]],
+    ) -> None:
+        """Record several ``(parent_key, action, payload)`` expansions under one lock acquisition.
+
+        ``on_expansion_batch`` receives every result in one call; otherwise
+        ``on_expansion_result`` is invoked once per expansion.
+        """
+
+        results: List[Tuple[AgentNode, Dict[str, object]]] = []
         async with self._lock:
-            child = self._nodes.setdefault(child_key, AgentNode(key=child_key, parent=key))
-            child.metadata.update(payload)
-        if self._on_expansion_result is not None:
-            callback_payload = {"action": action, **payload}
-            await _invoke_callback(self._on_expansion_result, child, callback_payload)
+            self._roll_up()
+            for key, action, payload in expansions:
+                extra = dict(payload or {})
+                child = self._get_node(f"{key}/{action}", parent=key)
+                child.metadata.update(extra)
+                self._sync_pruned(child)
+                results.append((child, {"action": action, **extra}))
+        await _dispatch(self._on_expansion_result, self._on_expansion_batch, results)
 
     async def record_evaluation(
         self,
@@ -178,28 +265,49 @@ class HGMEngine:
         weight: float = 1.0,
         payload: Optional[Dict[str, object]] = None,
     ) -> None:
-        """Record the evaluation outcome for a node."""
+        """Record the evaluation outcome for a node.
 
-        extra = dict(payload or {})
+        The callback payload's ``cmp`` covers the node's rolled-up clade plus
+        its own pending evaluations; descendants' evaluations that have not
+        been rolled up yet are folded in on the next read.
+        """
 
-        async with self._lock:
-            node = self._nodes.setdefault(key, AgentNode(key=key))
-            node.record_reward(reward, weight)
+        await self.record_evaluations([(key, reward, weight, payload)])
+
+    async def record_evaluations(
+        self,
+        evaluations: Sequence[Tuple[str, float, float, Optional[Dict[str, object]]]],
+    ) -> None:
+        """Record several ``(key, reward, weight, payload)`` evaluations under one lock acquisition.
+
+        The batch is validated before any of it is applied.  ``on_evaluation_batch``
+        receives every result in one call; otherwise ``on_evaluation_result``
+        is invoked once per evaluation.
+        """
 
-            parent_key = node.parent
-            while parent_key is not None:
-                parent = self._nodes.setdefault(parent_key, AgentNode(key=parent_key))
-                parent.record_reward(reward, weight)
-                parent_key = parent.parent
+        for _, reward, weight, _ in evaluations:
+            if not 0.0 <= reward <= 1.0:
+                raise ValueError("Rewards must lie within [0, 1]")
+            if weight <= 0:
+                raise ValueError("Weights must be positive")
 
-            payload = {"reward": reward, "weight": weight, "cmp": node.cmp.to_dict(), **extra}
-        if self._on_evaluation_result is not None:
-            await _invoke_callback(self._on_evaluation_result, node, payload)
+        results: List[Tuple[AgentNode, Dict[str, object]]] = []
+        async with self._lock:
+            for key, reward, weight, extra in evaluations:
+                node = self._get_node(key)
+                local = self._pending.get(key)
+                if local is None:
+                    local = self._pending[key] = AgentNode(key=key)
+                local.record_reward(reward, weight)
+                cmp = merge_cmp_aggregates((node.cmp, local.cmp))
+                results.append((node, {"reward": reward, "weight": weight, "cmp": cmp.to_dict(), **(extra or {})}))
+        await _dispatch(self._on_evaluation_result, self._on_evaluation_batch, results)
 
     async def snapshot(self) -> Dict[str, AgentNode]:
         """Return a shallow copy of the nodes tracked by the engine."""
 
         async with self._lock:
+            self._roll_up()
             return dict(self._nodes)
 
     async def get_config(self) -> EngineConfig:
@@ -237,6 +345,99 @@ class HGMEngine:
 
             return replace(self._config)
 
+    def _get_node(self, key: str, *, parent: str | None = None) -> AgentNode:
+        """Return the node for ``key``, creating it (with ``parent``) when missing."""
+
+        node = self._nodes.get(key)
+        if node is None:
+            node = AgentNode(key=key, parent=parent)
+            self._nodes[key] = node
+            if self._store is not None:
+                self._store.id_of(key)
+        return node
+
+    def _roll_up(self) -> None:
+        """Fold pending local accumulators into every ancestor's clade totals.
+
+        Deltas are processed deepest level first and merged per ancestor
+        before climbing further.  Depths only order the work: a stale depth
+        means less merging, never a missed or repeated update.
+        """
+
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        if len(pending) == 1:
+            # A read after every evaluation: a plain walk up the lineage is cheapest.
+            ((key, delta),) = pending.items()
+            lineage: List[str] = []
+            node: Optional[AgentNode] = self._nodes[key]
+            while node is not None:
+                node.merge(delta)
+                lineage.append(node.key)
+                node = self._get_node(node.parent) if node.parent is not None else None
+            if self._store is not None:
+                self._store.add_rewards(
+                    [self._store.id_of(member) for member in lineage], delta.success_weight, delta.failure_weight
+                )
+            return
+        levels: Dict[int, Dict[str, AgentNode]] = {}
+        heap: List[int] = []
+        for key, delta in pending.items():
+            depth = self._depth(key)
+            level = levels.get(depth)
+            if level is None:
+                level = levels[depth] = {}
+                heapq.heappush(heap, -depth)
+            level[key] = delta
+        ids: List[int] = []
+        successes: List[float] = []
+        failures: List[float] = []
+        while heap:
+            depth = -heapq.heappop(heap)
+            for key, delta in levels.pop(depth).items():
+                node = self._nodes[key]
+                node.merge(delta)
+                if self._store is not None:
+                    ids.append(self._store.id_of(key))
+                    successes.append(delta.success_weight)
+                    failures.append(delta.failure_weight)
+                if node.parent is None:
+                    continue
+                self._get_node(node.parent)
+                level = levels.get(depth - 1)
+                if level is None:
+                    level = levels[depth - 1] = {}
+                    heapq.heappush(heap, -(depth - 1))
+                carried = level.get(node.parent)
+                if carried is None:
+                    level[node.parent] = delta  # ``delta`` was copied into ``node``; reuse it upwards.
+                else:
+                    carried.merge(delta)
+        if ids:
+            assert self._store is not None
+            self._store.add_rewards(ids, successes, failures)
+
+    def _depth(self, key: str) -> int:
+        depth = self._depths.get(key)
+        if depth is not None:
+            return depth
+        chain: List[str] = []
+        current: Optional[str] = key
+        while current is not None and current not in self._depths:
+            chain.append(current)
+            node = self._nodes.get(current)
+            current = node.parent if node is not None else None
+        depth = self._depths[current] if current is not None else -1
+        for member in reversed(chain):
+            depth += 1
+            self._depths[member] = depth
+        return self._depths[key]
+
+    def _sync_pruned(self, node: AgentNode) -> None:
+        if self._store is not None:
+            self._store.set_pruned(self._store.id_of(node.key), _is_pruned(node))
+
 
 async def _invoke_callback(callback: Callback, node: AgentNode, payload: Dict[str, object]) -> None:
     """Invoke a callback that may be synchronous or asynchronous."""
@@ -246,6 +447,22 @@ async def _invoke_callback(callback: Callback, node: AgentNode, payload: Dict[st
         await result
 
 
+async def _dispatch(
+    callback: Callback | None,
+    batch_callback: BatchCallback | None,
+    results: List[Tuple[AgentNode, Dict[str, object]]],
+) -> None:
+    if not results:
+        return
+    if batch_callback is not None:
+        outcome = batch_callback(results)
+        if asyncio.iscoroutine(outcome):
+            await outcome
+    elif callback is not None:
+        for node, payload in results:
+            await _invoke_callback(callback, node, payload)
+
+
 def _ensure_sentinel_meta(node: AgentNode) -> Dict[str, object]:
     sentinel_meta = node.metadata.get("sentinel")
     if not isinstance(sentinel_meta, dict):
@@ -6,6 +6,11 @@ from dataclasses import dataclass
 from random import Random
 from typing import Sequence
 
+try:  # Optional dependency for the vectorized engine mode.
+    import numpy as np  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None  # type: ignore
+
 
 @dataclass(slots=True)
 class ThompsonSample:
@@ -65,6 +70,46 @@ class ThompsonSampler:
         return best_sample
 
 
+class VectorThompsonSampler:
+    """NumPy counterpart of :class:`ThompsonSampler` drawing every arm in one call.
+
+    Seeded samplers are deterministic, but they do not reproduce the draws of
+    :class:`ThompsonSampler` because the underlying generators differ.
+    """
+
+    def __init__(self, seed: int | None = None) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for VectorThompsonSampler")
+        self._rng = np.random.default_rng(seed)
+
+    def draw(self, alphas: "np.ndarray", betas: "np.ndarray") -> "np.ndarray":
+        """Return one Beta draw per ``(alpha, beta)`` pair."""
+
+        if alphas.shape != betas.shape:
+            raise ValueError("Alphas and betas must have matching shapes")
+        if (alphas <= 0).any() or (betas <= 0).any():
+            raise ValueError("Beta parameters must be positive")
+        return self._rng.beta(alphas, betas)
+
+    def draw_batch(self, alphas: Sequence["np.ndarray"], betas: Sequence["np.ndarray"]) -> "np.ndarray":
+        """Draw several parameter arrays in one call and return the concatenated samples."""
+
+        if len(alphas) == 1:
+            return self.draw(alphas[0], betas[0])
+        return self.draw(np.concatenate(alphas), np.concatenate(betas))
+
+    def choose(self, arms: Sequence[str], alphas: Sequence[float], betas: Sequence[float]) -> ThompsonSample:
+        """Vectorized equivalent of :meth:`ThompsonSampler.choose`."""
+
+        if not (len(arms) == len(alphas) == len(betas)):
+            raise ValueError("Arms, alphas and betas must have matching lengths")
+        if not arms:
+            raise ValueError("At least one arm is required")
+        values = self.draw(np.asarray(alphas, dtype=np.float64), np.asarray(betas, dtype=np.float64))
+        index = int(values.argmax())
+        return ThompsonSample(arm=arms[index], value=float(values[index]))
+
+
 def posterior_parameters(successes: float, failures: float, prior: float) -> tuple[float, float]:
     """Return posterior Beta parameters for a Bernoulli reward model."""
 
@@ -0,0 +1,106 @@
+"""Array-backed node statistics used by the vectorized engine mode."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+try:  # Optional dependency for the vectorized engine mode.
+    import numpy as np  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None  # type: ignore
+
+
+class ArrayNodeStore:
+    """Contiguous success/failure weights indexed by integer node ids.
+
+    The store mirrors the Thompson sampling statistics of the engine's
+    :class:`~hgm_core.types.AgentNode` objects so a decision over ``n``
+    children is a handful of array operations instead of ``n`` Python-level
+    lookups.  Each parent keeps an adjacency list of ``(action, child id)``
+    pairs in expansion order; the id array is cached until the next
+    expansion under that parent.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for the vectorized HGM engine")
+        capacity = max(1, capacity)
+        self._ids: Dict[str, int] = {}
+        self._success = np.zeros(capacity, dtype=np.float64)
+        self._failure = np.zeros(capacity, dtype=np.float64)
+        self._pruned = np.zeros(capacity, dtype=bool)
+        self._child_actions: Dict[int, List[str]] = {}
+        self._child_ids: Dict[int, List[int]] = {}
+        self._child_index: Dict[int, Dict[str, int]] = {}
+        self._child_arrays: Dict[int, "np.ndarray"] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def id_of(self, key: str) -> int:
+        """Return the id for ``key``, allocating a zeroed slot when it is new."""
+
+        node_id = self._ids.get(key)
+        if node_id is None:
+            node_id = len(self._ids)
+            if node_id == self._success.shape[0]:
+                self._grow()
+            self._ids[key] = node_id
+        return node_id
+
+    def add_child(self, parent_id: int, action: str, child_id: int) -> None:
+        index = self._child_index.setdefault(parent_id, {})
+        if action in index:
+            return
+        index[action] = child_id
+        self._child_actions.setdefault(parent_id, []).append(action)
+        self._child_ids.setdefault(parent_id, []).append(child_id)
+        self._child_arrays.pop(parent_id, None)
+
+    def children(self, parent_id: int) -> Tuple[List[str], "np.ndarray"]:
+        """Return ``(actions, ids)`` for the children of ``parent_id`` in expansion order."""
+
+        ids = self._child_arrays.get(parent_id)
+        if ids is None:
+            ids = np.asarray(self._child_ids.get(parent_id, ()), dtype=np.intp)
+            self._child_arrays[parent_id] = ids
+        return self._child_actions.get(parent_id, []), ids
+
+    def add_rewards(
+        self,
+        node_ids: Sequence[int],
+        successes: Sequence[float] | float,
+        failures: Sequence[float] | float,
+    ) -> None:
+        """Add success/failure mass (per id, or one value for all); repeated ids accumulate."""
+
+        np.add.at(self._success, node_ids, successes)
+        np.add.at(self._failure, node_ids, failures)
+
+    def set_pruned(self, node_id: int, pruned: bool) -> None:
+        self._pruned[node_id] = pruned
+
+    def reset_children(self, parent_id: int) -> None:
+        for table in (self._child_actions, self._child_ids, self._child_index, self._child_arrays):
+            table.pop(parent_id, None)
+
+    def posterior(self, node_ids: "np.ndarray", prior: float) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Return ``(positions, alphas, betas)`` for the unpruned entries of ``node_ids``.
+
+        ``positions`` index into ``node_ids`` (and the matching action list).
+        """
+
+        positions = np.flatnonzero(~self._pruned[node_ids])
+        live = node_ids[positions]
+        return positions, self._success[live] + prior, self._failure[live] + prior
+
+    def _grow(self) -> None:
+        size = self._success.shape[0] * 2
+        for name in ("_success", "_failure", "_pruned"):
+            current = getattr(self, name)
+            grown = np.zeros(size, dtype=current.dtype)
+            grown[: current.shape[0]] = current
+            setattr(self, name, grown)
+
+
+__all__ = ["ArrayNodeStore"]
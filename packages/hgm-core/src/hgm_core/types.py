@@ -47,6 +47,15 @@ class AgentNode:
         self.failure_weight += (1.0 - reward) * weight
         self.cmp.add(reward, weight)
 
+    def merge(self, other: "AgentNode") -> "AgentNode":
+        """Fold another node's statistics (not metadata) into this one and return ``self``."""
+
+        self.visits += other.visits
+        self.success_weight += other.success_weight
+        self.failure_weight += other.failure_weight
+        self.cmp.merge(other.cmp)
+        return self
+
     def as_dict(self) -> Dict[str, Any]:
         """Serialize the node to a JSON compatible structure."""
 
@@ -58,3 +58,115 @@ def test_callbacks_receive_payloads():
     assert evaluations[0][0] == "root/x"
     assert evaluations[0][1]["reward"] == 0.5
     assert evaluations[0][1]["cmp"]["weight"] == pytest.approx(2.0)
+
+
+def test_batch_callbacks_receive_whole_batches():
+    batches: list[list[tuple[str, dict[str, object]]]] = []
+
+    async def on_batch(results):
+        batches.append([(node.key, payload) for node, payload in results])
+
+    async def scenario():
+        engine = HGMEngine(EngineConfig(seed=1), on_expansion_batch=on_batch, on_evaluation_batch=on_batch)
+        await engine.record_expansions([("root", "a", None), ("root", "b", {"cost": 1.0})])
+        await engine.record_evaluations([("root/a", 1.0, 1.0, None), ("root/b", 0.0, 2.0, None)])
+        with pytest.raises(ValueError):
+            await engine.record_evaluations([("root/a", 0.5, 1.0, None), ("root/b", 2.0, 1.0, None)])
+        return await engine.snapshot()
+
+    snapshot = asyncio.run(scenario())
+
+    assert [[key for key, _ in batch] for batch in batches] == [["root/a", "root/b"], ["root/a", "root/b"]]
+    assert batches[0][1][1]["cost"] == 1.0
+    # The rejected batch is validated up front and leaves no partial update.
+    assert snapshot["root/a"].visits == 1
+    assert (snapshot["root"].success_weight, snapshot["root"].failure_weight) == pytest.approx((1.0, 2.0))
+
+
+def _wide_engine(seed: int, children: int) -> tuple[HGMEngine, list[str]]:
+    config = EngineConfig(widening_alpha=1.0, min_visitations=children, seed=seed, vectorized=True)
+    return HGMEngine(config), [f"arm-{index}" for index in range(children)]
+
+
+async def _expand_all(engine: HGMEngine, key: str, actions: list[str]) -> None:
+    for index, action in enumerate(actions):
+        assert await engine.next_action(key, actions) == action
+        await engine.record_evaluation(f"{key}/{action}", reward=index / len(actions))
+
+
+def test_vectorized_engine_is_seeded_and_skips_pruned_children():
+    pytest.importorskip("numpy")
+
+    async def decisions(seed: int) -> list[str | None]:
+        engine, actions = _wide_engine(seed, 50)
+        await _expand_all(engine, "root", actions)
+        await engine.mark_pruned("root/arm-49")
+        await engine.mark_pruned("root/arm-48")
+        chosen = [await engine.next_action("root", actions) for _ in range(20)]
+        snapshot = await engine.snapshot()
+        assert snapshot["root"].visits == pytest.approx(50.0)
+        assert snapshot["root/arm-10"].parent == "root"
+        return chosen
+
+    first = asyncio.run(decisions(5))
+    assert first == asyncio.run(decisions(5))
+    assert set(first) <= {f"arm-{index}" for index in range(48)}
+    # Arms with the highest rewards dominate the posterior draws.
+    assert sum(int(action.split("-")[1]) >= 30 for action in first if action) >= 15
+
+
+def test_next_actions_batches_decisions_in_order():
+    pytest.importorskip("numpy")
+
+    async def scenario() -> None:
+        engine, actions = _wide_engine(3, 4)
+        for parent in ("p", "q"):
+            await _expand_all(engine, parent, actions)
+        await engine.mark_pruned("q")
+
+        results = await engine.next_actions(["fresh", "fresh", "p", "q"], actions)
+        assert results[:2] == ["arm-0", "arm-1"]
+        assert results[2] in actions
+        assert results[3] is None
+        assert (await engine.snapshot())["fresh"].metadata["children"] == ["arm-0", "arm-1"]
+
+        await engine.set_expansion_gate(False)
+        assert await engine.next_actions(["p"], actions) == [None]
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_deferred_rollup_matches_clade_sums(vectorized):
+    if vectorized:
+        pytest.importorskip("numpy")
+    import random
+
+    rng = random.Random(17)
+    keys = ["root"]
+    for _ in range(60):
+        keys.append(f"{rng.choice(keys)}/{len(keys)}")
+    evaluations = [(rng.choice(keys), rng.random(), rng.choice([0.5, 1.0, 2.0])) for _ in range(300)]
+
+    async def scenario():
+        engine = HGMEngine(EngineConfig(seed=2, vectorized=vectorized))
+        await engine.ensure_node("root")
+        for key in keys[1:]:
+            parent, action = key.rsplit("/", 1)
+            await engine.record_expansion(parent, action)
+        for index, (key, reward, weight) in enumerate(evaluations):
+            await engine.record_evaluation(key, reward, weight=weight)
+            if index % 37 == 0:
+                await engine.snapshot()
+        return await engine.snapshot()
+
+    nodes = asyncio.run(scenario())
+    for key in keys:
+        clade = [(reward, weight) for member, reward, weight in evaluations if member == key or member.startswith(key + "/")]
+        node = nodes[key]
+        assert node.visits == pytest.approx(sum(weight for _, weight in clade))
+        assert node.success_weight == pytest.approx(sum(reward * weight for reward, weight in clade))
+        assert node.failure_weight == pytest.approx(sum((1 - reward) * weight for reward, weight in clade))
+        assert node.cmp.total_weight == pytest.approx(node.visits)
+    with pytest.raises(ValueError):
+        asyncio.run(HGMEngine().record_evaluation("root", 1.5))
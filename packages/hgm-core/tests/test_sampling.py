@@ -30,3 +30,16 @@ def test_sampler_choose_returns_highest_sample():
     assert sample.arm in arms
     # Check reproducibility.
     assert sample.value == pytest.approx(0.6034191019)
+
+
+def test_vector_sampler_is_deterministic_and_validates():
+    np = pytest.importorskip("numpy")
+    from hgm_core.sampling import VectorThompsonSampler
+
+    alphas = np.array([1.0, 2.0, 30.0])
+    betas = np.array([30.0, 2.0, 1.0])
+    draws = VectorThompsonSampler(seed=11).draw_batch([alphas[:2], alphas[2:]], [betas[:2], betas[2:]])
+    assert np.allclose(draws, VectorThompsonSampler(seed=11).draw(alphas, betas))
+    assert VectorThompsonSampler(seed=11).choose(["a", "b", "c"], list(alphas), list(betas)).arm == "c"
+    with pytest.raises(ValueError):
+        VectorThompsonSampler().draw(np.array([0.0]), np.array([1.0]))
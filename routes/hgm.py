@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 
 from backend.database import get_database
-from backend.models.hgm import HgmRepository, seed_demo_run
+from backend.models.hgm import HgmRepository, LineagePage, seed_demo_run
 
 try:  # pragma: no cover - align auth with Onebox router when available
     from .onebox import require_api  # type: ignore
@@ -47,10 +48,15 @@ def delete_run(run_id: str, repo: HgmRepository = Depends(_repository)) -> Respo
 
 
 @router.get("/runs/{run_id}/lineage")
-def get_lineage(run_id: str, root: Optional[str] = None, repo: HgmRepository = Depends(_repository)) -> List[Dict[str, Any]]:
-    """Return the lineage tree for the requested run."""
-
-    nodes = repo.fetch_lineage(run_id, root_key=root)
+def get_lineage(
+    run_id: str,
+    root: Optional[str] = None,
+    depth: Optional[int] = Query(None, ge=0),
+    repo: HgmRepository = Depends(_repository),
+) -> List[Dict[str, Any]]:
+    """Return the lineage tree for the requested run, optionally depth-limited."""
+
+    nodes = repo.fetch_lineage(run_id, root_key=root, max_depth=depth)
     if not nodes:
         if repo.get_run(run_id) is None:
             raise HTTPException(status_code=404, detail="RUN_NOT_FOUND")
@@ -58,6 +64,60 @@ def get_lineage(run_id: str, root: Optional[str] = None, repo: HgmRepository = D
     return [node.to_dict() for node in nodes]
 
 
+_MAX_PAGE_SIZE = 1000
+
+
+def _lineage_page(repo: HgmRepository, run_id: str, **filters: Any) -> LineagePage:
+    try:
+        page = repo.lineage_page(run_id, **filters)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="INVALID_CURSOR") from None
+    if not page.nodes and repo.get_run(run_id) is None:
+        raise HTTPException(status_code=404, detail="RUN_NOT_FOUND")
+    return page
+
+
+@router.get("/runs/{run_id}/lineage/nodes")
+def get_lineage_nodes(
+    run_id: str,
+    root: Optional[str] = None,
+    depth: Optional[int] = Query(None, ge=0),
+    since: Optional[float] = None,
+    first: int = Query(500, ge=1, le=_MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    repo: HgmRepository = Depends(_repository),
+) -> Dict[str, Any]:
+    """Return one flat, cursor-paginated page of lineage nodes in path order."""
+
+    page = _lineage_page(repo, run_id, root_key=root, max_depth=depth, since=since, after=after, limit=first)
+    return page.to_dict()
+
+
+@router.get("/runs/{run_id}/lineage/stream")
+def stream_lineage(
+    run_id: str,
+    root: Optional[str] = None,
+    depth: Optional[int] = Query(None, ge=0),
+    since: Optional[float] = None,
+    after: Optional[str] = None,
+    repo: HgmRepository = Depends(_repository),
+) -> StreamingResponse:
+    """Stream matching lineage nodes as NDJSON, one node per line, parents first."""
+
+    filters: Dict[str, Any] = {"root_key": root, "max_depth": depth, "since": since, "limit": _MAX_PAGE_SIZE}
+    page = _lineage_page(repo, run_id, after=after, **filters)
+
+    def _lines(page: LineagePage) -> Iterator[bytes]:
+        while True:
+            for node in page.nodes:
+                yield json.dumps(node.to_dict(), separators=(",", ":")).encode("utf-8") + b"\n"
+            if page.next_cursor is None:
+                return
+            page = repo.lineage_page(run_id, after=page.next_cursor, **filters)
+
+    return StreamingResponse(_lines(page), media_type="application/x-ndjson")
+
+
 @router.post("/runs/demo-seed", status_code=201)
 def seed_demo(repo: HgmRepository = Depends(_repository)) -> Dict[str, Any]:
     run = seed_demo_run(repo)
@@ -66,22 +126,21 @@ def seed_demo(repo: HgmRepository = Depends(_repository)) -> Dict[str, Any]:
 
 _LINEAGE_CALL_PATTERN = re.compile(r"\blineage\s*\((?P<args>[^)]*)\)", re.DOTALL)
 _LINEAGE_ARG_PATTERN = re.compile(
-    r"(?P<key>runId|root)\s*:\s*(?P<value>\"(?:\\\"|[^\"])*\"|\$[A-Za-z_][A-Za-z0-9_]*)"
+    r"(?P<key>runId|root|depth|first|after|since)\s*:\s*"
+    r"(?P<value>\"(?:\\\"|[^\"])*\"|\$[A-Za-z_][A-Za-z0-9_]*|-?\d+(?:\.\d+)?)"
 )
 
 
-def _parse_argument_value(value: str, variables: Dict[str, Any]) -> Optional[str]:
+def _parse_argument_value(value: str, variables: Dict[str, Any]) -> Any:
     if value.startswith("$"):
-        var_name = value[1:]
-        var_value = variables.get(var_name)
-        return var_value if isinstance(var_value, str) else None
+        return variables.get(value[1:])
     try:
         return json.loads(value)
     except Exception:
         return None
 
 
-def _extract_lineage_args(payload: Dict[str, Any]) -> tuple[str, Optional[str]]:
+def _extract_lineage_args(payload: Dict[str, Any]) -> Dict[str, Any]:
     query = payload.get("query")
     if not isinstance(query, str):
         raise HTTPException(status_code=400, detail="INVALID_QUERY")
@@ -91,27 +150,61 @@ def _extract_lineage_args(payload: Dict[str, Any]) -> tuple[str, Optional[str]]:
     args_raw = match.group("args")
     variables = payload.get("variables")
     variables = variables if isinstance(variables, dict) else {}
-    parsed: Dict[str, Optional[str]] = {"runId": None, "root": None}
+    parsed: Dict[str, Any] = {}
     for arg_match in _LINEAGE_ARG_PATTERN.finditer(args_raw):
-        key = arg_match.group("key")
         value = _parse_argument_value(arg_match.group("value"), variables)
-        parsed[key] = value
+        if value is not None:
+            parsed[arg_match.group("key")] = value
     run_id = parsed.get("runId")
-    root = parsed.get("root")
     if not isinstance(run_id, str) or not run_id:
         raise HTTPException(status_code=400, detail="INVALID_QUERY")
-    if root is not None and not isinstance(root, str):
+    for key in ("root", "after"):
+        if key in parsed and not isinstance(parsed[key], str):
+            raise HTTPException(status_code=400, detail="INVALID_QUERY")
+    for key in ("depth", "first"):
+        value = parsed.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+            raise HTTPException(status_code=400, detail="INVALID_QUERY")
+    since = parsed.get("since")
+    if since is not None and (isinstance(since, bool) or not isinstance(since, (int, float))):
         raise HTTPException(status_code=400, detail="INVALID_QUERY")
-    return run_id, root
+    return parsed
 
 
 @router.post("/graphql")
 def graphql(payload: Dict[str, Any], repo: HgmRepository = Depends(_repository)) -> Dict[str, Any]:
-    """Minimal GraphQL endpoint supporting ``lineage`` queries."""
-
-    run_id, root = _extract_lineage_args(payload)
-    data = repo.fetch_lineage(run_id, root_key=root)
-    return {"data": {"lineage": [node.to_dict() for node in data]}}
+    """Minimal GraphQL endpoint supporting ``lineage`` queries.
+
+    ``lineage(runId, root, depth)`` returns the nested tree.  Adding ``first``,
+    ``after`` or ``since`` switches to a connection of flat nodes with
+    ``pageInfo { hasNextPage endCursor }`` and a ``watermark`` for delta polling.
+    """
+
+    args = _extract_lineage_args(payload)
+    run_id, root, depth = args["runId"], args.get("root"), args.get("depth")
+    if not {"first", "after", "since"} & args.keys():
+        data = repo.fetch_lineage(run_id, root_key=root, max_depth=depth)
+        return {"data": {"lineage": [node.to_dict() for node in data]}}
+    try:
+        page = repo.lineage_page(
+            run_id,
+            root_key=root,
+            max_depth=depth,
+            since=args.get("since"),
+            after=args.get("after"),
+            limit=min(max(1, args.get("first", 500)), _MAX_PAGE_SIZE),
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="INVALID_CURSOR") from None
+    return {
+        "data": {
+            "lineage": {
+                "nodes": [node.to_dict() for node in page.nodes],
+                "pageInfo": {"hasNextPage": page.next_cursor is not None, "endCursor": page.next_cursor},
+                "watermark": page.watermark,
+            }
+        }
+    }
 
 
 __all__ = ["router"]
@@ -8,10 +8,11 @@ import sys
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
 from prometheus_client import Counter, Histogram
 
+from orchestrator.dispatch import RunQueueFull
 from orchestrator.models import ExecIn, PlanIn, PlanOut, SimIn, SimOut, StatusOut
 from orchestrator.planner import make_plan
 from orchestrator.runner import get_status, start_run
-from orchestrator.simulator import simulate_plan
+from orchestrator.simulator import simulate_plan_async
 from .security import SecurityContext, audit_event
 from .security import require_security
 
@@ -125,9 +126,9 @@ def plan(req: PlanIn, request: Request) -> PlanOut:
 
 
 @router.post("/simulate", response_model=SimOut)
-def simulate(req: SimIn, request: Request) -> SimOut:
+async def simulate(req: SimIn, request: Request) -> SimOut:
     with _SIM_LATENCY.time():
-        result = simulate_plan(req.plan)
+        result = await simulate_plan_async(req.plan)
     logger.info(
         "meta_orchestrator.simulate",
         extra={"plan_id": req.plan.plan_id, "risks": result.risks, "blockers": result.blockers},
@@ -145,7 +146,15 @@ def simulate(req: SimIn, request: Request) -> SimOut:
 
 @router.post("/execute")
 def execute(req: ExecIn, request: Request) -> dict:
-    run = start_run(req.plan, req.approvals)
+    try:
+        run = start_run(req.plan, req.approvals)
+    except RunQueueFull as exc:
+        logger.warning("meta_orchestrator.execute.backpressure", extra={"plan_id": req.plan.plan_id})
+        raise HTTPException(
+            status_code=429,
+            detail="RUN_QUEUE_FULL",
+            headers={"Retry-After": "1"},
+        ) from exc
     logger.info("meta_orchestrator.execute", extra={"plan_id": run.plan_id, "run_id": run.id})
     audit_event(
         _context_from_request(request),
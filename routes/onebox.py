@@ -10,7 +10,6 @@ import inspect
 import hashlib
 import json
 import logging
-import math
 import os
 import re
 import threading
@@ -19,10 +18,12 @@ import time
 import uuid
 import sys
 import types
+from collections import OrderedDict
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
-from typing import Any, Dict, List, Literal, Optional, Sequence, Set, Tuple
+from typing import Any, Dict, List, Literal, Optional, Sequence, Set, Tuple, Union
 
 from urllib.parse import quote
 
@@ -281,6 +282,20 @@ except Exception:  # pragma: no cover - exercised in test stubs
 
         async def execute(self, *_args, **_kwargs):
             raise AAConfigurationError("Account abstraction executor not configured")
+from orchestrator.canonical import DigestMemo, maybe_model_dump, normalize_for_digest, plan_digest, receipt_digest
+from orchestrator.http_pool import ProviderHealth, get_http_pool
+from orchestrator.org_policy import (
+    FilePolicySource,
+    PolicySource,
+    PolicyWatcher,
+    ToolAllowlist,
+    build_policy_source,
+    normalize_tool_patterns,
+    parse_policy_document,
+)
+from orchestrator.plan_store import PlanMetadataStore, build_plan_store
+from orchestrator.relayer import FeeOracle, ReceiptTimeout, RelayerPipeline
+from orchestrator.rpc import JsonRpcError, get_rpc_client
 from .security import SecurityContext, audit_event, require_security
 router = APIRouter(prefix="/onebox", tags=["onebox"])
 health_router = APIRouter(tags=["health"])
@@ -294,6 +309,8 @@ AGIALPHA_DECIMALS = int(os.getenv("AGIALPHA_DECIMALS", "18") or "18")
 _DEFAULT_POLICY_PATH = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "storage", "org-policies.json")
 )
+_ORG_POLICY_URL = os.getenv("ONEBOX_POLICY_STORE_URL") or None
+_ORG_POLICY_RELOAD_SECONDS = float(os.getenv("ONEBOX_POLICY_RELOAD_SECONDS", "1") or "1")
 _ERROR_CATALOG_PATH = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "backend", "errors", "catalog.json")
 )
@@ -748,6 +765,19 @@ class StatusResponse(BaseModel):
     token: Optional[str] = None
     deadline: Optional[int] = None
     assignee: Optional[str] = None
+
+
+class StatusBatchResponse(BaseModel):
+    statuses: List[StatusResponse] = Field(default_factory=list)
+    blockNumber: Optional[int] = None
+
+
+class RelayedTxStatusResponse(BaseModel):
+    txHash: str
+    state: Literal["pending", "mined", "failed", "dropped", "unknown"] = "unknown"
+    jobId: Optional[int] = None
+    receipt: Optional[Dict[str, Any]] = None
+
 ErrorEntry = Dict[str, Optional[str]]
 
 
@@ -900,88 +930,75 @@ class OrgPolicyViolation(Exception):
     def to_http_exception(self) -> HTTPException:
         return HTTPException(status_code=400, detail=_error_detail(self.code))
 
+@dataclass(frozen=True)
+class _OrgPolicySnapshot:
+    records: Dict[str, OrgPolicyRecord]
+    allowlists: Dict[str, ToolAllowlist]
+    fallback: OrgPolicyRecord
+
+
 class OrgPolicyStore:
+    """Organisation caps compiled into immutable snapshots.
+
+    ``enforce`` reads the current snapshot without locking; the snapshot is
+    recompiled when the policy file (or the shared database row) changes.
+    Unknown organisations get the environment defaults.
+    """
+
     def __init__(
         self,
         *,
         policy_path: Optional[str] = None,
         default_max_budget_wei: Optional[int] = None,
         default_max_duration_days: Optional[int] = None,
+        source: Optional[PolicySource] = None,
+        reload_interval: Optional[float] = None,
     ):
         self._policy_path = policy_path or _DEFAULT_POLICY_PATH
         self._default_max_budget_wei = default_max_budget_wei
         self._default_max_duration_days = default_max_duration_days
-        self._policies: Dict[str, OrgPolicyRecord] = {}
-        self._lock = threading.Lock()
-        self._load()
-        self._policies.setdefault(
-            "__default__",
-            OrgPolicyRecord(
-                max_budget_wei=self._default_max_budget_wei,
-                max_duration_days=self._default_max_duration_days,
-            ),
+        self._watcher: PolicyWatcher[_OrgPolicySnapshot] = PolicyWatcher(
+            source or FilePolicySource(self._policy_path),
+            self._compile,
+            reload_interval=_ORG_POLICY_RELOAD_SECONDS if reload_interval is None else reload_interval,
         )
 
+    @property
+    def _policies(self) -> Dict[str, OrgPolicyRecord]:
+        return self._watcher.current().records
+
     def _resolve_key(self, org_id: Optional[str]) -> str:
         return str(org_id or "__default__")
 
-    def _load(self) -> None:
-        try:
-            with open(self._policy_path, "r") as f:
-                data = json.load(f)
-        except FileNotFoundError:
-            data = {}
-        for key, value in data.items():
-            record = OrgPolicyRecord()
-            stored_budget = value.get("maxBudgetWei")
-            if isinstance(stored_budget, str):
-                try:
-                    record.max_budget_wei = int(stored_budget)
-                except ValueError:
-                    record.max_budget_wei = None
-            elif isinstance(stored_budget, (int, float)):
-                record.max_budget_wei = int(stored_budget)
-            stored_duration = value.get("maxDurationDays")
-            if isinstance(stored_duration, (int, str)):
-                try:
-                    record.max_duration_days = int(stored_duration)
-                except ValueError:
-                    record.max_duration_days = None
-            allowed_tools_raw = value.get("allowedTools")
-            if allowed_tools_raw is None:
-                allowed_tools_raw = value.get("toolWhitelist")
-            if allowed_tools_raw is not None:
-                allowed: List[str] = []
-                if isinstance(allowed_tools_raw, list):
-                    for entry in allowed_tools_raw:
-                        if isinstance(entry, str):
-                            trimmed = entry.strip()
-                            if trimmed:
-                                allowed.append(trimmed)
-                elif isinstance(allowed_tools_raw, str):
-                    tokens = re.split(r"[\s,;]+", allowed_tools_raw)
-                    for token in tokens:
-                        trimmed = token.strip()
-                        if trimmed:
-                            allowed.append(trimmed)
-                record.allowed_tools = allowed
-            if record.max_budget_wei is None:
-                record.max_budget_wei = self._default_max_budget_wei
-            if record.max_duration_days is None:
-                record.max_duration_days = self._default_max_duration_days
-            self._policies[key] = record
-
-    def _get_or_create(self, org_id: Optional[str]) -> OrgPolicyRecord:
-        key = self._resolve_key(org_id)
-        record = self._policies.get(key)
-        if record is not None:
-            return record
-        record = OrgPolicyRecord(
+    def _default_record(self) -> OrgPolicyRecord:
+        return OrgPolicyRecord(
             max_budget_wei=self._default_max_budget_wei,
             max_duration_days=self._default_max_duration_days,
         )
-        self._policies[key] = record
-        return record
+
+    def _compile(self, document: Dict[str, Any]) -> _OrgPolicySnapshot:
+        records: Dict[str, OrgPolicyRecord] = {}
+        allowlists: Dict[str, ToolAllowlist] = {}
+        for key, entry in parse_policy_document(document).items():
+            record = self._default_record()
+            # An explicit null (written by ``update(..., None, ...)``) means no cap.
+            if entry.max_budget_wei is not None or "maxBudgetWei" in entry.cleared:
+                record.max_budget_wei = entry.max_budget_wei
+            if entry.max_duration_days is not None or "maxDurationDays" in entry.cleared:
+                record.max_duration_days = entry.max_duration_days
+            if entry.updated_at:
+                record.updated_at = entry.updated_at
+            if entry.allowed_tools is not None:
+                record.allowed_tools = list(entry.allowed_tools)
+                allowlists[key] = ToolAllowlist.compile(entry.allowed_tools)
+            records[key] = record
+        records.setdefault("__default__", self._default_record())
+        return _OrgPolicySnapshot(records, allowlists, self._default_record())
+
+    def reload(self) -> bool:
+        """Re-read the policy source now; return whether the snapshot changed."""
+
+        return self._watcher.refresh(force=True)
 
     def enforce(
         self,
@@ -990,64 +1007,35 @@ class OrgPolicyStore:
         deadline_days: int,
         requested_tools: Optional[List[str]] = None,
     ) -> OrgPolicyRecord:
-        with self._lock:
-            record = self._get_or_create(org_id)
-            if record.max_budget_wei is not None and reward_wei > record.max_budget_wei:
-                message = (
-                    f"Requested reward of {reward_wei} wei exceeds organisation cap of {record.max_budget_wei} wei."
-                )
-                raise OrgPolicyViolation("JOB_BUDGET_CAP_EXCEEDED", message, record)
-            if record.max_duration_days is not None and deadline_days > record.max_duration_days:
-                message = (
-                    f"Requested deadline of {deadline_days} days exceeds organisation cap of {record.max_duration_days} days."
+        snapshot = self._watcher.current()
+        key = self._resolve_key(org_id)
+        record = snapshot.records.get(key) or snapshot.fallback
+        if record.max_budget_wei is not None and reward_wei > record.max_budget_wei:
+            message = (
+                f"Requested reward of {reward_wei} wei exceeds organisation cap of {record.max_budget_wei} wei."
+            )
+            raise OrgPolicyViolation("JOB_BUDGET_CAP_EXCEEDED", message, record)
+        if record.max_duration_days is not None and deadline_days > record.max_duration_days:
+            message = (
+                f"Requested deadline of {deadline_days} days exceeds organisation cap of {record.max_duration_days} days."
+            )
+            raise OrgPolicyViolation("JOB_DEADLINE_CAP_EXCEEDED", message, record)
+        allowlist = snapshot.allowlists.get(key) if record.allowed_tools is not None else None
+        if allowlist is not None and not allowlist.allow_all:
+            effective_tools = requested_tools or []
+            if not allowlist.has_patterns and effective_tools:
+                raise OrgPolicyViolation(
+                    "TOOL_NOT_ALLOWED",
+                    "Requested tools are not permitted by organisation policy.",
+                    record,
                 )
-                raise OrgPolicyViolation("JOB_DEADLINE_CAP_EXCEEDED", message, record)
-            if record.allowed_tools is not None:
-                allowed_patterns = [entry for entry in record.allowed_tools if isinstance(entry, str)]
-                allow_all = False
-                normalized_patterns: List[str] = []
-                for entry in allowed_patterns:
-                    trimmed = entry.strip()
-                    if not trimmed:
-                        continue
-                    lowered = trimmed.lower()
-                    if lowered in {"*", "all", "any"}:
-                        allow_all = True
-                        break
-                    normalized_patterns.append(trimmed)
-                if not allow_all:
-                    def _tool_allowed(tool_name: str) -> bool:
-                        target = tool_name.strip().lower()
-                        if not target:
-                            return True
-                        for pattern in normalized_patterns:
-                            lowered_pattern = pattern.strip().lower()
-                            if not lowered_pattern:
-                                continue
-                            if lowered_pattern.endswith("*"):
-                                prefix = lowered_pattern[:-1]
-                                if target.startswith(prefix):
-                                    return True
-                            elif target == lowered_pattern:
-                                return True
-                        return False
-
-                    effective_tools = requested_tools or []
-                    if not normalized_patterns and effective_tools:
-                        raise OrgPolicyViolation(
-                            "TOOL_NOT_ALLOWED",
-                            "Requested tools are not permitted by organisation policy.",
-                            record,
-                        )
-                    for tool in effective_tools:
-                        tool_str = str(tool or "").strip()
-                        if not tool_str:
-                            continue
-                        if _tool_allowed(tool_str):
-                            continue
-                        message = f"Requested tool {tool_str} is not permitted by organisation policy."
-                        raise OrgPolicyViolation("TOOL_NOT_ALLOWED", message, record)
-            return record
+            for tool in effective_tools:
+                tool_str = str(tool or "").strip()
+                if not tool_str or allowlist.allows(tool_str):
+                    continue
+                message = f"Requested tool {tool_str} is not permitted by organisation policy."
+                raise OrgPolicyViolation("TOOL_NOT_ALLOWED", message, record)
+        return record
 
     def update(
         self,
@@ -1056,38 +1044,23 @@ class OrgPolicyStore:
         max_duration_days: Optional[int],
         allowed_tools: Optional[List[str]] = None,
     ) -> None:
-        with self._lock:
-            key = self._resolve_key(org_id)
-            record = self._get_or_create(org_id)
-            record.max_budget_wei = max_budget_wei
-            record.max_duration_days = max_duration_days
-            if allowed_tools is not None:
-                sanitized: List[str] = []
-                for entry in allowed_tools:
-                    if isinstance(entry, str):
-                        trimmed = entry.strip()
-                        if trimmed:
-                            sanitized.append(trimmed)
-                record.allowed_tools = sanitized
-            else:
-                record.allowed_tools = None
-            record.updated_at = datetime.now(timezone.utc).isoformat()
-            self._policies[key] = record
-            try:
-                os.makedirs(os.path.dirname(self._policy_path), exist_ok=True)
-                with open(self._policy_path, "w") as f:
-                    data = {
-                        k: {
-                            "maxBudgetWei": str(v.max_budget_wei) if v.max_budget_wei is not None else None,
-                            "maxDurationDays": v.max_duration_days,
-                            "updatedAt": v.updated_at,
-                            "allowedTools": v.allowed_tools,
-                        }
-                        for k, v in self._policies.items()
-                    }
-                    json.dump(data, f, indent=2)
-            except Exception as e:
-                logging.error("Failed to persist org policy update: %s", e)
+        key = self._resolve_key(org_id)
+        sanitized = normalize_tool_patterns(list(allowed_tools)) if allowed_tools is not None else None
+        entry = {
+            "maxBudgetWei": str(max_budget_wei) if max_budget_wei is not None else None,
+            "maxDurationDays": max_duration_days,
+            "updatedAt": datetime.now(timezone.utc).isoformat(),
+            "allowedTools": list(sanitized) if sanitized is not None else None,
+        }
+
+        def _apply(document: Dict[str, Any]) -> Dict[str, Any]:
+            document[key] = entry
+            return document
+
+        try:
+            self._watcher.mutate(_apply)
+        except Exception as e:
+            logging.error("Failed to persist org policy update: %s", e)
 
 _ORG_POLICY_STORE: Optional[OrgPolicyStore] = None
 _ORG_POLICY_LOCK = threading.Lock()
@@ -1135,6 +1108,7 @@ def _get_org_policy_store() -> OrgPolicyStore:
                 policy_path=_DEFAULT_POLICY_PATH,
                 default_max_budget_wei=_parse_default_max_budget(),
                 default_max_duration_days=_parse_default_max_duration(),
+                source=build_policy_source(_DEFAULT_POLICY_PATH, url=_ORG_POLICY_URL),
             )
     return _ORG_POLICY_STORE
 
@@ -1192,71 +1166,27 @@ def _calculate_deadline_timestamp(days: int) -> int:
     base = int(time.time())
     return base + max(0, days_int) * 86400
 
-def _compute_plan_hash(intent: JobIntent) -> str:
-    intent_data = _model_dump_with_options(intent, exclude={"userContext"}, by_alias=True)
-    encoded = json.dumps(intent_data, sort_keys=True).encode("utf-8")
-    h = hashlib.sha256()
-    h.update(encoded)
-    return "0x" + h.hexdigest()
+_PLAN_DIGESTS = DigestMemo(max_entries=4096)
 
-def _normalize_for_digest(value: Any) -> Any:
-    if value is None:
-        return None
-    if isinstance(value, (bool, str)):
-        return value
-    if isinstance(value, Decimal):
-        try:
-            return f"decimal:{value.normalize()}"
-        except Exception:
-            return f"decimal:{value}"
-    if isinstance(value, int):
-        return value
-    if isinstance(value, float):
-        if math.isfinite(value):
-            return value
-        return str(value)
-    if isinstance(value, (bytes, bytearray)):
-        return Web3.to_hex(value)
-    if isinstance(value, (list, tuple)):
-        return [_normalize_for_digest(item) for item in value]
-    if isinstance(value, set):
-        normalized = [_normalize_for_digest(item) for item in value]
-        normalized.sort(key=lambda entry: json.dumps(entry, sort_keys=True, separators=(",", ":")))
-        return normalized
-    if isinstance(value, dict):
-        items = sorted((str(k), _normalize_for_digest(v)) for k, v in value.items())
-        return {k: v for k, v in items}
-    dumped = _maybe_model_dump(value)
-    if dumped is not None and dumped is not value:
-        return _normalize_for_digest(dumped)
-    if hasattr(value, "__iter__") and not isinstance(value, (bytes, bytearray, str)):
-        try:
-            return [_normalize_for_digest(item) for item in list(value)]
-        except Exception:
-            pass
+
+def _compute_plan_hash(intent: JobIntent) -> str:
+    def _digest() -> str:
+        return plan_digest(_model_dump_with_options(intent, exclude={"userContext"}, by_alias=True))
+
+    dump_json = getattr(intent, "model_dump_json", None)
+    if not callable(dump_json):
+        return _digest()
+    # JobIntent only holds str/int fields and lists of them, so its JSON dump
+    # identifies the hashed snapshot exactly and is cheaper than hashing it.
     try:
-        return json.loads(json.dumps(value, default=str))
+        key = (type(intent).__name__, dump_json(exclude={"userContext"}, by_alias=True))
     except Exception:
-        return str(value)
+        return _digest()
+    return _PLAN_DIGESTS.get_or_compute(key, _digest)
 
 
-def _maybe_model_dump(value: Any) -> Any:
-    if hasattr(value, "model_dump"):
-        try:
-            return value.model_dump(mode="json")
-        except TypeError:
-            try:
-                return value.model_dump()
-            except Exception:
-                pass
-        except Exception:
-            pass
-    if hasattr(value, "dict"):
-        try:
-            return value.dict()
-        except Exception:
-            pass
-    return value
+_normalize_for_digest = normalize_for_digest
+_maybe_model_dump = maybe_model_dump
 
 
 def _model_dump_with_options(value: Any, **kwargs: Any) -> Any:
@@ -1276,31 +1206,7 @@ def _model_dump_with_options(value: Any, **kwargs: Any) -> Any:
 
 
 def _compute_receipt_digest(payload: Any) -> str:
-    normalized = _normalize_for_digest(payload)
-    serialized = json.dumps(normalized, separators=(",", ":"), ensure_ascii=False)
-    data_bytes = serialized.encode("utf-8")
-    keccak_fn = getattr(Web3, "keccak", None)
-    digest_bytes: bytes
-    if callable(keccak_fn):
-        try:
-            digest_bytes = keccak_fn(text=serialized)  # type: ignore[arg-type]
-        except TypeError:
-            digest_bytes = keccak_fn(data_bytes)  # type: ignore[arg-type]
-    else:
-        try:
-            from eth_hash.auto import keccak as _auto_keccak
-
-            digest_bytes = _auto_keccak(data_bytes)
-        except Exception:
-            digest_bytes = hashlib.sha3_256(data_bytes).digest()
-    return _to_hex(digest_bytes)
-
-
-def _to_hex(data: bytes) -> str:
-    to_hex_fn = getattr(Web3, "to_hex", None)
-    if callable(to_hex_fn):
-        return to_hex_fn(data)
-    return "0x" + data.hex()
+    return receipt_digest(payload)
 
 
 def _finalize_receipt_metadata(metadata: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
@@ -1333,8 +1239,39 @@ def _normalize_plan_hash(plan_hash: Optional[str]) -> Optional[str]:
 def _current_timestamp() -> str:
     return datetime.now(timezone.utc).isoformat()
 
-_PLAN_METADATA: Dict[str, Dict[str, Any]] = {}
-_PLAN_LOCK = threading.Lock()
+_PLAN_STORE_BACKEND = os.getenv("ONEBOX_PLAN_STORE_BACKEND", "memory") or "memory"
+_PLAN_STORE_URL = os.getenv("ONEBOX_PLAN_STORE_URL") or None
+_PLAN_STORE_MAX_ENTRIES = max(1, int(os.getenv("ONEBOX_PLAN_STORE_MAX_ENTRIES", "100000") or "100000"))
+_PLAN_STORE_TTL = float(os.getenv("ONEBOX_PLAN_STORE_TTL_SECONDS", "604800") or "604800")
+_PLAN_STORE_LOCAL_TTL = float(os.getenv("ONEBOX_PLAN_STORE_LOCAL_TTL_SECONDS", "60") or "60")
+
+_PLAN_STORE_EVENTS = prometheus_client.Counter(
+    "onebox_plan_store_events_total",
+    "Plan metadata store lookups and removals",
+    ["event"],
+    registry=_metrics_registry(),
+)
+
+
+def _record_plan_store_event(event: str) -> None:
+    _PLAN_STORE_EVENTS.labels(event=event).inc()
+
+
+_PLAN_STORE: PlanMetadataStore = build_plan_store(
+    _PLAN_STORE_BACKEND,
+    url=_PLAN_STORE_URL,
+    max_entries=_PLAN_STORE_MAX_ENTRIES,
+    ttl=_PLAN_STORE_TTL,
+    local_ttl=_PLAN_STORE_LOCAL_TTL,
+    on_event=_record_plan_store_event,
+)
+_PLAN_STORE_SIZE = prometheus_client.Gauge(
+    "onebox_plan_store_entries",
+    "Plan metadata records held in this process",
+    registry=_metrics_registry(),
+)
+# Shared backends are not counted on every scrape; their local tier is.
+_PLAN_STORE_SIZE.set_function(lambda: len(getattr(_PLAN_STORE, "local", _PLAN_STORE)))
 
 def _store_plan_metadata(
     plan_hash: str,
@@ -1355,31 +1292,14 @@ def _store_plan_metadata(
         record["missingFields"] = list(missing_fields)
     if not record:
         return
-    with _PLAN_LOCK:
-        existing = _PLAN_METADATA.get(normalized)
-        if isinstance(existing, dict):
-            merged = dict(existing)
-        elif isinstance(existing, str):
-            merged = {"createdAt": existing}
-        else:
-            merged = {}
-        merged.update(record)
-        _PLAN_METADATA[normalized] = merged
+    _PLAN_STORE.update(normalized, record)
 
 
 def _lookup_plan_metadata(plan_hash: str) -> Optional[Dict[str, Any]]:
     normalized = _normalize_plan_hash(plan_hash)
     if normalized is None:
         return None
-    with _PLAN_LOCK:
-        record = _PLAN_METADATA.get(normalized)
-    if record is None:
-        return None
-    if isinstance(record, dict):
-        return record
-    if isinstance(record, str):
-        return {"createdAt": record}
-    return None
+    return _PLAN_STORE.get(normalized)
 
 
 def _lookup_plan_timestamp(plan_hash: str) -> Optional[str]:
@@ -1509,26 +1429,73 @@ def _bind_plan_hash(
 
 
 _STATUS_CACHE_ENABLED = not _FORCE_STUB_WEB3
-_STATUS_CACHE: Dict[int, "StatusResponse"] = {}
-_STATUS_CACHE_LOCK = threading.Lock()
+_STATUS_CACHE_SIZE = max(1, int(os.getenv("ONEBOX_STATUS_CACHE_SIZE", "10000") or "10000"))
+_STATUS_CACHE_TTL = float(os.getenv("ONEBOX_STATUS_CACHE_TTL_SECONDS", "15") or "15")
 
 
-def _cache_status(status: "StatusResponse") -> None:
+@dataclass
+class _StatusCacheEntry:
+    status: "StatusResponse"
+    block: Optional[int]
+    expires_at: float
+
+
+class _StatusCache:
+    """LRU of job statuses that expire after a TTL or once a newer block is seen."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: "OrderedDict[int, _StatusCacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, job_id: int, block: Optional[int] = None) -> Optional["StatusResponse"]:
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is None:
+                return None
+            stale_block = block is not None and entry.block is not None and entry.block < block
+            if stale_block or entry.expires_at <= time.monotonic():
+                del self._entries[job_id]
+                return None
+            self._entries.move_to_end(job_id)
+            return entry.status
+
+    def put(self, status: "StatusResponse", block: Optional[int] = None) -> None:
+        with self._lock:
+            self._entries[int(status.jobId)] = _StatusCacheEntry(status, block, time.monotonic() + self._ttl)
+            self._entries.move_to_end(int(status.jobId))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_STATUS_CACHE = _StatusCache(_STATUS_CACHE_SIZE, _STATUS_CACHE_TTL)
+# Latest block number observed by the status service; cache entries read at
+# an older block are treated as stale.
+_STATUS_BLOCK: Optional[int] = None
+
+
+def _cache_status(status: "StatusResponse", block: Optional[int] = None) -> None:
     if not _STATUS_CACHE_ENABLED:
         return
     try:
-        job_id = int(status.jobId)
+        int(status.jobId)
     except (TypeError, ValueError):
         return
-    with _STATUS_CACHE_LOCK:
-        _STATUS_CACHE[job_id] = status
+    _STATUS_CACHE.put(status, block)
 
 
 def _get_cached_status(job_id: int) -> Optional["StatusResponse"]:
     if not _STATUS_CACHE_ENABLED:
         return None
-    with _STATUS_CACHE_LOCK:
-        return _STATUS_CACHE.get(job_id)
+    return _STATUS_CACHE.get(job_id, _STATUS_BLOCK)
 
 def _detect_missing_fields(intent: JobIntent) -> List[str]:
     missing: List[str] = []
@@ -2000,62 +1967,255 @@ def _resolve_pinners() -> List[PinningProvider]:
 
     return providers
 
+_PIN_TIMEOUT = float(os.getenv("ONEBOX_PIN_TIMEOUT_SECONDS", "20") or "20")
+_PIN_HEDGED = os.getenv("ONEBOX_PIN_HEDGED", "1") != "0"
+_PIN_BREAKER_FAILURES = max(1, int(os.getenv("ONEBOX_PIN_BREAKER_FAILURES", "3") or "3"))
+_PIN_BREAKER_RESET = float(os.getenv("ONEBOX_PIN_BREAKER_RESET_SECONDS", "30") or "30")
+_PINNER_HEALTH: Dict[Tuple[str, str], ProviderHealth] = {}
+_PINNER_HEALTH_LOCK = threading.Lock()
+
+
+def _pinner_health(provider: PinningProvider) -> ProviderHealth:
+    key = (provider.name, _strip_slashes(provider.endpoint))
+    with _PINNER_HEALTH_LOCK:
+        health = _PINNER_HEALTH.get(key)
+        if health is None:
+            health = ProviderHealth(
+                provider.name,
+                failure_threshold=_PIN_BREAKER_FAILURES,
+                reset_timeout=_PIN_BREAKER_RESET,
+            )
+            _PINNER_HEALTH[key] = health
+        return health
+
+
+def _rank_pinners(providers: List[PinningProvider]) -> List[PinningProvider]:
+    """Order providers by observed latency, skipping those with an open breaker.
+
+    Providers without samples sort first so they get measured.  When every
+    breaker is open all providers are returned rather than failing outright.
+    Ranking never claims a half-open trial; only an actual attempt does.
+    """
+
+    ranked = sorted(providers, key=lambda provider: _pinner_health(provider).latency or 0.0)
+    healthy = [provider for provider in ranked if _pinner_health(provider).available()]
+    return healthy or ranked
+
+
+async def _pin_with_provider(
+    provider: PinningProvider, body: str, file_name: str, *, forced: bool = False
+) -> dict:
+    health = _pinner_health(provider)
+    if not health.allow() and not forced:
+        # Another request holds this provider's half-open trial.
+        raise PinningError(f"Pinning service {provider.name} circuit is open", provider=provider.name, retryable=True)
+    url = _ensure_upload_url(provider.endpoint, provider.name)
+    headers = _build_auth_headers(provider.name, provider.token)
+    started = time.perf_counter()
+    try:
+        res = await get_http_pool().post(
+            url,
+            headers=headers,
+            files={"file": (file_name, body, "application/json")},
+            timeout=_PIN_TIMEOUT,
+        )
+        if res.status_code not in (200, 201):
+            raise PinningError(
+                f"Pinning service {provider.name} failed: {res.status_code} {res.text}",
+                provider=provider.name,
+                status=res.status_code,
+                retryable=_is_retryable_status(res.status_code),
+            )
+        res_json = res.json()
+        cid = res_json.get("cid") or res_json.get("IpfsHash") or res_json.get("hash")
+        if not cid:
+            raise PinningError("Missing CID in pinning response", provider=provider.name)
+    except PinningError:
+        health.record_failure()
+        raise
+    except Exception as exc:
+        health.record_failure()
+        raise PinningError(str(exc) or exc.__class__.__name__, provider=provider.name, retryable=True) from exc
+    health.record_success(time.perf_counter() - started)
+    return _build_pin_result(
+        provider=provider.name,
+        cid=cid,
+        attempts=1,
+        status=res_json.get("status") or "pinned",
+        request_id=res_json.get("requestId") or res_json.get("id"),
+        size=res_json.get("size"),
+        pinned_at=res_json.get("created") or res_json.get("timestamp"),
+    )
+
+
+async def _race_pinners(
+    providers: List[PinningProvider],
+    body: str,
+    file_name: str,
+    errors: List[Tuple[str, int, str]],
+    *,
+    forced: bool = False,
+) -> Optional[dict]:
+    """Pin with every provider in ``providers`` at once and keep the first success.
+
+    Slower attempts are cancelled; failures are appended to ``errors``.
+    ``forced`` attempts providers even while their breaker is open.
+    """
+
+    tasks = [
+        asyncio.create_task(_pin_with_provider(provider, body, file_name, forced=forced)) for provider in providers
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                return await next_done
+            except PinningError as exc:
+                errors.append((exc.provider, exc.status or 0, str(exc)))
+        return None
+    finally:
+        losers = [task for task in tasks if not task.done()]
+        for task in losers:
+            task.cancel()
+        if losers:
+            await asyncio.gather(*losers, return_exceptions=True)
+
+
 async def _pin_json(data: dict, file_name: str) -> dict:
     providers = _resolve_pinners()
     if not providers:
         raise PinningError("No pinning providers configured", provider="none")
-    errors = []
-    for provider in providers:
-        if provider.name == "memory":
-            cid = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
-            return _build_pin_result(
-                provider="memory", cid=cid, attempts=1, status="pinned", templates=DEFAULT_GATEWAYS
-            )
-        url = _ensure_upload_url(provider.endpoint, provider.name)
-        headers = _build_auth_headers(provider.name, provider.token)
-        try:
-            files = {
-                "file": (
-                    file_name,
-                    json.dumps(data, sort_keys=True, separators=(",", ":")),
-                    "application/json",
-                )
-            }
-        except Exception as e:
-            raise PinningError(f"Failed to serialize JSON for pinning: {e}", provider=provider.name)
-        try:
-            async with httpx.AsyncClient(timeout=20.0) as client:
-                res = await client.post(url, headers=headers, files=files)
-                if res.status_code in (200, 201):
-                    res_json = res.json()
-                    cid = res_json.get("cid") or res_json.get("IpfsHash") or res_json.get("hash")
-                    if not cid:
-                        raise PinningError("Missing CID in pinning response", provider=provider.name)
-                    return _build_pin_result(
-                        provider=provider.name,
-                        cid=cid,
-                        attempts=1,
-                        status=res_json.get("status") or "pinned",
-                        request_id=res_json.get("requestId") or res_json.get("id"),
-                        size=res_json.get("size"),
-                        pinned_at=res_json.get("created") or res_json.get("timestamp"),
-                    )
-                if _is_retryable_status(res.status_code):
-                    errors.append((provider.name, res.status_code, res.text))
-                    continue
-                err_msg = f"Pinning service {provider.name} failed: {res.status_code} {res.text}"
-                raise PinningError(err_msg, provider=provider.name, status=res.status_code)
-        except Exception as e:
-            errors.append((provider.name, getattr(e, "status", None) or 0, str(e)))
-            continue
+    if providers[0].name == "memory":
+        cid = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+        return _build_pin_result(
+            provider="memory", cid=cid, attempts=1, status="pinned", templates=DEFAULT_GATEWAYS
+        )
+    try:
+        body = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    except Exception as e:
+        raise PinningError(f"Failed to serialize JSON for pinning: {e}", provider=providers[0].name)
+    # Hedged mode races the two best providers; the rest are fallbacks.
+    queue = _rank_pinners(providers)
+    forced = not any(_pinner_health(provider).available() for provider in queue)
+    width = 2 if _PIN_HEDGED else 1
+    errors: List[Tuple[str, int, str]] = []
+    while queue:
+        batch, queue = queue[:width], queue[width:]
+        result = await _race_pinners(batch, body, file_name, errors, forced=forced)
+        if result is not None:
+            result["attempts"] = len(errors) + 1
+            return result
     logging.error("All pinning attempts failed: %s", errors)
     raise PinningError("All configured pinning services failed", provider="all")
+_RELAYER_AWAIT_RECEIPT = os.getenv("ONEBOX_RELAYER_AWAIT_RECEIPT", "0") != "0"
+_RELAYER_RECEIPT_TIMEOUT = float(os.getenv("ONEBOX_RELAYER_RECEIPT_TIMEOUT_SECONDS", "180") or "180")
+_RELAYER_POLL_INTERVAL = float(os.getenv("ONEBOX_RELAYER_POLL_SECONDS", "1") or "1")
+_RELAYER_PIPELINE: Optional[RelayerPipeline] = None
+_FEE_ORACLE: Optional[FeeOracle] = None
+_RELAYER_PIPELINE_LOCK = threading.Lock()
+# Outcome of relayed transactions by hash, filled in when their receipt lands
+# so ``/status?txHash=`` can report the jobId of a non-blocking submit.
+_RELAYED_TX_LIMIT = max(1, int(os.getenv("ONEBOX_RELAYED_TX_CACHE_SIZE", "10000") or "10000"))
+_RELAYED_TXS: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_RELAYED_TXS_LOCK = threading.Lock()
+
+
+def _record_relayed_tx(tx_hash: str, **fields: Any) -> None:
+    with _RELAYED_TXS_LOCK:
+        entry = _RELAYED_TXS.setdefault(tx_hash.lower(), {"state": "pending", "jobId": None, "receipt": None})
+        entry.update(fields)
+        _RELAYED_TXS.move_to_end(tx_hash.lower())
+        while len(_RELAYED_TXS) > _RELAYED_TX_LIMIT:
+            _RELAYED_TXS.popitem(last=False)
+
+
+def _get_relayed_tx(tx_hash: str) -> Optional[Dict[str, Any]]:
+    with _RELAYED_TXS_LOCK:
+        entry = _RELAYED_TXS.get(tx_hash.lower())
+        return dict(entry) if entry is not None else None
+
+
+def _track_relayed_tx(tx_hash: str, receipt_future: "Future[Dict[str, Any]]") -> None:
+    """Record the receipt and decoded jobId of ``tx_hash`` once it is mined."""
+
+    _record_relayed_tx(tx_hash)
+
+    def _settle(future: "Future[Dict[str, Any]]") -> None:
+        try:
+            receipt = dict(future.result())
+        except ReceiptTimeout:
+            _record_relayed_tx(tx_hash, state="dropped")
+            return
+        except Exception as exc:
+            logger.warning("Receipt lookup for relayed tx %s failed: %s", tx_hash, exc)
+            _record_relayed_tx(tx_hash, state="unknown")
+            return
+        if receipt.get("status") == 0:
+            _record_relayed_tx(tx_hash, state="failed", receipt=receipt)
+            return
+        job_id = _decode_job_created(receipt, fallback=False)
+        _record_relayed_tx(tx_hash, state="mined", jobId=job_id, receipt=receipt)
+
+    receipt_future.add_done_callback(_settle)
+
+
+def _get_fee_oracle() -> FeeOracle:
+    global _FEE_ORACLE
+    with _RELAYER_PIPELINE_LOCK:
+        if _FEE_ORACLE is None:
+            _FEE_ORACLE = FeeOracle(w3, refresh_interval=_RELAYER_POLL_INTERVAL)
+        return _FEE_ORACLE
+
+
+def _fetch_receipts_batched(hashes: Sequence[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Look up many receipts with one JSON-RPC batch per receipt sweep."""
+
+    from web3._utils.method_formatters import receipt_formatter
+    from web3.datastructures import AttributeDict
+
+    results = get_rpc_client(RPC_URL).batch([("eth_getTransactionReceipt", [tx_hash]) for tx_hash in hashes])
+    receipts: Dict[str, Optional[Dict[str, Any]]] = {}
+    for tx_hash, result in zip(hashes, results):
+        if result is None or isinstance(result, JsonRpcError):
+            receipts[tx_hash] = None
+        else:
+            receipts[tx_hash] = AttributeDict.recursive(receipt_formatter(result))
+    return receipts
+
+
+def _get_relayer_pipeline() -> Optional[RelayerPipeline]:
+    global _RELAYER_PIPELINE
+    if not relayer:
+        return None
+    with _RELAYER_PIPELINE_LOCK:
+        pipeline = _RELAYER_PIPELINE
+        if pipeline is None or pipeline.account is not relayer:
+            if pipeline is not None:
+                pipeline.shutdown()
+            pipeline = RelayerPipeline(
+                w3,
+                relayer,
+                chain_id=CHAIN_ID or None,
+                fetch_receipts=_fetch_receipts_batched if RPC_URL and not _FORCE_STUB_WEB3 else None,
+                poll_interval=_RELAYER_POLL_INTERVAL,
+                receipt_timeout=_RELAYER_RECEIPT_TIMEOUT,
+                fee_refresh_interval=_RELAYER_POLL_INTERVAL,
+            )
+            _RELAYER_PIPELINE = pipeline
+        return pipeline
+
+
 def _build_tx(func, sender: str) -> dict:
-    tx = func.build_transaction({"from": sender, "nonce": w3.eth.get_transaction_count(sender)})
+    # Nonces are assigned by the relayer pipeline at broadcast time; fees and
+    # the gas cap come from a quote refreshed once per block.
+    quote = _get_fee_oracle().quote()
+    params: Dict[str, Any] = {"from": sender, "gasPrice": quote.gas_price}
+    if CHAIN_ID:
+        params["chainId"] = CHAIN_ID
+    tx = func.build_transaction(params)
     if CHAIN_ID:
         tx["chainId"] = CHAIN_ID
-    tx.setdefault("gas", min(w3.eth.get_block("latest").gasLimit, 500000))
-    tx.setdefault("gasPrice", w3.eth.gas_price)
+    tx.setdefault("gas", min(quote.gas_limit, 500000))
+    tx.setdefault("gasPrice", quote.gas_price)
     return tx
 
 async def _send_relayer_tx(
@@ -2086,21 +2246,21 @@ async def _send_relayer_tx(
             receipt_payload.setdefault("userOpHash", result.user_operation_hash)
             return result.transaction_hash, receipt_payload
 
-    if not relayer:
+    pipeline = _get_relayer_pipeline()
+    if pipeline is None:
         raise _http_error(400, "RELAY_UNAVAILABLE")
 
-    signed = await asyncio.to_thread(relayer.sign_transaction, tx)
-
-    raw_tx_hash = await asyncio.to_thread(w3.eth.send_raw_transaction, signed.rawTransaction)
-    if hasattr(raw_tx_hash, "hex") and callable(raw_tx_hash.hex):
-        tx_hash = raw_tx_hash.hex()
-    elif isinstance(raw_tx_hash, bytes):
-        tx_hash = raw_tx_hash.hex()
-    else:
-        tx_hash = str(raw_tx_hash)
-
-    receipt = await asyncio.to_thread(w3.eth.wait_for_transaction_receipt, tx_hash, timeout=180)
+    tx_hash = await asyncio.wrap_future(pipeline.submit(tx))
+    receipt_future = pipeline.watch(tx_hash)
+    _track_relayed_tx(tx_hash, receipt_future)
+    if not _RELAYER_AWAIT_RECEIPT:
+        return tx_hash, {}
 
+    try:
+        receipt = await asyncio.wait_for(asyncio.wrap_future(receipt_future), timeout=_RELAYER_RECEIPT_TIMEOUT)
+    except asyncio.TimeoutError:
+        # Still pending in the mempool; the tracked outcome shows up under /status.
+        return tx_hash, {}
     return tx_hash, dict(receipt)
 
 def _collect_tx_hashes(*candidates: Optional[Any]) -> List[str]:
@@ -2838,7 +2998,7 @@ async def execute(request: Request, req: ExecuteRequest):
                 except (AAPolicyRejection, AAPaymasterRejection):
                     wallet_response = _build_wallet_response()
                 else:
-                    job_id = module._decode_job_created(receipt)
+                    job_id = module._decode_job_created(receipt) if receipt else None
                     relayed_response = ExecuteResponse(
                         **base_response_kwargs,
                         jobId=job_id,
@@ -2997,15 +3157,45 @@ async def execute(request: Request, req: ExecuteRequest):
         _EXECUTE_TOTAL.labels(intent_type=intent_type, http_status=str(status_code)).inc()
         _TTO_SECONDS.labels(endpoint="execute").observe(duration)
 
-@router.get("/status", response_model=StatusResponse, dependencies=[Depends(require_api)])
-async def status(request: Request, jobId: int):
+@router.get(
+    "/status",
+    response_model=Union[StatusResponse, StatusBatchResponse, RelayedTxStatusResponse],
+    dependencies=[Depends(require_api)],
+)
+async def status(
+    request: Request, jobId: Optional[int] = None, jobIds: Optional[str] = None, txHash: Optional[str] = None
+):
     correlation_id = _get_correlation_id(request)
     intent_type = "check_status"
-    job_id = jobId
     context = _context_from_request(request)
 
+    if txHash is not None:
+        tracked = _get_relayed_tx(txHash) or {}
+        _log_event(logging.INFO, "onebox.status.tx", correlation_id, intent_type=intent_type, state=tracked.get("state"))
+        return RelayedTxStatusResponse(txHash=txHash, **tracked)
+
+    if jobIds is not None:
+        job_ids = _parse_job_ids(jobIds)
+        statuses = await _STATUS_SERVICE.get_many(job_ids)
+        failed = [job_id for job_id, result in statuses.items() if isinstance(result, Exception)]
+        if failed:
+            logger.error("Job status retrieval failed for %d of %d jobs", len(failed), len(job_ids))
+        batch = StatusBatchResponse(
+            statuses=[
+                result if isinstance(result, StatusResponse) else StatusResponse(jobId=job_id, state="unknown")
+                for job_id, result in statuses.items()
+            ],
+            blockNumber=_STATUS_BLOCK,
+        )
+        audit_event(context, "onebox.status.batch", jobs=len(job_ids), failed=len(failed))
+        _log_event(logging.INFO, "onebox.status.batch", correlation_id, intent_type=intent_type, jobs=len(job_ids))
+        return batch
+
+    if jobId is None:
+        raise _http_error(400, "JOB_ID_REQUIRED")
+    job_id = jobId
     try:
-        job = registry.functions.jobs(job_id).call()
+        response = await _STATUS_SERVICE.get(job_id)
     except Exception as e:
         logger.error("Job status retrieval failed for job %s: %s", job_id, e)
         audit_event(
@@ -3016,54 +3206,11 @@ async def status(request: Request, jobId: int):
         )
         return StatusResponse(jobId=job_id, state="unknown")
 
-    agent = None
-    reward = None
-    state_code = None
-    deadline = None
-    if isinstance(job, (list, tuple)) and len(job) >= 6:
-        agent = job[1]
-        reward = int(job[2])
-        state_code = int(job[5])
-        if len(job) > 8 and job[8]:
-            deadline = int(job[8])
-    else:
-        logger.warning("unknown job payload shape for job %s", job_id)
-
-    assignee = None
-    if agent:
-        try:
-            text_agent = str(agent).strip()
-            if text_agent and int(text_agent, 16) != 0:
-                try:
-                    assignee = Web3.to_checksum_address(text_agent)
-                except Exception:
-                    assignee = text_agent
-        except Exception:
-            assignee = None
-    reward_str = _format_reward(reward) if reward is not None else None
-    state_label = _STATE_MAP.get(state_code, "unknown")
-    state_output = (
-        "disputed"
-        if state_label == "disputed"
-        else state_label
-        if state_label in {"open", "assigned", "review", "completed", "finalized"}
-        else "unknown"
-    )
-
-    response = StatusResponse(
-        jobId=int(job_id),
-        state=state_output,
-        reward=reward_str,
-        token=AGIALPHA_TOKEN,
-        deadline=deadline,
-        assignee=assignee,
-    )
-    _cache_status(response)
     audit_event(
         context,
         "onebox.status.success",
         job_id=job_id,
-        state=state_output,
+        state=response.state,
     )
     _log_event(logging.INFO, "onebox.status.success", correlation_id, intent_type=intent_type)
     return response
@@ -3151,7 +3298,7 @@ def _encode_wallet_call(method: str, args: List[Any]) -> Tuple[str, str]:
         data = "0x"
     return registry_handle.address, data
 
-def _decode_job_created(receipt: Dict[str, Any]) -> Optional[int]:
+def _decode_job_created(receipt: Dict[str, Any], *, fallback: bool = True) -> Optional[int]:
     module = _active_module()
     registry_handle = getattr(module, "registry", registry)
     try:
@@ -3168,21 +3315,86 @@ def _decode_job_created(receipt: Dict[str, Any]) -> Optional[int]:
                     return int(job_id)
     except Exception as exc:
         logger.warning("Failed to decode JobCreated event: %s", exc)
+    if not fallback:
+        return None
     try:
         return int(registry_handle.functions.nextJobId().call())
     except Exception:
         return None
 
-async def _read_status(job_id: int) -> StatusResponse:
-    module = _active_module()
-    registry_handle = getattr(module, "registry", registry)
-    try:
-        job = registry_handle.functions.jobs(job_id).call()
-    except Exception:
-        response = StatusResponse(jobId=job_id, state="unknown")
-        _cache_status(response)
-        return response
+_STATUS_MAX_BATCH = max(1, int(os.getenv("ONEBOX_STATUS_MAX_BATCH", "1000") or "1000"))
+_STATUS_MULTICALL_CHUNK = max(1, int(os.getenv("ONEBOX_STATUS_MULTICALL_CHUNK", "200") or "200"))
+_STATUS_CONCURRENCY = max(1, int(os.getenv("ONEBOX_STATUS_CONCURRENCY", "16") or "16"))
+_STATUS_BLOCK_REFRESH = float(os.getenv("ONEBOX_STATUS_BLOCK_REFRESH_SECONDS", "1") or "1")
+_MULTICALL_RETRY_SECONDS = 300.0
+MULTICALL_ADDRESS = os.getenv("ONEBOX_MULTICALL_ADDRESS", "0xcA11bde05977b3631167028862bE2a173976CA11")
 
+_MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    }
+]
+_JOB_OUTPUT_TYPES = [
+    output["type"] for entry in _MIN_ABI if entry.get("name") == "jobs" for output in entry["outputs"]
+]
+
+_STATUS_REQUESTS = prometheus_client.Counter(
+    "onebox_status_lookups_total",
+    "Job status lookups by how they were served",
+    ["source"],
+    registry=_metrics_registry(),
+)
+
+
+def _parse_job_ids(raw: str) -> List[int]:
+    job_ids: List[int] = []
+    seen: Set[int] = set()
+    for token in raw.split(","):
+        token = token.strip()
+        if not token:
+            continue
+        try:
+            job_id = int(token)
+        except ValueError as exc:
+            raise _http_error(400, "JOB_ID_REQUIRED") from exc
+        if job_id < 0:
+            raise _http_error(400, "JOB_ID_REQUIRED")
+        if job_id not in seen:
+            seen.add(job_id)
+            job_ids.append(job_id)
+    if not job_ids:
+        raise _http_error(400, "JOB_ID_REQUIRED")
+    if len(job_ids) > _STATUS_MAX_BATCH:
+        raise _http_error(400, "STATUS_BATCH_TOO_LARGE")
+    return job_ids
+
+
+def _status_from_job(job_id: int, job: Any, token: Optional[str]) -> StatusResponse:
     agent = None
     reward: Optional[int] = None
     state_code: Optional[int] = None
@@ -3222,6 +3434,8 @@ async def _read_status(job_id: int) -> StatusResponse:
                 deadline = int(job[8])
             except (TypeError, ValueError):
                 deadline = None
+    else:
+        logger.warning("unknown job payload shape for job %s", job_id)
     assignee = None
     if agent:
         try:
@@ -3242,17 +3456,215 @@ async def _read_status(job_id: int) -> StatusResponse:
         if state_label in {"open", "assigned", "review", "completed", "finalized"}
         else "unknown"
     )
-    response = StatusResponse(
+    return StatusResponse(
         jobId=job_id,
         state=state_output,
         reward=reward_str,
-        token=getattr(module, "AGIALPHA_TOKEN", AGIALPHA_TOKEN),
+        token=token,
         deadline=deadline,
         assignee=assignee,
     )
-    _cache_status(response)
+
+
+async def _fetch_status(job_id: int) -> StatusResponse:
+    """Read one job from the registry off the event loop and cache it."""
+
+    module = _active_module()
+    registry_handle = getattr(module, "registry", registry)
+    block = _STATUS_BLOCK
+    job = await asyncio.to_thread(lambda: registry_handle.functions.jobs(job_id).call())
+    response = _status_from_job(job_id, job, getattr(module, "AGIALPHA_TOKEN", AGIALPHA_TOKEN))
+    _cache_status(response, block)
     return response
 
+
+async def _read_status(job_id: int) -> StatusResponse:
+    try:
+        return await _fetch_status(job_id)
+    except Exception:
+        return StatusResponse(jobId=job_id, state="unknown")
+
+
+def _multicall_jobs(job_ids: Sequence[int], block: Optional[int]) -> Dict[int, Any]:
+    """Read ``jobs(id)`` for every id through Multicall3 ``aggregate3``."""
+
+    from eth_abi import decode as abi_decode
+
+    module = _active_module()
+    registry_handle = getattr(module, "registry", registry)
+    web3 = getattr(module, "w3", w3)
+    multicall = web3.eth.contract(
+        address=Web3.to_checksum_address(getattr(module, "MULTICALL_ADDRESS", MULTICALL_ADDRESS)),
+        abi=_MULTICALL3_ABI,
+    )
+    target = registry_handle.address
+    results: Dict[int, Any] = {}
+    for offset in range(0, len(job_ids), _STATUS_MULTICALL_CHUNK):
+        chunk = job_ids[offset : offset + _STATUS_MULTICALL_CHUNK]
+        calls = [
+            (target, True, registry_handle.encodeABI(fn_name="jobs", args=[job_id]))
+            for job_id in chunk
+        ]
+        call_kwargs = {"block_identifier": block} if block is not None else {}
+        answers = multicall.functions.aggregate3(calls).call(**call_kwargs)
+        for job_id, (success, data) in zip(chunk, answers):
+            if success and data:
+                results[job_id] = abi_decode(_JOB_OUTPUT_TYPES, bytes(data))
+            else:
+                results[job_id] = RuntimeError(f"jobs({job_id}) reverted in multicall")
+    return results
+
+
+class _JobStatusService:
+    """Serve job statuses from the block-scoped cache, coalescing concurrent reads.
+
+    Concurrent requests for the same job share one in-flight registry read.
+    Bulk lookups resolve cache misses with Multicall3 ``eth_call`` batches
+    pinned to the latest block, falling back to bounded concurrent single
+    reads when the chain has no Multicall3 deployment.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[int, "asyncio.Future[StatusResponse]"] = {}
+        self._block_task: Optional["asyncio.Future[Optional[int]]"] = None
+        self._block_checked_at = 0.0
+        self._multicall_retry_at = 0.0
+
+    async def refresh_block(self) -> Optional[int]:
+        global _STATUS_BLOCK
+        if not _STATUS_CACHE_ENABLED:
+            return _STATUS_BLOCK
+        if time.monotonic() - self._block_checked_at < _STATUS_BLOCK_REFRESH:
+            return _STATUS_BLOCK
+        task = self._block_task
+        if task is None or task.done():
+            module = _active_module()
+            web3 = getattr(module, "w3", w3)
+            task = asyncio.ensure_future(asyncio.to_thread(lambda: int(web3.eth.block_number)))
+            self._block_task = task
+        try:
+            block = await asyncio.shield(task)
+        except Exception as exc:
+            logger.debug("Unable to read latest block for status cache: %s", exc)
+            return _STATUS_BLOCK
+        finally:
+            self._block_checked_at = time.monotonic()
+        if _STATUS_BLOCK is None or block > _STATUS_BLOCK:
+            _STATUS_BLOCK = block
+        return _STATUS_BLOCK
+
+    async def get(self, job_id: int) -> StatusResponse:
+        block = await self.refresh_block()
+        cached = _STATUS_CACHE.get(job_id, block) if _STATUS_CACHE_ENABLED else None
+        if cached is not None:
+            _STATUS_REQUESTS.labels(source="cache").inc()
+            return cached
+        pending = self._inflight.get(job_id)
+        if pending is not None:
+            _STATUS_REQUESTS.labels(source="coalesced").inc()
+            return await asyncio.shield(pending)
+        _STATUS_REQUESTS.labels(source="rpc").inc()
+        self._claim([job_id])
+        try:
+            result = await _fetch_status(job_id)
+        except BaseException as exc:
+            self._settle(job_id, exc if isinstance(exc, Exception) else RuntimeError("status read cancelled"))
+            raise
+        self._settle(job_id, result)
+        return result
+
+    async def get_many(self, job_ids: Sequence[int]) -> Dict[int, Union[StatusResponse, Exception]]:
+        block = await self.refresh_block()
+        results: Dict[int, Union[StatusResponse, Exception]] = {job_id: None for job_id in job_ids}  # type: ignore[misc]
+        waiting: Dict[int, "asyncio.Future[StatusResponse]"] = {}
+        missing: List[int] = []
+        for job_id in job_ids:
+            cached = _STATUS_CACHE.get(job_id, block) if _STATUS_CACHE_ENABLED else None
+            if cached is not None:
+                results[job_id] = cached
+            elif job_id in self._inflight:
+                waiting[job_id] = self._inflight[job_id]
+            else:
+                missing.append(job_id)
+        _STATUS_REQUESTS.labels(source="cache").inc(len(job_ids) - len(waiting) - len(missing))
+        _STATUS_REQUESTS.labels(source="coalesced").inc(len(waiting))
+        _STATUS_REQUESTS.labels(source="rpc").inc(len(missing))
+
+        if missing:
+            self._claim(missing)
+            try:
+                fetched = await self._fetch_many(missing, block)
+            except BaseException:
+                for job_id in missing:
+                    self._settle(job_id, RuntimeError("status read cancelled"))
+                raise
+            for job_id in missing:
+                self._settle(job_id, fetched[job_id])
+                results[job_id] = fetched[job_id]
+        for job_id, future in waiting.items():
+            try:
+                results[job_id] = await asyncio.shield(future)
+            except Exception as exc:
+                results[job_id] = exc
+        return results
+
+    async def _fetch_many(
+        self, job_ids: List[int], block: Optional[int]
+    ) -> Dict[int, Union[StatusResponse, Exception]]:
+        if len(job_ids) > 1 and time.monotonic() >= self._multicall_retry_at:
+            try:
+                raw = await asyncio.to_thread(_multicall_jobs, job_ids, block)
+            except Exception as exc:
+                logger.info("Multicall status read unavailable, using single reads: %s", exc)
+                self._multicall_retry_at = time.monotonic() + _MULTICALL_RETRY_SECONDS
+            else:
+                token = getattr(_active_module(), "AGIALPHA_TOKEN", AGIALPHA_TOKEN)
+                fetched: Dict[int, Union[StatusResponse, Exception]] = {}
+                for job_id in job_ids:
+                    job = raw.get(job_id)
+                    if isinstance(job, Exception) or job is None:
+                        fetched[job_id] = job or RuntimeError(f"jobs({job_id}) missing from multicall")
+                        continue
+                    response = _status_from_job(job_id, job, token)
+                    _cache_status(response, block)
+                    fetched[job_id] = response
+                return fetched
+
+        semaphore = asyncio.Semaphore(_STATUS_CONCURRENCY)
+
+        async def _bounded(job_id: int) -> Union[StatusResponse, Exception]:
+            async with semaphore:
+                try:
+                    return await _fetch_status(job_id)
+                except Exception as exc:
+                    return exc
+
+        answers = await asyncio.gather(*(_bounded(job_id) for job_id in job_ids))
+        return dict(zip(job_ids, answers))
+
+    def _claim(self, job_ids: Sequence[int]) -> Dict[int, "asyncio.Future[StatusResponse]"]:
+        loop = asyncio.get_running_loop()
+        claimed = {}
+        for job_id in job_ids:
+            future: "asyncio.Future[StatusResponse]" = loop.create_future()
+            # Waiters re-raise failures; nobody may be waiting, so mark them retrieved.
+            future.add_done_callback(lambda fut: fut.cancelled() or fut.exception())
+            self._inflight[job_id] = future
+            claimed[job_id] = future
+        return claimed
+
+    def _settle(self, job_id: int, result: Union[StatusResponse, Exception]) -> None:
+        future = self._inflight.pop(job_id, None)
+        if future is None or future.done():
+            return
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+_STATUS_SERVICE = _JobStatusService()
+
 def _naive_parse(text: str) -> JobIntent:
     normalized = text.strip()
     lower = normalized.lower()
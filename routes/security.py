@@ -2,31 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import hmac
 import json
 import logging
-import os
-import hashlib
-import hmac
-import json
-import logging
+import math
 import os
 import sys
+import threading
 import time
 import types
-from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Deque, Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from backend.database import Database, Migration
 
 try:  # pragma: no cover - exercised in test shims
     from fastapi import Header, HTTPException, Request
 except Exception:  # pragma: no cover - fallback for environments without FastAPI
     class HTTPException(Exception):
-        def __init__(self, status_code: int, detail=None) -> None:
+        def __init__(self, status_code: int, detail=None, headers=None) -> None:
             super().__init__(detail)
             self.status_code = status_code
             self.detail = detail
+            self.headers = headers
 
     class Request:
         def __init__(self):
@@ -60,6 +61,8 @@ class SecuritySettings:
     signature_tolerance: int
     rate_limit: int
     rate_window: float
+    rate_backend: str
+    rate_url: Optional[str]
 
 
 def _parse_json_env(name: str) -> dict[str, str]:
@@ -124,6 +127,8 @@ def _load_settings() -> SecuritySettings:
     tolerance = int(os.getenv("API_SIGNATURE_TOLERANCE_SECONDS", os.getenv("ONEBOX_SIGNATURE_TOLERANCE", "300")) or "300")
     rate_limit = int(os.getenv("ONEBOX_RATE_LIMIT_PER_MINUTE", os.getenv("API_RATE_LIMIT_PER_MINUTE", "120")) or "120")
     rate_window = float(os.getenv("API_RATE_LIMIT_WINDOW_SECONDS", "60"))
+    rate_backend = (os.getenv("API_RATE_LIMIT_BACKEND", "memory") or "memory").strip().lower()
+    rate_url = os.getenv("API_RATE_LIMIT_URL") or None
 
     return SecuritySettings(
         tokens=tokens,
@@ -134,37 +139,221 @@ def _load_settings() -> SecuritySettings:
         signature_tolerance=tolerance,
         rate_limit=rate_limit,
         rate_window=rate_window,
+        rate_backend=rate_backend,
+        rate_url=rate_url,
     )
 
 
 _SETTINGS = _load_settings()
+_LOGGER = logging.getLogger(__name__)
 
 
 class RateLimiter:
-    """Simple in-memory sliding window rate limiter."""
+    """In-memory GCRA (token bucket) allowing ``limit`` requests per ``window_seconds``.
 
-    def __init__(self, limit: int, window_seconds: float) -> None:
+    Each key keeps a single theoretical arrival time, so memory is O(keys)
+    rather than O(requests).  Keys whose bucket has fully refilled are
+    dropped once more than ``max_keys`` are tracked.
+    """
+
+    shared = False
+
+    def __init__(self, limit: int, window_seconds: float, *, max_keys: int = 10_000) -> None:
         self._limit = limit
         self._window = window_seconds
-        self._buckets: Dict[str, Deque[float]] = defaultdict(deque)
+        self._interval = window_seconds / limit if limit > 0 else 0.0
+        self._max_keys = max(1, max_keys)
+        self._tat: Dict[str, float] = {}
+        self._lock = threading.Lock()
 
     def check(self, key: str) -> None:
         if self._limit <= 0:
             return
+        wait = self._consume(key)
+        if wait > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="RATE_LIMIT_EXCEEDED",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+
+    async def check_async(self, key: str) -> None:
+        """Run :meth:`check`, off the event loop when the backend does network I/O."""
+
+        if self.shared and self._limit > 0:
+            await asyncio.to_thread(self.check, key)
+        else:
+            self.check(key)
+
+    def _consume(self, key: str) -> float:
+        """Take one request from ``key``'s bucket; return seconds to wait, or 0 if admitted."""
+
         now = time.monotonic()
-        bucket = self._buckets[key]
-        window_start = now - self._window
-        while bucket and bucket[0] < window_start:
-            bucket.popleft()
-        if len(bucket) >= self._limit:
-            raise HTTPException(status_code=429, detail="RATE_LIMIT_EXCEEDED")
-        bucket.append(now)
+        with self._lock:
+            tat = max(self._tat.get(key, now), now)
+            new_tat = tat + self._interval
+            if new_tat - now > self._window:
+                return new_tat - now - self._window
+            self._tat[key] = new_tat
+            if len(self._tat) > self._max_keys:
+                self._tat = {k: v for k, v in self._tat.items() if v > now}
+        return 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tat.clear()
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+class RedisRateLimiter(RateLimiter):
+    """GCRA evaluated atomically in Redis so the limit holds across API replicas.
+
+    The script reads the clock from Redis itself to avoid replica clock skew.
+    If Redis is unreachable the process-local bucket is used instead.
+    """
+
+    shared = True
+    _PREFIX = "api:ratelimit:"
+    _SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+if new_tat - now > window then
+    return tostring(new_tat - now - window)
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return '0'
+"""
+
+    def __init__(self, limit: int, window_seconds: float, url: str) -> None:
+        super().__init__(limit, window_seconds)
+        try:
+            import redis  # type: ignore[import-not-found]
+        except Exception as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("redis package is required for the redis rate limit backend") from exc
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(self._SCRIPT)
+
+    def _consume(self, key: str) -> float:
+        try:
+            return float(self._script(keys=[self._PREFIX + key], args=[self._interval, self._window]))
+        except Exception as exc:
+            _LOGGER.warning("Redis rate limiter unavailable, using local bucket: %s", exc)
+            return super()._consume(key)
 
     def reset(self) -> None:
-        self._buckets.clear()
+        super().reset()
+        keys = list(self._client.scan_iter(match=self._PREFIX + "*", count=1000))
+        if keys:
+            self._client.delete(*keys)
+
+
+class _RateLimitMigration(Migration):
+    version = "0001_api_rate_limits"
+
+    def upgrade(self, cursor, driver: str) -> None:  # type: ignore[override]
+        timestamp = "DOUBLE PRECISION" if driver == "postgres" else "REAL"
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS api_rate_limits (
+                bucket TEXT PRIMARY KEY,
+                tat {timestamp} NOT NULL
+            )
+            """
+        )
+
+
+class DatabaseRateLimiter(RateLimiter):
+    """GCRA stored in a SQLite or PostgreSQL table shared by workers on one host.
+
+    Each check is a single conditional upsert, so concurrent workers cannot
+    both take the last slot.  Fully refilled buckets are purged every
+    ``purge_every`` checks.
+    """
+
+    shared = True
+
+    def __init__(self, limit: int, window_seconds: float, database: Database, *, purge_every: int = 1000) -> None:
+        super().__init__(limit, window_seconds)
+        self._db = database
+        self._purge_every = max(1, purge_every)
+        self._checks = 0
+        self._db.run_migrations([_RateLimitMigration()], table="api_rate_limit_migrations")
+        p = self._db.placeholder()
+        greatest = "GREATEST" if self._db.driver == "postgres" else "MAX"
+        next_tat = f"{greatest}(api_rate_limits.tat, {p}) + {p}"
+        self._upsert = (
+            f"INSERT INTO api_rate_limits (bucket, tat) VALUES ({p}, {p}) "
+            f"ON CONFLICT (bucket) DO UPDATE SET tat = {next_tat} WHERE {next_tat} - {p} <= {p}"
+        )
+        self._select = f"SELECT tat FROM api_rate_limits WHERE bucket = {p}"
+        self._purge = f"DELETE FROM api_rate_limits WHERE tat <= {p}"
+
+    def _consume(self, key: str) -> float:
+        now = time.time()
+        interval = self._interval
+        with self._db.transaction() as cur:
+            cur.execute(self._upsert, (key, now + interval, now, interval, now, interval, now, self._window))
+            admitted = cur.rowcount != 0
+            wait = 0.0
+            if not admitted:
+                cur.execute(self._select, (key,))
+                row = cur.fetchone()
+                wait = float(row[0]) + interval - now - self._window if row else interval
+            self._checks += 1
+            if self._checks % self._purge_every == 0:
+                cur.execute(self._purge, (now,))
+        return max(wait, 0.0) if not admitted else 0.0
+
+    def reset(self) -> None:
+        super().reset()
+        with self._db.transaction() as cur:
+            cur.execute("DELETE FROM api_rate_limits")
+
+
+def build_rate_limiter(settings: SecuritySettings) -> RateLimiter:
+    """Create the limiter selected by ``API_RATE_LIMIT_BACKEND`` (``memory``, ``redis``, ``sqlite``/``postgres``)."""
+
+    backend = settings.rate_backend
+    if backend == "memory" or settings.rate_limit <= 0:
+        return RateLimiter(settings.rate_limit, settings.rate_window)
+    if backend == "redis":
+        return RedisRateLimiter(settings.rate_limit, settings.rate_window, settings.rate_url or "redis://localhost:6379/0")
+    if backend in {"database", "sqlite", "postgres", "postgresql"}:
+        database = Database(settings.rate_url or "sqlite:///storage/api/rate-limits.db")
+        return DatabaseRateLimiter(settings.rate_limit, settings.rate_window, database)
+    raise RuntimeError(f"Unknown rate limit backend: {backend}")
 
 
-_RATE_LIMITER = RateLimiter(_SETTINGS.rate_limit, _SETTINGS.rate_window)
+_RATE_LIMITER = build_rate_limiter(_SETTINGS)
+_AUTH_CACHE_SIZE = max(1, int(os.getenv("API_AUTH_CACHE_SIZE", "256") or "256"))
+
+
+@lru_cache(maxsize=_AUTH_CACHE_SIZE)
+def _authenticate_token(token: str, fallback_token: Optional[str], fallback_role: Optional[str]) -> Tuple[str, str]:
+    """Return ``(role, token_hash)`` for ``token``.
+
+    Rejected tokens raise and are therefore never cached, so unknown
+    tokens cannot evict valid ones.
+    """
+
+    role = _SETTINGS.tokens.get(token)
+    if role is None and fallback_token and token == fallback_token:
+        role = fallback_role or _SETTINGS.default_role
+    if role is None and _SETTINGS.default_token and token == _SETTINGS.default_token:
+        role = _SETTINGS.default_role
+    if role is None:
+        raise HTTPException(status_code=401, detail="AUTH_INVALID")
+    if role not in _SETTINGS.allowed_roles:
+        raise HTTPException(status_code=403, detail="ROLE_FORBIDDEN")
+    return role, hashlib.sha256(token.encode()).hexdigest()
+
 
 _AUDIT_LOGGER = logging.getLogger("agi.meta_api.audit")
 
@@ -186,7 +375,8 @@ def reload_security_settings() -> None:
         pass
 
     _SETTINGS = _load_settings()
-    _RATE_LIMITER = RateLimiter(_SETTINGS.rate_limit, _SETTINGS.rate_window)
+    _RATE_LIMITER = build_rate_limiter(_SETTINGS)
+    _authenticate_token.cache_clear()
 
 
 def reset_rate_limits() -> None:
@@ -204,11 +394,7 @@ async def build_security_context(
     fallback_token: Optional[str] = None,
     fallback_role: Optional[str] = None,
 ) -> SecurityContext:
-    tokens = dict(_SETTINGS.tokens)
-    if fallback_token:
-        tokens.setdefault(fallback_token, fallback_role or _SETTINGS.default_role)
-
-    if not tokens and not _SETTINGS.signing_secret:
+    if not _SETTINGS.tokens and not fallback_token and not _SETTINGS.signing_secret:
         context = SecurityContext(actor="anonymous", role="public", token_hash="")
         request.state.security_context = context
         return context
@@ -217,25 +403,15 @@ async def build_security_context(
         raise HTTPException(status_code=401, detail="AUTH_MISSING")
 
     token = authorization.split(" ", 1)[1].strip()
-    role = tokens.get(token)
-    if role is None and _SETTINGS.default_token and token == _SETTINGS.default_token:
-        role = _SETTINGS.default_role
-    if role is None:
-        raise HTTPException(status_code=401, detail="AUTH_INVALID")
-
-    if role not in _SETTINGS.allowed_roles:
-        raise HTTPException(status_code=403, detail="ROLE_FORBIDDEN")
-
-    token_hash = hashlib.sha256(token.encode()).hexdigest()
+    role, token_hash = _authenticate_token(token, fallback_token, fallback_role)
 
     actor = actor_header or token_hash[:16]
 
-    _RATE_LIMITER.check(token_hash)
-
-    body = await request.body()
-    request.state.raw_body = body
+    await _RATE_LIMITER.check_async(token_hash)
 
     if _SETTINGS.signing_secret is not None:
+        body = await request.body()
+        request.state.raw_body = body
         if not timestamp:
             raise HTTPException(status_code=401, detail="SIGNATURE_TIMESTAMP_MISSING")
         try:
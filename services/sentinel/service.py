@@ -6,7 +6,7 @@ import asyncio
 import contextlib
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Dict, Optional
+from typing import Any, Awaitable, Dict, Optional, Sequence, Tuple
 
 from hgm_core.engine import HGMEngine
 
@@ -22,6 +22,7 @@ class SentinelEvent:
     kind: str
     agent_key: Optional[str] = None
     payload: Dict[str, Any] = field(default_factory=dict)
+    events: Tuple["SentinelEvent", ...] = ()
 
 
 @dataclass(slots=True)
@@ -78,6 +79,16 @@ class SentinelMonitor:
         self._ensure_task()
         await self._queue.put(SentinelEvent(kind="expansion", agent_key=agent_key, payload=dict(payload)))
 
+    async def observe_expansions(self, items: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """Record several ``(agent_key, payload)`` expansions with a single queue entry."""
+
+        await self._observe_batch("expansion", items)
+
+    async def observe_evaluations(self, items: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """Record several ``(agent_key, payload)`` evaluations with a single queue entry."""
+
+        await self._observe_batch("evaluation", items)
+
     async def observe_evaluation(self, agent_key: str, payload: Dict[str, Any]) -> None:
         """Record an evaluation payload for guardrail evaluation."""
 
@@ -126,6 +137,13 @@ class SentinelMonitor:
 
     # ------------------------------------------------------------------
     # Internal helpers
+    async def _observe_batch(self, kind: str, items: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        if self._closed or not items:
+            return
+        self._ensure_task()
+        events = tuple(SentinelEvent(kind=kind, agent_key=key, payload=dict(payload)) for key, payload in items)
+        await self._queue.put(events[0] if len(events) == 1 else SentinelEvent(kind="batch", events=events))
+
     def _ensure_task(self) -> None:
         if self._task is None or self._task.done():
             loop = asyncio.get_running_loop()
@@ -153,6 +171,9 @@ class SentinelMonitor:
             await self._handle_expansion(event)
         elif event.kind == "evaluation":
             await self._handle_evaluation(event)
+        elif event.kind == "batch":
+            for member in event.events:
+                await self._process_event(member)
         else:  # pragma: no cover - defensive
             LOGGER.debug("Unknown sentinel event kind: %s", event.kind)
 
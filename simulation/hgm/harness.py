@@ -1,10 +1,23 @@
-"""Simulation harness exercising the HGM orchestration workflow."""
+"""Simulation harness exercising the HGM orchestration workflow.
+
+Besides :func:`run_simulation`, the module measures end-to-end evaluation
+throughput (engine update, write-behind persistence into a temporary SQLite
+database and sentinel fan-out) with one ``evaluation_activity`` per event
+versus ``record_evaluations`` batches submitted concurrently per branch::
+
+    python -m simulation.hgm.harness --evaluations 10000 --branches 8 --batch-size 100
+"""
 
 from __future__ import annotations
 
+import argparse
 import asyncio
+import json
+import os
 import random
-from typing import Dict
+import tempfile
+import time
+from typing import Dict, List
 
 from orchestrator.workflows import HGMOrchestrationWorkflow
 from orchestrator.workflows.hgm import WorkflowConfig
@@ -47,4 +60,71 @@ async def run_simulation(
     return {key: node.as_dict() for key, node in snapshot.items()}
 
 
-__all__ = ["run_simulation"]
+async def _evaluations_per_second(
+    database_url: str, evaluations: int, branches: int, batch_size: int, *, batched: bool
+) -> float:
+    from backend.database import Database
+    from backend.migrations import MIGRATIONS
+    from backend.models.hgm import HgmRepository
+
+    database = Database(database_url)
+    database.run_migrations(MIGRATIONS)
+    workflow = HGMOrchestrationWorkflow(config=WorkflowConfig(repository=HgmRepository(database)))
+    try:
+        await workflow.ensure_node("root")
+        leaves: List[str] = []
+        for branch in range(branches):
+            await workflow.record_expansions([("root", f"branch-{branch}"), (f"root/branch-{branch}", "leaf")])
+            leaves.append(f"root/branch-{branch}/leaf")
+
+        started = time.perf_counter()
+        if batched:
+            per_branch = max(1, evaluations // branches)
+
+            async def _feed(leaf: str) -> None:
+                for offset in range(0, per_branch, batch_size):
+                    count = min(batch_size, per_branch - offset)
+                    await workflow.record_evaluations(
+                        [(leaf, 0.5 + ((offset + index) % 5) / 10) for index in range(count)]
+                    )
+
+            await asyncio.gather(*(_feed(leaf) for leaf in leaves))
+            recorded = per_branch * branches
+        else:
+            for index in range(evaluations):
+                await workflow.evaluation_activity(leaves[index % branches], 0.5 + (index % 5) / 10)
+            recorded = evaluations
+        await workflow.drain()
+        elapsed = time.perf_counter() - started
+    finally:
+        await workflow.shutdown()
+        database.close()
+    return recorded / elapsed
+
+
+def run_throughput_benchmark(evaluations: int, branches: int, batch_size: int) -> Dict[str, float]:
+    """Return evaluations/sec through the workflow per event and in concurrent per-branch batches."""
+
+    results: Dict[str, float] = {}
+    for name, batched in (("per_event_per_sec", False), ("batched_per_sec", True)):
+        with tempfile.TemporaryDirectory() as directory:
+            url = f"sqlite:///{os.path.join(directory, 'hgm.db')}"
+            rate = asyncio.run(_evaluations_per_second(url, evaluations, branches, batch_size, batched=batched))
+        results[name] = round(rate, 1)
+    return results
+
+
+def main() -> None:  # pragma: no cover - CLI helper
+    parser = argparse.ArgumentParser(description="Measure HGM workflow evaluation throughput.")
+    parser.add_argument("--evaluations", type=int, default=10000)
+    parser.add_argument("--branches", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    print(json.dumps(run_throughput_benchmark(args.evaluations, args.branches, args.batch_size), indent=2))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
+
+
+__all__ = ["run_simulation", "run_throughput_benchmark"]
@@ -0,0 +1,76 @@
+"""Measure HGM evaluation persistence throughput at several lineage depths.
+
+Builds a linear lineage of ``depth`` agents in a temporary SQLite database
+and records ``--evaluations`` rewards on the deepest agent, either one
+``record_evaluation`` call at a time or through the write-behind
+:class:`backend.models.hgm.HgmEvaluationWriter`::
+
+    python -m simulation.hgm.persistence --depths 5,20,50 --evaluations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+
+def _evaluations_per_second(depth: int, evaluations: int, *, batched: bool) -> float:
+    from backend.database import Database
+    from backend.migrations import MIGRATIONS
+    from backend.models.hgm import HgmEvaluationWriter, HgmRepository
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Database(f"sqlite:///{os.path.join(directory, 'hgm.db')}")
+        database.run_migrations(MIGRATIONS)
+        repository = HgmRepository(database)
+        repository.ensure_run("bench", "root")
+        parent = None
+        key = "root"
+        for level in range(depth):
+            repository.ensure_agent("bench", key, parent)
+            parent, key = key, f"{key}/{level}"
+        leaf = parent or "root"
+        payloads = [{"reward": (index % 10) / 10, "weight": 1.0} for index in range(evaluations)]
+
+        started = time.perf_counter()
+        if batched:
+            writer = HgmEvaluationWriter(repository)
+            for payload in payloads:
+                writer.submit("bench", leaf, payload)
+            writer.flush()
+            writer.close()
+        else:
+            for payload in payloads:
+                repository.record_evaluation("bench", leaf, payload)
+        elapsed = time.perf_counter() - started
+        database.close()
+    return evaluations / elapsed
+
+
+def run_persistence_benchmark(depths: List[int], evaluations: int) -> Dict[str, Dict[str, float]]:
+    """Return evaluations/sec per depth for direct and write-behind persistence."""
+
+    return {
+        str(depth): {
+            "direct_per_sec": round(_evaluations_per_second(depth, evaluations, batched=False), 1),
+            "write_behind_per_sec": round(_evaluations_per_second(depth, evaluations, batched=True), 1),
+        }
+        for depth in depths
+    }
+
+
+def main() -> None:  # pragma: no cover - CLI helper
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depths", default="5,20,50")
+    parser.add_argument("--evaluations", type=int, default=2000)
+    args = parser.parse_args()
+    depths = [int(value) for value in args.depths.split(",") if value.strip()]
+    print(json.dumps(run_persistence_benchmark(depths, args.evaluations), indent=2))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
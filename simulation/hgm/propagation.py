@@ -0,0 +1,68 @@
+"""Measure HGMEngine evaluation throughput at several lineage depths.
+
+Builds a linear lineage of ``depth`` nodes and records ``--evaluations``
+rewards spread over the deepest ``--leaves`` nodes, either all before a
+single ``snapshot`` (the roll-up runs once) or with a ``next_action`` read
+after every evaluation (the roll-up runs every time)::
+
+    python -m simulation.hgm.propagation --depths 10,100,1000 --evaluations 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+
+async def _evaluations_per_second(depth: int, evaluations: int, leaves: int, *, interleaved: bool) -> float:
+    from hgm_core.config import EngineConfig
+    from hgm_core.engine import HGMEngine
+
+    engine = HGMEngine(EngineConfig(seed=3))
+    key = "root"
+    keys = [key]
+    for level in range(1, depth):
+        await engine.record_expansion(key, str(level))
+        key = f"{key}/{level}"
+        keys.append(key)
+    targets = keys[-max(1, min(leaves, depth)):]
+
+    started = time.perf_counter()
+    for index in range(evaluations):
+        target = targets[index % len(targets)]
+        await engine.record_evaluation(target, reward=(index % 10) / 10)
+        if interleaved:
+            await engine.next_action(target, ["probe"])
+    await engine.snapshot()
+    return evaluations / (time.perf_counter() - started)
+
+
+def run_propagation_benchmark(depths: List[int], evaluations: int, leaves: int) -> Dict[str, Dict[str, float]]:
+    """Return evaluations/sec per depth with one roll-up and with a read after every evaluation."""
+
+    return {
+        str(depth): {
+            "batched_per_sec": round(asyncio.run(_evaluations_per_second(depth, evaluations, leaves, interleaved=False)), 1),
+            "interleaved_per_sec": round(
+                asyncio.run(_evaluations_per_second(depth, evaluations, leaves, interleaved=True)), 1
+            ),
+        }
+        for depth in depths
+    }
+
+
+def main() -> None:  # pragma: no cover - CLI helper
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depths", default="10,100,1000")
+    parser.add_argument("--evaluations", type=int, default=5000)
+    parser.add_argument("--leaves", type=int, default=4)
+    args = parser.parse_args()
+    depths = [int(value) for value in args.depths.split(",") if value.strip()]
+    print(json.dumps(run_propagation_benchmark(depths, args.evaluations, args.leaves), indent=2))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
@@ -0,0 +1,73 @@
+"""Measure HGMEngine decision throughput for wide nodes.
+
+Expands ``width`` children under each of ``--parents`` nodes, records one
+reward per child and then times Thompson-sampling decisions with the default
+engine, the vectorized (NumPy) engine, and the vectorized engine deciding
+all parents per ``next_actions`` call::
+
+    python -m simulation.hgm.sampling --widths 10,100,500 --decisions 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+
+async def _decisions_per_second(width: int, parents: int, decisions: int, *, vectorized: bool, batched: bool) -> float:
+    from hgm_core.config import EngineConfig
+    from hgm_core.engine import HGMEngine
+
+    engine = HGMEngine(EngineConfig(widening_alpha=1.0, min_visitations=width, seed=7, vectorized=vectorized))
+    actions = [f"action-{index}" for index in range(width)]
+    keys = [f"root-{index}" for index in range(parents)]
+    for key in keys:
+        for index in range(width):
+            action = await engine.next_action(key, actions)
+            await engine.record_evaluation(f"{key}/{action}", reward=(index % 10) / 10)
+
+    rounds = max(1, decisions // parents)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        if batched:
+            await engine.next_actions(keys, actions)
+        else:
+            for key in keys:
+                await engine.next_action(key, actions)
+    return rounds * parents / (time.perf_counter() - started)
+
+
+def run_sampling_benchmark(widths: List[int], parents: int, decisions: int) -> Dict[str, Dict[str, float]]:
+    """Return decisions/sec per width for each engine mode."""
+
+    modes = {
+        "default_per_sec": (False, False),
+        "vectorized_per_sec": (True, False),
+        "vectorized_batched_per_sec": (True, True),
+    }
+    return {
+        str(width): {
+            name: round(
+                asyncio.run(_decisions_per_second(width, parents, decisions, vectorized=vectorized, batched=batched)), 1
+            )
+            for name, (vectorized, batched) in modes.items()
+        }
+        for width in widths
+    }
+
+
+def main() -> None:  # pragma: no cover - CLI helper
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--widths", default="10,100,500")
+    parser.add_argument("--parents", type=int, default=32)
+    parser.add_argument("--decisions", type=int, default=2000)
+    args = parser.parse_args()
+    widths = [int(value) for value in args.widths.split(",") if value.strip()]
+    print(json.dumps(run_sampling_benchmark(widths, args.parents, args.decisions), indent=2))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
@@ -0,0 +1,139 @@
+"""Measure distributed HGM evaluation throughput with worker processes on one box.
+
+Queues ``--evaluations`` CPU-bound scoring activities on a shared SQLite
+activity queue and drains them with ``--processes`` worker processes (each
+an :class:`orchestrator.worker.HGMActivityWorker` without a workflow).  Each
+worker replies with ``hgm.evaluate`` calls.  A coordinator worker bound to
+the workflow applies the replies in batches.  ``0`` processes scores
+in-process on the coordinator's event loop, which is the single-loop
+baseline::
+
+    python -m simulation.hgm.workers --processes 0,1,2,4 --evaluations 2000 --rounds 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+_BRANCHES = 8
+
+
+async def _score(node_key: str, seed: int, rounds: int):
+    from orchestrator.activity_queue import ActivityCall
+
+    digest = f"{node_key}:{seed}".encode("utf-8")
+    for _ in range(rounds):
+        digest = hashlib.sha256(digest).digest()
+    return ActivityCall("hgm.evaluate", (node_key, digest[0] / 255.0))
+
+
+def register(worker) -> None:
+    """Register the benchmark scoring activity (usable with ``python -m orchestrator.worker --activities``)."""
+
+    worker.register("bench.score", _score)
+
+
+def _work_until_empty(path: str, concurrency: int) -> None:
+    from orchestrator.activity_queue import SqliteActivityQueue
+    from orchestrator.worker import HGMActivityWorker
+
+    work = SqliteActivityQueue(path, queue="work")
+    results = SqliteActivityQueue(path, queue="results")
+    worker = HGMActivityWorker(None, queue=work, reply_queue=results, concurrency=concurrency)
+    register(worker)
+
+    async def _drain() -> None:
+        while await worker.run_once():
+            pass
+
+    asyncio.run(_drain())
+    work.close()
+    results.close()
+
+
+async def _coordinate(directory: str, evaluations: int, rounds: int, processes: int) -> float:
+    from backend.database import Database
+    from backend.migrations import MIGRATIONS
+    from backend.models.hgm import HgmRepository
+    from orchestrator.activity_queue import ActivityCall, SqliteActivityQueue
+    from orchestrator.worker import HGMActivityWorker
+    from orchestrator.workflows import HGMOrchestrationWorkflow
+    from orchestrator.workflows.hgm import WorkflowConfig
+
+    path = os.path.join(directory, "activities.db")
+    database = Database(f"sqlite:///{os.path.join(directory, 'hgm.db')}")
+    database.run_migrations(MIGRATIONS)
+    workflow = HGMOrchestrationWorkflow(config=WorkflowConfig(repository=HgmRepository(database)))
+    work = SqliteActivityQueue(path, queue="work")
+    results = SqliteActivityQueue(path, queue="results")
+    coordinator = HGMActivityWorker(workflow, queue=results, reply_queue=results, concurrency=500)
+    await workflow.ensure_node("root")
+    await workflow.record_expansions([("root", f"branch-{index}") for index in range(_BRANCHES)])
+    work.enqueue_many(
+        [
+            (ActivityCall("bench.score", (f"root/branch-{index % _BRANCHES}", index, rounds)), f"score-{index}")
+            for index in range(evaluations)
+        ]
+    )
+
+    started = time.perf_counter()
+    if processes:
+        context = multiprocessing.get_context("spawn")
+        pool = [context.Process(target=_work_until_empty, args=(path, 4)) for _ in range(processes)]
+        for process in pool:
+            process.start()
+    else:
+        # Single event loop baseline: the coordinator scores too.
+        coordinator.queue = work
+        register(coordinator)
+        while await coordinator.run_once():
+            pass
+        coordinator.queue = results
+    applied = 0
+    while applied < evaluations:
+        leased = await coordinator.run_once()
+        applied += leased
+        if not leased:
+            await asyncio.sleep(0.01)
+    await workflow.drain()
+    elapsed = time.perf_counter() - started
+    if processes:
+        for process in pool:
+            process.join()
+    await workflow.shutdown()
+    work.close()
+    results.close()
+    database.close()
+    return evaluations / elapsed
+
+
+def run_worker_benchmark(processes: List[int], evaluations: int, rounds: int) -> Dict[str, object]:
+    """Return evaluations/sec per worker-process count (``0`` = in-process baseline)."""
+
+    throughput: Dict[str, float] = {}
+    for count in processes:
+        with tempfile.TemporaryDirectory() as directory:
+            throughput[str(count)] = round(asyncio.run(_coordinate(directory, evaluations, rounds, count)), 1)
+    return {"cpu_count": os.cpu_count(), "evaluations_per_sec": throughput}
+
+
+def main() -> None:  # pragma: no cover - CLI helper
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", default="0,1,2,4")
+    parser.add_argument("--evaluations", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=2000, help="SHA-256 rounds per scoring activity")
+    args = parser.parse_args()
+    processes = [int(value) for value in args.processes.split(",") if value.strip()]
+    print(json.dumps(run_worker_benchmark(processes, args.evaluations, args.rounds), indent=2))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
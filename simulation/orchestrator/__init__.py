@@ -0,0 +1 @@
+"""Throughput and contention benchmarks for the orchestration runtime."""
@@ -0,0 +1,142 @@
+"""Compare checkpoint encodings by snapshot time, load time and peak RSS.
+
+Each case runs in a fresh interpreter so peak resident memory reflects only
+that encoding.  The runtime state is built first; the reported
+``snapshot_rss_mb`` is how far the process peak rose above the resident size
+of that state while hashing and writing the checkpoint::
+
+    python -m simulation.orchestrator.checkpoints --jobs 1000 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+_ENCODINGS = {
+    "json": ("json", None),
+    "msgpack": ("msgpack", None),
+    "msgpack+zstd": ("msgpack", "zstd"),
+}
+
+
+def _current_rss_mb() -> float:
+    with open("/proc/self/statm", encoding="ascii") as handle:
+        resident_pages = int(handle.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _build_checkpoint(jobs: int, steps: int):  # type: ignore[no-untyped-def]
+    from orchestrator.checkpoint import Checkpoint, JobCheckpoint
+    from orchestrator.models import Budget, OrchestrationPlan, Policies, RunInfo, StatusOut, Step, StepStatus
+
+    plan = OrchestrationPlan(
+        plan_id="plan-bench",
+        steps=[Step(id=f"step-{index}", name=f"Step {index}", kind="llm", params={"prompt": "x" * 64}) for index in range(steps)],
+        budget=Budget(),
+        policies=Policies(),
+    )
+    now = time.time()
+    status = StatusOut(
+        run=RunInfo(id="template", plan_id=plan.plan_id, state="running", created_at=now, started_at=now),
+        steps=[
+            StepStatus(id=f"step-{index}", name=f"Step {index}", kind="llm", state="completed", started_at=now, completed_at=now)
+            for index in range(steps)
+        ],
+        current=None,
+        logs=[f"Step {index} completed" for index in range(steps)],
+    )
+    entries: Dict[str, JobCheckpoint] = {}
+    for index in range(jobs):
+        run_id = f"run-{index:08d}"
+        job_status = status.model_copy(deep=True)
+        job_status.run.id = run_id
+        entries[run_id] = JobCheckpoint(status=job_status, plan=plan, updated_at=now)
+    return Checkpoint(sequence=1, created_at=now, jobs=entries, integrity="")
+
+
+def measure_checkpoint_encoding(
+    *,
+    jobs: int,
+    encoding: str,
+    steps: int = 4,
+    directory: Optional[str] = None,
+) -> Dict[str, float]:
+    """Snapshot ``jobs`` synthetic runs with ``encoding`` in this process."""
+
+    from orchestrator.checkpoint import FileCheckpointStore
+
+    file_encoding, compression = _ENCODINGS[encoding]
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        path = Path(tmp) / "checkpoint"
+        store = FileCheckpointStore(path, encoding=file_encoding, compression=compression)
+        checkpoint = _build_checkpoint(jobs, steps)
+        baseline = _current_rss_mb()
+
+        started = time.perf_counter()
+        checkpoint.integrity = checkpoint.compute_integrity()
+        store.save(checkpoint)
+        snapshot_seconds = time.perf_counter() - started
+        snapshot_peak = _peak_rss_mb()
+
+        started = time.perf_counter()
+        loaded = store.load_latest()
+        load_seconds = time.perf_counter() - started
+        assert loaded is not None and loaded.integrity == checkpoint.integrity
+        return {
+            "jobs": float(jobs),
+            "snapshot_seconds": snapshot_seconds,
+            "load_seconds": load_seconds,
+            "file_mb": path.stat().st_size / (1024 * 1024),
+            "state_rss_mb": baseline,
+            "snapshot_rss_mb": max(0.0, snapshot_peak - baseline),
+        }
+
+
+def _measure_case(args: tuple[int, str, int]) -> Dict[str, float]:
+    jobs, encoding, steps = args
+    return measure_checkpoint_encoding(jobs=jobs, encoding=encoding, steps=steps)
+
+
+def run_checkpoint_benchmark(
+    job_counts: Sequence[int] = (1_000, 10_000, 100_000),
+    encodings: Sequence[str] = tuple(_ENCODINGS),
+    *,
+    steps: int = 4,
+) -> List[Dict[str, object]]:
+    """Measure every ``encoding`` at every job count in isolated processes."""
+
+    context = multiprocessing.get_context("spawn")
+    results: List[Dict[str, object]] = []
+    for jobs in job_counts:
+        for encoding in encodings:
+            with context.Pool(1, maxtasksperchild=1) as pool:
+                measurement = pool.apply(_measure_case, ((jobs, encoding, steps),))
+            results.append({"encoding": encoding, **measurement})
+    return results
+
+
+def main() -> None:  # pragma: no cover - CLI helper
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--encodings", nargs="+", choices=sorted(_ENCODINGS), default=list(_ENCODINGS))
+    parser.add_argument("--steps", type=int, default=4)
+    args = parser.parse_args()
+    results = run_checkpoint_benchmark(args.jobs, args.encodings, steps=args.steps)
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
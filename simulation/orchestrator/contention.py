@@ -0,0 +1,187 @@
+"""Measure ``get_status`` latency while runs execute steps concurrently.
+
+Dashboards poll ``/onebox/status`` continuously, so status reads must not
+queue behind step execution or checkpointing.  The benchmark drives a batch
+of background runs through :mod:`orchestrator.runner` with a fixed per-step
+delay while reader threads poll their status, and reports read latency
+percentiles::
+
+    python -m simulation.orchestrator.contention --runs 200 --readers 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+
+class _SleepExecutor:
+    """Stand-in step executor that only burns wall-clock time."""
+
+    def __init__(self, delay: float) -> None:
+        self._delay = delay
+
+    def execute(self, step, abort=None):  # type: ignore[no-untyped-def]
+        from orchestrator.tools.executors import StepResult
+
+        time.sleep(self._delay)
+        return StepResult(success=True, logs=[f"ran {step.id}"], attempts=1, duration=self._delay)
+
+
+@contextlib.contextmanager
+def _isolated_runner(root: Path, *, delay: float, workers: int) -> Iterator[object]:
+    from orchestrator import runner
+    from orchestrator.checkpoint import CheckpointManager, FileCheckpointStore, GovernanceSettings
+    from orchestrator.dispatch import RunDispatcher
+    from orchestrator.state import FileRunStateStore
+
+    saved_env = {key: os.environ.get(key) for key in ("ORCHESTRATOR_SYNC_RUNS", "PYTEST_CURRENT_TEST")}
+    saved_attrs = {
+        name: getattr(runner, name)
+        for name in ("_EXECUTOR", "_STORE", "_CHECKPOINT_MANAGER", "_CHECKPOINT_RESTORED", "_DISPATCHER", "_RUNS")
+    }
+    os.environ["ORCHESTRATOR_SYNC_RUNS"] = "0"
+    os.environ.pop("PYTEST_CURRENT_TEST", None)
+    runner._EXECUTOR = _SleepExecutor(delay)
+    runner._STORE = FileRunStateStore(root / "runs")
+    runner._CHECKPOINT_MANAGER = CheckpointManager(
+        store=FileCheckpointStore(root / "checkpoint.json"),
+        governance=GovernanceSettings.default(),
+    )
+    runner._CHECKPOINT_RESTORED = True
+    runner._DISPATCHER = RunDispatcher(workers=workers, max_queue=1_000_000, lease_ttl=runner._STALL_THRESHOLD)
+    runner._RUNS = {}
+    try:
+        yield runner
+    finally:
+        runner._DISPATCHER.shutdown(wait=False)
+        for name, value in saved_attrs.items():
+            setattr(runner, name, value)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def run_status_contention_benchmark(
+    *,
+    runs: int = 100,
+    steps_per_run: int = 4,
+    readers: int = 8,
+    workers: int = 8,
+    step_delay: float = 0.002,
+    poll_interval: float = 0.001,
+    timeout: float = 120.0,
+) -> Dict[str, float]:
+    """Execute ``runs`` plans in the background while polling their status.
+
+    Each reader polls every ``poll_interval`` seconds.  Returns read latency
+    percentiles in milliseconds together with the read and step throughput
+    observed during the run.
+    """
+
+    from orchestrator.models import Budget, OrchestrationPlan, Policies, Step
+
+    plan = OrchestrationPlan(
+        plan_id="contention-benchmark",
+        steps=[Step(id=f"step-{idx}", name=f"Step {idx}", kind="llm") for idx in range(steps_per_run)],
+        budget=Budget(),
+        policies=Policies(),
+    )
+    latencies: List[float] = []
+    latencies_lock = threading.Lock()
+    stop = threading.Event()
+
+    with tempfile.TemporaryDirectory() as tmp, _isolated_runner(Path(tmp), delay=step_delay, workers=workers) as runner:
+        run_ids: List[str] = []
+
+        def _reader(offset: int) -> None:
+            local: List[float] = []
+            index = offset
+            while not stop.is_set():
+                if not run_ids:
+                    time.sleep(0.001)
+                    continue
+                run_id = run_ids[index % len(run_ids)]
+                index += 1
+                started = time.perf_counter()
+                runner.get_status(run_id)
+                local.append(time.perf_counter() - started)
+                if poll_interval:
+                    time.sleep(poll_interval)
+            with latencies_lock:
+                latencies.extend(local)
+
+        threads = [threading.Thread(target=_reader, args=(idx,), daemon=True) for idx in range(readers)]
+        for thread in threads:
+            thread.start()
+        began = time.perf_counter()
+        for _ in range(runs):
+            run_ids.append(runner.start_run(plan, approvals=[]).id)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            stats = runner._DISPATCHER.stats()
+            if not stats["queued"] and not stats["running"]:
+                break
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - began
+        stop.set()
+        for thread in threads:
+            thread.join()
+        completed = sum(1 for run_id in run_ids if runner.get_status(run_id).run.state == "succeeded")
+
+    millis = [value * 1000.0 for value in latencies]
+    return {
+        "runs": float(runs),
+        "completed_runs": float(completed),
+        "elapsed_seconds": elapsed,
+        "steps_per_second": (completed * steps_per_run) / elapsed if elapsed else 0.0,
+        "reads": float(len(millis)),
+        "reads_per_second": len(millis) / elapsed if elapsed else 0.0,
+        "read_p50_ms": _percentile(millis, 0.50),
+        "read_p95_ms": _percentile(millis, 0.95),
+        "read_p99_ms": _percentile(millis, 0.99),
+        "read_max_ms": max(millis) if millis else 0.0,
+        "read_mean_ms": statistics.fmean(millis) if millis else 0.0,
+    }
+
+
+def main() -> None:  # pragma: no cover - CLI helper
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--step-delay", type=float, default=0.002)
+    parser.add_argument("--poll-interval", type=float, default=0.001)
+    args = parser.parse_args()
+    result = run_status_contention_benchmark(
+        runs=args.runs,
+        steps_per_run=args.steps,
+        readers=args.readers,
+        workers=args.workers,
+        step_delay=args.step_delay,
+        poll_interval=args.poll_interval,
+    )
+    print(json.dumps(result, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
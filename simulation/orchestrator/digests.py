@@ -0,0 +1,94 @@
+"""Microbenchmarks for receipt digests and plan hashes.
+
+Compares the reference receipt encoding (build the normalised tree, then
+``json.dumps``) with the single-pass :func:`orchestrator.canonical.canonical_json`
+on receipt-shaped payloads, and times plan hashing with and without the
+digest memo::
+
+    python -m simulation.orchestrator.digests --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict
+
+
+def _receipt_payload(width: int) -> Dict[str, Any]:
+    return {
+        "planHash": "0x" + "ab" * 32,
+        "jobId": 77,
+        "txHashes": ["0x" + f"{index:064x}" for index in range(width)],
+        "fees": {"feePct": Decimal("2.5"), "burnPct": Decimal("0.50"), "feeAmount": "125000000000000000"},
+        "toolingVersions": {"router": "1.2.3", "commit": "abc123"},
+        "policySnapshot": {"org": "acme", "maxBudgetWei": 5 * 10**18, "allowedTools": {f"tool.{i}" for i in range(width)}},
+        "attachments": [{"uri": f"ipfs://bafy{index}", "name": f"file-{index}.json", "size": 1024 * index} for index in range(width)],
+        "signature": bytes(range(65)),
+        "createdAt": "2026-01-01T00:00:00+00:00",
+    }
+
+
+def _time_per_call(func: Callable[[], Any], iterations: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run_digest_benchmark(*, iterations: int = 2000, width: int = 16) -> Dict[str, float]:
+    """Return microseconds per call for each digest path."""
+
+    from orchestrator.canonical import canonical_json, keccak256, normalize_for_digest, plan_digest
+
+    payload = _receipt_payload(width)
+
+    def _reference_digest() -> bytes:
+        text = json.dumps(normalize_for_digest(payload), separators=(",", ":"), ensure_ascii=False)
+        return keccak256(text.encode("utf-8"))
+
+    def _canonical_digest() -> bytes:
+        return keccak256(canonical_json(payload).encode("utf-8"))
+
+    assert _reference_digest() == _canonical_digest()
+    result = {
+        "receipt_reference_us": _time_per_call(_reference_digest, iterations),
+        "receipt_canonical_us": _time_per_call(_canonical_digest, iterations),
+    }
+
+    try:
+        from routes import onebox
+    except Exception:  # pragma: no cover - onebox needs the API dependencies
+        return result
+    intent = onebox.JobIntent(
+        action="post_job",
+        payload=onebox.JobPayload(title="Label 500 images", reward="5", deadlineDays=7, agentTypes=["vision"]),
+    )
+
+    def _uncached_plan_hash() -> str:
+        return plan_digest(onebox._model_dump_with_options(intent, exclude={"userContext"}, by_alias=True))
+
+    def _memo_miss_plan_hash() -> str:
+        onebox._PLAN_DIGESTS.clear()
+        return onebox._compute_plan_hash(intent)
+
+    assert _uncached_plan_hash() == onebox._compute_plan_hash(intent)
+    result["plan_hash_uncached_us"] = _time_per_call(_uncached_plan_hash, iterations)
+    result["plan_hash_memo_miss_us"] = _time_per_call(_memo_miss_plan_hash, iterations)
+    result["plan_hash_memo_hit_us"] = _time_per_call(lambda: onebox._compute_plan_hash(intent), iterations)
+    return result
+
+
+def main() -> None:  # pragma: no cover - CLI helper
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--width", type=int, default=16)
+    args = parser.parse_args()
+    print(json.dumps(run_digest_benchmark(iterations=args.iterations, width=args.width), indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
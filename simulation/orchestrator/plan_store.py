@@ -0,0 +1,112 @@
+"""Track resident memory while the onebox plan store absorbs a plan stream.
+
+Every ``/onebox/plan`` call stores an intent snapshot keyed by its plan hash.
+The benchmark writes ``--plans`` synthetic records through
+:func:`orchestrator.plan_store.build_plan_store` and samples RSS at fixed
+intervals; once the LRU tier is full the samples should stay flat::
+
+    python -m simulation.orchestrator.plan_store --plans 1000000 --max-entries 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+def _current_rss_mb() -> float:
+    with open("/proc/self/statm", encoding="ascii") as handle:
+        resident_pages = int(handle.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _record(index: int) -> Dict[str, object]:
+    return {
+        "createdAt": "2026-01-01T00:00:00+00:00",
+        "intentSnapshot": {
+            "action": "post_job",
+            "payload": {"title": f"Plan {index}", "reward": "5", "deadlineDays": 7},
+        },
+        "missingFields": [],
+    }
+
+
+def run_plan_store_benchmark(
+    *,
+    plans: int = 1_000_000,
+    max_entries: int = 100_000,
+    backend: str = "memory",
+    url: Optional[str] = None,
+    samples: int = 20,
+) -> Dict[str, object]:
+    """Store ``plans`` records and report RSS samples and store event counts.
+
+    ``rss_growth_after_fill_mb`` compares the last sample with the first one
+    taken after ``max_entries`` records were written, i.e. the growth that a
+    leak would cause once eviction is in steady state.
+    """
+
+    from orchestrator.plan_store import build_plan_store
+
+    events: Counter = Counter()
+
+    def _count(event: str) -> None:
+        events[event] += 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if backend != "memory" and url is None:
+            url = f"sqlite:///{tmp}/plans.db"
+        store = build_plan_store(backend, url=url, max_entries=max_entries, on_event=_count)
+        interval = max(1, plans // max(1, samples))
+        rss: List[Dict[str, float]] = [{"plans": 0.0, "rss_mb": _current_rss_mb()}]
+        began = time.perf_counter()
+        for index in range(plans):
+            plan_hash = "0x" + hashlib.sha256(index.to_bytes(8, "big")).hexdigest()
+            store.update(plan_hash, _record(index))
+            if index % 4 == 0:
+                store.get(plan_hash)
+            if (index + 1) % interval == 0:
+                rss.append({"plans": float(index + 1), "rss_mb": _current_rss_mb()})
+        elapsed = time.perf_counter() - began
+        held = len(getattr(store, "local", store))
+
+    filled = [sample["rss_mb"] for sample in rss if sample["plans"] >= max_entries]
+    return {
+        "plans": plans,
+        "max_entries": max_entries,
+        "backend": backend,
+        "entries_held": held,
+        "elapsed_seconds": elapsed,
+        "plans_per_second": plans / elapsed if elapsed else 0.0,
+        "events": dict(events),
+        "rss_samples": rss,
+        "rss_growth_after_fill_mb": (filled[-1] - filled[0]) if filled else 0.0,
+    }
+
+
+def main() -> None:  # pragma: no cover - CLI helper
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plans", type=int, default=1_000_000)
+    parser.add_argument("--max-entries", type=int, default=100_000)
+    parser.add_argument("--backend", default="memory")
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+    result = run_plan_store_benchmark(
+        plans=args.plans,
+        max_entries=args.max_entries,
+        backend=args.backend,
+        url=args.url,
+        samples=args.samples,
+    )
+    print(json.dumps(result, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
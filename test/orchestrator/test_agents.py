@@ -6,7 +6,7 @@ import time
 
 import pytest
 
-from orchestrator.agents import AgentRegistry, AgentUnauthorizedError
+from orchestrator.agents import AgentAssignmentError, AgentRegistry, AgentUnauthorizedError
 from orchestrator.models import (
     AgentCapability,
     AgentHeartbeatIn,
@@ -82,3 +82,141 @@ def test_watchdog_marks_agent_offline(tmp_path) -> None:
     time.sleep(0.7)
     status = registry.get("agent-1")
     assert status.status == "offline"
+
+
+def test_heartbeat_refresh_postpones_offline_deadline(tmp_path) -> None:
+    registry = _registry(tmp_path, timeout=0.4)
+    registry.register(_registration_payload("agent-1", secret="beatgood"))
+    for _ in range(4):
+        registry.record_heartbeat("agent-1", AgentHeartbeatIn(secret="beatgood"))
+        time.sleep(0.2)
+    assert registry.get("agent-1").status == "active"
+
+    time.sleep(0.6)
+    assert registry.get("agent-1").status == "offline"
+    persisted = AgentRegistry(path=tmp_path / "registry.json", heartbeat_timeout=0.4)
+    assert persisted.get("agent-1").status == "offline"
+
+
+def _staked(agent_id: str, amount: str, region: str, capabilities: list[AgentCapability]) -> AgentRegistrationIn:
+    payload = _registration_payload(agent_id)
+    return payload.model_copy(update={"stake": AgentStake(amount=amount), "region": region, "capabilities": capabilities})
+
+
+def test_replacement_prefers_capability_region_then_stake(tmp_path) -> None:
+    registry = _registry(tmp_path, timeout=30.0)
+    registry.register(_staked("exec-eu-low", "10", "eu-west", [AgentCapability.EXECUTION]))
+    registry.register(_staked("exec-eu-high", "50", "eu-west", [AgentCapability.EXECUTION]))
+    registry.register(_staked("exec-us-top", "900", "us-east", [AgentCapability.EXECUTION]))
+    registry.register(_staked("val-eu-top", "999", "eu-west", [AgentCapability.VALIDATION]))
+    registry.register(_staked("gone", "5000", "eu-west", [AgentCapability.EXECUTION]))
+    registry.update("gone", AgentUpdateIn(status="offline"))
+
+    def _step(params: dict) -> Step:
+        return Step(id="s", name="Execute", kind="code", tool="execution", params=params, needs=[])
+
+    (regional, _), (fallback, _), (any_region, _) = registry.prepare_steps(
+        [
+            (_step({"agent": "gone", "region": "eu-west"}), ["gone"]),
+            (_step({"agent": "gone", "region": "ap-south"}), ["gone"]),
+            (Step(id="t", name="Other", kind="code", params={"region": "eu-west"}, needs=[]), ["gone"]),
+        ]
+    )
+    assert regional == ["exec-eu-high"]
+    assert fallback == ["exec-us-top"]
+    assert any_region == ["val-eu-top"]
+
+    registry.update("exec-eu-high", AgentUpdateIn(status="suspended"))
+    agents, _ = registry.prepare_step(_step({"region": "eu-west"}), ["gone"])
+    assert agents == ["exec-eu-low"]
+    assert [entry.agent_id for entry in registry.list(region="eu-west", status="active").agents] == [
+        "exec-eu-low",
+        "val-eu-top",
+    ]
+
+
+def test_prepare_steps_can_skip_unstaffed_steps(tmp_path) -> None:
+    registry = _registry(tmp_path, timeout=30.0)
+    registry.register(_staked("exec", "10", "eu-west", [AgentCapability.EXECUTION]))
+    registry.update("exec", AgentUpdateIn(status="suspended"))
+    registry.register(_staked("live", "10", "eu-west", [AgentCapability.EXECUTION]))
+    step = Step(id="s", name="Execute", kind="code", tool="execution", params={"agent": "live"}, needs=[])
+    registry.update("live", AgentUpdateIn(status="offline"))
+
+    assert registry.prepare_steps([(step, ["live"])], skip_unstaffed=True) == [None]
+    with pytest.raises(AgentAssignmentError):
+        registry.prepare_steps([(step, ["live"])])
+
+
+def test_registry_journal_replays_and_compacts(tmp_path, monkeypatch) -> None:
+    from orchestrator import agents as agents_module
+
+    path = tmp_path / "registry.json"
+    registry = AgentRegistry(path=path, heartbeat_timeout=30.0)
+    registry.register(_registration_payload("agent-1", secret="beatgood"))
+    registry.register(_registration_payload("agent-2"))
+    registry.record_heartbeat("agent-1", AgentHeartbeatIn(secret="beatgood", router="edge"))
+    registry.deregister("agent-2")
+    journal = path.with_suffix(".journal.jsonl")
+    assert journal.exists() and not path.exists()
+    with journal.open("a", encoding="utf-8") as handle:
+        handle.write('{"op": "put", "agent"')
+
+    restored = AgentRegistry(path=path, heartbeat_timeout=30.0)
+    assert path.exists() and not journal.exists()
+    assert [entry.agent_id for entry in restored.list().agents] == ["agent-1"]
+    assert restored.get("agent-1").router == "edge"
+    with pytest.raises(AgentUnauthorizedError):
+        restored.record_heartbeat("agent-1", AgentHeartbeatIn(secret="wrong000"))
+
+    monkeypatch.setattr(agents_module, "_JOURNAL_COMPACT_MIN", 3)
+    for _ in range(3):
+        restored.record_heartbeat("agent-1", AgentHeartbeatIn(secret="beatgood"))
+    assert path.exists()
+    assert not journal.exists()
+    assert AgentRegistry(path=path, heartbeat_timeout=30.0).get("agent-1").status == "active"
+
+
+def test_runner_staffs_every_step_in_one_registry_pass(tmp_path, monkeypatch) -> None:
+    import importlib
+
+    from orchestrator.models import Budget, OrchestrationPlan, Policies
+    from orchestrator.tools import executors
+    from orchestrator.tools.executors import StepResult
+
+    monkeypatch.setenv("ORCHESTRATOR_CHECKPOINT_BACKEND", "file")
+    monkeypatch.setenv("ORCHESTRATOR_CHECKPOINT_PATH", str(tmp_path / "checkpoint.json"))
+    monkeypatch.setenv("ORCHESTRATOR_STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.setenv("ORCHESTRATOR_SCOREBOARD_PATH", str(tmp_path / "scoreboard.json"))
+    runner = importlib.reload(importlib.import_module("orchestrator.runner"))
+
+    registry = _registry(tmp_path, timeout=30.0)
+    registry.register(_registration_payload("primary"))
+    registry.update("primary", AgentUpdateIn(status="offline"))
+    registry.register(_registration_payload("backup"))
+    passes = []
+    prepare_steps = registry.prepare_steps
+    monkeypatch.setattr(registry, "prepare_steps", lambda *args, **kwargs: passes.append(1) or prepare_steps(*args, **kwargs))
+    monkeypatch.setattr(executors, "get_registry", lambda: registry)
+
+    seen = []
+
+    class RecordingExecutor:
+        def execute(self, step, abort=None):
+            seen.append(step.params["agent"])
+            return StepResult(success=True, logs=[], attempts=1, duration=0.0)
+
+    monkeypatch.setattr(runner, "_EXECUTOR", RecordingExecutor())
+    steps = [
+        Step(id=f"step-{index}", name=f"Step {index}", kind="code", tool="execution", params={"agent": "primary"})
+        for index in range(3)
+    ]
+    plan = OrchestrationPlan(plan_id="plan-staffed", steps=steps, budget=Budget(), policies=Policies())
+
+    run = runner.start_run(plan, approvals=[])
+
+    status = runner.get_status(run.id)
+    assert status.run.state == "succeeded"
+    assert seen == ["backup", "backup", "backup"]
+    assert passes == [1]
+    assert sum("reassigned to `backup`" in line for line in status.logs) == 3
@@ -0,0 +1,164 @@
+import os
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+pytest.importorskip("pydantic")
+
+if shutil.which("node") is None:  # pragma: no cover - depends on the host
+    pytest.skip("node is not installed", allow_module_level=True)
+
+from orchestrator.tools import executors
+from orchestrator.tools.bridge_pool import BridgeStartError, BridgeUnsupported, BridgeWorkerError, NodeBridgePool
+
+_SERVE_BRIDGE = r"""
+import readline from "node:readline";
+
+if (process.argv[2] !== "--serve") {
+  process.stdout.write(`one-shot ${process.argv[2]}\n`);
+  process.exit(0);
+}
+const reply = (message) => process.stdout.write(JSON.stringify(message) + "\n");
+readline.createInterface({ input: process.stdin }).on("line", (line) => {
+  const request = JSON.parse(line);
+  if (request.method === "ping") return reply({ id: request.id, ok: true });
+  if (request.intent === "crash") process.exit(3);
+  if (request.intent === "fail") return reply({ id: request.id, ok: false, logs: ["tried"], error: "boom" });
+  const delay = request.payload?.delay ?? 0;
+  setTimeout(() => reply({ id: request.id, ok: true, logs: [`pid ${process.pid}`, `ran ${request.intent}`] }), delay);
+});
+"""
+
+_LEGACY_BRIDGE = r"""
+let input = "";
+process.stdin.on("data", (chunk) => (input += chunk));
+process.stdin.on("end", () => process.stdout.write(`legacy ${process.argv[2]} ${input}\n`));
+"""
+
+
+# Only the first --serve worker starts slowly, like a cold start on a busy host.
+_SLOW_FIRST_START = r"""
+import fs from "node:fs";
+
+const marker = new URL("./started", import.meta.url);
+if (process.argv[2] === "--serve" && !fs.existsSync(marker)) {
+  fs.writeFileSync(marker, "");
+  await new Promise((resolve) => setTimeout(resolve, 3000));
+}
+"""
+
+
+@pytest.fixture
+def serve_bridge(tmp_path: Path) -> Path:
+    script = tmp_path / "bridge.mjs"
+    script.write_text(_SERVE_BRIDGE, encoding="utf-8")
+    return script
+
+
+def test_pool_runs_requests_concurrently_across_workers(serve_bridge):
+    pool = NodeBridgePool(serve_bridge, size=2, max_inflight=4)
+    try:
+        pool.request("create_job", {})  # warm one worker
+        results = []
+
+        def _call(index: int) -> None:
+            results.append(pool.request(f"intent-{index}", {"delay": 300}))
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=_call, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        assert len(results) == 8 and all(result["ok"] for result in results)
+        assert elapsed < 8 * 0.3 / 2
+        assert len({result["logs"][0] for result in results}) == 2
+        assert pool.stats()["workers"] == 2
+    finally:
+        pool.close()
+
+
+def test_pool_restarts_crashed_workers(serve_bridge):
+    pool = NodeBridgePool(serve_bridge, size=1)
+    try:
+        first = pool.request("create_job", {})["logs"][0]
+        with pytest.raises(BridgeWorkerError):
+            pool.request("crash", {})
+        second = pool.request("create_job", {})["logs"][0]
+
+        assert first != second
+        assert pool.stats()["restarts"] == 1
+        assert pool.health_check() == {"1": True}
+    finally:
+        pool.close()
+
+
+def test_pool_rejects_bridges_without_serve_mode(tmp_path):
+    script = tmp_path / "legacy.mjs"
+    script.write_text(_LEGACY_BRIDGE, encoding="utf-8")
+    pool = NodeBridgePool(script, size=1, start_timeout=0.5)
+    try:
+        with pytest.raises(BridgeUnsupported):
+            pool.request("create_job", {})
+    finally:
+        pool.close()
+
+
+def test_slow_starting_bridge_is_retried_instead_of_marked_unsupported(tmp_path):
+    script = tmp_path / "bridge.mjs"
+    script.write_text(_SLOW_FIRST_START + _SERVE_BRIDGE, encoding="utf-8")
+    pool = NodeBridgePool(script, size=1, start_timeout=0.5, start_backoff=0.3)
+    try:
+        with pytest.raises(BridgeStartError):
+            pool.request("create_job", {})
+        with pytest.raises(BridgeStartError, match="backing off"):
+            pool.request("create_job", {})
+        time.sleep(0.35)
+        assert pool.request("create_job", {})["logs"][1] == "ran create_job"
+    finally:
+        pool.close()
+
+
+def test_node_bridge_pools_a_slow_starting_bridge_afterwards(tmp_path, monkeypatch):
+    script = tmp_path / "bridge.mjs"
+    script.write_text(_SLOW_FIRST_START + _SERVE_BRIDGE, encoding="utf-8")
+    bridge = executors._NodeBridge()
+    monkeypatch.setenv("ORCHESTRATOR_JS_BRIDGE", str(script))
+    monkeypatch.setattr(executors, "_BRIDGE_START_TIMEOUT", 0.5)
+    monkeypatch.setattr(executors, "_BRIDGE_START_BACKOFF", 0.0)
+    try:
+        assert list(bridge.run("create_job", {})) == ["one-shot create_job"]
+        assert list(bridge.run("create_job", {}))[1] == "ran create_job"
+        assert bridge.stats()["workers"] == 1
+    finally:
+        if bridge._pool is not None:
+            bridge._pool.close()
+
+
+def test_node_bridge_uses_pool_and_falls_back_to_one_shot(serve_bridge, tmp_path, monkeypatch):
+    bridge = executors._NodeBridge()
+    monkeypatch.setenv("ORCHESTRATOR_JS_BRIDGE", str(serve_bridge))
+    monkeypatch.setattr(executors, "_BRIDGE_START_TIMEOUT", 0.5)
+    try:
+        assert list(bridge.run("create_job", {}))[1] == "ran create_job"
+        with pytest.raises(executors.StepExecutionError, match="boom"):
+            list(bridge.run("fail", {}))
+
+        legacy = tmp_path / "legacy.mjs"
+        legacy.write_text(_LEGACY_BRIDGE, encoding="utf-8")
+        monkeypatch.setenv("ORCHESTRATOR_JS_BRIDGE", str(legacy))
+        assert list(bridge.run("stake", {"params": {}})) == ['legacy stake {"params": {}}']
+        assert list(bridge.run("stake", {})) == ["legacy stake {}"]
+    finally:
+        if bridge._pool is not None:
+            bridge._pool.close()
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import random
+import sys
+from decimal import Decimal
+from typing import Any
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from orchestrator.canonical import (
+    DigestMemo,
+    canonical_json,
+    keccak256,
+    normalize_for_digest,
+    plan_digest,
+    receipt_digest,
+)
+
+
+def _reference(value: Any) -> str:
+    return json.dumps(normalize_for_digest(value), separators=(",", ":"), ensure_ascii=False)
+
+
+class _Opaque:
+    def __str__(self) -> str:
+        return "opaque"
+
+
+class _Model:
+    def __init__(self, **fields: Any) -> None:
+        self._fields = fields
+
+    def model_dump(self, mode: str = "python") -> dict:
+        return dict(self._fields)
+
+
+def _random_value(rng: random.Random, depth: int = 0) -> Any:
+    scalars = [
+        lambda: None,
+        lambda: rng.random() < 0.5,
+        lambda: rng.randint(-(10**20), 10**20),
+        lambda: rng.uniform(-1e6, 1e6),
+        lambda: rng.choice([float("inf"), float("nan"), -0.0, 1e300]),
+        lambda: Decimal(rng.randint(0, 10**6)) / Decimal(rng.choice([1, 10, 100, 1000])),
+        lambda: "".join(rng.choice("aZ9 \"\\\n\té€😀") for _ in range(rng.randint(0, 6))),
+        lambda: bytes(rng.randint(0, 255) for _ in range(rng.randint(0, 4))),
+        lambda: _Opaque(),
+    ]
+    if depth >= 3 or rng.random() < 0.4:
+        return rng.choice(scalars)()
+    kind = rng.randint(0, 4)
+    size = rng.randint(0, 4)
+    if kind == 0:
+        return [_random_value(rng, depth + 1) for _ in range(size)]
+    if kind == 1:
+        return tuple(_random_value(rng, depth + 1) for _ in range(size))
+    if kind == 2:
+        return {rng.choice(["é", "b", "a", "10", "2", "Z"]) + str(index): _random_value(rng, depth + 1) for index in range(size)}
+    if kind == 3:
+        return {rng.choice(["x", "ÿ", "😀", "a b", "1", "01"]) for _ in range(size)}
+    return _Model(payload=_random_value(rng, depth + 1), name="m")
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"b": 1, "a": [1.5, Decimal("1.500"), b"\x01\xff", None, True]},
+        {"nested": {"set": {"é", "z", "a"}, "tuple": (1, 2)}},
+        {1: "int key", "2": "str key", None: "none key"},
+        {1: "int", "1": "str"},
+        {"range": range(2), "frozen": frozenset({"b"})},
+        {"model": _Model(reward=Decimal("5"), tags={"b", "a"}), "opaque": _Opaque()},
+        {"floats": [float("inf"), float("-inf"), 1e-7, 0.1]},
+        [],
+        {},
+        "plain",
+    ],
+)
+def test_canonical_json_matches_reference(value: Any) -> None:
+    assert canonical_json(value) == _reference(value)
+
+
+def test_canonical_json_matches_reference_on_random_payloads() -> None:
+    rng = random.Random(1234)
+    for _ in range(2000):
+        value = _random_value(rng)
+        assert canonical_json(value) == _reference(value)
+
+
+def test_generators_are_encoded_as_lists() -> None:
+    assert canonical_json({"gen": (x for x in range(3))}) == _reference({"gen": [0, 1, 2]})
+
+
+def test_sets_with_non_ascii_elements_sort_by_escaped_json() -> None:
+    # "é" sorts before "z" once escaped even though "é" > "z".
+    assert canonical_json({"é", "z"}) == '["é","z"]'
+
+
+def test_receipt_digest_is_keccak_of_reference_encoding() -> None:
+    payload = {"planHash": "0xabc", "fees": Decimal("0.25"), "txHashes": ["0x01"], "tools": {"b", "a"}}
+    expected = keccak256(_reference(payload).encode("utf-8"))
+    assert receipt_digest(payload) == "0x" + expected.hex()
+    # Check against the backend directly rather than ``web3``: other test
+    # modules install a stub ``web3`` in ``sys.modules`` without ``to_hex``.
+    eth_hash = pytest.importorskip("eth_hash.auto")
+    assert receipt_digest(payload) == "0x" + eth_hash.keccak(_reference(payload).encode("utf-8")).hex()
+
+
+def test_plan_digest_matches_sorted_json_sha256() -> None:
+    snapshot = {"payload": {"title": "Label", "reward": "5"}, "action": "post_job"}
+    expected = hashlib.sha256(json.dumps(snapshot, sort_keys=True).encode("utf-8")).hexdigest()
+    assert plan_digest(snapshot) == "0x" + expected
+
+
+def test_digest_memo_reuses_and_bounds_entries() -> None:
+    memo = DigestMemo(max_entries=2)
+    calls = []
+
+    def compute(value: str) -> str:
+        calls.append(value)
+        return value.upper()
+
+    assert memo.get_or_compute("a", lambda: compute("a")) == "A"
+    assert memo.get_or_compute("a", lambda: compute("a")) == "A"
+    memo.get_or_compute("b", lambda: compute("b"))
+    memo.get_or_compute("c", lambda: compute("c"))
+    memo.get_or_compute("a", lambda: compute("a"))
+
+    assert calls == ["a", "b", "c", "a"]
+    assert len(memo) == 2
+    assert (memo.hits, memo.misses) == (1, 4)
@@ -1,3 +1,4 @@
+import hashlib
 import importlib
 import json
 import time
@@ -91,11 +92,75 @@ def test_checkpoint_integrity_detection(tmp_path: Path) -> None:
         new_manager.restore_runtime()
 
 
+def test_delta_log_replays_on_top_of_base(tmp_path: Path) -> None:
+    checkpoint_path = tmp_path / "checkpoint.json"
+    store = FileCheckpointStore(checkpoint_path)
+    manager = CheckpointManager(store=store, governance=GovernanceSettings.default(), compaction_interval=100)
+    plan = _simple_plan()
+    manager.snapshot_runtime({"run-1": _simple_status("run-1", plan.plan_id)}, {"run-1": plan})
+
+    updated = _simple_status("run-1", plan.plan_id)
+    updated.steps[0].state = "completed"
+    first = manager.record_job(updated, plan)
+    second = manager.record_job(_simple_status("run-2", plan.plan_id), plan)
+    manager.remove_job("run-2")
+
+    assert first is not None and second is not None
+    assert first.previous == manager.last_snapshot().integrity
+    assert second.previous == first.integrity
+    assert second.sequence == first.sequence + 1
+    assert manager.pending_deltas() == 3
+    assert len(checkpoint_path.with_suffix(".deltas.jsonl").read_text(encoding="utf-8").splitlines()) == 3
+
+    restored = CheckpointManager(store=store, governance=GovernanceSettings.default()).restore_runtime()
+    assert set(restored) == {"run-1"}
+    assert restored["run-1"].status.steps[0].state == "completed"
+
+
+def test_delta_log_compacts_into_base(tmp_path: Path) -> None:
+    checkpoint_path = tmp_path / "checkpoint.json"
+    store = FileCheckpointStore(checkpoint_path)
+    manager = CheckpointManager(store=store, governance=GovernanceSettings.default(), compaction_interval=2)
+    manager.restore_runtime()
+    plan = _simple_plan()
+
+    for index in range(3):
+        manager.record_job(_simple_status(f"run-{index}", plan.plan_id), plan)
+        if manager.compaction_due():
+            manager.compact(scoreboard={"node-1": {"wins": index}})
+
+    assert manager.pending_deltas() == 1
+    base = store.load_latest()
+    assert base is not None and set(base.jobs) == {"run-0", "run-1"}
+    assert base.scoreboard == {"node-1": {"wins": 1}}
+    assert [delta.run_id for delta in store.load_deltas(base.sequence)] == ["run-2"]
+
+    restored = CheckpointManager(store=store, governance=GovernanceSettings.default()).restore_runtime()
+    assert set(restored) == {"run-0", "run-1", "run-2"}
+
+
+def test_delta_chain_tampering_detected(tmp_path: Path) -> None:
+    checkpoint_path = tmp_path / "checkpoint.json"
+    store = FileCheckpointStore(checkpoint_path)
+    manager = CheckpointManager(store=store, governance=GovernanceSettings.default(), compaction_interval=100)
+    plan = _simple_plan()
+    manager.snapshot_runtime({}, {})
+    manager.record_job(_simple_status("run-1", plan.plan_id), plan)
+    manager.record_job(_simple_status("run-2", plan.plan_id), plan)
+
+    delta_path = checkpoint_path.with_suffix(".deltas.jsonl")
+    lines = delta_path.read_text(encoding="utf-8").splitlines()
+    delta_path.write_text(lines[1] + "\n", encoding="utf-8")
+
+    with pytest.raises(CheckpointIntegrityError):
+        CheckpointManager(store=store, governance=GovernanceSettings.default()).restore_runtime()
+
+
 class CrashOnceExecutor:
     def __init__(self) -> None:
         self.calls = 0
 
-    def execute(self, step: Step):  # type: ignore[override]
+    def execute(self, step: Step, abort=None):  # type: ignore[override]
         from orchestrator.tools.executors import StepResult
 
         self.calls += 1
@@ -105,12 +170,58 @@ class CrashOnceExecutor:
 
 
 class ResumeExecutor:
-    def execute(self, step: Step):  # type: ignore[override]
+    def execute(self, step: Step, abort=None):  # type: ignore[override]
         from orchestrator.tools.executors import StepResult
 
         return StepResult(success=True, logs=[f"resume {step.id}"], attempts=1, duration=0.01)
 
 
+def test_streaming_integrity_matches_v1_canonical_json(tmp_path: Path) -> None:
+    manager = CheckpointManager(store=FileCheckpointStore(tmp_path / "checkpoint.json"))
+    manager.update_shard(ShardState(shard_id="earth", capacity=2, metadata={"zone": "ü"}))
+    plans = {f"run-{index}": _simple_plan() for index in range(3)}
+    runs = {run_id: _simple_status(run_id, plan.plan_id) for run_id, plan in plans.items()}
+
+    checkpoint = manager.snapshot_runtime(runs, plans, scoreboard={"node-1": {"wins": 2, "ratio": 0.5}})
+
+    payload = checkpoint.model_dump(mode="json", exclude={"integrity"})
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    assert "".join(checkpoint.iter_canonical()) == canonical
+    assert checkpoint.integrity == hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@pytest.mark.parametrize("compression", [None, "zstd"])
+def test_binary_checkpoint_roundtrip_and_reads_v1_json(tmp_path: Path, compression: str | None) -> None:
+    pytest.importorskip("msgpack")
+    if compression:
+        pytest.importorskip("zstandard")
+    checkpoint_path = tmp_path / "checkpoint.bin"
+    plan = _simple_plan()
+    status = _simple_status("run-1", plan.plan_id)
+    status.logs.append("payout 340282366920938463463374607431768211455 wei")
+
+    legacy = CheckpointManager(store=FileCheckpointStore(checkpoint_path))
+    legacy.snapshot_runtime({"run-1": status}, {"run-1": plan})
+    assert checkpoint_path.read_text(encoding="utf-8").startswith("{")
+
+    store = FileCheckpointStore(checkpoint_path, encoding="msgpack", compression=compression)
+    restored = CheckpointManager(store=store).restore_runtime()
+    assert restored["run-1"].status.logs == status.logs
+
+    status.run.state = "running"
+    manager = CheckpointManager(store=store)
+    manager.restore_runtime()
+    checkpoint = manager.snapshot_runtime({"run-1": status}, {"run-1": plan}, scoreboard={"big": {"stake": 2**70}})
+    assert checkpoint_path.read_bytes()[:4] == b"OCKP"
+
+    loaded = FileCheckpointStore(checkpoint_path).load_latest()
+    assert loaded is not None
+    loaded.verify()
+    assert loaded.integrity == checkpoint.integrity
+    assert loaded.jobs["run-1"].status.run.state == "running"
+    assert loaded.scoreboard == {"big": {"stake": 2**70}}
+
+
 def test_restart_workflow_resumes_mid_run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     checkpoint_path = tmp_path / "checkpoint.json"
     state_dir = tmp_path / "state"
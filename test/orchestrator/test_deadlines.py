@@ -0,0 +1,69 @@
+import threading
+import time
+
+from orchestrator.deadlines import DeadlineScheduler, get_deadline_scheduler
+
+
+def test_deadlines_fire_in_order_and_refresh_replaces() -> None:
+    scheduler = DeadlineScheduler(name="test-deadlines-order")
+    fired: list[str] = []
+    done = threading.Event()
+    try:
+        scheduler.schedule("late", 0.15, lambda: (fired.append("late"), done.set()))
+        scheduler.schedule("early", 0.05, lambda: fired.append("early"))
+        scheduler.schedule("refreshed", 0.01, lambda: fired.append("stale"))
+        scheduler.schedule("refreshed", 0.1, lambda: fired.append("refreshed"))
+        scheduler.schedule("cancelled", 0.02, lambda: fired.append("cancelled"))
+        assert scheduler.cancel("cancelled")
+        assert scheduler.pending() == 3
+
+        assert done.wait(2.0)
+        assert fired == ["early", "refreshed", "late"]
+        stats = scheduler.stats()
+        assert stats["pending"] == 0
+        assert stats["fired"] == 3
+        assert stats["max_lag_seconds"] >= 0
+    finally:
+        scheduler.shutdown()
+
+
+def test_refresh_churn_keeps_heap_bounded() -> None:
+    scheduler = DeadlineScheduler(name="test-deadlines-churn")
+    try:
+        for _ in range(10_000):
+            for key in range(10):
+                scheduler.schedule(key, 60.0, lambda: None)
+        stats = scheduler.stats()
+        assert stats["pending"] == 10
+        assert stats["heap_size"] <= 128
+    finally:
+        scheduler.shutdown()
+
+
+def test_runner_stall_deadline_reschedules_stuck_run(monkeypatch) -> None:
+    from orchestrator import runner
+    from orchestrator.models import Budget, OrchestrationPlan, Policies, RunInfo, StatusOut, Step, StepStatus
+
+    plan = OrchestrationPlan(
+        plan_id="plan-stall",
+        steps=[Step(id="step-1", name="Slow", kind="llm", params={})],
+        budget=Budget(),
+        policies=Policies(),
+    )
+    now = time.time()
+    status = StatusOut(
+        run=RunInfo(id="run-stall", plan_id=plan.plan_id, state="running", created_at=now, started_at=now),
+        steps=[StepStatus(id="step-1", name="Slow", kind="llm", state="running", started_at=now)],
+        current="step-1",
+    )
+    state = runner._RunState(status, plan)
+    resumed = threading.Event()
+    monkeypatch.setattr(runner, "_STALL_THRESHOLD", 0.1)
+    monkeypatch.setitem(runner._RUNS, state.run_id, state)
+    monkeypatch.setattr(runner, "_dispatch_resume", lambda target: resumed.set())
+
+    runner._arm_stall_deadline(state)
+
+    assert resumed.wait(2.0)
+    assert any("stall" in line for line in state.status.logs)
+    get_deadline_scheduler().cancel(runner._stall_key(state.run_id))
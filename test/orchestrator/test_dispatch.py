@@ -0,0 +1,159 @@
+import threading
+import time
+
+import pytest
+
+from orchestrator.dispatch import RunDispatcher, RunQueueFull
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_dispatcher_runs_higher_priority_first() -> None:
+    dispatcher = RunDispatcher(workers=1, max_queue=10)
+    gate = threading.Event()
+    order: list[str] = []
+
+    dispatcher.submit("blocker", lambda lease: gate.wait(2.0))
+    assert _wait_for(lambda: dispatcher.stats()["running"] == 1)
+    dispatcher.submit("low", lambda lease: order.append("low"), priority=0)
+    dispatcher.submit("high", lambda lease: order.append("high"), priority=5)
+    dispatcher.submit("low-2", lambda lease: order.append("low-2"), priority=0)
+    gate.set()
+
+    assert _wait_for(lambda: len(order) == 3)
+    assert order == ["high", "low", "low-2"]
+    dispatcher.shutdown()
+
+
+def test_dispatcher_enforces_tenant_limit_and_backpressure() -> None:
+    dispatcher = RunDispatcher(workers=4, max_queue=3, tenant_limit=1)
+    gate = threading.Event()
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def job(tenant: str):
+        def _run(lease) -> None:
+            with lock:
+                active[tenant] = active.get(tenant, 0) + 1
+                peak[tenant] = max(peak.get(tenant, 0), active[tenant])
+            gate.wait(2.0)
+            with lock:
+                active[tenant] -= 1
+
+        return _run
+
+    dispatcher.submit("a-1", job("a"), tenant="a")
+    dispatcher.submit("a-2", job("a"), tenant="a")
+    dispatcher.submit("b-1", job("b"), tenant="b")
+    assert _wait_for(lambda: dispatcher.stats()["running"] == 2)
+    assert dispatcher.stats()["queued"] == 1
+
+    dispatcher.submit("a-3", job("a"), tenant="a")
+    dispatcher.submit("a-4", job("a"), tenant="a")
+    with pytest.raises(RunQueueFull):
+        dispatcher.submit("a-5", job("a"), tenant="a")
+
+    gate.set()
+    assert _wait_for(lambda: dispatcher.stats()["queued"] == 0 and dispatcher.stats()["running"] == 0)
+    assert peak == {"a": 1, "b": 1}
+    dispatcher.shutdown()
+
+
+def test_dispatcher_resume_is_idempotent_while_leased() -> None:
+    dispatcher = RunDispatcher(workers=2, max_queue=10, lease_ttl=0.2)
+    gate = threading.Event()
+    calls: list[bool] = []
+
+    def stalled(lease) -> None:
+        gate.wait(2.0)
+        calls.append(lease.renew())
+
+    assert dispatcher.submit("run-1", stalled)
+    assert _wait_for(lambda: dispatcher.stats()["running"] == 1)
+    assert dispatcher.submit("run-1", lambda lease: calls.append(True)) is False
+    assert dispatcher.is_active("run-1")
+
+    # Once the lease expires a resume may take over; the stalled holder loses it.
+    time.sleep(0.25)
+    assert not dispatcher.is_active("run-1")
+    assert dispatcher.submit("run-1", lambda lease: calls.append(lease.held))
+    assert _wait_for(lambda: calls == [True])
+    gate.set()
+    assert _wait_for(lambda: len(calls) == 2)
+    assert calls == [True, False]
+    dispatcher.shutdown()
+
+
+def test_keepalive_holds_lease_past_ttl() -> None:
+    dispatcher = RunDispatcher(workers=1, max_queue=10, lease_ttl=0.15)
+    outcome: list[bool] = []
+
+    def long_step(lease) -> None:
+        with lease.keepalive() as lost:
+            time.sleep(0.5)
+            outcome.append(lost.is_set())
+        outcome.append(lease.held)
+
+    assert dispatcher.submit("run-1", long_step)
+    assert _wait_for(lambda: dispatcher.stats()["running"] == 1)
+    time.sleep(0.3)
+    # Well past the TTL the heartbeat still owns the run, so resumes are no-ops.
+    assert dispatcher.is_active("run-1")
+    assert dispatcher.submit("run-1", lambda lease: outcome.append(None)) is False
+    assert _wait_for(lambda: len(outcome) == 2)
+    assert outcome == [False, True]
+    dispatcher.shutdown()
+
+
+def test_runner_step_outliving_lease_ttl_runs_once(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import importlib
+
+    from orchestrator.models import Budget, OrchestrationPlan, Policies, Step
+    from orchestrator.tools.executors import StepResult
+
+    monkeypatch.setenv("ORCHESTRATOR_CHECKPOINT_BACKEND", "file")
+    monkeypatch.setenv("ORCHESTRATOR_CHECKPOINT_PATH", str(tmp_path / "checkpoint.json"))
+    monkeypatch.setenv("ORCHESTRATOR_STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.setenv("ORCHESTRATOR_SCOREBOARD_PATH", str(tmp_path / "scoreboard.json"))
+    runner = importlib.reload(importlib.import_module("orchestrator.runner"))
+
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0, "calls": 0}
+
+    class SlowExecutor:
+        def execute(self, step, abort=None):
+            with lock:
+                active["now"] += 1
+                active["calls"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.6)
+            with lock:
+                active["now"] -= 1
+            return StepResult(success=True, logs=[f"ran {step.id}"], attempts=1, duration=0.6)
+
+    dispatcher = RunDispatcher(workers=2, max_queue=10, lease_ttl=0.15)
+    monkeypatch.setattr(runner, "_EXECUTOR", SlowExecutor())
+    monkeypatch.setattr(runner, "_DISPATCHER", dispatcher)
+    monkeypatch.setattr(runner, "_STALL_THRESHOLD", 0.1)
+    monkeypatch.setattr(runner, "_should_run_inline", lambda: False)
+
+    plan = OrchestrationPlan(
+        plan_id="plan-slow",
+        steps=[Step(id="step-1", name="Slow", kind="llm", params={})],
+        budget=Budget(),
+        policies=Policies(),
+    )
+    run = runner.start_run(plan, approvals=[])
+    assert _wait_for(lambda: runner.get_status(run.id).run.state == "succeeded", timeout=5.0)
+    # The stall watchdog fired repeatedly but the heartbeat kept the lease live.
+    assert active["calls"] == 1
+    assert active["peak"] == 1
+    dispatcher.shutdown()
@@ -0,0 +1,125 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List, Set
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+pytest.importorskip("httpx")
+
+from orchestrator.http_pool import HttpClientPool, ProviderHealth
+
+
+class _StubServer:
+    """HTTP endpoint that records client ports and peak request concurrency."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.ports: Set[int] = set()
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802 - http.server API
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                with server._lock:
+                    server.ports.add(self.client_address[1])
+                    server.active += 1
+                    server.peak = max(server.peak, server.active)
+                time.sleep(delay)
+                with server._lock:
+                    server.active -= 1
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *_args: Any) -> None:
+                return
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def test_sequential_requests_reuse_one_connection() -> None:
+    server = _StubServer()
+    pool = HttpClientPool(http2=False)
+
+    async def runner() -> List[int]:
+        try:
+            return [(await pool.post(server.url, json={"i": index})).status_code for index in range(5)]
+        finally:
+            await pool.aclose()
+
+    try:
+        assert asyncio.run(runner()) == [200] * 5
+    finally:
+        server.close()
+    assert len(server.ports) == 1
+
+
+def test_concurrent_requests_respect_per_host_limit() -> None:
+    server = _StubServer(delay=0.05)
+    pool = HttpClientPool(max_connections_per_host=2, http2=False)
+
+    async def runner() -> None:
+        try:
+            await asyncio.gather(*(pool.post(server.url, content=b"x") for _ in range(6)))
+        finally:
+            await pool.aclose()
+
+    try:
+        asyncio.run(runner())
+    finally:
+        server.close()
+    assert server.peak == 2
+
+
+def test_each_event_loop_gets_its_own_client() -> None:
+    pool = HttpClientPool(http2=False)
+
+    async def current() -> Any:
+        return pool.client()
+
+    first = asyncio.run(current())
+    second = asyncio.run(current())
+    assert first is not second
+
+
+def test_provider_health_opens_and_half_opens(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr("orchestrator.http_pool.time.monotonic", lambda: now[0])
+    health = ProviderHealth("pinata", failure_threshold=2, reset_timeout=10.0)
+
+    health.record_failure()
+    assert health.allow()
+    health.record_failure()
+    assert health.is_open
+    assert not health.allow()
+
+    now[0] += 10.0
+    assert health.available() and health.available(), "checking never claims the trial"
+    assert health.allow()
+    assert not health.allow(), "only one trial request while half-open"
+    assert not health.available()
+
+    health.record_success(0.2)
+    assert not health.is_open
+    assert health.allow()
+    health.record_success(0.4)
+    assert health.latency == pytest.approx(0.26)
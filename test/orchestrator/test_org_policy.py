@@ -0,0 +1,157 @@
+import json
+import os
+import random
+import sys
+import threading
+from pathlib import Path
+from typing import List
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.database import Database
+from orchestrator import simulator
+from orchestrator.org_policy import (
+    DatabasePolicySource,
+    FilePolicySource,
+    PolicyWatcher,
+    ToolAllowlist,
+    parse_policy_document,
+)
+
+
+def _linear_match(patterns: List[str], tool: str) -> bool:
+    """The allowlist semantics the compiled matcher replaces."""
+
+    lowered = [entry.strip().lower() for entry in patterns if entry.strip()]
+    if any(entry in {"*", "all", "any"} for entry in lowered):
+        return True
+    target = tool.strip().lower()
+    if not target:
+        return True
+    for pattern in lowered:
+        if pattern.endswith("*"):
+            if target.startswith(pattern[:-1]):
+                return True
+        elif target == pattern:
+            return True
+    return False
+
+
+def _write(path: Path, document: dict) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(document))
+    os.replace(tmp, path)
+
+
+def test_allowlist_matches_linear_scan_on_random_patterns() -> None:
+    rng = random.Random(7)
+    alphabet = "abAB.*"
+    for _ in range(2000):
+        patterns = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4))) for _ in range(rng.randint(0, 4))]
+        tool = "".join(rng.choice("abAB. ") for _ in range(rng.randint(0, 5)))
+        assert ToolAllowlist.compile(patterns).allows(tool) == _linear_match(patterns, tool), (patterns, tool)
+
+
+def test_allowlist_prefix_and_allow_all_tokens() -> None:
+    allowlist = ToolAllowlist.compile(["Search*", "ipfs.pin"])
+    assert allowlist.allows("search.web")
+    assert allowlist.allows("SEARCH")
+    assert allowlist.allows("IPFS.pin")
+    assert not allowlist.allows("ipfs.unpin")
+    assert ToolAllowlist.compile(["ipfs.pin", "ANY"]).allow_all
+    assert not ToolAllowlist.compile([" ", ""]).has_patterns
+
+
+def test_parse_policy_document_accepts_legacy_fields() -> None:
+    entries = parse_policy_document(
+        {
+            "acme": {"maxBudgetWei": "10", "maxDurationDays": "3", "toolWhitelist": "a, b;c  d"},
+            "beta": {"maxBudgetWei": 2.0, "allowedTools": ["  x ", 5, ""]},
+            "broken": "not an object",
+        }
+    )
+    assert entries["acme"].max_budget_wei == 10
+    assert entries["acme"].max_duration_days == 3
+    assert entries["acme"].allowed_tools == ("a", "b", "c", "d")
+    assert entries["beta"].allowed_tools == ("x",)
+    assert "broken" not in entries
+
+
+def test_watcher_reloads_when_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "policies.json"
+    _write(path, {"acme": {"maxBudgetWei": "1"}})
+    watcher = PolicyWatcher(FilePolicySource(str(path)), parse_policy_document, reload_interval=0)
+    first = watcher.current()
+    assert first["acme"].max_budget_wei == 1
+    assert watcher.current() is first, "unchanged files are not recompiled"
+
+    _write(path, {"acme": {"maxBudgetWei": "20"}})
+    assert watcher.current()["acme"].max_budget_wei == 20
+
+
+def test_watcher_keeps_previous_snapshot_when_reload_fails(tmp_path: Path) -> None:
+    path = tmp_path / "policies.json"
+    _write(path, {"acme": {"maxBudgetWei": "1"}})
+    watcher = PolicyWatcher(FilePolicySource(str(path)), parse_policy_document, reload_interval=0)
+
+    path.write_text("{not json")
+    assert watcher.current()["acme"].max_budget_wei == 1
+
+    _write(path, {"acme": {"maxBudgetWei": "5"}})
+    assert watcher.current()["acme"].max_budget_wei == 5
+
+
+def test_concurrent_file_mutations_are_not_lost(tmp_path: Path) -> None:
+    path = tmp_path / "policies.json"
+    watchers = [PolicyWatcher(FilePolicySource(str(path)), parse_policy_document) for _ in range(4)]
+
+    def _add(watcher: PolicyWatcher, org: str) -> None:
+        watcher.mutate(lambda document: {**document, org: {"maxBudgetWei": "1"}})
+
+    threads = [threading.Thread(target=_add, args=(watchers[i % 4], f"org-{i}")) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(json.loads(path.read_text())) == sorted(f"org-{i}" for i in range(16))
+
+
+def test_database_source_is_shared_between_watchers(tmp_path: Path) -> None:
+    url = f"sqlite:///{tmp_path / 'policies.db'}"
+    writer = PolicyWatcher(DatabasePolicySource(Database(url)), parse_policy_document, reload_interval=0)
+    reader = PolicyWatcher(DatabasePolicySource(Database(url)), parse_policy_document, reload_interval=0)
+    assert reader.current() == {}
+
+    writer.mutate(lambda document: {**document, "acme": {"maxDurationDays": 4}})
+    assert reader.current()["acme"].max_duration_days == 4
+    writer.mutate(lambda document: {**document, "beta": {"maxDurationDays": 2}})
+    assert sorted(reader.current()) == ["acme", "beta"]
+
+
+def test_simulator_policies_reload_without_restart(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "policies.json"
+    _write(path, {"__default__": {"maxBudgetWei": "100", "maxDurationDays": 0}})
+    monkeypatch.setattr(simulator, "_ORG_POLICY_PATH", str(path))
+    monkeypatch.setattr(simulator, "_ORG_POLICY_URL", None)
+    monkeypatch.setattr(simulator, "_ORG_POLICY_RELOAD_SECONDS", 0)
+    monkeypatch.setattr(simulator, "_ORG_POLICIES", None)
+
+    assert simulator._load_org_policies() == {"__default__": {"maxBudgetWei": 100}}
+    _write(path, {"__default__": {"maxBudgetWei": "100", "maxDurationDays": 3, "updatedAt": "2026-01-01"}})
+    assert simulator._load_org_policies() == {
+        "__default__": {"maxBudgetWei": 100, "maxDurationDays": 3, "updatedAt": "2026-01-01"}
+    }
+
+
+def test_simulator_tolerates_invalid_policy_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "policies.json"
+    path.write_text("[1, 2]")
+    monkeypatch.setattr(simulator, "_ORG_POLICY_PATH", str(path))
+    monkeypatch.setattr(simulator, "_ORG_POLICY_URL", None)
+    monkeypatch.setattr(simulator, "_ORG_POLICIES", None)
+
+    assert simulator._load_org_policies() == {}
@@ -0,0 +1,109 @@
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.database import Database
+from orchestrator.plan_store import (
+    DatabasePlanMetadataStore,
+    MemoryPlanMetadataStore,
+    PlanStoreError,
+    TieredPlanMetadataStore,
+    build_plan_store,
+)
+
+
+def _counter():
+    events: Counter = Counter()
+
+    def _record(event: str) -> None:
+        events[event] += 1
+
+    return events, _record
+
+
+def test_memory_store_evicts_least_recently_used() -> None:
+    events, hook = _counter()
+    store = MemoryPlanMetadataStore(max_entries=2, on_event=hook)
+    store.put("a", {"createdAt": "1"})
+    store.put("b", {"createdAt": "2"})
+    assert store.get("a") == {"createdAt": "1"}
+    store.put("c", {"createdAt": "3"})
+
+    assert len(store) == 2
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert events == Counter({"hit": 2, "miss": 1, "eviction": 1})
+
+
+def test_memory_store_expires_records(monkeypatch: pytest.MonkeyPatch) -> None:
+    events, hook = _counter()
+    now = [1000.0]
+    monkeypatch.setattr("orchestrator.plan_store.time.monotonic", lambda: now[0])
+    store = MemoryPlanMetadataStore(max_entries=10, ttl=5.0, on_event=hook)
+    store.put("a", {"createdAt": "1"})
+    now[0] += 6.0
+
+    assert store.get("a") is None
+    assert len(store) == 0
+    assert events["expired"] == 1
+
+
+def test_update_merges_fields_and_returns_copies() -> None:
+    store = MemoryPlanMetadataStore()
+    store.update("a", {"createdAt": "1"})
+    merged = store.update("a", {"missingFields": ["reward"]})
+    merged["createdAt"] = "mutated"
+
+    assert store.get("a") == {"createdAt": "1", "missingFields": ["reward"]}
+
+
+def test_database_store_is_shared_between_instances(tmp_path: Path) -> None:
+    url = f"sqlite:///{tmp_path / 'plans.db'}"
+    writer = DatabasePlanMetadataStore(Database(url))
+    reader = DatabasePlanMetadataStore(Database(url))
+    writer.update("0xabc", {"createdAt": "1", "intentSnapshot": {"action": "post_job"}})
+    writer.update("0xabc", {"missingFields": []})
+
+    assert reader.get("0xabc") == {
+        "createdAt": "1",
+        "intentSnapshot": {"action": "post_job"},
+        "missingFields": [],
+    }
+    assert len(reader) == 1
+
+
+def test_database_store_ignores_and_purges_expired_rows(tmp_path: Path) -> None:
+    store = DatabasePlanMetadataStore(Database(f"sqlite:///{tmp_path / 'plans.db'}"), ttl=-1.0, purge_every=2)
+    store.put("a", {"createdAt": "1"})
+    assert store.get("a") is None
+    store.put("b", {"createdAt": "2"})
+
+    assert len(store) == 0
+
+
+def test_tiered_store_serves_local_hits_and_writes_through(tmp_path: Path) -> None:
+    events, hook = _counter()
+    store = build_plan_store("sqlite", url=f"sqlite:///{tmp_path / 'plans.db'}", max_entries=1, on_event=hook)
+    assert isinstance(store, TieredPlanMetadataStore)
+    store.update("a", {"createdAt": "1"})
+    store.update("b", {"createdAt": "2"})
+
+    assert store.get("b") == {"createdAt": "2"}
+    assert store.get("a") == {"createdAt": "1"}
+    assert len(store.local) == 1
+    assert len(store.shared) == 2
+    assert events["hit"] == 1
+    assert events["miss"] == 1
+    assert events["eviction"] >= 1
+
+
+def test_build_plan_store_rejects_unknown_backend() -> None:
+    with pytest.raises(PlanStoreError):
+        build_plan_store("memcached")
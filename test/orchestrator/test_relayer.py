@@ -0,0 +1,177 @@
+import os
+import sys
+import threading
+import time
+import types
+from typing import Any, Dict, List, Optional, Sequence
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from orchestrator.relayer import FeeOracle, NonceManager, ReceiptTimeout, RelayerPipeline
+
+
+class _StubEth:
+    """In-memory chain: sent transactions are mined when ``mine`` is called."""
+
+    def __init__(self) -> None:
+        self.block_number = 100
+        self.gas_price = 7
+        self.mined_count = 0
+        self.pending_count = 0
+        self.sent: List[int] = []
+        self.receipts: Dict[str, Dict[str, Any]] = {}
+        self.reject_nonces_below = 0
+        self.calls: Dict[str, int] = {"get_block": 0, "get_transaction_count": 0}
+        self._lock = threading.Lock()
+
+    def get_block(self, _tag: str) -> Dict[str, int]:
+        self.calls["get_block"] += 1
+        return {"gasLimit": 30_000_000}
+
+    def get_transaction_count(self, _address: str, tag: str) -> int:
+        self.calls["get_transaction_count"] += 1
+        return self.pending_count if tag == "pending" else self.mined_count
+
+    def send_raw_transaction(self, raw: bytes) -> bytes:
+        nonce = raw[0]
+        with self._lock:
+            if nonce < self.reject_nonces_below:
+                raise ValueError("nonce too low")
+            self.sent.append(nonce)
+        return bytes([0x99, nonce])
+
+    def mine(self, *tx_hashes: str) -> None:
+        for tx_hash in tx_hashes:
+            self.receipts[tx_hash] = {"transactionHash": tx_hash, "status": 1}
+        self.block_number += 1
+
+
+class _StubAccount:
+    address = "0x00000000000000000000000000000000000000aa"
+
+    @staticmethod
+    def sign_transaction(tx: Dict[str, Any]) -> types.SimpleNamespace:
+        return types.SimpleNamespace(rawTransaction=bytes([tx["nonce"]]))
+
+
+@pytest.fixture
+def chain():
+    return _StubEth()
+
+
+@pytest.fixture
+def pipeline_factory(chain):
+    created: List[RelayerPipeline] = []
+    fetches: List[Sequence[str]] = []
+
+    def _fetch(hashes: Sequence[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        fetches.append(list(hashes))
+        return {tx_hash: chain.receipts.get(tx_hash) for tx_hash in hashes}
+
+    def _build(**kwargs: Any) -> RelayerPipeline:
+        pipeline = RelayerPipeline(
+            types.SimpleNamespace(eth=chain), _StubAccount(), chain_id=1, fetch_receipts=_fetch, poll_interval=0.01, **kwargs
+        )
+        pipeline.fetches = fetches
+        created.append(pipeline)
+        return pipeline
+
+    yield _build
+    for pipeline in created:
+        pipeline.shutdown()
+
+
+def test_nonce_manager_seeds_once_and_reuses_released_nonces():
+    fetched = []
+    manager = NonceManager(lambda: fetched.append(1) or 5)
+
+    assert [manager.allocate() for _ in range(4)] == [5, 6, 7, 8]
+    manager.release(6)
+    manager.release(8)
+    assert manager.stats() == {"next_nonce": 8, "nonce_gaps": 1}
+    assert manager.allocate() == 6
+    assert manager.allocate() == 8
+    assert len(fetched) == 1
+
+
+def test_fee_oracle_fetches_once_per_block(chain):
+    oracle = FeeOracle(types.SimpleNamespace(eth=chain), refresh_interval=0)
+
+    first = oracle.quote()
+    assert oracle.quote() is first
+    chain.block_number += 1
+    chain.gas_price = 9
+    second = oracle.quote()
+
+    assert (first.gas_price, second.gas_price, second.gas_limit) == (7, 9, 30_000_000)
+    assert chain.calls["get_block"] == 2
+
+
+def test_concurrent_submissions_get_sequential_nonces(chain, pipeline_factory):
+    pipeline = pipeline_factory()
+    futures = [pipeline.submit({"to": "0x01", "gas": 21_000}) for _ in range(20)]
+
+    hashes = [future.result(timeout=2) for future in futures]
+
+    assert sorted(chain.sent) == list(range(20))
+    assert len(set(hashes)) == 20
+    assert chain.calls["get_transaction_count"] == 1
+
+
+def test_nonce_conflict_resyncs_from_chain(chain, pipeline_factory):
+    pipeline = pipeline_factory()
+    pipeline.submit({"to": "0x01"}).result(timeout=2)
+    # Someone else used the account out of band.
+    chain.pending_count = 4
+    chain.reject_nonces_below = 4
+
+    tx_hash = pipeline.submit({"to": "0x01"}).result(timeout=2)
+
+    assert tx_hash == "0x9904"
+    assert chain.sent == [0, 4]
+
+
+def test_one_sweep_resolves_many_receipts(chain, pipeline_factory):
+    pipeline = pipeline_factory()
+    hashes = [pipeline.submit({"to": "0x01"}).result(timeout=2) for _ in range(10)]
+    watches = [pipeline.watch(tx_hash) for tx_hash in hashes]
+
+    chain.mine(*hashes)
+    receipts = [watch.result(timeout=2) for watch in watches]
+
+    assert [receipt["transactionHash"] for receipt in receipts] == hashes
+    assert any(len(batch) == 10 for batch in pipeline.fetches)
+    assert pipeline.stats()["pending_receipts"] == 0
+
+
+def test_dropped_transaction_releases_its_nonce(chain, pipeline_factory):
+    pipeline = pipeline_factory(receipt_timeout=0.05)
+    tx_hash = pipeline.submit({"to": "0x01"}).result(timeout=2)
+
+    with pytest.raises(ReceiptTimeout):
+        pipeline.watch(tx_hash).result(timeout=2)
+
+    assert pipeline.nonces.stats()["next_nonce"] == 0
+    pipeline.submit({"to": "0x01"}).result(timeout=2)
+    assert chain.sent == [0, 0]
+
+
+def test_transaction_still_pending_after_timeout_keeps_its_nonce(chain, pipeline_factory):
+    pipeline = pipeline_factory(receipt_timeout=0.05)
+    tx_hash = pipeline.submit({"to": "0x01"}).result(timeout=2)
+    # The node still holds the transaction in its mempool.
+    chain.pending_count = 1
+    watch = pipeline.watch(tx_hash)
+    time.sleep(0.2)
+
+    pipeline.submit({"to": "0x01"}).result(timeout=2)
+    assert chain.sent == [0, 1]
+    assert not watch.done()
+
+    chain.mined_count = 2
+    chain.mine(tx_hash)
+    assert watch.result(timeout=2)["transactionHash"] == tx_hash
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+pytest.importorskip("httpx")
+pytest.importorskip("pydantic")
+
+from orchestrator import rpc, simulator
+from orchestrator.models import JobIntent, OrchestrationPlan, Step
+from orchestrator.rpc import JsonRpcClient, JsonRpcError, RpcTransportError
+
+_REVERT_TARGET = "0x00000000000000000000000000000000000000bb"
+
+
+class _StubNode:
+    """Minimal JSON-RPC endpoint recording every HTTP request it serves."""
+
+    def __init__(self, *, accept_batches: bool = True) -> None:
+        self.requests: List[Any] = []
+        self.accept_batches = accept_batches
+        self.batch_error: Dict[str, Any] | None = None
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802 - http.server API
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                node.requests.append(body)
+                if isinstance(body, list):
+                    if node.batch_error is not None:
+                        payload = {"jsonrpc": "2.0", "id": None, "error": node.batch_error}
+                    elif node.accept_batches:
+                        payload: Any = [node.respond(item) for item in body]
+                    else:
+                        payload = {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch disabled"}}
+                else:
+                    payload = node.respond(body)
+                raw = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *_args: Any) -> None:
+                return
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def respond(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method = request["method"]
+        params = request.get("params") or []
+        base = {"jsonrpc": "2.0", "id": request["id"]}
+        if params and isinstance(params[0], dict) and params[0].get("to") == _REVERT_TARGET:
+            return {**base, "error": {"code": 3, "message": "execution reverted", "data": {"message": "execution reverted: allowance"}}}
+        results = {"eth_estimateGas": "0x5208", "eth_gasPrice": "0x3b9aca00", "eth_call": "0x01", "eth_chainId": "0x1"}
+        return {**base, "result": results.get(method)}
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def node():
+    server = _StubNode()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def client(node):
+    instance = JsonRpcClient(node.url, timeout=2)
+    yield instance
+    instance.close()
+
+
+def _chain_plan(*targets: str) -> OrchestrationPlan:
+    intent = JobIntent(kind="post_job", title="Test", reward_agialpha="1", deadline_days=7)
+    steps = [
+        Step(
+            id=f"chain-{index}",
+            name=f"Chain {index}",
+            kind="chain",
+            tool="job.post",
+            params={"call": {"to": target, "data": "0xdeadbeef"}},
+        )
+        for index, target in enumerate(targets)
+    ]
+    return OrchestrationPlan.from_intent(intent, steps, "1.07")
+
+
+def test_batch_returns_results_in_order_with_per_call_errors(node, client):
+    results = client.batch(
+        [
+            ("eth_estimateGas", [{"to": "0x01"}]),
+            ("eth_call", [{"to": _REVERT_TARGET}, "latest"]),
+            ("eth_chainId", []),
+        ]
+    )
+
+    assert results[0] == "0x5208"
+    assert isinstance(results[1], JsonRpcError) and results[1].code == 3
+    assert results[2] == "0x1"
+    assert len(node.requests) == 1 and len(node.requests[0]) == 3
+
+
+def test_ttl_cache_and_async_api_share_the_pool(node, client):
+    assert client.call("eth_gasPrice") == "0x3b9aca00"
+    assert asyncio.run(client.acall("eth_gasPrice")) == "0x3b9aca00"
+    assert client.call("eth_call", [{"to": "0x01"}, "latest"]) == "0x01"
+    assert client.call("eth_call", [{"to": "0x01"}, "latest"]) == "0x01"
+
+    methods = [request["method"] for request in node.requests]
+    assert methods == ["eth_gasPrice", "eth_call", "eth_call"]
+
+    client.clear_cache()
+    client.call("eth_gasPrice")
+    assert len(node.requests) == 4
+
+
+def test_batch_falls_back_when_endpoint_rejects_batches():
+    node = _StubNode(accept_batches=False)
+    client = JsonRpcClient(node.url, timeout=2)
+    try:
+        assert client.batch([("eth_estimateGas", [{"to": "0x01"}]), ("eth_call", [{"to": "0x01"}, "latest"])]) == [
+            "0x5208",
+            "0x01",
+        ]
+        assert client.batch([("eth_estimateGas", [{"to": "0x02"}]), ("eth_call", [{"to": "0x02"}, "latest"])]) == [
+            "0x5208",
+            "0x01",
+        ]
+        assert sum(isinstance(request, list) for request in node.requests) == 1
+    finally:
+        client.close()
+        node.close()
+
+
+def test_transient_batch_error_keeps_batching(node, client):
+    node.batch_error = {"code": -32005, "message": "request rate exceeded"}
+    results = client.batch([("eth_estimateGas", [{"to": "0x03"}]), ("eth_call", [{"to": "0x03"}, "latest"])])
+    assert [result.code for result in results] == [-32005, -32005]
+
+    node.batch_error = None
+    assert client.batch([("eth_estimateGas", [{"to": "0x04"}]), ("eth_call", [{"to": "0x04"}, "latest"])]) == [
+        "0x5208",
+        "0x01",
+    ]
+    assert [isinstance(request, list) for request in node.requests] == [True, True]
+
+
+def test_transport_errors_raise():
+    client = JsonRpcClient("http://127.0.0.1:9", timeout=0.5)
+    try:
+        with pytest.raises(RpcTransportError):
+            client.call("eth_chainId")
+    finally:
+        client.close()
+
+
+def test_simulate_plan_uses_one_round_trip(node, client, monkeypatch):
+    monkeypatch.setattr(rpc, "_CLIENTS", {rpc._DEFAULT_RPC_URL: client})
+    plan = _chain_plan("0x00000000000000000000000000000000000000aa", _REVERT_TARGET, "0x00000000000000000000000000000000000000cc")
+
+    result = simulator.simulate_plan(plan)
+
+    assert len(node.requests) == 1
+    methods = sorted(request["method"] for request in node.requests[0])
+    assert methods == ["eth_call"] * 3 + ["eth_estimateGas"] * 3 + ["eth_gasPrice"]
+    ok, reverted, last = result.chain_calls
+    assert ok["status"] == "ok" and ok["fee_wei"] == str(0x5208 * 0x3B9ACA00)
+    assert reverted["status"] == "error" and reverted["revert_reason"] == "allowance"
+    assert last["status"] == "ok"
+    assert result.total_gas_estimate == str(2 * 0x5208)
+    assert "UNKNOWN_REVERT" not in result.blockers and result.blockers
+
+
+def test_simulate_plan_async_matches_sync(node, client, monkeypatch):
+    monkeypatch.setattr(rpc, "_CLIENTS", {rpc._DEFAULT_RPC_URL: client})
+    plan = _chain_plan("0x00000000000000000000000000000000000000aa")
+
+    expected = simulator.simulate_plan(plan)
+    result = asyncio.run(simulator.simulate_plan_async(plan))
+
+    assert result.model_dump() == expected.model_dump()
+
+
+def test_simulate_plan_reports_transport_failure(monkeypatch):
+    client = JsonRpcClient("http://127.0.0.1:9", timeout=0.5)
+    monkeypatch.setattr(rpc, "_CLIENTS", {rpc._DEFAULT_RPC_URL: client})
+    try:
+        result = simulator.simulate_plan(_chain_plan("0x00000000000000000000000000000000000000aa", "0x00000000000000000000000000000000000000cc"))
+    finally:
+        client.close()
+
+    assert "RPC_TIMEOUT" in result.blockers
+    assert len(result.chain_calls) == 1 and result.chain_calls[0]["status"] == "error"
@@ -0,0 +1,166 @@
+import threading
+import time
+from pathlib import Path
+from typing import List, Sequence
+
+import pytest
+
+from orchestrator.models import RunInfo, StatusOut, StepStatus
+from orchestrator.state import (
+    FileRunStateStore,
+    GroupCommitRunStateStore,
+    RunArchive,
+    RunStateError,
+    RunStateStore,
+)
+
+
+def _status(run_id: str, state: str = "pending") -> StatusOut:
+    run = RunInfo(id=run_id, plan_id="plan-1", state=state, created_at=time.time())
+    steps = [StepStatus(id="step-1", name="First", kind="llm", state="pending")]
+    return StatusOut(run=run, steps=steps, current=None, logs=[])
+
+
+class RecordingStore(RunStateStore):
+    def __init__(self) -> None:
+        self.batches: List[List[str]] = []
+        self.saved: dict[str, StatusOut] = {}
+        self.flushed = threading.Event()
+
+    def save(self, status: StatusOut) -> None:
+        self.save_many([status])
+
+    def save_many(self, statuses: Sequence[StatusOut]) -> None:
+        self.batches.append([status.run.id for status in statuses])
+        for status in statuses:
+            self.saved[status.run.id] = status.model_copy(deep=True)
+        self.flushed.set()
+
+    def load(self, run_id: str):
+        return self.saved.get(run_id)
+
+    def delete(self, run_id: str) -> None:
+        self.saved.pop(run_id, None)
+
+    def list_ids(self):
+        return list(self.saved)
+
+
+def test_group_commit_coalesces_writes_per_run() -> None:
+    backend = RecordingStore()
+    store = GroupCommitRunStateStore(backend, interval=60.0, max_batch=100)
+    try:
+        status = _status("run-1")
+        store.save(status)
+        status.run.state = "running"
+        store.save(status)
+        store.save(_status("run-2"))
+
+        assert backend.batches == []
+        assert store.load("run-1").run.state == "running"
+        assert sorted(store.list_ids()) == ["run-1", "run-2"]
+
+        store.flush()
+        assert len(backend.batches) == 1
+        assert sorted(backend.batches[0]) == ["run-1", "run-2"]
+        assert backend.saved["run-1"].run.state == "running"
+        assert store.pending() == 0
+    finally:
+        store.close()
+
+
+def test_group_commit_flushes_on_time_and_size_budget() -> None:
+    backend = RecordingStore()
+    store = GroupCommitRunStateStore(backend, interval=0.01, max_batch=100)
+    try:
+        store.save(_status("run-1"))
+        assert backend.flushed.wait(2.0)
+        assert backend.batches == [["run-1"]]
+    finally:
+        store.close()
+
+    backend = RecordingStore()
+    store = GroupCommitRunStateStore(backend, interval=60.0, max_batch=3)
+    try:
+        for index in range(3):
+            store.save(_status(f"run-{index}"))
+        assert backend.flushed.wait(2.0)
+        assert len(backend.batches[0]) == 3
+    finally:
+        store.close()
+
+
+def test_group_commit_close_drains_to_file_store(tmp_path: Path) -> None:
+    backend = FileRunStateStore(tmp_path)
+    store = GroupCommitRunStateStore(backend, interval=60.0, max_batch=100)
+    store.save(_status("run-1", "succeeded"))
+    store.close()
+
+    restored = backend.load("run-1")
+    assert restored is not None and restored.run.state == "succeeded"
+    assert not list(tmp_path.rglob("*.tmp"))
+    with pytest.raises(RunStateError):
+        store.save(_status("run-2"))
+
+
+def test_file_store_shards_by_run_id_and_migrates_legacy_files(tmp_path: Path) -> None:
+    legacy = _status("abcdef", "succeeded")
+    (tmp_path / "abcdef.json").write_text(legacy.model_dump_json(), encoding="utf-8")
+
+    store = FileRunStateStore(tmp_path)
+    assert store.load("abcdef").run.state == "succeeded"
+    assert list(store.list_ids()) == ["abcdef"]
+
+    store.save(_status("abcdef", "failed"))
+    assert (tmp_path / "ab" / "abcdef.json").exists()
+    assert not (tmp_path / "abcdef.json").exists()
+    assert store.load("abcdef").run.state == "failed"
+
+    store.delete("abcdef")
+    assert store.load("abcdef") is None
+    assert list(store.list_ids()) == []
+
+
+def test_file_store_lists_with_filters_and_cursor(tmp_path: Path) -> None:
+    store = FileRunStateStore(tmp_path)
+    for index in range(5):
+        store.save(_status(f"run-{index}", "succeeded" if index % 2 else "running"))
+    other = _status("run-other", "succeeded")
+    other.run.plan_id = "plan-2"
+    store.save(other)
+
+    first = store.list(plan_id="plan-1", limit=2)
+    assert [entry.run_id for entry in first.entries] == ["run-0", "run-1"]
+    assert first.cursor is not None
+    second = store.list(plan_id="plan-1", limit=2, cursor=first.cursor)
+    third = store.list(plan_id="plan-1", limit=2, cursor=second.cursor)
+    assert [entry.run_id for entry in second.entries + third.entries] == ["run-2", "run-3", "run-4"]
+    assert third.cursor is None
+
+    succeeded = store.list(state="succeeded")
+    assert [entry.run_id for entry in succeeded.entries] == ["run-1", "run-3", "run-other"]
+    cutoff = succeeded.entries[-1].updated_at
+    assert store.list(state="succeeded", updated_after=cutoff).entries[-1].run_id == "run-other"
+    assert "run-other" not in [entry.run_id for entry in store.list(updated_before=cutoff).entries]
+
+    with pytest.raises(RunStateError):
+        store.list(cursor="not-a-cursor")
+
+    reopened = FileRunStateStore(tmp_path)
+    assert len(reopened.list(limit=10).entries) == 6
+
+
+def test_archive_expired_moves_terminal_runs_to_cold_store(tmp_path: Path) -> None:
+    store = FileRunStateStore(tmp_path / "runs")
+    archive = RunArchive(tmp_path / "archive")
+    store.save(_status("run-done", "succeeded"))
+    store.save(_status("run-live", "running"))
+
+    assert store.archive_expired(archive, ttl=60.0) == []
+    archived = store.archive_expired(archive, ttl=60.0, now=time.time() + 120.0)
+
+    assert archived == ["run-done"]
+    assert store.load("run-done") is None
+    assert store.load("run-live") is not None
+    assert archive.load("run-done").run.state == "succeeded"
+    assert [path.suffix for path in archive.segments()] == [".gz"]
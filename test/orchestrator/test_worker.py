@@ -1,8 +1,11 @@
 import asyncio
+import time
 
 import pytest
 
-from orchestrator.worker import build_worker, run_worker_forever
+from orchestrator.activity_queue import ActivityCall, InMemoryActivityQueue, SqliteActivityQueue
+from orchestrator.tools.executors import RetryPolicy
+from orchestrator.worker import HGMActivityWorker, build_worker, run_worker_forever
 
 
 def test_build_worker_and_dispatch_records_events():
@@ -22,20 +25,178 @@ def test_build_worker_and_dispatch_records_events():
     asyncio.run(runner())
 
 
-def test_run_worker_forever_invokes_sleep(monkeypatch):
+def _queue(kind: str, tmp_path, name: str = "default", **kwargs):
+    if kind == "sqlite":
+        return SqliteActivityQueue(tmp_path / "activities.db", queue=name, **kwargs)
+    return InMemoryActivityQueue(**kwargs)
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_queue_leases_acks_and_redelivers_expired_leases(kind, tmp_path):
+    queue = _queue(kind, tmp_path, max_attempts=2)
+    call = ActivityCall("hgm.evaluate", ("root/a", 0.5), {"weight": 2.0})
+    assert queue.enqueue(call, key="eval-1")
+    assert queue.enqueue(call, key="eval-1") is False
+
+    [first] = queue.lease("w1", limit=5, visibility_timeout=0.05)
+    assert (first.call, first.key, first.attempts) == (call, "eval-1", 1)
+    assert queue.lease("w2") == []
+
+    time.sleep(0.06)
+    [second] = queue.lease("w2", visibility_timeout=30.0)
+    assert second.attempts == 2
+    # The first worker lost its lease; only the current holder can settle the task.
+    assert queue.ack(first) is False
+    assert queue.ack(second) is True
+    assert queue.enqueue(call, key="eval-1") is False
+    assert queue.stats()["done"] == 1
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_queue_retries_then_dead_letters(kind, tmp_path):
+    queue = _queue(kind, tmp_path, max_attempts=2)
+    queue.enqueue(ActivityCall("flaky"), key="flaky-1")
+
+    [task] = queue.lease("w1")
+    assert queue.nack(task, "boom", delay=0.05)
+    assert queue.lease("w1") == []
+    time.sleep(0.06)
+    [task] = queue.lease("w1")
+    assert queue.nack(task, "boom again")
+
+    assert queue.lease("w1") == []
+    stats = queue.stats()
+    assert (stats["dead"], stats["queued"], stats["leased"]) == (1, 0, 0)
+    assert queue.purge(0.0) == 1
+
+
+def test_sqlite_queues_are_shared_by_name(tmp_path):
+    producer = SqliteActivityQueue(tmp_path / "activities.db", queue="work")
+    consumer = SqliteActivityQueue(tmp_path / "activities.db", queue="work")
+    other = SqliteActivityQueue(tmp_path / "activities.db", queue="results")
+    producer.enqueue_many([(ActivityCall("score", (index,)), f"score-{index}") for index in range(3)])
+
+    assert [task.call.args for task in consumer.lease("w1", limit=10)] == [(0,), (1,), (2,)]
+    assert other.lease("w1") == []
+
+
+def test_remote_results_are_applied_once_in_batches():
+    async def runner() -> None:
+        work = InMemoryActivityQueue()
+        results = InMemoryActivityQueue()
+        remote = HGMActivityWorker(None, queue=work, reply_queue=results, concurrency=4)
+
+        async def score(node_key: str, quality: float):
+            return ActivityCall("hgm.evaluate", (node_key, quality), {"payload": {"scored_by": "remote"}})
+
+        remote.register("score", score)
+        coordinator = build_worker(queue=results, concurrency=8)
+        await coordinator.workflow.ensure_node("root")
+        results.enqueue(ActivityCall("hgm.expand", ("root", "a")), key="expand-a")
+        work.enqueue_many([(ActivityCall("score", ("root/a", 0.25 * index)), f"score-{index}") for index in range(4)])
+
+        assert await remote.run_once() == 4
+        # A redelivered scoring task re-emits the same follow-up key, which the queue ignores.
+        assert results.enqueue(ActivityCall("hgm.evaluate", ("root/a", 1.0)), key="score-0:0") is False
+        assert await coordinator.run_once() == 5
+
+        snapshot = await coordinator.workflow.snapshot()
+        assert snapshot["root/a"].visits == pytest.approx(4.0)
+        assert snapshot["root/a"].success_weight == pytest.approx(1.5)
+        assert coordinator.processed == 5
+        assert results.stats()["done"] == 5
+        await coordinator.workflow.shutdown()
+
+    asyncio.run(runner())
+
+
+def test_run_worker_forever_drains_queue_until_cancelled():
     async def runner() -> None:
-        worker = build_worker()
-        calls: list[float] = []
+        queue = InMemoryActivityQueue()
+        worker = build_worker(queue=queue, concurrency=2, retry=RetryPolicy(attempts=1, backoff=0.0))
+        await worker.workflow.ensure_node("root")
+        seen: list[int] = []
 
-        async def fake_sleep(interval: float) -> None:
-            calls.append(interval)
-            raise asyncio.CancelledError
+        async def work(index: int):
+            if index == 3 and index not in seen:
+                seen.append(index)
+                raise RuntimeError("transient")
+            seen.append(index)
 
-        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        worker.register("work", work)
+        queue.enqueue_many([(ActivityCall("work", (index,)), None) for index in range(6)])
 
+        task = asyncio.create_task(run_worker_forever(worker))
+        for _ in range(200):
+            if queue.stats()["done"] == 6:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
         with pytest.raises(asyncio.CancelledError):
-            await run_worker_forever(worker)
+            await task
+
+        assert sorted(set(seen)) == list(range(6))
+        assert (worker.processed, worker.failed) == (6, 1)
+        await worker.workflow.shutdown()
+
+    asyncio.run(runner())
+
 
-        assert calls == [3600], "Worker loop should sleep for an hour between polls"
+def test_applied_results_are_not_counted_twice():
+    async def runner() -> None:
+        results = InMemoryActivityQueue(max_attempts=2)
+        coordinator = build_worker(queue=results, concurrency=8)
+        workflow = coordinator.workflow
+        await workflow.ensure_node("root/a")
+
+        class _BrokenWriter:
+            def submit_many(self, *args, **kwargs):
+                raise RuntimeError("writer closed")
+
+            def flush(self):
+                pass
+
+            def close(self):
+                pass
+
+        workflow._evaluation_writer = _BrokenWriter()
+        results.enqueue_many(
+            [
+                (ActivityCall("hgm.evaluate", ("root/a", 1.0)), "good-1"),
+                (ActivityCall("hgm.evaluate", ("root/a", 0.0)), "good-2"),
+                (ActivityCall("hgm.evaluate", ("root/a", 7.0)), "bad-reward"),
+            ]
+        )
+        # The writer fails after the engine took the batch: no per-task replay.
+        assert await coordinator.run_once(visibility_timeout=0.05) == 3
+        assert (await workflow.snapshot())["root/a"].visits == pytest.approx(2.0)
+        assert (results.stats()["done"], coordinator.failed) == (2, 1)
+
+        # A result whose acknowledgement was lost is redelivered and skipped.
+        results.enqueue(ActivityCall("hgm.evaluate", ("root/a", 1.0)), key="good-3")
+        original_ack_many = results.ack_many
+        results.ack_many = lambda tasks: (_ for _ in ()).throw(RuntimeError("ack lost"))
+        with pytest.raises(RuntimeError):
+            await coordinator.run_once(visibility_timeout=0.05)
+        results.ack_many = original_ack_many
+        await asyncio.sleep(0.06)
+        assert await coordinator.run_once() == 1
+        assert (await workflow.snapshot())["root/a"].visits == pytest.approx(3.0)
+        assert results.stats()["done"] == 3
+        await workflow.shutdown()
 
     asyncio.run(runner())
+
+
+def test_sqlite_queue_rolls_back_when_an_operation_raises(tmp_path):
+    queue = SqliteActivityQueue(tmp_path / "activities.db", queue="work")
+    queue.enqueue(ActivityCall("score", (1,)), key="corrupt")
+    queue._conn.execute("UPDATE activities SET args = 'not json' WHERE key = 'corrupt'")
+
+    with pytest.raises(ValueError):
+        queue.lease("w1")
+    assert not queue._conn.in_transaction
+    queue._conn.execute("DELETE FROM activities WHERE key = 'corrupt'")
+    assert queue.enqueue(ActivityCall("score", (2,)), key="fine")
+    assert [task.key for task in queue.lease("w1")] == ["fine"]
+    queue.close()
@@ -126,6 +126,23 @@ def test_simulate_blocks_post_job_without_budget():
     assert "BUDGET_REQUIRED" in payload["detail"]["blockers"]
 
 
+def test_execute_applies_backpressure_when_run_queue_full(monkeypatch):
+    import routes.meta_orchestrator as meta_module
+    from orchestrator.dispatch import RunQueueFull
+
+    def _full(plan, approvals):
+        raise RunQueueFull("run queue is full")
+
+    monkeypatch.setattr(meta_module, "start_run", _full)
+    client = TestClient(create_app())
+
+    response = client.post("/onebox/execute", json={"plan": _serialize_plan(_build_finalize_plan())})
+
+    assert response.status_code == 429
+    assert response.json()["detail"] == "RUN_QUEUE_FULL"
+    assert response.headers["Retry-After"] == "1"
+
+
 def test_meta_requires_token_when_configured(monkeypatch):
     monkeypatch.setattr(onebox, "_API_TOKEN", "meta-secret")
     reload_security_settings()
@@ -7,7 +7,8 @@ import tempfile
 import types
 import unittest
 import threading
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, List, Optional, Set
 from unittest import mock
 
 os.environ.setdefault("RPC_URL", "http://localhost:8545")
@@ -1503,50 +1504,153 @@ class ReceiptPinningMetadataTests(unittest.IsolatedAsyncioTestCase):
 
         build_tx_mock.assert_called_once()
 
-class RelayerTransactionTests(unittest.IsolatedAsyncioTestCase):
-    async def test_send_relayer_tx_allows_concurrent_tasks(self) -> None:
-        loop = asyncio.get_running_loop()
-        wait_started = asyncio.Event()
-        release = threading.Event()
-        receipt_payload = {"status": 1}
-        tx = {"nonce": 7}
 
-        mock_relayer = mock.Mock()
-        mock_relayer.address = "0x0000000000000000000000000000000000000000"
-        mock_relayer.sign_transaction.return_value = types.SimpleNamespace(rawTransaction=b"\xaa")
+class HedgedPinningTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.providers = [
+            onebox.PinningProvider(name=name, endpoint=f"https://{name}.example/upload", token="t", gateway_templates=[])
+            for name in ("slow", "fast", "spare")
+        ]
+        self.cancelled: List[str] = []
+        self.bodies: List[Any] = []
+        self.delays = {"slow": 1.0, "fast": 0.01, "spare": 0.01}
+        self.failing: Set[str] = set()
+        test = self
+
+        class _Pool:
+            async def post(self, url, *, headers=None, files=None, timeout=None):  # type: ignore[no-untyped-def]
+                name = url.split("//", 1)[1].split(".", 1)[0]
+                test.bodies.append(files["file"][1])
+                try:
+                    await asyncio.sleep(test.delays[name])
+                except asyncio.CancelledError:
+                    test.cancelled.append(name)
+                    raise
+                if name in test.failing:
+                    return types.SimpleNamespace(status_code=503, text="unavailable", json=lambda: {})
+                return types.SimpleNamespace(status_code=200, text="", json=lambda: {"cid": f"bafy{name}"})
+
+        self._patches = [
+            mock.patch.object(onebox, "_resolve_pinners", return_value=self.providers),
+            mock.patch.object(onebox, "get_http_pool", return_value=_Pool()),
+            mock.patch.object(onebox, "_PINNER_HEALTH", {}),
+            mock.patch.object(onebox, "_PIN_HEDGED", True),
+        ]
+        for patcher in self._patches:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self._patches):
+            patcher.stop()
+
+    async def test_races_two_providers_and_cancels_the_loser(self) -> None:
+        result = await onebox._pin_json({"b": 2, "a": 1}, "payload.json")
+
+        self.assertEqual(result["provider"], "fast")
+        self.assertEqual(result["cid"], "bafyfast")
+        self.assertEqual(self.cancelled, ["slow"])
+        self.assertEqual(self.bodies, ['{"a":1,"b":2}', '{"a":1,"b":2}'])
+        self.assertIsNotNone(onebox._pinner_health(self.providers[1]).latency)
+
+    async def test_falls_back_past_failed_pair_and_opens_breaker(self) -> None:
+        self.failing = {"slow", "fast"}
+        self.delays["slow"] = 0.0
+        with mock.patch.object(onebox, "_PIN_BREAKER_FAILURES", 1):
+            result = await onebox._pin_json({"a": 1}, "payload.json")
+            self.assertEqual(result["provider"], "spare")
+            self.assertEqual(result["attempts"], 3)
+
+            self.bodies.clear()
+            await onebox._pin_json({"a": 1}, "payload.json")
+
+        self.assertEqual(len(self.bodies), 1)
+
+
+    async def test_ranking_does_not_spend_a_fallback_half_open_trial(self) -> None:
+        spare = onebox._pinner_health(self.providers[2])
+        with mock.patch("orchestrator.http_pool.time.monotonic", return_value=100.0):
+            for _ in range(onebox._PIN_BREAKER_FAILURES):
+                spare.record_failure()
+        self.assertTrue(spare.available())  # the reset window has passed: half-open
+
+        result = await onebox._pin_json({"a": 1}, "payload.json")
+
+        self.assertEqual(result["provider"], "fast")
+        self.assertTrue(spare.allow(), "the unused fallback keeps its trial request")
+
 
-        def _fake_wait(tx_hash: str, timeout: int = 180):
-            loop.call_soon_threadsafe(wait_started.set)
-            if not release.wait(timeout=1):
-                raise AssertionError("release signal not triggered")
-            return receipt_payload
+class RelayerTransactionTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.mined: Dict[str, Dict[str, int]] = {}
+        self.relayer = mock.Mock()
+        self.relayer.address = "0x0000000000000000000000000000000000000000"
+        self.relayer.sign_transaction.side_effect = lambda tx: types.SimpleNamespace(rawTransaction=bytes([tx["nonce"]]))
+        self._patches = [
+            mock.patch.object(onebox, "relayer", self.relayer),
+            mock.patch.object(onebox, "_RELAYER_PIPELINE", None),
+            mock.patch.object(onebox, "_RELAYER_POLL_INTERVAL", 0.01),
+            mock.patch.object(onebox, "_RELAYER_AWAIT_RECEIPT", True),
+            mock.patch.object(onebox.w3.eth, "send_raw_transaction", side_effect=lambda raw: b"\x99" + raw),
+            mock.patch.object(
+                onebox.w3.eth, "get_transaction_receipt", side_effect=lambda tx_hash: self.mined.get(tx_hash), create=True
+            ),
+        ]
+        for patcher in self._patches:
+            patcher.start()
 
-        expected_tx_hash = b"\x99".hex()
+    async def asyncTearDown(self) -> None:
+        if onebox._RELAYER_PIPELINE is not None:
+            onebox._RELAYER_PIPELINE.shutdown()
+        for patcher in reversed(self._patches):
+            patcher.stop()
+
+    async def test_send_relayer_tx_waits_for_receipt_without_blocking_the_loop(self) -> None:
+        send_task = asyncio.create_task(onebox._send_relayer_tx({"to": "0x01"}, mode="legacy"))
+
+        for _ in range(100):
+            pipeline = onebox._RELAYER_PIPELINE
+            if pipeline is not None and pipeline.stats()["pending_receipts"] == 1:
+                break
+            await asyncio.sleep(0.01)
+        self.assertFalse(send_task.done())
+
+        self.mined["0x9900"] = {"status": 1}
+        tx_hash, receipt = await asyncio.wait_for(send_task, timeout=1)
+
+        self.assertEqual(tx_hash, "0x9900")
+        self.assertEqual(receipt, {"status": 1})
+        self.relayer.sign_transaction.assert_called_once()
+
+    async def test_concurrent_sends_receive_distinct_nonces(self) -> None:
+        with mock.patch.object(onebox, "_RELAYER_AWAIT_RECEIPT", False):
+            results = await asyncio.gather(
+                *(onebox._send_relayer_tx({"to": "0x01"}, mode="legacy") for _ in range(5))
+            )
 
-        with mock.patch.object(onebox, "relayer", mock_relayer), mock.patch.object(
-            onebox.w3.eth, "send_raw_transaction", return_value=b"\x99"
-        ) as send_mock, mock.patch.object(
-            onebox.w3.eth, "wait_for_transaction_receipt", side_effect=_fake_wait
-        ) as wait_mock:
-            send_task = asyncio.create_task(onebox._send_relayer_tx(tx, mode="legacy"))
+        self.assertEqual(sorted(tx_hash for tx_hash, _ in results), [f"0x990{index}" for index in range(5)])
+        self.assertTrue(all(receipt == {} for _, receipt in results))
+        self.assertEqual(onebox._RELAYER_PIPELINE.stats()["next_nonce"], 5)
 
-            async def _other_task() -> str:
-                await wait_started.wait()
-                return "progressed"
 
-            other_task = asyncio.create_task(_other_task())
-            other_result = await asyncio.wait_for(other_task, timeout=1)
-            self.assertEqual(other_result, "progressed")
-            self.assertFalse(send_task.done())
+    async def test_job_id_of_non_blocking_submit_is_reported_once_mined(self) -> None:
+        with mock.patch.object(onebox, "_RELAYER_AWAIT_RECEIPT", False):
+            tx_hash, receipt = await onebox._send_relayer_tx({"to": "0x01"}, mode="legacy")
+        self.assertEqual(receipt, {})
+        pending = await onebox.status(_make_request(), txHash=tx_hash)
+        self.assertEqual((pending.state, pending.jobId), ("pending", None))
 
-            release.set()
-            tx_hash, receipt = await asyncio.wait_for(send_task, timeout=1)
+        decode = mock.Mock(return_value=42)
+        with mock.patch.object(onebox, "_decode_job_created", decode):
+            self.mined[tx_hash] = {"status": 1, "logs": []}
+            for _ in range(100):
+                if onebox._get_relayed_tx(tx_hash)["state"] != "pending":
+                    break
+                await asyncio.sleep(0.01)
 
-        self.assertEqual(tx_hash, expected_tx_hash)
-        self.assertEqual(receipt, receipt_payload)
-        mock_relayer.sign_transaction.assert_called_once_with(tx)
-        send_mock.assert_called_once_with(mock_relayer.sign_transaction.return_value.rawTransaction)
-        wait_mock.assert_called_once_with(expected_tx_hash, timeout=180)
+        mined = await onebox.status(_make_request(), txHash=tx_hash)
+        self.assertEqual((mined.state, mined.jobId), ("mined", 42))
+        self.assertEqual(mined.receipt, {"status": 1, "logs": []})
+        decode.assert_called_once_with({"status": 1, "logs": []}, fallback=False)
 
 
 class OrgPolicyEnforcementTests(unittest.IsolatedAsyncioTestCase):
@@ -1776,6 +1880,107 @@ class StatusReadTests(unittest.IsolatedAsyncioTestCase):
         self.assertIsNone(status.deadline)
 
 
+class StatusServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        onebox._STATUS_CACHE.clear()
+        self._patches = [
+            mock.patch.object(onebox, "_STATUS_CACHE_ENABLED", True),
+            mock.patch.object(onebox, "_STATUS_BLOCK", None),
+            mock.patch.object(onebox, "_STATUS_SERVICE", onebox._JobStatusService()),
+            mock.patch.object(onebox, "_STATUS_BLOCK_REFRESH", 0.0),
+            mock.patch("routes.onebox.AGIALPHA_TOKEN", "0xToken"),
+        ]
+        for patcher in self._patches:
+            patcher.start()
+        self.web3 = mock.MagicMock()
+        self.web3.eth.block_number = 100
+        self._patches.append(mock.patch("routes.onebox.w3", self.web3))
+        self._patches[-1].start()
+        self.registry = mock.MagicMock()
+        self.registry.address = "0x0000000000000000000000000000000000000001"
+        self.calls: list = []
+
+        def _jobs(job_id: int):  # type: ignore[no-untyped-def]
+            self.calls.append(job_id)
+
+            def _call() -> Dict[str, int]:
+                time.sleep(0.05)
+                return {"reward": job_id * 10**18, "packedMetadata": _encode_metadata(1)}
+
+            handle = mock.MagicMock()
+            handle.call.side_effect = _call
+            return handle
+
+        self.registry.functions.jobs.side_effect = _jobs
+        self._patches.append(mock.patch("routes.onebox.registry", self.registry))
+        self._patches[-1].start()
+
+    async def asyncTearDown(self) -> None:
+        for patcher in reversed(self._patches):
+            patcher.stop()
+        onebox._STATUS_CACHE.clear()
+
+    async def test_concurrent_requests_share_one_read(self) -> None:
+        results = await asyncio.gather(*(onebox._STATUS_SERVICE.get(5) for _ in range(10)))
+
+        self.assertEqual(self.calls, [5])
+        self.assertTrue(all(result.reward == "5" for result in results))
+
+    async def test_cache_is_invalidated_by_new_blocks(self) -> None:
+        await onebox._STATUS_SERVICE.get(5)
+        await onebox._STATUS_SERVICE.get(5)
+        self.assertEqual(self.calls, [5])
+        self.assertEqual(onebox._get_cached_status(5).state, "open")
+
+        self.web3.eth.block_number = 101
+        await onebox._STATUS_SERVICE.get(5)
+        self.assertEqual(self.calls, [5, 5])
+
+    async def test_status_cache_evicts_least_recently_used(self) -> None:
+        cache = onebox._StatusCache(max_entries=2, ttl=60)
+        for job_id in (1, 2):
+            cache.put(StatusResponse(jobId=job_id, state="open"))
+        cache.get(1)
+        cache.put(StatusResponse(jobId=3, state="open"))
+
+        self.assertIsNotNone(cache.get(1))
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(len(cache), 2)
+
+    async def test_bulk_status_uses_one_multicall(self) -> None:
+        await onebox._STATUS_SERVICE.get(1)
+        multicall_calls: list = []
+
+        def _multicall(job_ids, block):  # type: ignore[no-untyped-def]
+            multicall_calls.append((list(job_ids), block))
+            return {job_id: ("0x0", "0x0", job_id * 10**18, 0, 0, 2, True, 0, 0) for job_id in job_ids}
+
+        with mock.patch.object(onebox, "_multicall_jobs", side_effect=_multicall):
+            response = await onebox.status(_make_request(), jobIds="1, 2,3,2")
+
+        self.assertEqual(multicall_calls, [([2, 3], 100)])
+        self.assertEqual([entry.jobId for entry in response.statuses], [1, 2, 3])
+        self.assertEqual([entry.state for entry in response.statuses], ["open", "assigned", "assigned"])
+        self.assertEqual(response.blockNumber, 100)
+
+    async def test_bulk_status_falls_back_to_single_reads(self) -> None:
+        with mock.patch.object(onebox, "_multicall_jobs", side_effect=RuntimeError("no multicall")):
+            response = await onebox.status(_make_request(), jobIds="7,8")
+
+        self.assertEqual(sorted(self.calls), [7, 8])
+        self.assertEqual([entry.reward for entry in response.statuses], ["7", "8"])
+
+    async def test_bulk_status_rejects_invalid_and_oversized_requests(self) -> None:
+        with self.assertRaises(fastapi.HTTPException) as invalid:
+            await onebox.status(_make_request(), jobIds="1,abc")
+        self.assertEqual(invalid.exception.detail["code"], "JOB_ID_REQUIRED")  # type: ignore[index]
+
+        with mock.patch.object(onebox, "_STATUS_MAX_BATCH", 2):
+            with self.assertRaises(fastapi.HTTPException) as oversized:
+                await onebox.status(_make_request(), jobIds="1,2,3")
+        self.assertEqual(oversized.exception.detail["code"], "STATUS_BATCH_TOO_LARGE")  # type: ignore[index]
+
+
 class JobCreatedDecodingTests(unittest.TestCase):
     def test_decode_job_created_with_full_event_payload(self) -> None:
         receipt = {"logs": ["dummy"]}
@@ -9,7 +9,18 @@ os.environ.setdefault("RPC_URL", "http://localhost:8545")
 # implementation during this test module's import.
 sys.modules.pop("routes.onebox", None)
 
-from routes.onebox import OrgPolicyStore
+from routes.onebox import OrgPolicyStore, OrgPolicyViolation
+
+
+def _violation() -> type:
+    """Return the exception class ``OrgPolicyStore.enforce`` raises right now.
+
+    The root conftest reloads ``routes.onebox`` before every test, which
+    rebinds ``OrgPolicyViolation`` in the namespace ``enforce`` resolves it
+    from, so the class imported above can go stale.
+    """
+
+    return OrgPolicyStore.enforce.__globals__.get("OrgPolicyViolation", OrgPolicyViolation)
 
 
 @pytest.fixture()
@@ -70,3 +81,49 @@ def test_load_without_file_uses_defaults(tmp_path):
     record = store._policies["__default__"]
     assert record.max_budget_wei == 5 * 10**17
     assert record.max_duration_days == 3
+
+
+def test_enforce_uses_compiled_allowlist_and_hot_reloads(temp_policy_file):
+    temp_policy_file.write_text(json.dumps({"acme": {"allowedTools": "search* ipfs.pin"}}))
+    store = OrgPolicyStore(policy_path=str(temp_policy_file), reload_interval=0)
+
+    assert store.enforce("acme", 1, 1, ["Search.web", "ipfs.pin", ""]) is store._policies["acme"]
+    with pytest.raises(_violation()) as exc:
+        store.enforce("acme", 1, 1, ["ipfs.unpin"])
+    assert exc.value.code == "TOOL_NOT_ALLOWED"
+
+    replacement = temp_policy_file.with_suffix(".tmp")
+    replacement.write_text(json.dumps({"acme": {"allowedTools": ["*"], "maxDurationDays": 2}}))
+    os.replace(replacement, temp_policy_file)
+
+    assert store.enforce("acme", 1, 2, ["ipfs.unpin"]).max_duration_days == 2
+    with pytest.raises(_violation()) as exc:
+        store.enforce("acme", 1, 3)
+    assert exc.value.code == "JOB_DEADLINE_CAP_EXCEEDED"
+
+
+def test_update_persists_only_the_changed_entry(temp_policy_file):
+    temp_policy_file.write_text(json.dumps({"acme": {"maxDurationDays": 4}}))
+    store = OrgPolicyStore(policy_path=str(temp_policy_file), default_max_budget_wei=9)
+
+    store.update("beta", 10**18, 7, [" search* ", ""])
+
+    stored = json.loads(temp_policy_file.read_text())
+    assert stored["acme"] == {"maxDurationDays": 4}
+    assert stored["beta"]["maxBudgetWei"] == str(10**18)
+    assert stored["beta"]["allowedTools"] == ["search*"]
+    assert store._policies["beta"].allowed_tools == ["search*"]
+
+
+def test_update_with_none_clears_the_cap(temp_policy_file):
+    temp_policy_file.write_text(json.dumps({"acme": {"maxBudgetWei": "5"}}))
+    store = OrgPolicyStore(policy_path=str(temp_policy_file), default_max_budget_wei=9, default_max_duration_days=3)
+
+    store.update("acme", None, None)
+
+    record = store._policies["acme"]
+    assert (record.max_budget_wei, record.max_duration_days) == (None, None)
+    assert store.enforce("acme", 10**30, 365) is record
+    # Organisations without an entry keep the environment defaults.
+    with pytest.raises(_violation()):
+        store.enforce("other", 10, 1)
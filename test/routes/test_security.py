@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import types
+from typing import List
+
+import pytest
+
+from backend.database import Database
+from routes import security
+from routes.security import DatabaseRateLimiter, HTTPException, RateLimiter
+
+
+class _Request:
+    def __init__(self) -> None:
+        self.state = types.SimpleNamespace()
+        self.url = types.SimpleNamespace(path="/onebox/plan")
+        self.method = "POST"
+        self.body_reads = 0
+
+    async def body(self) -> bytes:
+        self.body_reads += 1
+        return b"{}"
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    now = [1000.0]
+    monkeypatch.setattr("routes.security.time.monotonic", lambda: now[0])
+    monkeypatch.setattr("routes.security.time.time", lambda: now[0])
+    return now
+
+
+def _admitted(limiter: RateLimiter, key: str, attempts: int) -> int:
+    admitted = 0
+    for _ in range(attempts):
+        try:
+            limiter.check(key)
+        except HTTPException as exc:
+            assert exc.status_code == 429
+            assert exc.detail == "RATE_LIMIT_EXCEEDED"
+            continue
+        admitted += 1
+    return admitted
+
+
+def test_memory_limiter_allows_burst_then_refills(clock: List[float]) -> None:
+    limiter = RateLimiter(3, 60.0)
+    assert _admitted(limiter, "token", 5) == 3
+
+    with pytest.raises(HTTPException) as exc:
+        limiter.check("token")
+    assert exc.value.headers == {"Retry-After": "20"}
+
+    clock[0] += 20.0
+    assert _admitted(limiter, "token", 2) == 1
+    assert _admitted(limiter, "other", 3) == 3
+
+
+def test_memory_limiter_drops_refilled_buckets(clock: List[float]) -> None:
+    limiter = RateLimiter(2, 1.0, max_keys=10)
+    for index in range(10):
+        limiter.check(f"key-{index}")
+    clock[0] += 5.0
+    limiter.check("fresh")
+    assert len(limiter) == 1
+
+
+def test_database_limiter_is_shared_between_workers(tmp_path, clock: List[float]) -> None:
+    url = f"sqlite:///{tmp_path / 'limits.db'}"
+    workers = [DatabaseRateLimiter(4, 60.0, Database(url)) for _ in range(2)]
+    admitted = [0, 0]
+
+    def _run(index: int) -> None:
+        admitted[index] = _admitted(workers[index], "token", 5)
+
+    threads = [threading.Thread(target=_run, args=(index,)) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(admitted) == 4
+
+    clock[0] += 15.0
+    assert _admitted(workers[1], "token", 2) == 1
+
+
+def test_tokens_are_resolved_once_and_body_read_only_for_signatures(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("API_TOKEN_ROLES", '{"alpha": "operator", "guest": "viewer"}')
+    monkeypatch.delenv("API_SIGNING_SECRET", raising=False)
+    monkeypatch.delenv("ONEBOX_SIGNING_SECRET", raising=False)
+    security.reload_security_settings()
+
+    request = _Request()
+    for _ in range(3):
+        context = asyncio.run(security.build_security_context(request, "Bearer alpha", None, None, None))
+    assert context.role == "operator"
+    assert security._authenticate_token.cache_info().hits == 2
+    assert request.body_reads == 0
+
+    for header, detail in (("Bearer nope", "AUTH_INVALID"), ("Bearer guest", "ROLE_FORBIDDEN")):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(security.build_security_context(request, header, None, None, None))
+        assert exc.value.detail == detail
+    assert security._authenticate_token.cache_info().currsize == 1
+
+    monkeypatch.setenv("API_SIGNING_SECRET", "secret")
+    security.reload_security_settings()
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(security.build_security_context(request, "Bearer alpha", None, None, None))
+    assert exc.value.detail == "SIGNATURE_TIMESTAMP_MISSING"
+    assert request.body_reads == 1
+
+    monkeypatch.delenv("API_TOKEN_ROLES")
+    monkeypatch.delenv("API_SIGNING_SECRET")
+    security.reload_security_settings()
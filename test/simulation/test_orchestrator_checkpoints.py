@@ -0,0 +1,14 @@
+import pytest
+
+from simulation.orchestrator.checkpoints import measure_checkpoint_encoding
+
+
+@pytest.mark.parametrize("encoding", ["json", "msgpack"])
+def test_checkpoint_benchmark_measures_encoding(tmp_path, encoding):
+    if encoding == "msgpack":
+        pytest.importorskip("msgpack")
+    report = measure_checkpoint_encoding(jobs=20, encoding=encoding, directory=str(tmp_path))
+
+    assert report["jobs"] == 20
+    assert report["file_mb"] > 0
+    assert report["snapshot_seconds"] >= 0
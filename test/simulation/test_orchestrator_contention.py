@@ -0,0 +1,9 @@
+from simulation.orchestrator.contention import run_status_contention_benchmark
+
+
+def test_contention_benchmark_completes_runs_while_reading():
+    report = run_status_contention_benchmark(runs=4, steps_per_run=2, readers=2, workers=2, step_delay=0.0)
+
+    assert report["completed_runs"] == 4
+    assert report["reads"] > 0
+    assert report["read_p99_ms"] >= report["read_p50_ms"]
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from backend.database import Database
+
+
+def _database(tmp_path: Path, pool_size: int = 2) -> Database:
+    database = Database(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=pool_size)
+    with database.transaction() as cur:
+        cur.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, label TEXT)")
+        cur.execute("INSERT INTO items (label) VALUES ('committed')")
+    return database
+
+
+def test_reads_do_not_wait_for_open_write_transaction(tmp_path: Path) -> None:
+    database = _database(tmp_path)
+    writing = threading.Event()
+    release = threading.Event()
+
+    def _slow_write() -> None:
+        with database.transaction() as cur:
+            cur.execute("INSERT INTO items (label) VALUES ('pending')")
+            writing.set()
+            release.wait(5)
+
+    writer = threading.Thread(target=_slow_write)
+    writer.start()
+    try:
+        assert writing.wait(5)
+        started = time.perf_counter()
+        with database.transaction(readonly=True) as cur:
+            cur.execute("SELECT label FROM items ORDER BY id")
+            labels = [row[0] for row in cur.fetchall()]
+        assert time.perf_counter() - started < 1.0
+        assert labels == ["committed"]
+    finally:
+        release.set()
+        writer.join()
+
+    with database.transaction(readonly=True) as cur:
+        cur.execute("SELECT COUNT(*) FROM items")
+        assert cur.fetchone()[0] == 2
+    database.close()
+
+
+def test_reader_pool_is_bounded_and_reports_stats(tmp_path: Path) -> None:
+    database = _database(tmp_path, pool_size=2)
+    inside = threading.Barrier(3)
+    release = threading.Event()
+
+    def _hold_reader() -> None:
+        with database.transaction(readonly=True) as cur:
+            cur.execute("SELECT 1")
+            inside.wait(5)
+            release.wait(5)
+
+    holders = [threading.Thread(target=_hold_reader) for _ in range(2)]
+    for thread in holders:
+        thread.start()
+    inside.wait(5)
+    threading.Timer(0.1, release.set).start()
+    with database.transaction(readonly=True) as cur:
+        cur.execute("SELECT 1")
+    for thread in holders:
+        thread.join()
+
+    stats = database.pool_stats()
+    assert stats["reader"]["checkouts"] == 3
+    assert stats["reader"]["maxWaitSeconds"] >= 0.05
+    assert stats["writer"]["checkouts"] == 1
+    assert len(database._readers._opened) == 2  # type: ignore[union-attr]
+    database.close()
+
+
+def test_readonly_transactions_reject_writes(tmp_path: Path) -> None:
+    database = _database(tmp_path)
+    with pytest.raises(sqlite3.OperationalError):
+        with database.transaction(readonly=True) as cur:
+            cur.execute("INSERT INTO items (label) VALUES ('nope')")
+    database.close()
+
+
+def test_discarded_connection_wakes_waiter_and_is_closed() -> None:
+    from backend.database import _ConnectionPool
+
+    class _Conn:
+        def __init__(self) -> None:
+            self.closed = False
+            self.close_calls = 0
+
+        def close(self) -> None:
+            self.close_calls += 1
+            self.closed = True
+
+    opened: list[_Conn] = []
+
+    def _factory() -> _Conn:
+        conn = _Conn()
+        opened.append(conn)
+        return conn
+
+    pool = _ConnectionPool(_factory, 1)
+    holding = threading.Event()
+    got: list[_Conn] = []
+
+    def _waiter() -> None:
+        holding.wait(5)
+        with pool.connection() as conn:
+            got.append(conn)
+
+    waiter = threading.Thread(target=_waiter)
+    waiter.start()
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            holding.set()
+            time.sleep(0.1)  # let the waiter block on the exhausted pool
+            conn.closed = True  # the server dropped the connection mid-query
+            raise RuntimeError("connection lost")
+    waiter.join(5)
+
+    assert not waiter.is_alive()
+    assert len(opened) == 2
+    assert got == [opened[1]]
+    assert opened[0].close_calls == 1
+    assert pool._opened == [opened[1]]
+    pool.close()
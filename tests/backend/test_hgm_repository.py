@@ -3,7 +3,7 @@ from __future__ import annotations
 import math
 
 from backend.database import get_database
-from backend.models.hgm import HgmRepository, seed_demo_run
+from backend.models.hgm import HgmEvaluationWriter, HgmRepository, seed_demo_run
 
 
 def test_migrations_create_tables() -> None:
@@ -61,3 +61,172 @@ def test_seed_demo_run_populates_sample() -> None:
     assert lineage
     alpha = next(child for child in lineage[0].children if child.agent_key.endswith("alpha"))
     assert alpha.children  # deep node present
+
+
+def _deep_lineage(repo: HgmRepository, run_id: str, depth: int) -> list[str]:
+    repo.ensure_run(run_id, "root")
+    keys = ["root"]
+    repo.ensure_agent(run_id, "root", None)
+    for level in range(1, depth):
+        keys.append(f"{keys[-1]}/{level}")
+        repo.ensure_agent(run_id, keys[-1], keys[-2])
+    return keys
+
+
+def _clade(repo: HgmRepository, run_id: str) -> dict[str, tuple[float, float]]:
+    nodes = list(repo.fetch_lineage(run_id))
+    totals = {}
+    while nodes:
+        node = nodes.pop()
+        totals[node.agent_key] = (round(node.clade_success, 9), round(node.clade_failure, 9))
+        nodes.extend(node.children)
+    return totals
+
+
+def test_batched_evaluations_match_single_writes() -> None:
+    payloads = [("root/1/2", {"reward": 0.25}), ("root/1/2/3/4", {"reward": 0.9, "weight": 2.0}), ("root/1", {"reward": 0.5})]
+    single = HgmRepository(get_database())
+    keys = _deep_lineage(single, "single", 5)
+    for agent_key, payload in payloads:
+        single.record_evaluation("single", agent_key, payload)
+
+    # A fresh repository has no cached parents and must fetch them in bulk.
+    batched = HgmRepository(get_database())
+    _deep_lineage(HgmRepository(get_database()), "batched", 5)
+    batched.record_evaluations("batched", payloads + [("orphan", {"reward": 1.0})])
+
+    expected = _clade(single, "single")
+    actual = _clade(batched, "batched")
+    assert actual.pop("orphan") == (1.0, 0.0)
+    assert actual == expected
+    assert expected[keys[0]] == (0.25 + 1.8 + 0.5, 0.75 + 0.2 + 0.5)
+    assert [e.agent_key for e in batched.list_evaluations("batched")][:3] == [key for key, _ in payloads]
+
+
+def test_evaluation_writer_flushes_in_batches() -> None:
+    repo = HgmRepository(get_database())
+    keys = _deep_lineage(repo, "writer", 20)
+    writer = HgmEvaluationWriter(repo, max_batch=64, flush_interval=0.01)
+    for _ in range(200):
+        writer.submit("writer", keys[-1], {"reward": 1.0})
+    writer.flush()
+    writer.close()
+
+    assert (writer.written, writer.failed) == (200, 0)
+    assert math.isclose(_clade(repo, "writer")["root"][0], 200.0)
+    assert len(repo.list_evaluations("writer", keys[-1])) == 200
+
+
+def test_evaluation_writer_keeps_the_rest_of_a_batch_with_a_bad_payload() -> None:
+    repo = HgmRepository(get_database())
+    keys = _deep_lineage(repo, "partial", 3)
+    writer = HgmEvaluationWriter(repo, max_batch=64, flush_interval=0.5)
+    writer.submit("partial", keys[-1], {"reward": 1.0})
+    writer.submit("partial", keys[-1], {"reward": "not-a-number"})
+    writer.submit("partial", keys[-1], {"reward": 0.5})
+    writer.flush()
+    writer.close()
+
+    assert (writer.written, writer.failed) == (2, 1)
+    assert len(repo.list_evaluations("partial", keys[-1])) == 2
+    assert math.isclose(_clade(repo, "partial")["root"][0], 1.5)
+
+
+def test_evaluation_writer_retries_a_failed_batch_row_by_row(monkeypatch) -> None:
+    repo = HgmRepository(get_database())
+    keys = _deep_lineage(repo, "retry", 3)
+    record_rows = repo._record_rows
+
+    def _flaky(run_id, rows):  # type: ignore[no-untyped-def]
+        if len(rows) > 1 or rows[0].reward == 0.25:
+            raise RuntimeError("write failed")
+        record_rows(run_id, rows)
+
+    monkeypatch.setattr(repo, "_record_rows", _flaky)
+    writer = HgmEvaluationWriter(repo, max_batch=64, flush_interval=0.5)
+    writer.submit_many("retry", [(keys[-1], {"reward": 1.0}), (keys[-1], {"reward": 0.25}), (keys[-1], {"reward": 0.5})])
+    writer.flush()
+    writer.close()
+
+    assert (writer.written, writer.failed) == (2, 1)
+    assert len(repo.list_evaluations("retry", keys[-1])) == 2
+
+
+def test_record_expansions_writes_one_batch() -> None:
+    repo = HgmRepository(get_database())
+    repo.ensure_run("bulk", "root")
+    repo.ensure_agent("bulk", "root", None)
+    agents = repo.record_expansions(
+        "bulk",
+        [("root/a", "root", {"label": "A"}), ("root/a/b", "root/a", None), ("root/c", "root", None)],
+    )
+
+    assert [(agent.agent_key, agent.depth) for agent in agents] == [("root/a", 1), ("root/a/b", 2), ("root/c", 1)]
+    assert _flatten(repo.fetch_lineage("bulk")) == ["root", "root/a", "root/a/b", "root/c"]
+    assert agents[0].metadata["label"] == "A"
+
+
+def _flatten(nodes) -> list[str]:
+    keys = []
+    for node in nodes:
+        keys.append(node.agent_key)
+        keys.extend(_flatten(node.children))
+    return keys
+
+
+def test_lineage_subtree_depth_and_pagination() -> None:
+    repo = HgmRepository(get_database())
+    seed_demo_run(repo, run_id="paged")
+    repo.record_expansion("paged", "root/alpha-2", "root", {"label": "Sibling sharing a key prefix"})
+
+    (alpha,) = repo.fetch_lineage("paged", "root/alpha")
+    assert _flatten([alpha]) == ["root/alpha", "root/alpha/deep"]
+    assert _flatten(repo.fetch_lineage("paged", "root/alpha", max_depth=0)) == ["root/alpha"]
+    assert _flatten(repo.fetch_lineage("paged", max_depth=1)) == ["root", "root/alpha", "root/alpha-2", "root/beta"]
+
+    keys = []
+    cursor = None
+    while True:
+        page = repo.lineage_page("paged", after=cursor, limit=2)
+        keys.extend(node.agent_key for node in page.nodes)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert keys == _flatten(repo.fetch_lineage("paged"))
+
+    watermark = repo.lineage_page("paged").watermark
+    repo.record_evaluation("paged", "root/beta", {"reward": 1.0})
+    delta = repo.lineage_page("paged", since=watermark + 1e-6)
+    assert [node.agent_key for node in delta.nodes] == ["root", "root/beta"]
+    assert delta.watermark > watermark
+
+
+def test_reparenting_moves_subtree_paths() -> None:
+    repo = HgmRepository(get_database())
+    seed_demo_run(repo, run_id="moved")
+    repo.ensure_agent("moved", "root/alpha", "root/beta")
+
+    (beta,) = repo.fetch_lineage("moved", "root/beta")
+    assert _flatten([beta]) == ["root/beta", "root/alpha", "root/alpha/deep"]
+    assert [node.depth for node in repo.lineage_page("moved", root_key="root/alpha").nodes] == [2, 3]
+
+
+def test_reparenting_by_another_writer_refreshes_cached_parents(monkeypatch) -> None:
+    writer = HgmRepository(get_database())
+    other = HgmRepository(get_database())
+    writer.ensure_run("shared", "root")
+    for key, parent in (("root", None), ("root/p1", "root"), ("root/p2", "root"), ("leaf", "root/p1")):
+        writer.ensure_agent("shared", key, parent)
+    writer.record_evaluation("shared", "leaf", {"reward": 1.0})
+
+    other.ensure_agent("shared", "leaf", "root/p2")
+    # The upsert itself notices the parent moved and drops the cached link, so
+    # even a write racing ahead of the post-commit cache refresh sees root/p2.
+    monkeypatch.setattr(writer, "_remember_parents", lambda run_id, links: None)
+    writer.ensure_agent("shared", "leaf")
+    writer.record_evaluation("shared", "leaf", {"reward": 1.0})
+
+    clade = _clade(writer, "shared")
+    assert clade["root/p1"] == (1.0, 0.0)
+    assert clade["root/p2"] == (1.0, 0.0)
+    assert clade["root"] == (2.0, 0.0)
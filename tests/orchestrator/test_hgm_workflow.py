@@ -8,6 +8,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "packages" / "hgm-c
 
 import pytest
 
+from hgm_core.config import EngineConfig
 from orchestrator.workflows import HGMOrchestrationWorkflow, TaskScheduler
 from orchestrator.workflows.hgm import WorkflowConfig
 from orchestrator.tools.executors import RetryPolicy
@@ -48,6 +49,127 @@ def test_scheduler_respects_concurrency_and_retries():
     asyncio.run(scenario())
 
 
+def test_scheduler_orders_by_priority_and_key_fairness():
+    async def scenario() -> List[str]:
+        scheduler = TaskScheduler(concurrency=1)
+        order: List[str] = []
+
+        def _record(name: str):
+            async def _task():
+                order.append(name)
+
+            return _task
+
+        gate = asyncio.Event()
+        await scheduler.schedule("gate", gate.wait)
+        await asyncio.sleep(0)
+        for index in range(3):
+            await scheduler.schedule(f"hot-{index}", _record(f"hot-{index}"), priority=1, key="hot")
+        await scheduler.schedule("cold-0", _record("cold-0"), priority=1, key="cold")
+        await scheduler.schedule("urgent", _record("urgent"), priority=0, key="hot")
+        # Queued work is held as callables, not parked asyncio tasks.
+        assert len(scheduler._workers) == 1
+        assert scheduler.stats()["pending"] == 5
+        gate.set()
+        await scheduler.wait_for_all()
+        assert scheduler.stats()["max_wait_seconds"] > 0
+        return order
+
+    assert asyncio.run(scenario()) == ["urgent", "hot-0", "cold-0", "hot-1", "hot-2"]
+
+
+def test_scheduler_bounds_pending_queue_and_dedupe_memory():
+    async def scenario() -> None:
+        scheduler = TaskScheduler(concurrency=1, max_pending=2, dedupe_ttl=0.05, max_tracked=3)
+        gate = asyncio.Event()
+        assert await scheduler.schedule("running", gate.wait)
+        await asyncio.sleep(0)
+        assert await scheduler.schedule("a", gate.wait)
+        assert await scheduler.schedule("b", gate.wait)
+        assert await scheduler.schedule("c", gate.wait) is False
+        assert scheduler.stats()["rejected"] == 1
+        gate.set()
+        await scheduler.wait_for_all()
+
+        assert await scheduler.schedule("a", gate.wait) is False
+        for index in range(5):
+            assert await scheduler.schedule(f"extra-{index}", gate.wait)
+            await scheduler.wait_for_all()
+        assert len(scheduler.attempts) == 3
+        await asyncio.sleep(0.06)
+        assert await scheduler.schedule("extra-4", gate.wait)
+        await scheduler.wait_for_all()
+
+    asyncio.run(scenario())
+
+
+def test_scheduler_retries_with_capped_jittered_backoff():
+    async def scenario() -> None:
+        scheduler = TaskScheduler(concurrency=1, retry=RetryPolicy(attempts=4, backoff=0.01), max_backoff=0.02)
+        delays = [scheduler._backoff(attempt) for attempt in range(1, 6) for _ in range(20)]
+        assert all(0.0 < delay <= 0.02 for delay in delays)
+        assert len(set(delays)) > 1
+
+        async def _always_fails():
+            raise RuntimeError("boom")
+
+        await scheduler.schedule("doomed", _always_fails)
+        await scheduler.wait_for_all()
+        assert scheduler.attempts["doomed"] == 4
+        assert isinstance(scheduler.errors["doomed"], RuntimeError)
+
+    asyncio.run(scenario())
+
+
+def test_rejected_expansion_does_not_widen_the_tree():
+    async def scenario() -> None:
+        workflow = HGMOrchestrationWorkflow(
+            config=WorkflowConfig(concurrency=1, max_pending_tasks=1, engine=EngineConfig(min_visitations=9)),
+        )
+        await workflow.ensure_node("root")
+        gate = asyncio.Event()
+
+        async def expansion(action: str):
+            await gate.wait()
+            return {"action": action}
+
+        assert await workflow.schedule_expansion("root", ["a", "b", "c"], expansion)
+        await asyncio.sleep(0)  # the first expansion leaves the queue for the worker
+        assert await workflow.schedule_expansion("root", ["a", "b", "c"], expansion)
+        assert await workflow.schedule_expansion("root", ["a", "b", "c"], expansion) is False
+        node = (await workflow.snapshot())["root"]
+        assert node.metadata["children"] == ["a", "b"]
+        assert workflow.scheduler.stats()["reserved"] == 0
+
+        gate.set()
+        await workflow.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_scheduler_metrics_are_labelled_per_workflow():
+    from prometheus_client import REGISTRY
+
+    async def scenario() -> None:
+        first = HGMOrchestrationWorkflow(config=WorkflowConfig(run_id="metrics-a"))
+        second = HGMOrchestrationWorkflow(config=WorkflowConfig(run_id="metrics-b"))
+        gate = asyncio.Event()
+        await first.schedule_evaluation("root", lambda: gate.wait(), request_id="held")
+
+        def depth(run_id: str):
+            return REGISTRY.get_sample_value("orchestrator_scheduler_queue_depth", {"scheduler": f"hgm-{run_id}"})
+
+        assert depth("metrics-a") == 1.0
+        assert depth("metrics-b") == 0.0
+        gate.set()
+        await first.shutdown()
+        await second.shutdown()
+        assert depth("metrics-a") is None
+        assert depth("metrics-b") is None
+
+    asyncio.run(scenario())
+
+
 def test_workflow_applies_results_and_blocks_busy_agents():
     async def scenario() -> None:
         workflow = HGMOrchestrationWorkflow(
@@ -148,3 +270,39 @@ def test_sentinel_gates_expansions_and_resumes():
         await workflow.shutdown()
 
     asyncio.run(scenario())
+
+
+def test_batched_activities_update_engine_repository_and_sentinel():
+    async def scenario() -> None:
+        workflow = HGMOrchestrationWorkflow(config=WorkflowConfig(lock_stripes=4))
+        await workflow.ensure_node("root")
+        await workflow.record_expansions([("root", "a"), ("root", "b", {"cost": 2.0}), ("root/a", "x")])
+        await asyncio.gather(
+            workflow.record_evaluations([("root/a/x", 1.0)] * 5),
+            workflow.record_evaluations([("root/b", 0.5, 2.0, {"value": 4.0})] * 5),
+        )
+        await workflow.drain()
+
+        snapshot = await workflow.snapshot()
+        assert snapshot["root/a"].success_weight == pytest.approx(5.0)
+        assert snapshot["root"].visits == pytest.approx(15.0)
+        assert len(workflow.expansion_events) == 3
+        assert len(workflow.evaluation_events) == 10
+
+        repository = workflow._repository
+        assert repository is not None
+        lineage = {node.agent_key: node for node in repository.fetch_lineage(workflow._run_id)[0].children}
+        assert lineage["root/a"].children[0].agent_key == "root/a/x"
+        assert len(repository.list_evaluations(workflow._run_id, "root/b")) == 5
+
+        sentinel = workflow._sentinel
+        assert sentinel is not None
+        assert sentinel.snapshot().total_cost == pytest.approx(2.0)
+        assert sentinel.snapshot().total_value == pytest.approx(20.0)
+
+        locks = workflow._engine_guards(["root/a/x", "root/a", "root/a/y/z"])
+        assert len(locks) == 1
+        assert workflow._engine_guards(None) == workflow._engine_locks
+        await workflow.shutdown()
+
+    asyncio.run(scenario())
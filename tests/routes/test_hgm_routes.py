@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import os
 
 from fastapi.testclient import TestClient
@@ -60,3 +61,35 @@ def test_graphql_lineage_endpoint_with_variables() -> None:
     payload = response.json()
     assert "data" in payload
     assert payload["data"]["lineage"][0]["agentKey"] == "root"
+
+
+def test_lineage_pages_stream_and_graphql_connection() -> None:
+    repo = HgmRepository(get_database())
+    seed_demo_run(repo, run_id="demo-pages")
+    client = TestClient(create_app())
+
+    first = client.get("/hgm/runs/demo-pages/lineage/nodes", params={"first": 2}).json()
+    assert [node["agentKey"] for node in first["nodes"]] == ["root", "root/alpha"]
+    rest = client.get("/hgm/runs/demo-pages/lineage/nodes", params={"after": first["nextCursor"]}).json()
+    assert [node["agentKey"] for node in rest["nodes"]] == ["root/alpha/deep", "root/beta"]
+    assert rest["nextCursor"] is None
+    assert client.get("/hgm/runs/demo-pages/lineage/nodes", params={"after": "!"}).status_code == 400
+    assert client.get("/hgm/runs/missing/lineage/nodes").status_code == 404
+
+    streamed = client.get("/hgm/runs/demo-pages/lineage/stream", params={"root": "root/alpha"})
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["agentKey"] for line in streamed.text.splitlines()] == ["root/alpha", "root/alpha/deep"]
+
+    tree = client.get("/hgm/runs/demo-pages/lineage", params={"depth": 1}).json()
+    assert [child["children"] for child in tree[0]["children"]] == [[], []]
+
+    response = client.post(
+        "/hgm/graphql",
+        json={
+            "query": "query Page($after: String) { lineage(runId: \"demo-pages\", depth: 1, first: 2, after: $after) { nodes { agentKey } } }",
+            "variables": {"after": first["nextCursor"]},
+        },
+    )
+    connection = response.json()["data"]["lineage"]
+    assert [node["agentKey"] for node in connection["nodes"]] == ["root/beta"]
+    assert connection["pageInfo"] == {"hasNextPage": False, "endCursor": None}